@@ -0,0 +1,205 @@
+"""
+jobs.py
+- Background job model for long-running API work (post generation).
+- Requests enqueue a job and return its id right away; a bounded worker pool runs the job
+  and clients poll /jobs/<id> or stream /jobs/<id>/stream (Server-Sent Events).
+"""
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from src.utils.index import get_env_variable
+
+DEFAULT_JOB_WORKERS = 4
+# Finished jobs are kept this long so clients can still fetch the result
+DEFAULT_JOB_RETENTION_SECONDS = 60 * 60
+MAX_RETAINED_JOBS = 1000
+# Seconds between SSE keep-alive comments while a job is quiet
+STREAM_HEARTBEAT_SECONDS = 15
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+@dataclass
+class Job:
+    """A unit of background work and its observable progress."""
+    id: str
+    kind: str
+    tenant: Optional[str] = None
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "tenant": self.tenant,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Thread-safe registry and worker pool for background jobs.
+
+    A slow job only occupies one worker; request threads return immediately after submit().
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        retention_seconds: float = DEFAULT_JOB_RETENTION_SECONDS,
+        max_jobs: int = MAX_RETAINED_JOBS,
+    ):
+        workers = max_workers or int(get_env_variable("API_JOB_WORKERS") or DEFAULT_JOB_WORKERS)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="api-job")
+        self._jobs: Dict[str, Job] = {}
+        self._condition = threading.Condition()
+        self.retention_seconds = retention_seconds
+        self.max_jobs = max_jobs
+
+    def submit(self, kind: str, func: Callable[..., Any], *args, tenant: Optional[str] = None, **kwargs) -> Job:
+        """
+        Queues `func(job, *args, **kwargs)` on the worker pool.
+        The return value becomes job.result; an exception marks the job failed.
+        """
+        job = Job(id=uuid.uuid4().hex, kind=kind, tenant=tenant)
+        with self._condition:
+            self._prune()
+            self._jobs[job.id] = job
+            self._record(job, JOB_QUEUED)
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._condition:
+            return self._jobs.get(job_id)
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns a consistent dict view of a job, or None if it is unknown or expired."""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def add_event(self, job: Job, message: str, **data) -> None:
+        """Records a progress event for streaming clients."""
+        with self._condition:
+            self._record(job, "progress", message=message, **data)
+
+    def add_text_delta(self, job: Job, text: str) -> None:
+        """Records a piece of streamed post text for streaming clients."""
+        with self._condition:
+            self._record(job, "text_delta", text=text)
+
+    def add_text_reset(self, job: Job) -> None:
+        """Tells streaming clients to discard the post text received so far."""
+        with self._condition:
+            self._record(job, "text_reset")
+
+    def iter_events(self, job_id: str, heartbeat: float = STREAM_HEARTBEAT_SECONDS) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Yields the job's events in order, blocking for new ones until the job finishes.
+        Yields None when `heartbeat` seconds pass without an event (for keep-alives).
+        """
+        index = 0
+        while True:
+            with self._condition:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                if index >= len(job.events) and not job.is_finished:
+                    self._condition.wait(timeout=heartbeat)
+                pending = job.events[index:]
+                index += len(pending)
+                finished = job.is_finished and index >= len(job.events)
+            if not pending and not finished:
+                yield None
+            for event in pending:
+                yield event
+            if finished:
+                return
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        with self._condition:
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            self._record(job, JOB_RUNNING)
+        try:
+            result = func(job, *args, **kwargs)
+        except Exception as e:
+            print(f"❌ Job {job.id} failed: {e}")
+            with self._condition:
+                job.status = JOB_FAILED
+                job.error = str(e)
+                job.finished_at = time.time()
+                self._record(job, JOB_FAILED, error=job.error)
+            return
+        with self._condition:
+            job.status = JOB_SUCCEEDED
+            job.result = result
+            job.finished_at = time.time()
+            self._record(job, JOB_SUCCEEDED, result=result)
+
+    def _record(self, job: Job, event: str, **data) -> None:
+        # Caller must hold self._condition
+        job.events.append({"event": event, "status": job.status, "at": time.time(), **data})
+        self._condition.notify_all()
+
+    def _prune(self) -> None:
+        # Caller must hold self._condition
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and now - job.finished_at > self.retention_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if len(self._jobs) >= self.max_jobs:
+            finished = sorted((job for job in self._jobs.values() if job.is_finished), key=lambda job: job.finished_at)
+            for job in finished[: len(self._jobs) - self.max_jobs + 1]:
+                del self._jobs[job.id]
+
+
+def format_sse(event: Optional[Dict[str, Any]]) -> str:
+    """Formats a job event as a Server-Sent Events frame (None becomes a keep-alive comment)."""
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Returns the process-wide job manager (size: API_JOB_WORKERS)."""
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = JobManager()
+    return _job_manager
@@ -1,42 +1,25 @@
-from flask import request, jsonify, Blueprint
+from flask import request, jsonify, Blueprint, g, Response, stream_with_context, url_for
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
 from utils.config.config_loader import config as base_config
-from main import main as run_bot
 from socials.linkedin_bot import get_linkedin_profile_id
-from utils.prompt_builder import init_globals_if_needed, get_prompt_globals
-from utils.helpers.post_cache_helper import is_blog_already_posted
+from src.utils.helpers.prompt.run_context import RunContext, set_run_context, reset_run_context
+from src.utils.index import run_coroutine_sync
+from src.utils.workflow import run_preview_workflow, run_rss_to_social_workflow
+from src.api.jobs import Job, format_sse, get_job_manager
+from src.utils.api.config_handler import get_effective_config_cache, thaw_config
+from src.utils.config.config_service import get_config_service
+from src.utils.dispatch.provider_router import get_provider_router, rank_providers, routing_candidates
 from data.user_model import UserPreferences
 
 # Create blueprint for API routes
 api_blueprint = Blueprint('api', __name__)
 
-# Store header-based config override for the current request
-request_config_override = {}
-request_preferences: Optional[UserPreferences] = None
+# Cached effective configs are derived from base_config; drop them whenever it reloads
+get_config_service().add_listener(lambda _config: get_effective_config_cache().clear())
 
-def merge_configs(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Recursively merge two dictionaries with override taking precedence.
-    
-    Args:
-        base: Base configuration dictionary
-        override: Override dictionary with values to apply on top of base
-        
-    Returns:
-        Merged configuration dictionary
-    """
-    result = base.copy()
-    
-    for key, value in override.items():
-        # If both base and override have dict at this key, merge them recursively
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_configs(result[key], value)
-        # Otherwise override takes precedence
-        else:
-            result[key] = value
-            
-    return result
+# * Header-based config overrides are request-scoped: they live on flask.g
+# * (g.config_override), never in module globals shared by worker threads.
 
 def extract_config_from_headers() -> Dict[str, Any]:
     """
@@ -305,42 +288,106 @@ def user_preferences_to_dict(preferences: UserPreferences) -> Dict[str, Any]:
     
     return config_dict
 
+@api_blueprint.before_request
+def open_run_context():
+    """
+    Give every request its own RunContext so prompt state never leaks between requests.
+    """
+    g.run_context_token = set_run_context(RunContext())
+
+@api_blueprint.teardown_request
+def close_run_context(exc: Optional[BaseException] = None):
+    token = g.pop("run_context_token", None)
+    if token is not None:
+        reset_run_context(token)
+
 @api_blueprint.before_request
 def process_config_headers():
     """
     Process configuration headers before handling the request.
-    Extracts header-based configuration and converts to UserPreferences object.
+    Only the raw header overrides are extracted here; the UserPreferences conversion and merge
+    happen in resolve_effective_config() and are cached per override profile.
     """
-    global request_config_override
-    global request_preferences
-    
-    # Extract configuration from headers
-    request_config_override = extract_config_from_headers()
-    
-    # Convert to UserPreferences object
-    request_preferences = dict_to_user_preferences(request_config_override)
+    g.config_override = extract_config_from_headers()
+
+def preferences_override(config_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a raw override dictionary through the UserPreferences model.
+    """
+    return user_preferences_to_dict(dict_to_user_preferences(config_dict))
+
+def resolve_effective_config(config_dict: Dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Merge the base configuration with an override dictionary (from headers or a request body).
+    Results are memoized by a fingerprint of the override, so repeated profiles skip the
+    UserPreferences round-trip and the merge. The returned mapping is read-only.
     
-    print("Header config override processed into UserPreferences object")
+    Returns:
+        Merged, read-only configuration mapping
+    """
+    return get_effective_config_cache().resolve(base_config.snapshot(), config_dict, normalize=preferences_override)
 
-def get_effective_config() -> Dict[str, Any]:
+def get_effective_config() -> Mapping[str, Any]:
     """
     Get the effective configuration by merging base config with header overrides.
     Uses the UserPreferences model for structured configuration handling.
     
     Returns:
-        Merged configuration dictionary
+        Merged, read-only configuration mapping
     """
-    global request_config_override
-    global request_preferences
-    
-    # If we have a UserPreferences object, convert it to dict for merging
-    if request_preferences:
-        # Convert UserPreferences to dict and merge with base config
-        preferences_dict = user_preferences_to_dict(request_preferences)
-        return merge_configs(base_config, preferences_dict)
-    else:
-        # Fall back to direct dictionary merging
-        return merge_configs(base_config, request_config_override)
+    return resolve_effective_config(g.get("config_override", {}))
+
+def build_job_run_context(job: Job, effective_config: Mapping[str, Any]) -> RunContext:
+    """
+    RunContext for a background job, streaming text to the job's events. The cached effective
+    config is read-only; the run gets a plain copy, since handlers serialize parts of it.
+    """
+    manager = get_job_manager()
+    return RunContext(
+        run_id=job.id,
+        tenant=job.tenant,
+        config=thaw_config(effective_config),
+        on_text_delta=lambda text: manager.add_text_delta(job, text),
+        on_text_reset=lambda: manager.add_text_reset(job),
+    )
+
+def run_generate_post_job(job: Job, rss_source: str, effective_config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Background body of /generate-post: runs the workflow in its own RunContext on a job worker.
+    """
+    manager = get_job_manager()
+    run_context = build_job_run_context(job, effective_config)
+    manager.add_event(job, f"Running workflow for source: {rss_source}")
+    outcome = run_coroutine_sync(run_rss_to_social_workflow(rss_source, run_context=run_context))
+    if outcome.get("status") == "skipped":
+        return {"success": False, "error": "No new blog detected"}
+    return {
+        "success": True,
+        "blog_id": outcome.get("blog_id"),
+        "message": "Post generated and published successfully",
+    }
+
+def run_preview_post_job(job: Job, effective_config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Background body of /preview-post: generates the newest blog's post without publishing it,
+    streaming the text to the job's events as it is generated.
+    """
+    run_context = build_job_run_context(job, effective_config)
+    outcome = run_coroutine_sync(run_preview_workflow(run_context=run_context))
+    if outcome.get("status") == "skipped":
+        return {"success": False, "error": "No blog to preview"}
+    return {"success": True, "blog_id": outcome.get("blog_id"), "post": outcome.get("post")}
+
+def submit_preview_job() -> Job:
+    data = request.get_json(silent=True) or {}
+    user_prefs_dict = data.get('user_preferences')
+    effective_config = resolve_effective_config(user_prefs_dict) if user_prefs_dict else get_effective_config()
+    return get_job_manager().submit(
+        "preview-post",
+        run_preview_post_job,
+        effective_config,
+        tenant=data.get('tenant'),
+    )
 
 # API Routes
 @api_blueprint.route('/generate-post', methods=['POST'])
@@ -352,8 +399,10 @@ def generate_post():
     1. Through X-Config headers (recommended for simple overrides)
     2. By sending a UserPreferences object directly in the request body
     
+    The post is generated in the background.
+    
     Returns:
-        JSON response with generated post
+        202 JSON response with the job id and its status/stream URLs
     """
     try:
         # Get request data
@@ -364,11 +413,8 @@ def generate_post():
         
         # If user preferences were provided in the body, use them instead of headers
         if user_prefs_dict:
-            # Create UserPreferences from the provided dictionary
-            preferences = dict_to_user_preferences(user_prefs_dict)
-            # Convert to dict for merging with base config
-            preferences_dict = user_preferences_to_dict(preferences)
-            effective_config = merge_configs(base_config, preferences_dict)
+            # Normalized through UserPreferences and merged with base config (cached per profile)
+            effective_config = resolve_effective_config(user_prefs_dict)
         else:
             # Use header-based configuration
             effective_config = get_effective_config()
@@ -376,33 +422,22 @@ def generate_post():
         # Extract source from request body or use default
         rss_source = data.get('source', 'codingoni')  # Default to codingoni
         
-        # Initialize globals and check for new blog
-        is_new_blog = init_globals_if_needed()
-        if not is_new_blog:
-            return jsonify({
-                "success": False,
-                "error": "No new blog detected"
-            }), 404
-            
-        # Get blog ID to check for duplicates
-        blog_state = get_prompt_globals()
-        raw_blog = blog_state.get("raw_blog", {})
-        blog_id = raw_blog.get("id") if isinstance(raw_blog, dict) else None
-        
-        # Check if this blog has already been posted
-        if blog_id and is_blog_already_posted(blog_id):
-            return jsonify({
-                "success": False,
-                "error": f"Blog ID {blog_id} has already been posted"
-            }), 409  # Conflict status code
-        
-        # Run the bot with the effective configuration
-        run_bot(rss_source, override_config=effective_config)
+        # Generation takes as long as the LLM round-trip; run it as a job and return right away
+        job = get_job_manager().submit(
+            "generate-post",
+            run_generate_post_job,
+            rss_source,
+            effective_config,
+            tenant=data.get('tenant'),
+        )
         
         return jsonify({
             "success": True,
-            "message": "Post generated and published successfully"
-        })
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": url_for('api.get_job', job_id=job.id),
+            "stream_url": url_for('api.stream_job', job_id=job.id),
+        }), 202
         
     except Exception as e:
         return jsonify({
@@ -410,6 +445,109 @@ def generate_post():
             "error": str(e)
         }), 500
 
+@api_blueprint.route('/preview-post', methods=['POST'])
+def preview_post():
+    """
+    Generate (but do not publish) the post for the newest blog.
+    
+    Accepts the same configuration as /generate-post (X-Config headers or user_preferences).
+    The job's stream carries `text_delta` events with the post text as it is generated.
+    
+    Returns:
+        202 JSON response with the job id and its status/stream URLs
+    """
+    try:
+        job = submit_preview_job()
+        return jsonify({
+            "success": True,
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": url_for('api.get_job', job_id=job.id),
+            "stream_url": url_for('api.stream_job', job_id=job.id),
+        }), 202
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@api_blueprint.route('/preview-post/stream', methods=['POST'])
+def preview_post_stream():
+    """
+    /preview-post in one round-trip: starts the job and answers with its Server-Sent Events
+    stream right away, so the first generated text reaches the client without polling.
+    """
+    try:
+        job = submit_preview_job()
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+    events = (format_sse(event) for event in get_job_manager().iter_events(job.id))
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no', 'X-Job-Id': job.id},
+    )
+
+@api_blueprint.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """
+    Poll a background job.
+    
+    Returns:
+        JSON job status; `result` is set once status is "succeeded", `error` once "failed"
+    """
+    job = get_job_manager().snapshot(job_id)
+    if job is None:
+        return jsonify({
+            "success": False,
+            "error": f"Job {job_id} not found"
+        }), 404
+    return jsonify({"success": True, "job": job})
+
+@api_blueprint.route('/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id: str):
+    """
+    Stream a background job's events as Server-Sent Events until it finishes.
+    """
+    manager = get_job_manager()
+    if manager.get(job_id) is None:
+        return jsonify({
+            "success": False,
+            "error": f"Job {job_id} not found"
+        }), 404
+    events = (format_sse(event) for event in manager.iter_events(job_id))
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+@api_blueprint.route('/providers/stats', methods=['GET'])
+def provider_stats():
+    """
+    Live provider health used by "Auto" routing.
+    
+    Returns:
+        JSON with latency/error EWMAs, SLO score (lower is better, null while the circuit is open)
+        and circuit state per provider and model, plus the current Auto candidate order
+    """
+    router = get_provider_router()
+    return jsonify({
+        "success": True,
+        "slo": {
+            "latency_seconds": router.slo_latency_seconds,
+            "error_rate": router.slo_error_rate,
+        },
+        "providers": router.stats(),
+        "auto_order": {
+            "text": rank_providers("text", routing_candidates("text"), router),
+            "image": rank_providers("image", routing_candidates("image"), router),
+        },
+    })
+
 @api_blueprint.route('/status', methods=['GET'])
 def check_status():
     """
@@ -433,11 +571,8 @@ def check_status():
         if user_prefs_json:
             try:
                 user_prefs_dict = json.loads(user_prefs_json)
-                # Create UserPreferences from the provided dictionary
-                preferences = dict_to_user_preferences(user_prefs_dict)
-                # Convert to dict for merging with base config
-                preferences_dict = user_preferences_to_dict(preferences)
-                effective_config = merge_configs(base_config, preferences_dict)
+                # Normalized through UserPreferences and merged with base config (cached per profile)
+                effective_config = resolve_effective_config(user_prefs_dict)
             except json.JSONDecodeError:
                 return jsonify({
                     "success": False,
@@ -491,11 +626,8 @@ def run_test():
         if user_prefs_json:
             try:
                 user_prefs_dict = json.loads(user_prefs_json)
-                # Create UserPreferences from the provided dictionary
-                preferences = dict_to_user_preferences(user_prefs_dict)
-                # Convert to dict for merging with base config
-                preferences_dict = user_preferences_to_dict(preferences)
-                effective_config = merge_configs(base_config, preferences_dict)
+                # Normalized through UserPreferences and merged with base config (cached per profile)
+                effective_config = resolve_effective_config(user_prefs_dict)
             except json.JSONDecodeError:
                 return jsonify({
                     "success": False,
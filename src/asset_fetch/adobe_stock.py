@@ -1,7 +1,9 @@
-import requests
+from src.utils.helpers.http_client_helper import get_session
 from typing import List, Optional, Dict, Any
 from utils.index import get_env_variable
 
+session = get_session()
+
 # ! Untested: Needs integration and test coverage.
 def adobe_stock_search_images(query: str, limit: int = 5) -> Optional[List[Dict[str, Any]]]:
     """
@@ -18,7 +20,7 @@ def adobe_stock_search_images(query: str, limit: int = 5) -> Optional[List[Dict[
         "Accept": "application/json"
     }
     params = {"search_parameters[words]": query, "search_parameters[limit]": limit}
-    response = requests.get(endpoint, headers=headers, params=params)
+    response = session.get(endpoint, headers=headers, params=params)
     response.raise_for_status()
     data = response.json()
     return data.get("files")
@@ -0,0 +1,455 @@
+"""
+candid_index.py
+- Persistent index of the candid media library, so lookups no longer walk and stat the whole tree.
+- File records live in SQLite under _temp/. A rescan only re-reads files whose size or mtime
+  changed, and rescans are throttled to one per `rescan_interval` seconds.
+- Search goes through an inverted token index with a trigram index over the vocabulary for fuzzy
+  matches ("sunst" -> "sunset"), instead of fuzzy-matching the query against every filename.
+- Optional perceptual-hash (dHash, needs Pillow) dedup of near-identical images.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from src.utils.config.config_loader import config
+
+# Define the directory and ensure it exists
+TEMP_FOLDER = '_temp'
+os.makedirs(TEMP_FOLDER, exist_ok=True)
+
+CANDID_INDEX_DB_FILE = os.path.join(TEMP_FOLDER, 'candid_media_index.db')
+
+IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
+VIDEO_EXTS = {'.mp4', '.mov', '.avi', '.webm', '.mkv'}
+AUDIO_EXTS = {'.mp3', '.wav', '.m4a'}
+DEFAULT_SUPPORTED_EXTS = IMAGE_EXTS | VIDEO_EXTS | AUDIO_EXTS
+
+DEFAULT_RESCAN_INTERVAL_SECONDS = 30
+DEFAULT_MIN_SCORE = 0.6
+# Minimum trigram (Dice) similarity for a fuzzy token match
+FUZZY_MIN_SIMILARITY = 0.5
+# dHash bits that may differ for two images to count as duplicates. The hash is split into 4
+# bands of 16 bits, so any pair within 3 bits shares at least one band.
+DUPLICATE_MAX_DISTANCE = 3
+_DHASH_BANDS = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    root TEXT NOT NULL,
+    relative_path TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created REAL NOT NULL,
+    modified REAL NOT NULL,
+    media_type TEXT NOT NULL,
+    dhash TEXT,
+    PRIMARY KEY (root, relative_path)
+);
+"""
+
+_COLUMNS = ("relative_path", "filename", "size_bytes", "created", "modified", "media_type", "dhash")
+
+
+def media_type_for(ext: str) -> str:
+    ext = ext.lower()
+    return (
+        'image' if ext in IMAGE_EXTS else
+        'video' if ext in VIDEO_EXTS else
+        'audio' if ext in AUDIO_EXTS else
+        'other'
+    )
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens of a filename or query; splits on separators, camelCase and digits."""
+    stem, ext = os.path.splitext(text)
+    if ext.lower() in DEFAULT_SUPPORTED_EXTS:
+        text = stem
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    return re.findall(r"[a-z]+|[0-9]+", text.lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def compute_dhash(path: str, hash_size: int = 8) -> Optional[str]:
+    """
+    Difference hash of an image as a hex string, or None if Pillow is not installed or the file
+    cannot be read as an image.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(path) as image:
+            pixels = list(image.convert("L").resize((hash_size + 1, hash_size)).getdata())
+    except Exception as e:
+        print(f"⚠️ Could not hash {path}: {e}")
+        return None
+    bits = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:0{hash_size * hash_size // 4}x}"
+
+
+def hamming_distance(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+class CandidSearchIndex:
+    """
+    In-memory inverted token index plus a trigram index over the token vocabulary.
+    Records are candid metadata dicts keyed by `relative_path`.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = ()):
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._by_filename: Dict[str, Set[str]] = defaultdict(set)
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        key = record.get('relative_path') or record['filename']
+        if key in self.records:
+            self.remove(key)
+        self.records[key] = record
+        self._by_filename[record['filename']].add(key)
+        for token in set(tokenize(record['filename'])):
+            if token not in self._postings:
+                for gram in trigrams(token):
+                    self._trigrams[gram].add(token)
+            self._postings[token].add(key)
+
+    def remove(self, key: str) -> None:
+        record = self.records.pop(key, None)
+        if record is None:
+            return
+        self._discard(self._by_filename, record['filename'], key)
+        for token in set(tokenize(record['filename'])):
+            if self._discard(self._postings, token, key):
+                for gram in trigrams(token):
+                    self._discard(self._trigrams, gram, token)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, value: str) -> bool:
+        """Removes value from index[key]; returns True if that emptied and dropped the key."""
+        values = index.get(key)
+        if values is None:
+            return False
+        values.discard(value)
+        if not values:
+            del index[key]
+            return True
+        return False
+
+    def by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        keys = self._by_filename.get(filename)
+        return self.records[min(keys)] if keys else None
+
+    def _token_matches(self, token: str) -> Dict[str, float]:
+        """Vocabulary tokens similar to `token`, with their similarity (exact match = 1.0)."""
+        matches = {token: 1.0} if token in self._postings else {}
+        grams = trigrams(token)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self._trigrams.get(gram, ()):
+                shared[candidate] += 1
+        for candidate, count in shared.items():
+            similarity = 2 * count / (len(grams) + len(trigrams(candidate)))
+            if similarity >= FUZZY_MIN_SIMILARITY and similarity > matches.get(candidate, 0):
+                matches[candidate] = similarity
+        return matches
+
+    def search(self, query: str, limit: int = 10, dedupe: bool = False) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Ranks records by how well their filename tokens cover the query tokens (fuzzy matches count
+        by their similarity), with a small penalty for filenames carrying many extra words.
+        With `dedupe`, results whose dHash is within DUPLICATE_MAX_DISTANCE of a better result are dropped.
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+        coverage: Dict[str, List[float]] = defaultdict(lambda: [0.0] * len(query_tokens))
+        for position, token in enumerate(query_tokens):
+            for match, similarity in self._token_matches(token).items():
+                for key in self._postings[match]:
+                    best = coverage[key]
+                    best[position] = max(best[position], similarity)
+        scored = []
+        for key, best in coverage.items():
+            record = self.records[key]
+            record_tokens = len(set(tokenize(record['filename']))) or 1
+            matched = sum(1 for similarity in best if similarity)
+            score = sum(best) / len(query_tokens) * (0.9 + 0.1 * min(1.0, matched / record_tokens))
+            scored.append((score, key))
+        scored.sort(key=lambda item: (-item[0], len(item[1]), item[1]))
+
+        results: List[Tuple[float, Dict[str, Any]]] = []
+        for score, key in scored:
+            record = self.records[key]
+            if dedupe and record.get('dhash') and any(
+                kept.get('dhash') and hamming_distance(record['dhash'], kept['dhash']) <= DUPLICATE_MAX_DISTANCE
+                for _, kept in results
+            ):
+                continue
+            results.append((score, record))
+            if len(results) >= limit:
+                break
+        return results
+
+    def best_match(self, query: str, min_score: float = DEFAULT_MIN_SCORE) -> Optional[Dict[str, Any]]:
+        """Exact filename first, then the top search hit scoring at least `min_score`."""
+        exact = self.by_filename(query)
+        if exact is not None:
+            return exact
+        results = self.search(query, limit=1)
+        if results and results[0][0] >= min_score:
+            return results[0][1]
+        return None
+
+    def duplicates(self, max_distance: int = DUPLICATE_MAX_DISTANCE) -> List[List[Dict[str, Any]]]:
+        """
+        Groups of images whose dHashes differ by at most `max_distance` bits (at most
+        DUPLICATE_MAX_DISTANCE; larger values would need more bands). Candidate pairs come from
+        16-bit hash bands, so the library is not compared pairwise.
+        """
+        hashed = [(key, record['dhash']) for key, record in self.records.items() if record.get('dhash')]
+        buckets: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+        for position, (_, dhash) in enumerate(hashed):
+            band_width = len(dhash) // _DHASH_BANDS
+            for band in range(_DHASH_BANDS):
+                buckets[(band, dhash[band * band_width:(band + 1) * band_width])].append(position)
+
+        parent = list(range(len(hashed)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1:]:
+                    if find(first) != find(second) and hamming_distance(hashed[first][1], hashed[second][1]) <= max_distance:
+                        parent[find(first)] = find(second)
+
+        groups: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for position, (key, _) in enumerate(hashed):
+            groups[find(position)].append(self.records[key])
+        return [sorted(group, key=lambda record: record['relative_path']) for group in groups.values() if len(group) > 1]
+
+
+class CandidMediaIndex:
+    """
+    Persistent, incrementally refreshed index of one candid media directory.
+
+    Args:
+        candid_dir (str): Library root.
+        db_path (str): SQLite file holding the file records.
+        supported_exts (set): Extensions to index. Defaults to common image, video and audio types.
+        rescan_interval (float): Seconds during which lookups reuse the last scan.
+        perceptual_hash (bool): Compute dHashes of images for dedup (requires Pillow).
+    """
+
+    def __init__(
+        self,
+        candid_dir: str,
+        db_path: str = CANDID_INDEX_DB_FILE,
+        supported_exts: Optional[Set[str]] = None,
+        rescan_interval: float = DEFAULT_RESCAN_INTERVAL_SECONDS,
+        perceptual_hash: bool = False,
+    ):
+        self.candid_dir = os.path.abspath(candid_dir)
+        self.db_path = db_path
+        self.supported_exts = {ext.lower() for ext in (supported_exts or DEFAULT_SUPPORTED_EXTS)}
+        self.rescan_interval = rescan_interval
+        self.perceptual_hash = perceptual_hash
+        # Indexes of the same directory with different extension filters keep separate rows
+        self._root_key = f"{self.candid_dir}|{','.join(sorted(self.supported_exts))}"
+        self.search_index = CandidSearchIndex()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._loaded = False
+        self._last_scan = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller must hold self._lock
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _load(self) -> None:
+        # Caller must hold self._lock
+        if self._loaded:
+            return
+        rows = self._connection().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM media WHERE root = ?", (self._root_key,)
+        ).fetchall()
+        for row in rows:
+            self.search_index.add(self._record(*row))
+        self._loaded = True
+
+    @staticmethod
+    def _record(relative_path, filename, size_bytes, created, modified, media_type, dhash) -> Dict[str, Any]:
+        return {
+            'filename': filename,
+            'relative_path': relative_path,
+            'size_bytes': size_bytes,
+            'created': created,
+            'modified': modified,
+            'media_type': media_type,
+            'dhash': dhash,
+        }
+
+    def _walk(self) -> Iterable[Tuple[str, os.stat_result]]:
+        """Yields (relative_path, stat) of every supported file; scandir reuses directory entries."""
+        stack = [self.candid_dir]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in self.supported_exts:
+                            try:
+                                yield os.path.relpath(entry.path, self.candid_dir), entry.stat()
+                            except OSError:
+                                continue
+            except OSError as e:
+                print(f"⚠️ Could not scan {directory}: {e}")
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """
+        Brings the index up to date with the directory. Only new files and files whose size or mtime
+        changed are re-read; deleted files are dropped. Skipped (all zeros) within `rescan_interval`
+        of the last scan unless `force` is set.
+        """
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        with self._lock:
+            self._load()
+            if not force and self._last_scan and time.monotonic() - self._last_scan < self.rescan_interval:
+                return stats
+            if not os.path.isdir(self.candid_dir):
+                print(f"⚠️ Candid directory not found: {self.candid_dir}")
+                return stats
+
+            seen = set()
+            changed = []
+            for relative_path, stat in self._walk():
+                seen.add(relative_path)
+                existing = self.search_index.records.get(relative_path)
+                if (
+                    existing is not None
+                    and existing['size_bytes'] == stat.st_size
+                    and existing['modified'] == stat.st_mtime
+                    and (existing['dhash'] or not self._wants_dhash(existing['media_type']))
+                ):
+                    stats['unchanged'] += 1
+                    continue
+                media_type = media_type_for(os.path.splitext(relative_path)[1])
+                dhash = None
+                if self._wants_dhash(media_type):
+                    dhash = compute_dhash(os.path.join(self.candid_dir, relative_path))
+                record = self._record(
+                    relative_path, os.path.basename(relative_path), stat.st_size,
+                    stat.st_ctime, stat.st_mtime, media_type, dhash,
+                )
+                stats['updated' if existing is not None else 'added'] += 1
+                changed.append(record)
+                self.search_index.add(record)
+            removed = [key for key in self.search_index.records if key not in seen]
+            for key in removed:
+                self.search_index.remove(key)
+            stats['removed'] = len(removed)
+
+            if changed or removed:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO media (root, {', '.join(_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(self._root_key, *(record[column] for column in _COLUMNS)) for record in changed],
+                    )
+                    conn.executemany(
+                        "DELETE FROM media WHERE root = ? AND relative_path = ?",
+                        [(self._root_key, key) for key in removed],
+                    )
+            self._last_scan = time.monotonic()
+        return stats
+
+    def _wants_dhash(self, media_type: str) -> bool:
+        return self.perceptual_hash and media_type == 'image'
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Every indexed record, ordered by relative path."""
+        self.refresh()
+        with self._lock:
+            return [self.search_index.records[key] for key in sorted(self.search_index.records)]
+
+    def by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            return self.search_index.by_filename(filename)
+
+    def search(self, query: str, limit: int = 10, dedupe: bool = False) -> List[Tuple[float, Dict[str, Any]]]:
+        self.refresh()
+        with self._lock:
+            return self.search_index.search(query, limit=limit, dedupe=dedupe)
+
+    def best_match(self, query: str, min_score: float = DEFAULT_MIN_SCORE) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            return self.search_index.best_match(query, min_score=min_score)
+
+    def duplicates(self, max_distance: int = DUPLICATE_MAX_DISTANCE) -> List[List[Dict[str, Any]]]:
+        self.refresh()
+        with self._lock:
+            return self.search_index.duplicates(max_distance=max_distance)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_indexes: Dict[Tuple[str, frozenset], CandidMediaIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_candid_index(candid_dir: str, supported_exts: Optional[Set[str]] = None) -> CandidMediaIndex:
+    """Returns the shared index for a directory, configured from the `candid_media` config block."""
+    exts = frozenset(ext.lower() for ext in (supported_exts or DEFAULT_SUPPORTED_EXTS))
+    key = (os.path.abspath(candid_dir), exts)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            candid_config = config.get("candid_media", {})
+            index = CandidMediaIndex(
+                candid_dir,
+                db_path=CANDID_INDEX_DB_FILE,
+                supported_exts=set(exts),
+                rescan_interval=candid_config.get("rescan_interval_seconds", DEFAULT_RESCAN_INTERVAL_SECONDS),
+                perceptual_hash=candid_config.get("perceptual_hash", False),
+            )
+            _indexes[key] = index
+        return index
@@ -3,45 +3,163 @@
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-import requests
+import asyncio
+import re
+from datetime import datetime
+import httpx
+from src.utils.helpers.http_client_helper import pooled_async_client
+from src.utils.helpers.ttl_cache_helper import TTLCache
+from src.utils.index import run_coroutine_sync
 from typing import List, Optional,Any,Dict,Union
 from utils.index import get_env_variable
 
-def giphy_find_with_metadata(search_terms: List[str]) -> Dict[str, Union[Dict, List[str]]]:
+GIPHY_SEARCH_ENDPOINT = "https://api.giphy.com/v1/gifs/search"
+DEFAULT_SEARCH_LIMIT = 5
+DEFAULT_RATING = "g"
+DEFAULT_LANG = "en"
+GIPHY_CACHE_TTL_SECONDS = 60 * 60
+# Largest GIF the social platforms accept as an image upload (Twitter: 15 MB)
+MAX_GIF_BYTES = 15 * 1024 * 1024
+
+# Score weights: title relevance to the search term, Giphy's own ranking, the order of the
+# AI-suggested terms, and recency (the previous sole criterion) as a tie-breaker
+RELEVANCE_WEIGHT = 0.5
+POSITION_WEIGHT = 0.25
+TERM_RANK_WEIGHT = 0.15
+RECENCY_WEIGHT = 0.1
+OVERSIZED_PENALTY = 0.5
+RECENCY_HORIZON_DAYS = 5 * 365
+
+# Search responses keyed by (term, rating, lang, limit)
+_search_cache = TTLCache(ttl=GIPHY_CACHE_TTL_SECONDS, maxsize=512)
+
+
+def get_giphy_search_cache() -> TTLCache:
+    return _search_cache
+
+
+def _tokens(text: str) -> set:
+    return set(re.findall(r"[a-z0-9]+", (text or "").lower()))
+
+
+def score_gif(gif: Dict[str, Any], term: str, term_rank: int = 0, position: int = 0, total_terms: int = 1) -> float:
+    """
+    Scores a search hit (higher is better).
+
+    Args:
+        gif: Giphy GIF object.
+        term: Search term that returned it.
+        term_rank: Index of the term in the AI-suggested list (earlier terms fit the post better).
+        position: Index of the GIF in Giphy's results for the term.
+        total_terms: Number of terms searched.
+    """
+    term_tokens = _tokens(term)
+    gif_tokens = _tokens(" ".join([gif.get("title", ""), gif.get("slug", ""), gif.get("alt_text", "")]))
+    relevance = len(term_tokens & gif_tokens) / len(term_tokens) if term_tokens else 0.0
+    position_score = 1 / (1 + position)
+    term_rank_score = 1 - term_rank / max(1, total_terms)
+
+    recency = 0.0
+    try:
+        imported = datetime.strptime(gif.get("import_datetime", ""), "%Y-%m-%d %H:%M:%S")
+        age_days = (datetime.now() - imported).days
+        recency = max(0.0, 1 - age_days / RECENCY_HORIZON_DAYS)
+    except ValueError:
+        pass
+
+    score = (
+        RELEVANCE_WEIGHT * relevance
+        + POSITION_WEIGHT * position_score
+        + TERM_RANK_WEIGHT * term_rank_score
+        + RECENCY_WEIGHT * recency
+    )
+    original = gif.get("images", {}).get("original", {})
+    try:
+        if int(original.get("size") or 0) > MAX_GIF_BYTES:
+            score -= OVERSIZED_PENALTY
+    except ValueError:
+        pass
+    return score
+
+
+async def giphy_search_term(
+    client: httpx.AsyncClient,
+    api_key: str,
+    term: str,
+    rating: str = DEFAULT_RATING,
+    lang: str = DEFAULT_LANG,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+) -> Optional[Dict[str, Any]]:
+    """Searches one term, served from the TTL cache when possible. Returns None on failure."""
+    cache_key = (term.strip().lower(), rating, lang, limit)
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    params = {
+        "api_key": api_key,
+        "q": term,
+        "limit": limit,
+        "rating": rating,
+        "lang": lang,
+    }
+    try:
+        response = await client.get(GIPHY_SEARCH_ENDPOINT, params=params)
+    except httpx.HTTPError as e:
+        print(f"Failed search for term '{term}': {e}")
+        return None
+    if response.status_code != 200:
+        print(f"Failed search for term '{term}': {response.status_code}")
+        return None
+    try:
+        result = response.json()
+    except ValueError as e:
+        # A garbled body only costs this term its results, not the whole search
+        print(f"Failed search for term '{term}': invalid JSON ({e})")
+        return None
+    if not isinstance(result, dict):
+        print(f"Failed search for term '{term}': unexpected response")
+        return None
+    _search_cache.set(cache_key, result)
+    return result
+
+
+async def giphy_find_with_metadata_async(
+    search_terms: List[str],
+    rating: str = DEFAULT_RATING,
+    lang: str = DEFAULT_LANG,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+) -> Dict[str, Union[Dict, List[str]]]:
+    """
+    Searches every term at once on the shared client and returns the best-scoring GIF.
+    Returns:
+        {"result": {"gif", "pagination", "meta", "term", "score"} or {}, "valid_terms": [...]}
+    """
     api_key: Optional[str] = get_env_variable("GIPHY_ASSET_TOKEN")
     if not api_key:
         raise ValueError("GIPHY_ASSET_TOKEN is not set in the environment.")
 
-    endpoint = "https://api.giphy.com/v1/gifs/search"
+    terms = list(dict.fromkeys(term.strip() for term in search_terms if term and term.strip()))
+    async with pooled_async_client() as client:
+        results = await asyncio.gather(
+            *(giphy_search_term(client, api_key, term, rating, lang, limit) for term in terms)
+        )
+
     valid_terms = []
-    best_gif_data = None
-    latest_datetime = ""
-
-    for term in search_terms:
-        params = {
-            "api_key": api_key,
-            "q": term,
-            "limit": 5,
-            "rating": "g",
-            "lang": "en",
-        }
-        response = requests.get(endpoint, params=params)
-        if response.status_code == 200:
-            result = response.json()
-            gifs = result.get("data", [])
-            for gif in gifs:
-                dt = gif.get("import_datetime", "")
-                if dt and dt > latest_datetime:
-                    best_gif_data = {
-                        "gif": gif,
-                        "pagination": result.get("pagination", {}),
-                        "meta": result.get("meta", {})
-                    }
-                    latest_datetime = dt
-            if gifs:
-                valid_terms.append(term)
-        else:
-            print(f"Failed search for term '{term}': {response.status_code}")
+    best_gif_data: Optional[Dict[str, Any]] = None
+    for term_rank, (term, result) in enumerate(zip(terms, results)):
+        gifs = (result or {}).get("data", [])
+        if gifs:
+            valid_terms.append(term)
+        for position, gif in enumerate(gifs):
+            score = score_gif(gif, term, term_rank, position, len(terms))
+            if best_gif_data is None or score > best_gif_data["score"]:
+                best_gif_data = {
+                    "gif": gif,
+                    "pagination": result.get("pagination", {}),
+                    "meta": result.get("meta", {}),
+                    "term": term,
+                    "score": score,
+                }
 
     return {
         "result": best_gif_data or {},
@@ -49,6 +167,16 @@ def giphy_find_with_metadata(search_terms: List[str]) -> Dict[str, Union[Dict, L
     }
 
 
+def giphy_find_with_metadata(
+    search_terms: List[str],
+    rating: str = DEFAULT_RATING,
+    lang: str = DEFAULT_LANG,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+) -> Dict[str, Union[Dict, List[str]]]:
+    """Blocking wrapper around giphy_find_with_metadata_async for sync callers."""
+    return run_coroutine_sync(giphy_find_with_metadata_async(search_terms, rating, lang, limit))
+
+
 
 def extract_social_upload_metadata(gif_object: Dict[str, Any]) -> Dict[str, str]:
     """
@@ -1,7 +1,9 @@
-import requests
+from src.utils.helpers.http_client_helper import get_session
 from typing import List, Optional, Dict, Any
 from utils.index import get_env_variable
 
+session = get_session()
+
 # ! Untested: Needs integration and test coverage.
 def pexels_search_images(query: str, per_page: int = 5) -> Optional[List[Dict[str, Any]]]:
     """
@@ -15,7 +17,7 @@ def pexels_search_images(query: str, per_page: int = 5) -> Optional[List[Dict[st
     endpoint = "https://api.pexels.com/v1/search"
     headers = {"Authorization": api_key}
     params = {"query": query, "per_page": per_page}
-    response = requests.get(endpoint, headers=headers, params=params)
+    response = session.get(endpoint, headers=headers, params=params)
     response.raise_for_status()
     data = response.json()
     return data.get("photos")
@@ -0,0 +1,491 @@
+"""
+stock_media_aggregator.py
+- One search over every configured stock media provider (Pexels, Unsplash, Pixabay,
+  Shutterstock, Adobe Stock).
+- All (provider, tag) searches run at once on the shared async client; whatever has answered
+  when the latency budget runs out is ranked, the rest is cancelled.
+- Results are normalized into MediaRecord, cached per (provider, query, per_page), and each
+  provider has a rate limiter fed by its X-RateLimit headers and 429 responses.
+- Library only for now: the post pipeline does not call it yet (posts use GIFs or generated images).
+"""
+import asyncio
+import base64
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+import httpx
+from src.utils.config.config_loader import config
+from src.utils.helpers.http_client_helper import pooled_async_client
+from src.utils.helpers.ttl_cache_helper import TTLCache
+from src.utils.index import get_env_variable, run_coroutine_sync
+
+DEFAULT_PROVIDERS = ["pexels", "unsplash", "pixabay", "shutterstock", "adobe_stock"]
+DEFAULT_LATENCY_BUDGET_SECONDS = 3.0
+DEFAULT_PER_PAGE = 5
+DEFAULT_CACHE_TTL_SECONDS = 60 * 60
+DEFAULT_REQUESTS_PER_MINUTE = 60
+# Seconds to back off after a 429 without a Retry-After header
+DEFAULT_RATE_LIMIT_BACKOFF_SECONDS = 60.0
+
+# Ranking weights
+RELEVANCE_WEIGHT = 0.45
+RESOLUTION_WEIGHT = 0.2
+ORIENTATION_WEIGHT = 0.1
+POSITION_WEIGHT = 0.1
+PROVIDER_PRIORITY_WEIGHT = 0.1
+MULTI_TAG_BONUS = 0.05
+
+
+@dataclass
+class MediaRecord:
+    """A stock photo normalized across providers."""
+    provider: str
+    id: str
+    url: str
+    preview_url: str = ""
+    page_url: str = ""
+    width: int = 0
+    height: int = 0
+    title: str = ""
+    author: str = ""
+    tags: List[str] = field(default_factory=list)
+    license: str = ""
+    query: str = ""
+    position: int = 0
+    matched_queries: List[str] = field(default_factory=list)
+    score: float = 0.0
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.provider, self.id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "id": self.id,
+            "url": self.url,
+            "preview_url": self.preview_url,
+            "page_url": self.page_url,
+            "width": self.width,
+            "height": self.height,
+            "title": self.title,
+            "author": self.author,
+            "tags": list(self.tags),
+            "license": self.license,
+            "matched_queries": list(self.matched_queries),
+            "score": self.score,
+        }
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def normalize_pexels(item: Dict[str, Any]) -> MediaRecord:
+    src = item.get("src", {})
+    return MediaRecord(
+        provider="pexels",
+        id=str(item.get("id", "")),
+        url=src.get("original") or src.get("large2x") or "",
+        preview_url=src.get("medium", ""),
+        page_url=item.get("url", ""),
+        width=_int(item.get("width")),
+        height=_int(item.get("height")),
+        title=item.get("alt", ""),
+        author=item.get("photographer", ""),
+        license="Pexels License",
+        raw=item,
+    )
+
+
+def normalize_unsplash(item: Dict[str, Any]) -> MediaRecord:
+    urls = item.get("urls", {})
+    return MediaRecord(
+        provider="unsplash",
+        id=str(item.get("id", "")),
+        url=urls.get("full") or urls.get("regular") or "",
+        preview_url=urls.get("small", ""),
+        page_url=item.get("links", {}).get("html", ""),
+        width=_int(item.get("width")),
+        height=_int(item.get("height")),
+        title=item.get("description") or item.get("alt_description") or "",
+        author=item.get("user", {}).get("name", ""),
+        tags=[tag.get("title", "") for tag in item.get("tags", []) if isinstance(tag, dict)],
+        license="Unsplash License",
+        raw=item,
+    )
+
+
+def normalize_pixabay(item: Dict[str, Any]) -> MediaRecord:
+    return MediaRecord(
+        provider="pixabay",
+        id=str(item.get("id", "")),
+        url=item.get("largeImageURL") or item.get("webformatURL") or "",
+        preview_url=item.get("previewURL", ""),
+        page_url=item.get("pageURL", ""),
+        width=_int(item.get("imageWidth")),
+        height=_int(item.get("imageHeight")),
+        author=item.get("user", ""),
+        tags=[tag.strip() for tag in item.get("tags", "").split(",") if tag.strip()],
+        license="Pixabay Content License",
+        raw=item,
+    )
+
+
+def normalize_shutterstock(item: Dict[str, Any]) -> MediaRecord:
+    assets = item.get("assets", {})
+    preview = assets.get("preview_1000") or assets.get("huge_thumb") or assets.get("preview") or {}
+    return MediaRecord(
+        provider="shutterstock",
+        id=str(item.get("id", "")),
+        url=preview.get("url", ""),
+        preview_url=assets.get("preview", {}).get("url", ""),
+        page_url=f"https://www.shutterstock.com/image-photo/{item.get('id', '')}",
+        width=_int(preview.get("width")),
+        height=_int(preview.get("height")),
+        title=item.get("description", ""),
+        author=item.get("contributor", {}).get("id", ""),
+        license="Shutterstock (watermarked preview; license before publishing)",
+        raw=item,
+    )
+
+
+def normalize_adobe_stock(item: Dict[str, Any]) -> MediaRecord:
+    keywords = item.get("keywords") or []
+    return MediaRecord(
+        provider="adobe_stock",
+        id=str(item.get("id", "")),
+        url=item.get("thumbnail_url", ""),
+        preview_url=item.get("thumbnail_url", ""),
+        page_url=f"https://stock.adobe.com/{item.get('id', '')}",
+        width=_int(item.get("width")),
+        height=_int(item.get("height")),
+        title=item.get("title", ""),
+        author=item.get("creator_name", ""),
+        tags=[keyword.get("name", "") if isinstance(keyword, dict) else str(keyword) for keyword in keywords],
+        license="Adobe Stock (watermarked preview; license before publishing)",
+        raw=item,
+    )
+
+
+def shutterstock_authorization() -> Optional[str]:
+    """
+    Shutterstock accepts an OAuth token (SHUTTERSTOCK_API_TOKEN) or the application's consumer
+    key and secret (SHUTTERSTOCK_API_KEY + SHUTTERSTOCK_API_SECRET) as Basic auth.
+    """
+    token = get_env_variable("SHUTTERSTOCK_API_TOKEN")
+    if token:
+        return f"Bearer {token}"
+    key, secret = get_env_variable("SHUTTERSTOCK_API_KEY"), get_env_variable("SHUTTERSTOCK_API_SECRET")
+    if key and secret:
+        return "Basic " + base64.b64encode(f"{key}:{secret}".encode()).decode()
+    return None
+
+
+@dataclass(frozen=True)
+class StockProvider:
+    """
+    How to query one provider and normalize its results. `credentials` builds the value passed
+    to build_request when a provider needs more than the `env_var` key; None means not set up.
+    """
+    name: str
+    env_var: str
+    endpoint: str
+    build_request: Callable[[str, int, str], Tuple[Dict[str, Any], Dict[str, str]]]
+    results_key: str
+    normalize: Callable[[Dict[str, Any]], MediaRecord]
+    credentials: Optional[Callable[[], Optional[str]]] = None
+
+    def credential(self) -> Optional[str]:
+        return self.credentials() if self.credentials else get_env_variable(self.env_var)
+
+
+STOCK_PROVIDERS: Dict[str, StockProvider] = {
+    "pexels": StockProvider(
+        "pexels", "PEXELS_API_KEY", "https://api.pexels.com/v1/search",
+        lambda query, per_page, key: ({"query": query, "per_page": per_page}, {"Authorization": key}),
+        "photos", normalize_pexels,
+    ),
+    "unsplash": StockProvider(
+        "unsplash", "UNSPLASH_ACCESS_KEY", "https://api.unsplash.com/search/photos",
+        lambda query, per_page, key: ({"query": query, "per_page": per_page, "client_id": key}, {}),
+        "results", normalize_unsplash,
+    ),
+    "pixabay": StockProvider(
+        "pixabay", "PIXABAY_API_KEY", "https://pixabay.com/api/",
+        lambda query, per_page, key: ({"key": key, "q": query, "per_page": max(3, per_page), "image_type": "photo"}, {}),
+        "hits", normalize_pixabay,
+    ),
+    "shutterstock": StockProvider(
+        "shutterstock", "SHUTTERSTOCK_API_KEY", "https://api.shutterstock.com/v2/images/search",
+        lambda query, per_page, authorization: ({"query": query, "per_page": per_page}, {"Authorization": authorization}),
+        "data", normalize_shutterstock, credentials=shutterstock_authorization,
+    ),
+    "adobe_stock": StockProvider(
+        "adobe_stock", "ADOBE_STOCK_API_KEY", "https://stock.adobe.io/Rest/Media/1/Search/Files",
+        lambda query, per_page, key: (
+            {"search_parameters[words]": query, "search_parameters[limit]": per_page},
+            {"x-api-key": key, "x-product": "my-rss-social-bot", "Accept": "application/json"},
+        ),
+        "files", normalize_adobe_stock,
+    ),
+}
+
+
+class RateLimiter:
+    """
+    Non-blocking token bucket per provider, tightened by the provider's own rate-limit headers.
+    A search that cannot get a token is skipped instead of waiting past the latency budget.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE):
+        self.capacity = max(1.0, float(requests_per_minute))
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return False
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def block_for(self, seconds: float) -> None:
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + max(0.0, seconds))
+
+    def update_from_response(self, response: httpx.Response) -> None:
+        """Reads Retry-After / X-RateLimit-Remaining / X-RateLimit-Reset."""
+        headers = response.headers
+        if response.status_code == 429:
+            self.block_for(_float(headers.get("Retry-After"), DEFAULT_RATE_LIMIT_BACKOFF_SECONDS))
+            return
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get("X-Ratelimit-Remaining")
+        if remaining is not None and _float(remaining, 1) <= 0:
+            reset = _float(headers.get("X-RateLimit-Reset") or headers.get("X-Ratelimit-Reset"), DEFAULT_RATE_LIMIT_BACKOFF_SECONDS)
+            # Some providers send an epoch timestamp, others seconds until reset
+            seconds = reset - time.time() if reset > 1e9 else reset
+            self.block_for(seconds)
+
+
+def _float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _tokens(text: str) -> set:
+    return set(re.findall(r"[a-z0-9]+", (text or "").lower()))
+
+
+def media_relevance(record: MediaRecord, query: str) -> float:
+    """Share of the query's words found in the record's title and tags."""
+    query_tokens = _tokens(query)
+    record_tokens = _tokens(" ".join([record.title, " ".join(record.tags)]))
+    return len(query_tokens & record_tokens) / len(query_tokens) if query_tokens else 0.0
+
+
+def score_media(
+    record: MediaRecord,
+    query: str,
+    provider_rank: int = 0,
+    total_providers: int = 1,
+    min_side: int = 1024,
+    aspect_ratio: Optional[float] = None,
+) -> float:
+    """
+    Scores a record (higher is better): text relevance to the query, resolution against
+    `min_side`, closeness to `aspect_ratio`, position in the provider's results, and provider
+    priority (config order).
+    """
+    relevance = media_relevance(record, query)
+    resolution = min(1.0, min(record.width, record.height) / min_side) if record.width and record.height else 0.5
+    orientation = 0.5
+    if aspect_ratio and record.width and record.height:
+        orientation = max(0.0, 1 - abs(math.log((record.width / record.height) / aspect_ratio)))
+    position = 1 / (1 + record.position)
+    priority = 1 - provider_rank / max(1, total_providers)
+    return (
+        RELEVANCE_WEIGHT * relevance
+        + RESOLUTION_WEIGHT * resolution
+        + ORIENTATION_WEIGHT * orientation
+        + POSITION_WEIGHT * position
+        + PROVIDER_PRIORITY_WEIGHT * priority
+    )
+
+
+class StockMediaAggregator:
+    """
+    Concurrent search across stock providers with a shared cache and per-provider rate limits.
+
+    Args:
+        providers: Provider names in priority order (keys of STOCK_PROVIDERS).
+        latency_budget: Seconds to wait for answers; slower searches are cancelled.
+        per_page: Results requested per (provider, query).
+        cache_ttl: Seconds a provider's results for a query are reused.
+        requests_per_minute: Per-provider request budget, e.g. {"unsplash": 50}.
+    """
+
+    def __init__(
+        self,
+        providers: Optional[Sequence[str]] = None,
+        latency_budget: float = DEFAULT_LATENCY_BUDGET_SECONDS,
+        per_page: int = DEFAULT_PER_PAGE,
+        cache_ttl: float = DEFAULT_CACHE_TTL_SECONDS,
+        requests_per_minute: Optional[Mapping[str, float]] = None,
+    ):
+        self.providers = [name for name in (providers or DEFAULT_PROVIDERS) if name in STOCK_PROVIDERS]
+        self.latency_budget = latency_budget
+        self.per_page = per_page
+        self.cache = TTLCache(ttl=cache_ttl, maxsize=1024)
+        requests_per_minute = requests_per_minute or {}
+        self.rate_limiters = {
+            name: RateLimiter(requests_per_minute.get(name, DEFAULT_REQUESTS_PER_MINUTE)) for name in self.providers
+        }
+
+    def enabled_providers(self) -> List[str]:
+        """Configured providers whose credentials are set."""
+        return [name for name in self.providers if STOCK_PROVIDERS[name].credential()]
+
+    async def search_provider(self, client: httpx.AsyncClient, name: str, query: str) -> List[MediaRecord]:
+        """One (provider, query) search, served from the cache when possible."""
+        cache_key = (name, query.strip().lower(), self.per_page)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        if not self.rate_limiters[name].try_acquire():
+            print(f"⏳ Skipping {name} search for '{query}': rate limit reached.")
+            return []
+        provider = STOCK_PROVIDERS[name]
+        params, headers = provider.build_request(query, self.per_page, provider.credential())
+        try:
+            response = await client.get(provider.endpoint, params=params, headers=headers)
+        except httpx.HTTPError as e:
+            print(f"Failed {name} search for '{query}': {e}")
+            return []
+        self.rate_limiters[name].update_from_response(response)
+        if response.status_code != 200:
+            print(f"Failed {name} search for '{query}': {response.status_code}")
+            return []
+        try:
+            payload = response.json()
+        except ValueError as e:
+            print(f"Failed {name} search for '{query}': invalid JSON ({e})")
+            return []
+        items = payload.get(provider.results_key) if isinstance(payload, dict) else None
+        records = []
+        for position, item in enumerate(items or []):
+            if not isinstance(item, dict):
+                continue
+            record = provider.normalize(item)
+            if not record.url:
+                continue
+            record.query = query
+            record.position = position
+            records.append(record)
+        self.cache.set(cache_key, records)
+        return records
+
+    async def search(
+        self,
+        tags: Sequence[str],
+        min_side: int = 1024,
+        aspect_ratio: Optional[float] = None,
+    ) -> List[MediaRecord]:
+        """
+        Searches every enabled provider for every tag at once and returns the ranked, de-duplicated
+        records that arrived within the latency budget.
+        """
+        queries = list(dict.fromkeys(tag.strip() for tag in tags if tag and tag.strip()))
+        providers = self.enabled_providers()
+        if not queries or not providers:
+            return []
+        async with pooled_async_client() as client:
+            tasks = {
+                asyncio.create_task(self.search_provider(client, name, query)): name
+                for name in providers for query in queries
+            }
+            done, pending = await asyncio.wait(tasks, timeout=self.latency_budget)
+            for task in pending:
+                task.cancel()
+            if pending:
+                print(f"⏱️ {len(pending)} stock search(es) missed the {self.latency_budget}s budget: "
+                      f"{sorted({tasks[task] for task in pending})}")
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        ranked: Dict[Tuple[str, str], MediaRecord] = {}
+        for task in done:
+            if task.cancelled() or task.exception() is not None:
+                continue
+            name = tasks[task]
+            provider_rank = providers.index(name)
+            for cached_record in task.result():
+                # Cached records are shared between searches; score a copy
+                record = MediaRecord(**{**cached_record.__dict__, "matched_queries": [cached_record.query]})
+                record.score = score_media(record, record.query, provider_rank, len(providers), min_side, aspect_ratio)
+                existing = ranked.get(record.key)
+                if existing is None:
+                    ranked[record.key] = record
+                    continue
+                best = record if record.score > existing.score else existing
+                best.matched_queries = existing.matched_queries + [record.query]
+                # The same photo relevant to several tags is a better match
+                if media_relevance(record, record.query) and media_relevance(existing, existing.query):
+                    best.score += MULTI_TAG_BONUS
+                ranked[record.key] = best
+        return sorted(ranked.values(), key=lambda record: record.score, reverse=True)
+
+    async def find_best(self, tags: Sequence[str], **kwargs) -> Optional[MediaRecord]:
+        results = await self.search(tags, **kwargs)
+        return results[0] if results else None
+
+
+def build_stock_media_aggregator(stock_config: Optional[Mapping[str, Any]] = None) -> StockMediaAggregator:
+    stock_config = stock_config if stock_config is not None else config.get("stock_media", {})
+    return StockMediaAggregator(
+        providers=stock_config.get("providers") or DEFAULT_PROVIDERS,
+        latency_budget=stock_config.get("latency_budget_seconds", DEFAULT_LATENCY_BUDGET_SECONDS),
+        per_page=stock_config.get("per_page", DEFAULT_PER_PAGE),
+        cache_ttl=stock_config.get("cache_ttl_seconds", DEFAULT_CACHE_TTL_SECONDS),
+        requests_per_minute=stock_config.get("requests_per_minute") or {},
+    )
+
+
+_aggregator: Optional[StockMediaAggregator] = None
+_aggregator_lock = threading.Lock()
+
+
+def get_stock_media_aggregator() -> StockMediaAggregator:
+    """Returns the process-wide aggregator, configured from the `stock_media` config block."""
+    global _aggregator
+    if _aggregator is None:
+        with _aggregator_lock:
+            if _aggregator is None:
+                _aggregator = build_stock_media_aggregator()
+    return _aggregator
+
+
+async def find_best_stock_media(tags: List[str], **kwargs) -> Optional[MediaRecord]:
+    """Best stock photo for the tags across every enabled provider, or None."""
+    return await get_stock_media_aggregator().find_best(tags, **kwargs)
+
+
+def find_best_stock_media_sync(tags: List[str], **kwargs) -> Optional[MediaRecord]:
+    """Blocking wrapper around find_best_stock_media for sync callers."""
+    return run_coroutine_sync(find_best_stock_media(tags, **kwargs))
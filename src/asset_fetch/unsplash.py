@@ -1,7 +1,9 @@
-import requests
+from src.utils.helpers.http_client_helper import get_session
 from typing import List, Optional, Dict, Any
 from utils.index import get_env_variable
 
+session = get_session()
+
 # ! Untested: Needs integration and test coverage.
 def unsplash_search_images(query: str, per_page: int = 5) -> Optional[List[Dict[str, Any]]]:
     """
@@ -18,7 +20,7 @@ def unsplash_search_images(query: str, per_page: int = 5) -> Optional[List[Dict[
         "per_page": per_page,
         "client_id": access_key
     }
-    response = requests.get(endpoint, params=params)
+    response = session.get(endpoint, params=params)
     response.raise_for_status()
     data = response.json()
     return data.get("results")
@@ -3,7 +3,7 @@ main.py
 Entrypoint for the RSS-to-social bot. Selects the enabled blog source and runs the workflow.
 """
 from src.utils.config.config_provider import load_modular_config
-from src.utils.workflow import run_rss_to_social_workflow
+from src.utils.workflow import run_rss_to_social_workflow, run_batch_rss_to_social_workflow
 from src.utils.index import get_env_variable
 
 # ! TEST_MODE disables main workflow execution for test environments
@@ -36,6 +36,9 @@ def main() -> None:
     rss_source = enabled_sources[0]
     print(f"* Running workflow for source: {rss_source}")
     import asyncio
+    if config.get("batch_posting", {}).get("enabled", False):
+        asyncio.run(run_batch_rss_to_social_workflow())
+        return
     asyncio.run(run_rss_to_social_workflow(rss_source))
 
 
@@ -1,18 +1,37 @@
 from abc import ABC, abstractmethod
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 from utils.config.config_loader import config
 from utils.index import get_env_variable
-from utils.prompt_builder import get_prompt_globals, init_globals_for_test
+from utils.prompt_builder import init_globals_for_test
+from src.utils.helpers.prompt.run_context import RunContext, get_run_context, run_in_context
 import os
 from dotenv import load_dotenv
 
+# * Blocking generators are offloaded to this bounded pool so they never stall the event loop
+DEFAULT_BLOCKING_WORKERS = 8
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+_blocking_executor_lock = threading.Lock()
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Returns the shared thread pool used by send_message_async() fallbacks (size: LLM_BLOCKING_WORKERS)."""
+    global _blocking_executor
+    if _blocking_executor is None:
+        with _blocking_executor_lock:
+            if _blocking_executor is None:
+                workers = int(get_env_variable("LLM_BLOCKING_WORKERS") or DEFAULT_BLOCKING_WORKERS)
+                _blocking_executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="llm-blocking")
+    return _blocking_executor
+
 class BaseGenerator(ABC):
     """
     * Abstract base class for all ML model generators (Claude, DeepSeek, HuggingFace, OpenAI, Pollinations).
     * Handles environment loading, config parsing, prompt state extraction, and provides utility methods.
     * Extend this class and implement the required abstract methods for each provider.
     """
-    def __init__(self, provider: str, config_section: Optional[str] = None):
+    def __init__(self, provider: str, config_section: Optional[str] = None, run_context: Optional[RunContext] = None):
         load_dotenv()
         self.provider = provider
         self.config_section = config_section or provider
@@ -20,8 +39,12 @@ class BaseGenerator(ABC):
         self.test_mode = get_env_variable("TEST_MODE").lower() == "true"
         if self.test_mode:
             init_globals_for_test()
-        self.state = get_prompt_globals()
-        self.config = config.get("user_profile", {}).get("llm", {}).get(self.config_section, {})
+        # Bound to the run that created the generator, so concurrent runs never share a prompt
+        self.run_context = run_context or get_run_context()
+        self.state = self.run_context.state
+        # Model parameters come from the run's effective config (e.g. API overrides) when it has one
+        run_config = self.run_context.config or config
+        self.config = run_config.get("user_profile", {}).get("llm", {}).get(self.config_section, {})
         self._validate_api_key()
 
     def _get_api_key(self) -> Optional[str]:
@@ -43,4 +66,12 @@ class BaseGenerator(ABC):
         """Send a message to the provider. Must be implemented by subclasses."""
         pass
 
+    async def send_message_async(self, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Non-blocking send_message(). Providers with an async HTTP path override this;
+        the default runs send_message() on the bounded blocking pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_blocking_executor(), run_in_context(self.send_message, *args, **kwargs))
+
     # * Add any shared utility methods here for all generators (e.g., error formatting, logging, etc.)
@@ -1,7 +1,11 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import httpx
 import requests
+from src.utils.helpers.http_client_helper import get_async_client, get_session
 from src.ml_models.base_generator import BaseGenerator
 
+session = get_session()
+
 class ClaudeGenerator(BaseGenerator):
     """
     Claude AI generator using Anthropic API. Inherits shared logic from BaseGenerator.
@@ -12,10 +16,8 @@ class ClaudeGenerator(BaseGenerator):
         self.temperature = self.config.get("temperature", 0.7)
         self.max_tokens = self.config.get("max_tokens", 500)
 
-    def send_message(self) -> Dict[str, Any]:
-        """
-        Sends a blog post to Claude AI and returns a structured result.
-        """
+    def _build_request(self, prompt_text: Optional[str] = None) -> Optional[Tuple[str, Dict[str, str], Dict[str, Any]]]:
+        """Returns (url, headers, body) for the Messages API, or None if there is no prompt."""
         url = "https://api.anthropic.com/v1/messages"
         headers = {
             "x-api-key": self.api_key,
@@ -23,11 +25,11 @@ class ClaudeGenerator(BaseGenerator):
             "Content-Type": "application/json",
         }
         state = self.get_prompt_state()
-        prompt = state["prompt"]
+        prompt = prompt_text or state["prompt"]
         system_instructions = state["system_instructions"]
         if not prompt:
             print("No Prompt Given Claude")
-            return {"status": "error", "message": "No prompt given"}
+            return None
         data = {
             "model": self.claude_model,
             "max_tokens": self.max_tokens,
@@ -37,47 +39,79 @@ class ClaudeGenerator(BaseGenerator):
                 {"role": "user", "content": prompt},
             ],
         }
+        return url, headers, data
+
+    def _parse_response(self, response: Any) -> Dict[str, Any]:
+        """Turns a requests or httpx response into the structured result."""
         try:
-            response = requests.post(url, headers=headers, json=data)
-            try:
-                response_json = response.json()
-            except Exception as e:
-                print("❌ Failed to parse Claude response JSON:", e)
+            response_json = response.json()
+        except Exception as e:
+            print("❌ Failed to parse Claude response JSON:", e)
+            return {
+                "status": "error",
+                "response": "Invalid JSON response",
+                "status_code": response.status_code,
+                "raw": response.text,
+            }
+        if response.status_code == 200:
+            content_blocks = response_json.get("content", [])
+            if content_blocks and isinstance(content_blocks, list):
+                text = content_blocks[0].get("text", "").strip()
                 return {
-                    "status": "error",
-                    "response": "Invalid JSON response",
-                    "status_code": response.status_code,
-                    "raw": response.text,
+                    "status": "success",
+                    "response": text,
+                    "status_code": 200,
+                    "raw": response_json,
                 }
-            if response.status_code == 200:
-                content_blocks = response_json.get("content", [])
-                if content_blocks and isinstance(content_blocks, list):
-                    text = content_blocks[0].get("text", "").strip()
-                    return {
-                        "status": "success",
-                        "response": text,
-                        "status_code": 200,
-                        "raw": response_json,
-                    }
-                else:
-                    return {
-                        "status": "error",
-                        "response": "Claude returned an unexpected content format.",
-                        "status_code": 200,
-                        "raw": response_json,
-                    }
             else:
                 return {
-                    "status": "failed",
-                    "response": response_json.get("error", "Unknown error from Claude API"),
-                    "status_code": response.status_code,
+                    "status": "error",
+                    "response": "Claude returned an unexpected content format.",
+                    "status_code": 200,
                     "raw": response_json,
                 }
-        except requests.RequestException as req_err:
-            print("❌ Request error while sending to Claude:", str(req_err))
+        else:
             return {
-                "status": "error",
-                "response": "Request exception occurred",
-                "status_code": None,
-                "raw": str(req_err),
+                "status": "failed",
+                "response": response_json.get("error", "Unknown error from Claude API"),
+                "status_code": response.status_code,
+                "raw": response_json,
             }
+
+    @staticmethod
+    def _request_error(req_err: Exception) -> Dict[str, Any]:
+        print("❌ Request error while sending to Claude:", str(req_err))
+        return {
+            "status": "error",
+            "response": "Request exception occurred",
+            "status_code": None,
+            "raw": str(req_err),
+        }
+
+    def send_message(self, prompt_text: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Sends a blog post to Claude AI and returns a structured result.
+        """
+        request = self._build_request(prompt_text)
+        if request is None:
+            return {"status": "error", "message": "No prompt given"}
+        url, headers, data = request
+        try:
+            response = session.post(url, headers=headers, json=data)
+        except requests.RequestException as req_err:
+            return self._request_error(req_err)
+        return self._parse_response(response)
+
+    async def send_message_async(self, prompt_text: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Same as send_message(), but over the shared async client so the event loop is never blocked.
+        """
+        request = self._build_request(prompt_text)
+        if request is None:
+            return {"status": "error", "message": "No prompt given"}
+        url, headers, data = request
+        try:
+            response = await get_async_client().post(url, headers=headers, json=data)
+        except httpx.HTTPError as req_err:
+            return self._request_error(req_err)
+        return self._parse_response(response)
@@ -1,7 +1,11 @@
-from typing import Dict, Any
+from typing import Any, Dict, Optional, Tuple
+import httpx
 import requests
+from src.utils.helpers.http_client_helper import get_async_client, get_session
 from src.ml_models.base_generator import BaseGenerator
 
+session = get_session()
+
 class DeepSeekGenerator(BaseGenerator):
     """
     DeepSeek AI generator using the DeepSeek API. Inherits shared logic from BaseGenerator.
@@ -20,13 +24,14 @@ class DeepSeekGenerator(BaseGenerator):
         self.top_logprobs = self.config.get("top_logprobs", 5)
         self.tools = self.config.get("tools", "function")
 
-    def send_message(self) -> Dict[str, Any]:
+    def _build_request(self, prompt_text: Optional[str] = None) -> Optional[Tuple[str, Dict[str, str], Dict[str, Any], str]]:
+        """Returns (url, headers, payload, prompt) for the chat completions API, or None if there is no prompt."""
         state = self.get_prompt_state()
-        prompt = state["prompt"]
+        prompt = prompt_text or state["prompt"]
         system_instructions = state["system_instructions"]
         if not prompt:
             print("No Prompt Given DeepSeek")
-            return {"status": "error", "message": "No prompt given"}
+            return None
         url = "https://api.deepseek.com/chat/completions"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -60,48 +65,75 @@ class DeepSeekGenerator(BaseGenerator):
             ]
         if self.logprobs:
             payload["top_logprobs"] = self.top_logprobs
+        return url, headers, payload, prompt
+
+    def _parse_response(self, response: Any, prompt: str) -> Dict[str, Any]:
+        """Turns a requests or httpx response into the structured result."""
         try:
-            response = requests.post(url, headers=headers, json=payload)
-            try:
-                response_data = response.json()
-            except Exception as e:
-                print("❌ Failed to parse JSON:", e)
-                return {
-                    "status": "error",
-                    "response": "Invalid JSON response",
-                    "details": {
-                        "status_code": response.status_code,
-                        "text": response.text,
-                        "error": str(e),
-                    },
-                }
-            if response.status_code == 200:
-                completion = (
-                    response_data.get("choices", [{}])[0]
-                    .get("message", {})
-                    .get("content", "")
-                    .strip()
-                )
-                if completion == prompt.strip():
-                    return {
-                        "status": "failed",
-                        "response": "Completion is identical to prompt. Likely an error.",
-                        "details": {"status_code": response.status_code, "raw": response_data},
-                    }
+            response_data = response.json()
+        except Exception as e:
+            print("❌ Failed to parse JSON:", e)
+            return {
+                "status": "error",
+                "response": "Invalid JSON response",
+                "details": {
+                    "status_code": response.status_code,
+                    "text": response.text,
+                    "error": str(e),
+                },
+            }
+        if response.status_code == 200:
+            completion = (
+                response_data.get("choices", [{}])[0]
+                .get("message", {})
+                .get("content", "")
+                .strip()
+            )
+            if completion == prompt.strip():
                 return {
-                    "status": "success",
-                    "response": completion,
+                    "status": "failed",
+                    "response": "Completion is identical to prompt. Likely an error.",
                     "details": {"status_code": response.status_code, "raw": response_data},
                 }
             return {
-                "status": "failed",
-                "response": response_data.get("error", "Unknown error from DeepSeek"),
+                "status": "success",
+                "response": completion,
                 "details": {"status_code": response.status_code, "raw": response_data},
             }
+        return {
+            "status": "failed",
+            "response": response_data.get("error", "Unknown error from DeepSeek"),
+            "details": {"status_code": response.status_code, "raw": response_data},
+        }
+
+    @staticmethod
+    def _request_error(req_err: Exception) -> Dict[str, Any]:
+        print("❌ Request error while sending to DeepSeek:", str(req_err))
+        return {
+            "status": "error",
+            "response": "Request exception occurred",
+            "details": {"status_code": None, "raw": str(req_err)},
+        }
+
+    def send_message(self, prompt_text: Optional[str] = None) -> Dict[str, Any]:
+        request = self._build_request(prompt_text)
+        if request is None:
+            return {"status": "error", "message": "No prompt given"}
+        url, headers, payload, prompt = request
+        try:
+            response = session.post(url, headers=headers, json=payload)
         except requests.RequestException as req_err:
-            print("❌ Request error while sending to DeepSeek:", str(req_err))
-            return {
-                "status": "error",
-                "response": "Request exception occurred",
-                "details": {"status_code": None, "raw": str(req_err)},
-            }
+            return self._request_error(req_err)
+        return self._parse_response(response, prompt)
+
+    async def send_message_async(self, prompt_text: Optional[str] = None) -> Dict[str, Any]:
+        """Same as send_message(), but over the shared async client so the event loop is never blocked."""
+        request = self._build_request(prompt_text)
+        if request is None:
+            return {"status": "error", "message": "No prompt given"}
+        url, headers, payload, prompt = request
+        try:
+            response = await get_async_client().post(url, headers=headers, json=payload)
+        except httpx.HTTPError as req_err:
+            return self._request_error(req_err)
+        return self._parse_response(response, prompt)
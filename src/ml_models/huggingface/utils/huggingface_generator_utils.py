@@ -1,7 +1,9 @@
-from typing import Dict, Any
-import requests
+from typing import Any, Dict, Optional, Tuple
+from src.utils.helpers.http_client_helper import get_async_client, get_session
 from src.ml_models.base_generator import BaseGenerator
 
+session = get_session()
+
 class HuggingFaceGenerator(BaseGenerator):
     """
     Hugging Face generator using HuggingFace API. Inherits shared logic from BaseGenerator.
@@ -15,11 +17,12 @@ class HuggingFaceGenerator(BaseGenerator):
         self.image_height = self.config.get("image_height", 512)
         self.image_width = self.config.get("image_width", 512)
 
-    def send_message(self, prompt_text: str = None) -> Dict[str, Any]:
+    def _build_request(self, prompt_text: Optional[str] = None) -> Optional[Tuple[str, Dict[str, str], Dict[str, Any]]]:
+        """Returns (url, headers, body) for the inference API, or None if there is no prompt."""
         state = self.get_prompt_state()
         prompt = prompt_text or state["prompt"]
         if not prompt:
-            return {"status": "error", "message": "No prompt given"}
+            return None
         url = f"https://api-inference.huggingface.co/models/{self.text_model}"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -32,14 +35,37 @@ class HuggingFaceGenerator(BaseGenerator):
                 "max_new_tokens": self.max_tokens,
             },
         }
+        return url, headers, data
+
+    @staticmethod
+    def _parse_response(response: Any) -> Dict[str, Any]:
+        response.raise_for_status()
+        result = response.json()
+        # Hugging Face returns a list of dicts with 'generated_text'
+        if isinstance(result, list) and result and "generated_text" in result[0]:
+            return {"status": "success", "response": result[0]["generated_text"], "raw": result}
+        return {"status": "error", "response": "Unexpected HuggingFace response format", "raw": result}
+
+    def send_message(self, prompt_text: str = None) -> Dict[str, Any]:
+        request = self._build_request(prompt_text)
+        if request is None:
+            return {"status": "error", "message": "No prompt given"}
+        url, headers, data = request
         try:
-            response = requests.post(url, headers=headers, json=data)
-            response.raise_for_status()
-            result = response.json()
-            # Hugging Face returns a list of dicts with 'generated_text'
-            if isinstance(result, list) and result and "generated_text" in result[0]:
-                return {"status": "success", "response": result[0]["generated_text"], "raw": result}
-            return {"status": "error", "response": "Unexpected HuggingFace response format", "raw": result}
+            response = session.post(url, headers=headers, json=data)
+            return self._parse_response(response)
+        except Exception as e:
+            return {"status": "error", "response": str(e)}
+
+    async def send_message_async(self, prompt_text: str = None) -> Dict[str, Any]:
+        """Same as send_message(), but over the shared async client so the event loop is never blocked."""
+        request = self._build_request(prompt_text)
+        if request is None:
+            return {"status": "error", "message": "No prompt given"}
+        url, headers, data = request
+        try:
+            response = await get_async_client().post(url, headers=headers, json=data)
+            return self._parse_response(response)
         except Exception as e:
             return {"status": "error", "response": str(e)}
 
@@ -60,7 +86,7 @@ class HuggingFaceGenerator(BaseGenerator):
             }
         }
         try:
-            response = requests.post(url, headers=headers, json=data)
+            response = session.post(url, headers=headers, json=data)
             response.raise_for_status()
             # Image is returned as bytes (PNG/JPEG) or a URL, depending on the API
             return {"status": "success", "image": response.content}
@@ -1,6 +1,7 @@
-from typing import Dict, Any
-import requests
-from src.ml_models.base_generator import BaseGenerator
+import asyncio
+from typing import Any, Dict, Optional, Tuple, Union
+from src.ml_models.base_generator import BaseGenerator, get_blocking_executor
+from src.utils.helpers.prompt.run_context import run_in_context
 
 class OpenAIGenerator(BaseGenerator):
     """
@@ -13,18 +14,13 @@ class OpenAIGenerator(BaseGenerator):
         self.max_tokens = self.config.get("max_tokens", 500)
         self.assistant_id = self.config.get("assistant_id", None)
 
-    def send_message(self, prompt_text: str = None) -> Dict[str, Any]:
-        """
-        Sends a prompt to OpenAI using the modular utility pipeline (thread, message, assistant, wait, fetch response).
-        Returns a structured result dictionary.
-        """
+    def _start_run(self, prompt_text: str = None) -> Union[Tuple[str, str], Dict[str, Any]]:
+        """Creates the thread, posts the prompt, and starts a run. Returns (thread_id, run_id) or an error result."""
         from src.ml_models.openai.utils import (
             create_openai_thread,
             send_message_to_openai,
-            get_openai_response,
             create_openai_assistant,
             run_openai_assistant,
-            wait_for_openai_response,
         )
         thread_id = create_openai_thread()
         if not thread_id:
@@ -36,7 +32,11 @@ class OpenAIGenerator(BaseGenerator):
         run_id = run_openai_assistant(thread_id, assistant_id)
         if not run_id:
             return {"status": "error", "response": "❌ Failed to run OpenAI assistant."}
-        error_details = wait_for_openai_response(thread_id, run_id)
+        return thread_id, run_id
+
+    def _collect_response(self, thread_id: str, error_details: Optional[dict]) -> Dict[str, Any]:
+        """Builds the structured result from a finished run."""
+        from src.ml_models.openai.utils import get_openai_response
         if error_details:
             return {
                 "status": "failed",
@@ -54,6 +54,33 @@ class OpenAIGenerator(BaseGenerator):
                 "response": "❌ Assistant did not return a valid response.",
             }
 
+    def send_message(self, prompt_text: str = None) -> Dict[str, Any]:
+        """
+        Sends a prompt to OpenAI using the modular utility pipeline (thread, message, assistant, wait, fetch response).
+        Returns a structured result dictionary.
+        """
+        from src.ml_models.openai.utils import wait_for_openai_response
+        started = self._start_run(prompt_text)
+        if isinstance(started, dict):
+            return started
+        thread_id, run_id = started
+        return self._collect_response(thread_id, wait_for_openai_response(thread_id, run_id))
+
+    async def send_message_async(self, prompt_text: str = None) -> Dict[str, Any]:
+        """
+        Async send_message(). The short setup and fetch calls run on the blocking pool;
+        the long wait for the run is awaited on the event loop without holding a thread.
+        """
+        from src.ml_models.openai.utils import wait_for_openai_response_async
+        loop = asyncio.get_running_loop()
+        executor = get_blocking_executor()
+        started = await loop.run_in_executor(executor, run_in_context(self._start_run, prompt_text))
+        if isinstance(started, dict):
+            return started
+        thread_id, run_id = started
+        error_details = await wait_for_openai_response_async(thread_id, run_id)
+        return await loop.run_in_executor(executor, run_in_context(self._collect_response, thread_id, error_details))
+
     def generate_image(self, scoped_prompt: str) -> Dict[str, Any]:
         """
         Generates an image using OpenAI's DALL·E API via the utility function.
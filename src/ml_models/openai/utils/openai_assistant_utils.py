@@ -1,9 +1,13 @@
-import requests
+import asyncio
+import httpx
+from src.utils.helpers.http_client_helper import get_async_client, get_session
 from typing import Optional
-from utils.index import get_env_variable
+from utils.index import get_env_variable, run_coroutine_sync
 from utils.prompt_builder import get_prompt_globals
 from utils.config.config_loader import config
 
+session = get_session()
+
 OPENAI_API_KEY: Optional[str] = get_env_variable("OPENAI_API_KEY")
 openai_config = config.get("user_profile", {}).get("llm", {}).get("OpenAI", {})
 
@@ -29,7 +33,7 @@ def create_openai_assistant() -> str:
         "top_p": top_p,
         "response_format": "auto",
     }
-    response = requests.post(url, headers=headers, json=data)
+    response = session.post(url, headers=headers, json=data)
     if response.status_code == 200:
         assistant_id = response.json().get("id")
         print(f"✅ OpenAI Assistant created: {assistant_id} ⚠️Save this to .env or github secrets to reuse")
@@ -46,28 +50,132 @@ def run_openai_assistant(thread_id: str, assistant_id: str) -> Optional[str]:
         "OpenAI-Beta": "assistants=v2",
     }
     data = {"assistant_id": assistant_id}
-    response = requests.post(url, headers=headers, json=data)
+    response = session.post(url, headers=headers, json=data)
     if response.status_code == 200:
         return response.json().get("id")
     else:
         print("❌ Error running assistant:", response.json())
         return None
 
-def wait_for_openai_response(thread_id: str, run_id: str) -> Optional[dict]:
-    import time
-    url = f"https://api.openai.com/v1/threads/{thread_id}/runs/{run_id}"
-    headers = {
+# * Run polling: start fast, back off while the run is still queued/in progress
+RUN_POLL_INITIAL_INTERVAL = 0.25
+RUN_POLL_MAX_INTERVAL = 3.0
+RUN_POLL_BACKOFF = 1.6
+RUN_DEADLINE_SECONDS = 120.0
+RUN_FAILED_STATUSES = ("failed", "cancelled", "expired", "incomplete", "requires_action")
+# Rate limits are retried like 5xx errors; any other 4xx ends the wait
+RUN_POLL_RETRY_STATUS_CODES = (429,)
+
+def _run_headers() -> dict:
+    return {
         "Authorization": f"Bearer {OPENAI_API_KEY}",
         "Content-Type": "application/json",
         "OpenAI-Beta": "assistants=v2",
     }
-    while True:
-        response = requests.get(url, headers=headers)
+
+def _error_message(response: httpx.Response) -> str:
+    """Returns the API error message of a failed request, falling back to the raw body."""
+    try:
+        error = response.json().get("error")
+    except (ValueError, AttributeError):
+        error = None
+    if isinstance(error, dict) and error.get("message"):
+        return error["message"]
+    return response.text or f"HTTP {response.status_code}"
+
+def _run_payload(response: httpx.Response) -> Optional[dict]:
+    """Returns the run payload of a poll, or None when it should be retried (5xx, 429 or bad JSON)."""
+    if response.status_code != 200:
+        print(f"⚠️ OpenAI run poll returned HTTP {response.status_code}, retrying.")
+        return None
+    try:
         data = response.json()
-        status = data.get("status", "")
-        if status == "completed":
-            return None
-        elif status in ["failed", "cancelled"]:
-            print("❌ Assistant failed:", data)
-            return data
-        time.sleep(5)
+    except ValueError:
+        print("⚠️ OpenAI run poll returned invalid JSON, retrying.")
+        return None
+    return data if isinstance(data, dict) else None
+
+async def cancel_openai_run(thread_id: str, run_id: str, client: Optional[httpx.AsyncClient] = None) -> bool:
+    """Asks OpenAI to cancel a run. Returns True if the cancel request was accepted."""
+    client = client or get_async_client()
+    url = f"https://api.openai.com/v1/threads/{thread_id}/runs/{run_id}/cancel"
+    try:
+        response = await client.post(url, headers=_run_headers())
+        if response.status_code == 200:
+            print(f"🛑 Cancelled OpenAI run {run_id}")
+            return True
+        print("⚠️ Failed to cancel OpenAI run:", response.text)
+    except httpx.HTTPError as e:
+        print(f"⚠️ Error cancelling OpenAI run {run_id}: {e}")
+    return False
+
+async def wait_for_openai_response_async(
+    thread_id: str,
+    run_id: str,
+    deadline_seconds: Optional[float] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Optional[dict]:
+    """
+    Waits for an Assistants run to finish without blocking the event loop.
+
+    Polls with a short initial interval that backs off to RUN_POLL_MAX_INTERVAL, so fast
+    runs return within a fraction of a second. Server errors, rate limits and unreadable
+    bodies are retried on the same backoff; other 4xx responses end the wait. If the
+    deadline passes, or the waiting task is cancelled, the run is cancelled on OpenAI's side too.
+
+    Args:
+        thread_id (str): Thread the run belongs to.
+        run_id (str): Run to wait for.
+        deadline_seconds (Optional[float]): Overall time limit. Defaults to the
+            `run_timeout` OpenAI config value, or RUN_DEADLINE_SECONDS.
+        client (Optional[httpx.AsyncClient]): Client to use. Defaults to the shared pooled client.
+
+    Returns:
+        Optional[dict]: None when the run completed, otherwise the run payload (or an error
+        or timeout payload with `last_error`) describing the failure.
+    """
+    client = client or get_async_client()
+    if deadline_seconds is None:
+        deadline_seconds = float(openai_config.get("run_timeout", RUN_DEADLINE_SECONDS))
+    url = f"https://api.openai.com/v1/threads/{thread_id}/runs/{run_id}"
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds
+    interval = RUN_POLL_INITIAL_INTERVAL
+
+    try:
+        while True:
+            response = await client.get(url, headers=_run_headers())
+            if 400 <= response.status_code < 500 and response.status_code not in RUN_POLL_RETRY_STATUS_CODES:
+                print(f"❌ Error polling OpenAI run {run_id}: HTTP {response.status_code}", response.text)
+                return {
+                    "status": "error",
+                    "id": run_id,
+                    "last_error": {"code": response.status_code, "message": _error_message(response)},
+                }
+            data = _run_payload(response)
+            status = data.get("status", "") if data else ""
+            if status == "completed":
+                return None
+            if status in RUN_FAILED_STATUSES:
+                print("❌ Assistant failed:", data)
+                return data
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                await cancel_openai_run(thread_id, run_id, client)
+                print(f"⏰ OpenAI run {run_id} exceeded {deadline_seconds}s.")
+                return {
+                    "status": "timeout",
+                    "id": run_id,
+                    "last_error": {"message": f"Run did not finish within {deadline_seconds} seconds."},
+                }
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * RUN_POLL_BACKOFF, RUN_POLL_MAX_INTERVAL)
+    except asyncio.CancelledError:
+        # Don't leave the run burning tokens after the caller gave up
+        await asyncio.shield(cancel_openai_run(thread_id, run_id, client))
+        raise
+
+def wait_for_openai_response(thread_id: str, run_id: str, deadline_seconds: Optional[float] = None) -> Optional[dict]:
+    """Synchronous wrapper around wait_for_openai_response_async()."""
+    return run_coroutine_sync(wait_for_openai_response_async(thread_id, run_id, deadline_seconds))
@@ -1,8 +1,10 @@
-import requests
+from src.utils.helpers.http_client_helper import get_session
 from typing import Optional
 from utils.index import get_env_variable
 from utils.config.config_loader import config
 
+session = get_session()
+
 OPENAI_API_KEY: Optional[str] = get_env_variable("OPENAI_API_KEY")
 openai_cfg = config.get("user_profile", {}).get("llm", {}).get("OpenAI", {})
 
@@ -25,7 +27,7 @@ def generate_openai_image(scoped_prompt: str) -> Optional[str]:
         "size": size,
         "response_format": "url",
     }
-    response = requests.post(url, headers=headers, json=payload)
+    response = session.post(url, headers=headers, json=payload)
     if response.status_code == 200:
         image_data = response.json().get("data", [])
         if image_data and "url" in image_data[0]:
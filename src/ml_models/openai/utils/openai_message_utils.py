@@ -1,15 +1,14 @@
-import requests
+from src.utils.helpers.http_client_helper import get_session
 from typing import Optional, Dict, Any
 from utils.index import get_env_variable
 from utils.prompt_builder import get_prompt_globals
 from utils.config.config_loader import config
 
+session = get_session()
+
 OPENAI_API_KEY: Optional[str] = get_env_variable("OPENAI_API_KEY")
 OPENAI_ASSISTANT_ID: Optional[str] = get_env_variable("OPENAI_ASSISTANT_ID")
 
-state = get_prompt_globals()
-prompt = state["prompt"]
-system_instructions = state["system_instructions"]
 openai_config = config.get("user_profile", {}).get("llm", {}).get("OpenAI", {})
 
 def create_openai_thread() -> Optional[str]:
@@ -19,7 +18,7 @@ def create_openai_thread() -> Optional[str]:
         "Content-Type": "application/json",
         "OpenAI-Beta": "assistants=v2",
     }
-    response = requests.post(url, headers=headers)
+    response = session.post(url, headers=headers)
     if response.status_code == 200:
         return response.json().get("id")
     else:
@@ -33,14 +32,15 @@ def send_message_to_openai(thread_id: str, message: str = None) -> bool:
         "Content-Type": "application/json",
         "OpenAI-Beta": "assistants=v2",
     }
-    msg = message or prompt
+    state = get_prompt_globals()
+    msg = message or state["prompt"]
     data = {
         "role": "user",
         "content": msg,
         "attachments": [],
-        "metadata": {"system_instructions": system_instructions},
+        "metadata": {"system_instructions": state["system_instructions"]},
     }
-    response = requests.post(url, headers=headers, json=data)
+    response = session.post(url, headers=headers, json=data)
     if response.status_code == 200:
         print("✅ Message sent successfully!")
         return True
@@ -55,7 +55,7 @@ def get_openai_response(thread_id: str) -> Optional[str]:
         "Content-Type": "application/json",
         "OpenAI-Beta": "assistants=v2",
     }
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
     if response.status_code == 200:
         messages = response.json().get("data", [])
         if messages:
@@ -5,13 +5,15 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from typing import Optional
-import requests
-import time
+from src.utils.helpers.http_client_helper import get_session
 import os
 from dotenv import load_dotenv
 from utils.index import get_env_variable
 from utils.prompt_builder import get_prompt_globals, init_globals_for_test
 from utils.config.config_loader import config
+from src.ml_models.openai.utils.openai_assistant_utils import wait_for_openai_response as wait_for_openai_run
+
+session = get_session()
 
 # ✅ Load environment variables
 load_dotenv()
@@ -30,20 +32,9 @@ TEST_MODE = get_env_variable("TEST_MODE").lower() == "true"
 
 if TEST_MODE:
     init_globals_for_test()
-state = get_prompt_globals()
-
-prompt = state["prompt"]
-creative_prompt = state["creative_prompt"]
-gif_prompt = state["gif_prompt"]
-hashtags = state["hashtags"]
-system_instructions = state["system_instructions"]
-blog_content = state["blog_content"]
 openai_config = config.get("user_profile", {}).get("llm", {}).get("OpenAI", {})
 
 
-print(prompt, "OpenAI Scoped Prompt")
-
-
 def create_openai_assistant() -> str:
     """Creates a new OpenAI Assistant using YAML configuration if none exists."""
     url = "https://api.openai.com/v1/assistants"
@@ -71,7 +62,7 @@ def create_openai_assistant() -> str:
         "response_format": "auto",
     }
 
-    response = requests.post(url, headers=headers, json=data)
+    response = session.post(url, headers=headers, json=data)
 
     if response.status_code == 200:
         assistant_id = response.json().get("id")
@@ -99,7 +90,7 @@ def create_openai_thread() -> Optional[str]:
         "OpenAI-Beta": "assistants=v2",
     }
 
-    response = requests.post(url, headers=headers)
+    response = session.post(url, headers=headers)
     if response.status_code == 200:
         return response.json().get("id")
     else:
@@ -120,7 +111,10 @@ def send_message_to_openai(
 
     # 🔧 Config sections
 
-    # 📨 Final Message Content
+    # 📨 Final Message Content (read from the active run, not an import-time snapshot)
+    state = get_prompt_globals()
+    prompt = state["prompt"]
+    system_instructions = state["system_instructions"]
 
     print("Message Content:\n\n", prompt)
     data = {
@@ -130,7 +124,7 @@ def send_message_to_openai(
         "metadata": {"system_instructions": system_instructions},
     }
 
-    response = requests.post(url, headers=headers, json=data)
+    response = session.post(url, headers=headers, json=data)
     if response.status_code == 200:
         print("✅ Message sent successfully!")
     else:
@@ -147,7 +141,7 @@ def run_openai_assistant(thread_id: str) -> Optional[str]:
     }
     data = {"assistant_id": OPENAI_ASSISTANT_ID}
 
-    response = requests.post(url, headers=headers, json=data)
+    response = session.post(url, headers=headers, json=data)
     if response.status_code == 200:
         return response.json().get("id")
     else:
@@ -157,25 +151,8 @@ def run_openai_assistant(thread_id: str) -> Optional[str]:
 
 def wait_for_openai_response(thread_id: str, run_id: str) -> Optional[dict]:
     """Waits for OpenAI Assistant to process the request and returns failure details if any."""
-    url = f"https://api.openai.com/v1/threads/{thread_id}/runs/{run_id}"
-    headers = {
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-        "Content-Type": "application/json",
-        "OpenAI-Beta": "assistants=v2",
-    }
-
-    while True:
-        response = requests.get(url, headers=headers)
-        data = response.json()
-        status = data.get("status", "")
-
-        if status == "completed":
-            return None  # No issues
-        elif status in ["failed", "cancelled"]:
-            print("❌ Assistant failed:", data)
-            return data  # 👈 Return full error response
-
-        time.sleep(5)
+    # Adaptive polling with a deadline and remote cancellation lives in the shared utils
+    return wait_for_openai_run(thread_id, run_id)
 
 
 def get_openai_response(thread_id: str) -> Optional[str]:
@@ -190,7 +167,7 @@ def get_openai_response(thread_id: str) -> Optional[str]:
         "You're a professional copywriter helping turn blog posts into viral LinkedIn content."
     )
     print("system_instructions", system_instructions)
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
 
     if response.status_code == 200:
         messages = response.json().get("data", [])
@@ -232,7 +209,7 @@ def generate_openai_image(scoped_prompt: str) -> Optional[str]:
         "response_format": "url",
     }
 
-    response = requests.post(url, headers=headers, json=payload)
+    response = session.post(url, headers=headers, json=payload)
 
     if response.status_code == 200:
         image_data = response.json().get("data", [])
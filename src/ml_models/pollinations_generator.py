@@ -4,7 +4,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 import httpx
 import asyncio
 from typing import Optional, Dict, Any
-from utils.prompt_builder import  get_prompt_globals
+from src.utils.helpers.http_client_helper import pooled_async_client
+from src.utils.helpers.llm_stream_helper import StreamHTTPError, StreamValidationError, TextCallback, stream_chat_completion
+from src.utils.helpers.prompt.run_context import emit_text_delta, reset_text_stream
 import urllib.parse
 
 
@@ -21,17 +23,6 @@ MAX_RETRIES = 3
 RETRY_BACKOFF_SECONDS = 1.5
 
 
-# Get the shared global state
-state = get_prompt_globals()
-
-# Access individual variables
-prompt = state["prompt"]
-creative_prompt = state["creative_prompt"]
-gif_prompt = state["gif_prompt"]
-hashtags = state["hashtags"]
-system_instructions = state["system_instructions"]
-blog_content = state["blog_content"]
-
 async def fetch_with_retries(url: str, client: httpx.AsyncClient) -> Optional[httpx.Response]:
     for attempt in range(MAX_RETRIES):
         try:
@@ -52,7 +43,7 @@ async def generate_image(prompt: str, model: str = "stable-diffusion") -> Dict[s
     if model != "stable-diffusion":
         url += f"?model={model}"
 
-    async with httpx.AsyncClient() as client:
+    async with pooled_async_client() as client:
         try:
             response = await fetch_with_retries(url, client)
             if response:
@@ -113,7 +104,7 @@ async def generate_image_advanced(
     url = f"{BASE_IMAGE_URL}/prompt/{encoded_prompt}"
     
     try:
-        async with httpx.AsyncClient() as client:
+        async with pooled_async_client() as client:
             response = await client.get(url, params=query, timeout=15)
             if response.status_code == 200:
                 return str(response.url)
@@ -127,7 +118,7 @@ async def generate_image_advanced(
 
 
 async def list_image_models() -> Dict[str, Any]:
-    async with httpx.AsyncClient() as client:
+    async with pooled_async_client() as client:
         try:
             response = await client.get(f"{BASE_IMAGE_URL}/models")
             print(f"🖼️ Image Models Status Code: {response.status_code}")
@@ -169,7 +160,7 @@ async def list_image_models() -> Dict[str, Any]:
 
 async def generate_text(prompt: str) -> Dict[str, Any]:
     url = f"{BASE_TEXT_URL}/{prompt}"
-    async with httpx.AsyncClient() as client:
+    async with pooled_async_client() as client:
         try:
             response = await fetch_with_retries(url, client)
             if response:
@@ -199,8 +190,81 @@ async def generate_text(prompt: str) -> Dict[str, Any]:
             }
 
 
+async def stream_text_request(
+    url: str,
+    payload: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+    validate_json: bool = False,
+) -> Dict[str, Any]:
+    """
+    Streams a text/chat request (SSE) and returns the same result shape as the buffered calls,
+    with the assembler in "response". Post text is forwarded to the run's listener as it arrives,
+    and malformed JSON output aborts the request early. A request that fails after streaming
+    text tells the listener to discard it, so a retry or fallback does not append to it.
+    """
+    emitted = []
+
+    def on_text(text: str) -> None:
+        emitted.append(text)
+        emit_text_delta(text)
+
+    result = await _stream_text_result(url, payload, headers, validate_json, on_text)
+    if result["status"] != "success" and emitted:
+        reset_text_stream()
+    return result
+
+
+async def _stream_text_result(
+    url: str,
+    payload: Dict[str, Any],
+    headers: Optional[Dict[str, str]],
+    validate_json: bool,
+    on_text: TextCallback,
+) -> Dict[str, Any]:
+    async with pooled_async_client() as client:
+        try:
+            assembler = await stream_chat_completion(
+                client, url, payload, headers=headers, validate_json=validate_json, on_text=on_text
+            )
+            print(f"📡 Streamed {assembler.chunks} chunk(s) from {url}")
+            return {
+                "status": "success",
+                "status_code": 200,
+                "response": assembler,
+                "details": assembler.content[:100]
+            }
+        except StreamValidationError as e:
+            print(f"🛑 Aborted malformed streamed output: {e}")
+            return {
+                "status": "error",
+                "status_code": 200,
+                "response": "Malformed streamed output",
+                "details": str(e)
+            }
+        except StreamHTTPError as e:
+            return {
+                "status": "failed",
+                "status_code": e.status_code,
+                "response": "Failed to stream response",
+                "details": e.body
+            }
+        except Exception as e:
+            print(f"Exception during streamed text generation: {e}")
+            return {
+                "status": "error",
+                "status_code": 500,
+                "response": "Exception during API call",
+                "details": str(e)
+            }
+
+
 async def generate_text_advanced(payload: dict) -> Dict[str, Any]:
-    async with httpx.AsyncClient() as client:  
+    if payload.get("stream"):
+        result = await stream_text_request(BASE_TEXT_URL, payload, validate_json=bool(payload.get("json")))
+        if result["status"] == "success":
+            result["response"] = result["details"] = result["response"].content
+        return result
+    async with pooled_async_client() as client:  
         print(f"📥 Advanced Text Generation Payload Model: {payload['model']}") 
         try:
             response = await client.post(BASE_TEXT_URL, json=payload)
@@ -244,7 +308,7 @@ async def generate_text_advanced(payload: dict) -> Dict[str, Any]:
 async def generate_audio(prompt: str, voice: str = DEFAULT_VOICE) -> Dict[str, Any]:
     url = f"{BASE_AUDIO_URL}/{prompt}?model=openai-audio&voice={voice}"
     
-    async with httpx.AsyncClient() as client:
+    async with pooled_async_client() as client:
         try:
             response = await fetch_with_retries(url, client)
             if response and response.status_code == 200:
@@ -289,7 +353,7 @@ async def generate_audio(prompt: str, voice: str = DEFAULT_VOICE) -> Dict[str, A
 
 
 async def list_text_models() -> Dict[str, Any]:
-    async with httpx.AsyncClient() as client:
+    async with pooled_async_client() as client:
         try:
             response = await client.get(f"{BASE_TEXT_URL}/models")
             print(f"📝 Text Models Status Code: {response.status_code}")
@@ -337,7 +401,16 @@ async def call_openai_compatible_endpoint(
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
 
-    async with httpx.AsyncClient() as client:
+    if payload.get("stream"):
+        response_format = payload.get("response_format") or {}
+        result = await stream_text_request(
+            endpoint, payload, headers=headers, validate_json=response_format.get("type") == "json_object"
+        )
+        if result["status"] == "success":
+            result["response"] = result["details"] = result["response"].completion()
+        return result
+
+    async with pooled_async_client() as client:
         try:
             response = await client.post(endpoint, json=payload, headers=headers)
             print(f"🔄 OpenAI Compatible Endpoint Status Code: {response.status_code}")
@@ -377,7 +450,7 @@ async def call_openai_compatible_endpoint(
             }
 
 async def fetch_image_feed() -> Dict[str, Any]:
-    async with httpx.AsyncClient() as client:
+    async with pooled_async_client() as client:
         try:
             response = await client.get(f"{BASE_IMAGE_URL}/feed")
             print(f"📸 Image Feed Status Code: {response.status_code}")
@@ -417,7 +490,7 @@ async def fetch_image_feed() -> Dict[str, Any]:
             }
 
 async def fetch_text_feed() -> Dict[str, Any]:
-    async with httpx.AsyncClient() as client:
+    async with pooled_async_client() as client:
         try:
             response = await client.get(f"{BASE_TEXT_URL}/feed")
             print(f"📝 Text Feed Status Code: {response.status_code}")
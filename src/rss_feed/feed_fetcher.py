@@ -0,0 +1,265 @@
+"""
+feed_fetcher.py
+- Concurrent fetch engine for Medium, Wix, and WordPress RSS feeds.
+- Pulls every configured feed at the same time over one shared httpx.AsyncClient,
+  with per-source timeouts, a concurrency limit, and a deterministic priority merge.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import feedparser
+import httpx
+from utils.helpers.feed_cache_helper import FeedValidatorStore, fetch_feed_conditional_async
+from src.utils.helpers.http_client_helper import get_async_client
+from rss_feed.medium_bot import medium_feed_url, parse_medium_feed_entries
+from rss_feed.wix_bot import wix_feed_url, parse_wix_feed_entries
+from rss_feed.wordpress_bot import wordpress_feed_url, parse_wordpress_feed_entries
+
+# * Source order doubles as merge priority: the first platform with blogs wins
+PLATFORM_PRIORITY: Tuple[str, ...] = ("Medium", "Wix", "WordPress")
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_SOURCE_TIMEOUT = 10.0
+
+FeedUrlBuilder = Callable[[str], str]
+FeedEntryParser = Callable[[Any, str], List[Dict[str, Any]]]
+
+PLATFORM_HANDLERS: Dict[str, Tuple[str, FeedUrlBuilder, FeedEntryParser]] = {
+    # platform: (user_profile key, feed URL builder, entry parser)
+    "Medium": ("medium_username", medium_feed_url, parse_medium_feed_entries),
+    "Wix": ("wix_url", wix_feed_url, parse_wix_feed_entries),
+    "WordPress": ("wordpress_url", wordpress_feed_url, parse_wordpress_feed_entries),
+}
+
+
+@dataclass
+class FeedSource:
+    """A single feed to poll. Several sources may share a platform."""
+    platform: str
+    identifier: str
+    feed_url: str
+    priority: int
+    order: int
+    timeout: float = DEFAULT_SOURCE_TIMEOUT
+
+
+@dataclass
+class FeedResult:
+    """Outcome of polling one FeedSource."""
+    source: FeedSource
+    blogs: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def _as_identifier_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value if v]
+    return [str(value)]
+
+
+def build_feed_sources(
+    user_profile: Dict[str, Any],
+    fetch_config: Optional[Dict[str, Any]] = None,
+) -> List[FeedSource]:
+    """
+    Build the list of feeds to poll from the user_profile config section.
+
+    Each of medium_username, wix_url, and wordpress_url may be a single value or a list,
+    so one platform can contribute many feeds.
+
+    Args:
+        user_profile (Dict[str, Any]): The `user_profile` config section.
+        fetch_config (Optional[Dict[str, Any]]): The optional `feed_fetch` config section,
+            supporting `timeouts` (per platform, seconds) and `default_timeout`.
+
+    Returns:
+        List[FeedSource]: Sources in priority order.
+    """
+    fetch_config = fetch_config or {}
+    timeouts = fetch_config.get("timeouts", {}) or {}
+    default_timeout = float(fetch_config.get("default_timeout", DEFAULT_SOURCE_TIMEOUT))
+
+    sources: List[FeedSource] = []
+    for priority, platform in enumerate(PLATFORM_PRIORITY):
+        config_key, url_builder, _ = PLATFORM_HANDLERS[platform]
+        for identifier in _as_identifier_list(user_profile.get(config_key)):
+            sources.append(
+                FeedSource(
+                    platform=platform,
+                    identifier=identifier,
+                    feed_url=url_builder(identifier),
+                    priority=priority,
+                    order=len(sources),
+                    timeout=float(timeouts.get(platform, default_timeout)),
+                )
+            )
+    return sources
+
+
+def _parse_feed(source: FeedSource, content: bytes) -> List[Dict[str, Any]]:
+    feed = feedparser.parse(content)
+    if feed.bozo and not feed.entries:
+        raise ValueError(f"Error parsing feed: {feed.bozo_exception}")
+    _, _, entry_parser = PLATFORM_HANDLERS[source.platform]
+    return entry_parser(feed, source.identifier)
+
+
+async def fetch_feed(
+    client: httpx.AsyncClient,
+    source: FeedSource,
+    semaphore: asyncio.Semaphore,
+    store: Optional[FeedValidatorStore] = None,
+) -> FeedResult:
+    """
+    Fetch and parse a single feed. Never raises; failures are reported on the result.
+
+    Requests are conditional (ETag / Last-Modified), so unchanged feeds are served from the
+    validator store without parsing. Changed feeds are parsed in a worker thread.
+    """
+    start = time.perf_counter()
+    try:
+        async with semaphore:
+            async with asyncio.timeout(source.timeout):
+                blogs = await fetch_feed_conditional_async(
+                    client, source.feed_url, partial(_parse_feed, source), store=store
+                )
+        return FeedResult(source=source, blogs=blogs, elapsed=time.perf_counter() - start)
+    except TimeoutError:
+        error = f"Timed out after {source.timeout}s"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return FeedResult(source=source, error=error, elapsed=time.perf_counter() - start)
+
+
+async def fetch_all_feeds(
+    sources: Sequence[FeedSource],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    client: Optional[httpx.AsyncClient] = None,
+    store: Optional[FeedValidatorStore] = None,
+) -> List[FeedResult]:
+    """
+    Fetch every source concurrently over one shared client.
+
+    Args:
+        sources (Sequence[FeedSource]): Feeds to poll.
+        max_concurrency (int): Maximum number of in-flight feed requests.
+        client (Optional[httpx.AsyncClient]): Client to use. Defaults to the shared pooled client.
+        store (Optional[FeedValidatorStore]): Validator store for conditional GETs. Defaults to the shared store.
+
+    Returns:
+        List[FeedResult]: One result per source, in the same order as `sources`.
+    """
+    if not sources:
+        return []
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    client = client or get_async_client()
+    return list(await asyncio.gather(*(fetch_feed(client, s, semaphore, store) for s in sources)))
+
+
+def _published_timestamp(blog: Dict[str, Any]) -> Optional[float]:
+    published = blog.get("published")
+    if not published or not isinstance(published, str):
+        return None
+    try:
+        return parsedate_to_datetime(published).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def merge_feed_results(results: Sequence[FeedResult]) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Deterministically merge feed results.
+
+    The highest-priority platform that produced any blogs wins, matching the old
+    Medium → Wix → WordPress fallback. Blogs from that platform's feeds are de-duplicated
+    by id and ordered newest first; ties (or undated entries) keep source order, then feed order.
+
+    Returns:
+        Optional[Tuple[str, List[Dict[str, Any]]]]: (platform, blogs) or None if every feed was empty.
+    """
+    by_priority = sorted(
+        (r for r in results if r.blogs), key=lambda r: (r.source.priority, r.source.order)
+    )
+    if not by_priority:
+        return None
+    winning_priority = by_priority[0].source.priority
+    platform = by_priority[0].source.platform
+
+    ranked: List[Tuple[float, int, int, Dict[str, Any]]] = []
+    seen_ids = set()
+    for result in by_priority:
+        if result.source.priority != winning_priority:
+            break
+        for index, blog in enumerate(result.blogs):
+            blog_id = blog.get("id") or blog.get("link")
+            if blog_id in seen_ids:
+                continue
+            seen_ids.add(blog_id)
+            timestamp = _published_timestamp(blog)
+            # Undated entries sort after dated ones
+            sort_ts = -timestamp if timestamp is not None else float("inf")
+            ranked.append((sort_ts, result.source.order, index, blog))
+
+    ranked.sort(key=lambda item: item[:3])
+    return platform, [item[3] for item in ranked]
+
+
+async def fetch_latest_blog_concurrently(
+    user_profile: Dict[str, Any],
+    fetch_config: Optional[Dict[str, Any]] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    store: Optional[FeedValidatorStore] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Poll every configured feed at once and return the newest blog of the winning platform.
+
+    Args:
+        user_profile (Dict[str, Any]): The `user_profile` config section.
+        fetch_config (Optional[Dict[str, Any]]): The optional `feed_fetch` config section
+            (`max_concurrency`, `timeouts`, `default_timeout`).
+        client (Optional[httpx.AsyncClient]): Client to reuse across ticks.
+        store (Optional[FeedValidatorStore]): Validator store for conditional GETs.
+
+    Returns:
+        Optional[Dict[str, Any]]: Same keys as the `fetch_latest_*_blog` helpers
+        (`all_blogs`, `latest_blog`, `latest_blog_direct_link`) plus `platform`, or None.
+    """
+    fetch_config = fetch_config or {}
+    sources = build_feed_sources(user_profile, fetch_config)
+    if not sources:
+        print("! RSS Feed URL or Username Not Given In Config!")
+        return None
+
+    start = time.perf_counter()
+    results = await fetch_all_feeds(
+        sources,
+        max_concurrency=int(fetch_config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)),
+        client=client,
+        store=store,
+    )
+    for result in results:
+        if result.error:
+            print(f"⚠️ {result.source.platform} feed {result.source.feed_url} failed: {result.error}")
+    print(f"🌐 Polled {len(sources)} feed(s) in {time.perf_counter() - start:.2f}s")
+
+    merged = merge_feed_results(results)
+    if merged is None:
+        print("❌ No blogs found in any configured feed.")
+        return None
+
+    platform, blogs = merged
+    latest_blog = blogs[0]
+    return {
+        "platform": platform,
+        "all_blogs": blogs,
+        "latest_blog": latest_blog,
+        "latest_blog_direct_link": latest_blog.get("link"),
+    }
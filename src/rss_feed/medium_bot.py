@@ -5,15 +5,12 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from typing import Dict, List, Any, Optional
 import feedparser
-import requests
-from bs4 import BeautifulSoup
 import os
 from tabulate import tabulate
-from utils.helpers.blog_rss_helper import (
-    load_blog_cache,
-    is_blog_cache_valid,
-    extract_blog_media,
-)
+from src.utils.helpers.blog_rss_helper import get_blog_cache, extract_blog_media
+from utils.helpers.feed_cache_helper import fetch_feed_blogs
+from utils.helpers.avatar_cache_helper import resolve_avatar
+from src.utils.helpers.html_extractor import extract_html
 import traceback
 
 TEMP_FOLDER = "_temp"
@@ -30,40 +27,30 @@ def get_medium_avatar(username: str) -> str:
     Returns:
         str: URL of the user's profile avatar or a default avatar.
     """
-    profile_url = f"https://medium.com/@{username}"
+    return resolve_avatar(
+        "Medium",
+        username,
+        f"https://medium.com/@{username}",
+        "https://cdn-images-1.medium.com/fit/c/64/64/1*2Y7paYtPz5-Nj0zTLOzSwg.png",
+    )
 
-    try:
-        response = requests.get(profile_url, headers={"User-Agent": "Mozilla/5.0"})
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            # Look for the Open Graph image tag (og:image) which contains the avatar
-            og_image = soup.find("meta", property="og:image")
-            if og_image and og_image.get("content"):
-                return og_image["content"]
-    except Exception as e:
-        print(f"Error fetching avatar: {e}")
 
-    # Return default avatar if not found
-    return "https://cdn-images-1.medium.com/fit/c/64/64/1*2Y7paYtPz5-Nj0zTLOzSwg.png"
+def medium_feed_url(username: str) -> str:
+    """Return the RSS feed URL for a Medium user."""
+    return f"https://medium.com/feed/@{username}"
 
 
-def get_medium_blogs(username: str) -> Dict[str, Any]:
+def parse_medium_feed_entries(feed: Any, username: str) -> List[Dict[str, Any]]:
     """
-    Fetches blog posts from a Medium user's RSS feed, including their profile avatar, images, videos, and embeds.
+    Convert parsed Medium feed entries into blog dictionaries, including the first image, video, and embed.
 
     Args:
-        username (str): Medium username (without '@')
+        feed (Any): A feedparser result for a Medium RSS feed.
+        username (str): Medium username, used as the author fallback.
 
     Returns:
-        dict: Contains 'user_avatar' (str) and 'blogs' (list of blog posts)
+        List[Dict[str, Any]]: Blog posts in feed order.
     """
-    medium_feed_url = f"https://medium.com/feed/@{username}"
-    feed = feedparser.parse(medium_feed_url)
-
-    # Fetch user avatar
-    user_avatar = get_medium_avatar(username)
-    print("User Avatar:", user_avatar)
-
     blogs: List[Dict[str, Any]] = []
 
     for entry in feed.entries:
@@ -81,26 +68,12 @@ def get_medium_blogs(username: str) -> Dict[str, Any]:
             entry.content[0].value if hasattr(entry, "content") else entry.summary
         )
 
-        # Extract media (images, videos, embeds)
-        image_url, video_url, embed_url = None, None, None
-        if content_html:
-            soup = BeautifulSoup(content_html, "html.parser")
-
-            # Extract first image
-            img_tag = soup.find("img")
-            image_url = img_tag["src"] if img_tag else None
-
-            # Extract first video (iframe embeds)
-            iframe_tag = soup.find("iframe")
-            video_url = iframe_tag["src"] if iframe_tag else None
-
-            # Extract first embedded post (e.g., Twitter, Instagram, Medium embeds)
-            embed_tag = soup.find("blockquote")
-            embed_url = (
-                embed_tag.find("a")["href"]
-                if embed_tag and embed_tag.find("a")
-                else None
-            )
+        # Extract media (images, videos, embeds) in one pass; the result is memoized
+        # so later media/prompt extraction of this post reuses it
+        extraction = extract_html(content_html) if content_html else None
+        image_url = extraction.first_image if extraction else None
+        video_url = extraction.first_video if extraction else None
+        embed_url = extraction.first_embed if extraction else None
 
         blogs.append(
             {
@@ -120,6 +93,33 @@ def get_medium_blogs(username: str) -> Dict[str, Any]:
             }
         )
 
+    return blogs
+
+
+def get_medium_blogs(username: str) -> Dict[str, Any]:
+    """
+    Fetches blog posts from a Medium user's RSS feed, including their profile avatar, images, videos, and embeds.
+
+    Args:
+        username (str): Medium username (without '@')
+
+    Returns:
+        dict: Contains 'user_avatar' (str) and 'blogs' (list of blog posts)
+    """
+    # Conditional GET: an unchanged feed is served from the feed cache without re-parsing
+    try:
+        blogs = fetch_feed_blogs(
+            medium_feed_url(username),
+            lambda content: parse_medium_feed_entries(feedparser.parse(content), username),
+        )
+    except Exception as e:
+        print(f"Error fetching Medium feed: {e}")
+        blogs = []
+
+    # Fetch user avatar
+    user_avatar = get_medium_avatar(username)
+    print("User Avatar:", user_avatar)
+
     return {"user_avatar": user_avatar, "blogs": blogs}
 
 
@@ -149,15 +149,7 @@ def fetch_latest_medium_blog(username: str) -> Optional[Dict[str, Any]]:
 
         # Check cache
         print("🔍 Checking blog cache...")
-        cache_valid = is_blog_cache_valid()
-        print(f"🔍 Cache validity: {cache_valid}")
-
-        cached_data = load_blog_cache() if cache_valid else None
-        cached_latest_id = (
-            cached_data["blogs"][0]["id"]
-            if cached_data and cached_data.get("blogs")
-            else None
-        )
+        cached_latest_id = get_blog_cache().latest_blog_id()
         print(f"🔍 Cached latest blog ID: {cached_latest_id}")
 
         # Fetch fresh data
@@ -202,7 +194,7 @@ def fetch_latest_medium_blog(username: str) -> Optional[Dict[str, Any]]:
 
         # Get user avatar
         print("👤 Fetching user avatar...")
-        avatar_url = get_medium_avatar(username)
+        avatar_url = fresh_data.get("user_avatar") or get_medium_avatar(username)
         print(f"👤 Avatar URL: {avatar_url}")
 
         return {
@@ -3,10 +3,10 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from typing import Dict, List, Any, Optional
 import feedparser
-import requests
-from bs4 import BeautifulSoup
 import traceback
 from utils.helpers.blog_rss_helper import extract_blog_media  # reuse your media utility
+from utils.helpers.feed_cache_helper import fetch_feed_blogs
+from utils.helpers.avatar_cache_helper import resolve_avatar
 
 
 def get_wix_avatar(base_url: str) -> str:
@@ -19,43 +19,30 @@ def get_wix_avatar(base_url: str) -> str:
     Returns:
         str: Image URL or a default placeholder.
     """
-    try:
-        response = requests.get(base_url, headers={"User-Agent": "Mozilla/5.0"})
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            og_image = soup.find("meta", property="og:image")
-            if og_image and og_image.get("content"):
-                return og_image["content"]
-    except Exception as e:
-        print(f"Error fetching Wix avatar: {e}")
+    return resolve_avatar(
+        "Wix",
+        base_url,
+        base_url,
+        "https://static.wixstatic.com/media/3ed8f1_default.jpg",  # default fallback image
+    )
 
-    return "https://static.wixstatic.com/media/3ed8f1_default.jpg"  # default fallback image
 
+def wix_feed_url(base_url: str) -> str:
+    """Return the RSS feed URL for a Wix blog."""
+    return f"{base_url.rstrip('/')}/blog-feed.xml"
 
-def get_wix_blogs(base_url: str) -> Dict[str, Any]:
+
+def parse_wix_feed_entries(feed: Any, base_url: str = "") -> List[Dict[str, Any]]:
     """
-    Fetches blog posts from a Wix RSS feed.
+    Convert parsed Wix feed entries into blog dictionaries.
 
     Args:
-        base_url (str): The base URL of the Wix blog.
+        feed (Any): A feedparser result for a Wix RSS feed.
+        base_url (str): The base URL of the Wix blog (unused, kept for a uniform parser signature).
 
     Returns:
-        dict: Contains 'user_avatar' and 'blogs' list.
+        List[Dict[str, Any]]: Blog posts in feed order.
     """
-    feed_url = f"{base_url.rstrip('/')}/blog-feed.xml"
-
-    try:
-        response = requests.get(feed_url, headers={"User-Agent": "Mozilla/5.0"})
-    except Exception as e:
-        print(f"Request error: {e}")
-        return {"user_avatar": "", "blogs": []}
-
-    feed = feedparser.parse(response.content)
-    if feed.bozo:
-        print(f"❌ Error parsing feed: {feed.bozo_exception}")
-        return {"user_avatar": "", "blogs": []}
-
-    user_avatar = get_wix_avatar(base_url)
     blogs: List[Dict[str, Any]] = []
 
     for entry in feed.entries:
@@ -74,6 +61,36 @@ def get_wix_blogs(base_url: str) -> Dict[str, Any]:
             "content": content_html
         })
 
+    return blogs
+
+
+def get_wix_blogs(base_url: str) -> Dict[str, Any]:
+    """
+    Fetches blog posts from a Wix RSS feed.
+
+    Args:
+        base_url (str): The base URL of the Wix blog.
+
+    Returns:
+        dict: Contains 'user_avatar' and 'blogs' list.
+    """
+    feed_url = wix_feed_url(base_url)
+
+    def parse_blogs(content: bytes) -> List[Dict[str, Any]]:
+        feed = feedparser.parse(content)
+        if feed.bozo:
+            raise ValueError(f"Error parsing feed: {feed.bozo_exception}")
+        return parse_wix_feed_entries(feed, base_url)
+
+    # Conditional GET: an unchanged feed is served from the feed cache without re-parsing
+    try:
+        blogs = fetch_feed_blogs(feed_url, parse_blogs)
+    except Exception as e:
+        print(f"❌ Error fetching Wix feed: {e}")
+        return {"user_avatar": "", "blogs": []}
+
+    user_avatar = get_wix_avatar(base_url)
+
     return {
         "user_avatar": user_avatar,
         "blogs": blogs
@@ -3,12 +3,12 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from typing import Dict, List, Any, Optional
 import feedparser
-import requests
-from bs4 import BeautifulSoup
 import os
 from tabulate import tabulate
 import traceback
 from utils.helpers.blog_rss_helper import extract_blog_media  # reuse your media utility
+from utils.helpers.feed_cache_helper import fetch_feed_blogs
+from utils.helpers.avatar_cache_helper import resolve_avatar
 
 # You can adapt this if your WordPress site structure is different
 def get_wordpress_avatar(base_url: str) -> str:
@@ -21,35 +21,30 @@ def get_wordpress_avatar(base_url: str) -> str:
     Returns:
         str: Avatar/icon URL or a fallback image.
     """
-    try:
-        response = requests.get(base_url, headers={"User-Agent": "Mozilla/5.0"})
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            og_image = soup.find("meta", property="og:image")
-            if og_image and og_image.get("content"):
-                return og_image["content"]
-    except Exception as e:
-        print(f"Error fetching WordPress avatar: {e}")
+    return resolve_avatar(
+        "WordPress",
+        base_url,
+        base_url,
+        "https://s.w.org/about/images/logos/wordpress-logo-notext-rgb.png",
+    )
 
-    return "https://s.w.org/about/images/logos/wordpress-logo-notext-rgb.png"
 
+def wordpress_feed_url(base_url: str, tag: Optional[str] = None) -> str:
+    """Return the RSS feed URL for a WordPress site, optionally filtered by tag."""
+    return f"{base_url.rstrip('/')}/tag/{tag}/feed" if tag else f"{base_url.rstrip('/')}/feed"
 
-def get_wordpress_blogs(base_url: str, tag: str = None) -> Dict[str, Any]:
+
+def parse_wordpress_feed_entries(feed: Any, base_url: str = "") -> List[Dict[str, Any]]:
     """
-    Fetches blog posts from a WordPress RSS feed.
+    Convert parsed WordPress feed entries into blog dictionaries.
 
     Args:
-        base_url (str): The base URL of the WordPress site.
-        tag (str, optional): A tag to filter posts.
+        feed (Any): A feedparser result for a WordPress RSS feed.
+        base_url (str): The base URL of the WordPress site (unused, kept for a uniform parser signature).
 
     Returns:
-        dict: Contains 'user_avatar' and 'blogs' list
+        List[Dict[str, Any]]: Blog posts in feed order.
     """
-    feed_url = f"{base_url.rstrip('/')}/tag/{tag}/feed" if tag else f"{base_url.rstrip('/')}/feed"
-
-    feed = feedparser.parse(feed_url)
-    user_avatar = get_wordpress_avatar(base_url)
-
     blogs: List[Dict[str, Any]] = []
 
     for entry in feed.entries:
@@ -68,6 +63,31 @@ def get_wordpress_blogs(base_url: str, tag: str = None) -> Dict[str, Any]:
             "content": content_html
         })
 
+    return blogs
+
+
+def get_wordpress_blogs(base_url: str, tag: str = None) -> Dict[str, Any]:
+    """
+    Fetches blog posts from a WordPress RSS feed.
+
+    Args:
+        base_url (str): The base URL of the WordPress site.
+        tag (str, optional): A tag to filter posts.
+
+    Returns:
+        dict: Contains 'user_avatar' and 'blogs' list
+    """
+    # Conditional GET: an unchanged feed is served from the feed cache without re-parsing
+    try:
+        blogs = fetch_feed_blogs(
+            wordpress_feed_url(base_url, tag),
+            lambda content: parse_wordpress_feed_entries(feedparser.parse(content), base_url),
+        )
+    except Exception as e:
+        print(f"❌ Error fetching WordPress feed: {e}")
+        blogs = []
+    user_avatar = get_wordpress_avatar(base_url)
+
     return {
         "user_avatar": user_avatar,
         "blogs": blogs
@@ -1,12 +1,25 @@
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any
 import requests
+from src.utils.helpers.http_client_helper import get_session
+from src.utils.helpers.media_stream_helper import (
+    DEFAULT_READ_SIZE,
+    MediaStreamError,
+    MediaStreamReader,
+    RangedMediaSource,
+    media_stream_size,
+    open_media_stream,
+    request_with_retry,
+    spool_media_stream,
+)
 from dotenv import load_dotenv
 
 from utils.index import get_env_variable
 
+session = get_session()
+
 # ✅ Load environment variables
 load_dotenv()
 
@@ -15,6 +28,16 @@ ACCESS_TOKEN: Optional[str] = get_env_variable("LINKEDIN_ACCESS_TOKEN")
 if not ACCESS_TOKEN:
     raise ValueError("❌ LINKEDIN_ACCESS_TOKEN is missing! Set it in your .env file or GitHub Secrets.")
 
+# LinkedIn requires multipart uploads for videos over 200 MB
+LINKEDIN_MULTIPART_THRESHOLD_BYTES = 200 * 1024 * 1024
+LINKEDIN_UPLOAD_ATTEMPTS = 3
+
+LINKEDIN_RECIPES: Dict[str, str] = {
+    "IMAGE": "urn:li:digitalmediaRecipe:feedshare-image",
+    "GIF": "urn:li:digitalmediaRecipe:feedshare-image",  # GIFs are treated as images
+    "VIDEO": "urn:li:digitalmediaRecipe:feedshare-video"
+}
+
 def get_linkedin_profile_id() -> Optional[str]:
     """
     Fetch and return LinkedIn Profile ID.
@@ -29,7 +52,7 @@ def get_linkedin_profile_id() -> Optional[str]:
     url = "https://api.linkedin.com/v2/userinfo"
     headers = {"Authorization": f"Bearer {ACCESS_TOKEN}"}
 
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
     if response.status_code == 200:
         profile_id = response.json().get("sub")
         if isinstance(profile_id, str):
@@ -55,7 +78,7 @@ def get_linkedin_profile() -> Optional[Dict[str, Any]]:
         "X-Restli-Protocol-Version": "2.0.0"
     }
 
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
     if response.status_code == 200:
         return response.json()
     else:
@@ -63,10 +86,139 @@ def get_linkedin_profile() -> Optional[Dict[str, Any]]:
         return None
 
 
+def _register_linkedin_upload(profile_id: str, media_type: str, file_size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Registers an asset upload. With `file_size`, asks for LinkedIn's multipart mechanism, which
+    splits the file into byte ranges that are uploaded (and retried) separately.
+
+    Returns:
+        Optional[Dict[str, Any]]: The registerUpload "value" (asset URN and upload mechanism), else None.
+    """
+    upload_url = "https://api.linkedin.com/v2/assets?action=registerUpload"
+    headers = {
+        "Authorization": f"Bearer {ACCESS_TOKEN}",
+        "Content-Type": "application/json",
+        "X-Restli-Protocol-Version": "2.0.0"
+    }
+    media_request: Dict[str, Any] = {
+        "registerUploadRequest": {
+            "recipes": [LINKEDIN_RECIPES[media_type]],
+            "owner": f"urn:li:person:{profile_id}",
+            "serviceRelationships": [{"relationshipType": "OWNER", "identifier": "urn:li:userGeneratedContent"}]
+        }
+    }
+    if file_size is not None:
+        media_request["registerUploadRequest"]["supportedUploadMechanism"] = ["MULTIPART_UPLOAD"]
+        media_request["registerUploadRequest"]["fileSize"] = file_size
+
+    response = session.post(upload_url, headers=headers, json=media_request)
+    if response.status_code == 200:
+        return response.json()["value"]
+    print("❌ Error requesting LinkedIn upload URL:", response.json())
+    return None
+
+
+def _upload_linkedin_single(upload_endpoint: str, media_url: str, spool, size: int) -> bool:
+    """
+    Streams the whole file to a single upload URL. Every attempt rewinds the spool or starts a
+    fresh download, so nothing was left open while the upload was registered.
+    """
+    opened = []
+
+    def body():
+        if spool is not None:
+            spool.seek(0)
+            return MediaStreamReader(iter(lambda: spool.read(DEFAULT_READ_SIZE), b""), size)
+        stream = open_media_stream(media_url, session)
+        opened.append(stream)
+        return MediaStreamReader(stream.iter_content(DEFAULT_READ_SIZE), size)
+
+    try:
+        media_response = request_with_retry(
+            "POST",
+            upload_endpoint,
+            attempts=LINKEDIN_UPLOAD_ATTEMPTS,
+            body_factory=body,
+            session=session,
+            headers={"Authorization": f"Bearer {ACCESS_TOKEN}"},
+        )
+    except (MediaStreamError, requests.RequestException) as e:
+        print(f"❌ Error streaming media to LinkedIn: {e}")
+        return False
+    finally:
+        for stream in opened:
+            stream.close()
+    if media_response.status_code in (200, 201):
+        return True
+    print("❌ Error uploading media to LinkedIn:", media_response.status_code, media_response.text)
+    return False
+
+
+def _upload_linkedin_multipart(upload_value: Dict[str, Any], read_part: Callable[[int, int], bytes]) -> bool:
+    """
+    Uploads each byte range LinkedIn assigned, fetching it with `read_part(first, last)` right
+    before its upload, then completes the multipart upload. A failed part is retried on its own.
+    """
+    multipart = upload_value["uploadMechanism"]["com.linkedin.digitalmedia.uploading.MultipartUpload"]
+    part_requests = sorted(multipart["partUploadRequests"], key=lambda part: part["byteRange"]["firstByte"])
+    part_responses = []
+    for number, part in enumerate(part_requests, start=1):
+        first, last = part["byteRange"]["firstByte"], part["byteRange"]["lastByte"]
+        expected = last - first + 1
+        try:
+            data = read_part(first, last)
+        except (MediaStreamError, requests.RequestException) as e:
+            print(f"❌ Error reading part {number}/{len(part_requests)} of the media: {e}")
+            return False
+        if len(data) != expected:
+            print(f"❌ Media stream ended early: part {number} has {len(data)} of {expected} bytes.")
+            return False
+        try:
+            part_response = request_with_retry(
+                "PUT", part["url"], attempts=LINKEDIN_UPLOAD_ATTEMPTS, session=session,
+                data=data, headers=part.get("headers", {}),
+            )
+        except requests.RequestException as e:
+            print(f"❌ Error uploading part {number}/{len(part_requests)} to LinkedIn: {e}")
+            return False
+        if part_response.status_code not in (200, 201):
+            print(f"❌ Error uploading part {number}/{len(part_requests)} to LinkedIn:", part_response.status_code, part_response.text)
+            return False
+        part_responses.append({
+            "headers": {"ETag": part_response.headers.get("ETag", ""), "Content-Length": str(len(data))},
+            "httpStatusCode": part_response.status_code,
+        })
+
+    complete_response = session.post(
+        "https://api.linkedin.com/v2/assets?action=completeMultiPartUpload",
+        headers={
+            "Authorization": f"Bearer {ACCESS_TOKEN}",
+            "Content-Type": "application/json",
+            "X-Restli-Protocol-Version": "2.0.0"
+        },
+        json={
+            "completeMultipartUploadRequest": {
+                "mediaArtifact": upload_value["mediaArtifact"],
+                "metadata": multipart.get("metadata", ""),
+                "partUploadResponses": part_responses,
+            }
+        },
+    )
+    if complete_response.status_code == 200:
+        return True
+    print("❌ Error completing LinkedIn multipart upload:", complete_response.status_code, complete_response.text)
+    return False
+
+
 def upload_linkedin_media(profile_id: str, media_url: str, media_type: str) -> Optional[str]:
     """
     Uploads media (image, GIF, or video) to LinkedIn and returns a media URN.
 
+    The media is streamed from `media_url` to LinkedIn, so memory stays bounded by one
+    part (multipart videos) or a small read buffer, whatever the file size. Videos of at least
+    LINKEDIN_MULTIPART_THRESHOLD_BYTES use LinkedIn's multipart upload, downloading each part
+    with a Range request just before it is sent.
+
     Args:
         profile_id (str): LinkedIn Profile ID
         media_url (str): The direct URL of the media file
@@ -79,50 +231,61 @@ def upload_linkedin_media(profile_id: str, media_url: str, media_type: str) -> O
         print("❌ Error: Missing LinkedIn access token.")
         return None
 
-    upload_url = "https://api.linkedin.com/v2/assets?action=registerUpload"
-    headers = {
-        "Authorization": f"Bearer {ACCESS_TOKEN}",
-        "Content-Type": "application/json",
-        "X-Restli-Protocol-Version": "2.0.0"
-    }
-
     # ✅ Validate media type
-    recipe_map: Dict[str, str] = {
-        "IMAGE": "urn:li:digitalmediaRecipe:feedshare-image",
-        "GIF": "urn:li:digitalmediaRecipe:feedshare-image",  # GIFs are treated as images
-        "VIDEO": "urn:li:digitalmediaRecipe:feedshare-video"
-    }
-    
-    if media_type not in recipe_map:
+    if media_type not in LINKEDIN_RECIPES:
         print("❌ Invalid media type. Choose IMAGE, GIF, or VIDEO.")
         return None
 
-    media_request = {
-        "registerUploadRequest": {
-            "recipes": [recipe_map[media_type]],
-            "owner": f"urn:li:person:{profile_id}",
-            "serviceRelationships": [{"relationshipType": "OWNER", "identifier": "urn:li:userGeneratedContent"}]
-        }
-    }
+    try:
+        source = open_media_stream(media_url, session)
+    except MediaStreamError as e:
+        print(f"❌ {e}")
+        return None
 
-    response = requests.post(upload_url, headers=headers, json=media_request)
-    if response.status_code == 200:
-        response_data = response.json()
-        upload_urn = response_data["value"]["asset"]
-        upload_endpoint = response_data["value"]["uploadMechanism"]["com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"]["uploadUrl"]
+    spool = None
+    try:
+        size = media_stream_size(source)
+        if size is None:
+            # Unknown length: spool (memory, then disk) so the size can be declared up front
+            spool, size = spool_media_stream(source)
+    finally:
+        # Only the size (or the spooled copy) is needed; the upload reopens the media after
+        # registerUpload rather than leaving this download idle while LinkedIn answers
+        source.close()
+
+    ranged = None
+    try:
+        multipart = media_type == "VIDEO" and size >= LINKEDIN_MULTIPART_THRESHOLD_BYTES
+
+        upload_value = _register_linkedin_upload(profile_id, media_type, size if multipart else None)
+        if upload_value is None:
+            return None
+        upload_urn = upload_value["asset"]
 
         # ✅ Upload the actual media file
-        media_response = requests.post(upload_endpoint, headers={"Authorization": f"Bearer {ACCESS_TOKEN}"}, data=requests.get(media_url).content)
+        if multipart:
+            if spool is not None:
+                def read_part(first: int, last: int) -> bytes:
+                    spool.seek(first)
+                    return spool.read(last - first + 1)
+            else:
+                ranged = RangedMediaSource(media_url, session)
+                read_part = ranged.read_range
+            uploaded = _upload_linkedin_multipart(upload_value, read_part)
+        else:
+            upload_endpoint = upload_value["uploadMechanism"]["com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"]["uploadUrl"]
+            uploaded = _upload_linkedin_single(upload_endpoint, media_url, spool, size)
 
-        if media_response.status_code == 201:
+        if uploaded:
             print(f"✅ {media_type} uploaded successfully! URN: {upload_urn}")
             return upload_urn
-
-        print(f"❌ Error uploading {media_type} to LinkedIn:", media_response.json())
+        print(f"❌ Error uploading {media_type} to LinkedIn.")
         return None
-
-    print("❌ Error requesting LinkedIn upload URL:", response.json())
-    return None
+    finally:
+        if ranged is not None:
+            ranged.close()
+        if spool is not None:
+            spool.close()
 
 
 def post_to_linkedin(post_text: str, profile_id: str, media_url: Optional[str] = None, media_type: str = "NONE") -> None:
@@ -172,7 +335,7 @@ def post_to_linkedin(post_text: str, profile_id: str, media_url: Optional[str] =
         else:
             print("❌ Failed to upload media. Posting without media.")
 
-    response = requests.post(url, headers=headers, json=data)
+    response = session.post(url, headers=headers, json=data)
 
     if response.status_code == 201:
         print("✅ Successfully posted to LinkedIn Scoped!")
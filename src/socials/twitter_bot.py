@@ -1,13 +1,25 @@
 import os
 import json
-import shutil
-import requests
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from src.utils.helpers.http_client_helper import get_session
+from src.utils.helpers.media_stream_helper import (
+    DEFAULT_READ_SIZE,
+    MediaStreamError,
+    MediaStreamReader,
+    media_stream_size,
+    open_media_stream,
+    request_with_retry,
+    spool_media_stream,
+)
+from src.utils.helpers.ttl_cache_helper import TTLCache
 import base64
-import tempfile
 from typing import Optional, List, Dict, Any
 from requests_oauthlib import OAuth1
 from urllib.parse import urlencode
 
+session = get_session()
+
 # Twitter API credentials from environment variables
 API_KEY = os.environ.get("TWITTER_API_KEY")
 API_KEY_SECRET = os.environ.get("TWITTER_API_KEY_SECRET")
@@ -21,6 +33,15 @@ SIMULATION_MODE = os.environ.get("TWITTER_SIMULATION_MODE", "False").lower() ==
 USE_FREE_TIER = os.environ.get("TWITTER_USE_FREE_TIER", "True").lower() == "true"
 VERBOSE_MODE = os.environ.get("TWITTER_VERBOSE_MODE", "False").lower() == "true"
 
+# Chunked media upload (APPEND segments may be at most 5 MB)
+TWITTER_SEGMENT_BYTES = 4 * 1024 * 1024
+TWITTER_APPEND_CONCURRENCY = 3
+TWITTER_PROCESSING_TIMEOUT_SECONDS = 300
+# Twitter media_ids expire after 24 hours; cached ids are dropped an hour before that
+TWITTER_MEDIA_ID_TTL_SECONDS = 24 * 60 * 60
+
+_media_id_cache = TTLCache(ttl=TWITTER_MEDIA_ID_TTL_SECONDS - 60 * 60, maxsize=256)
+
 
 def get_oauth2_token() -> Optional[str]:
     """
@@ -53,7 +74,7 @@ def get_oauth2_token() -> Optional[str]:
     data = {"grant_type": "client_credentials"}
     
     try:
-        response = requests.post(url, headers=headers, data=data)
+        response = session.post(url, headers=headers, data=data)
         
         if response.status_code == 200:
             access_token = response.json().get("access_token")
@@ -165,7 +186,7 @@ def exchange_code_for_token(code: str, code_verifier: str = "challenge") -> Dict
     }
     
     try:
-        response = requests.post(token_url, data=payload, headers=headers)
+        response = session.post(token_url, data=payload, headers=headers)
         
         if response.status_code == 200:
             token_data = response.json()
@@ -208,7 +229,7 @@ def get_bearer_token() -> Optional[str]:
     headers = {"Content-Type": "application/x-www-form-urlencoded;charset=UTF-8"}
     
     try:
-        response = requests.post(url, auth=auth, data=data, headers=headers)
+        response = session.post(url, auth=auth, data=data, headers=headers)
         if response.status_code == 200:
             return response.json()["access_token"]
         else:
@@ -234,7 +255,7 @@ def get_user_id(username: str, bearer_token: str) -> Optional[str]:
     headers = {"Authorization": f"Bearer {bearer_token}"}
     
     try:
-        response = requests.get(url, headers=headers)
+        response = session.get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             if data.get("data") and data["data"].get("id"):
@@ -246,65 +267,165 @@ def get_user_id(username: str, bearer_token: str) -> Optional[str]:
         return None
 
 
+def get_twitter_media_cache() -> TTLCache:
+    """media_ids of media already uploaded, keyed by source URL, kept until Twitter expires them."""
+    return _media_id_cache
+
+
+def _twitter_media_category(content_type: str) -> str:
+    content_type = content_type.lower()
+    if content_type == "image/gif":
+        return "tweet_gif"
+    if content_type.startswith("video/"):
+        return "tweet_video"
+    return "tweet_image"
+
+
+def _append_media_segments(upload_url: str, media_id: str, reader: MediaStreamReader, auth) -> bool:
+    """
+    APPENDs the media in TWITTER_SEGMENT_BYTES segments, up to TWITTER_APPEND_CONCURRENCY at a
+    time. Reading pauses while that many are in flight, so at most concurrency + 1 segments are
+    held in memory. Each segment is retried on its own.
+    """
+    def append(segment_index: int, segment: bytes) -> int:
+        response = request_with_retry(
+            "POST", upload_url, session=session, auth=auth,
+            data={"command": "APPEND", "media_id": media_id, "segment_index": segment_index},
+            files={"media": segment},
+        )
+        if response.status_code not in (200, 204):
+            raise RuntimeError(f"APPEND of segment {segment_index} failed: {response.status_code} - {response.text}")
+        return segment_index
+
+    in_flight = set()
+    with ThreadPoolExecutor(max_workers=TWITTER_APPEND_CONCURRENCY) as executor:
+        try:
+            segment_index = 0
+            while True:
+                if len(in_flight) >= TWITTER_APPEND_CONCURRENCY:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                segment = reader.read(TWITTER_SEGMENT_BYTES)
+                if not segment:
+                    break
+                in_flight.add(executor.submit(append, segment_index, segment))
+                segment_index += 1
+            for future in in_flight:
+                future.result()
+        except Exception as e:
+            for future in in_flight:
+                future.cancel()
+            print(f"Error uploading media: {e}")
+            return False
+    return True
+
+
+def _wait_for_media_processing(upload_url: str, media_id: str, processing_info: Optional[Dict[str, Any]], auth) -> Optional[Dict[str, Any]]:
+    """
+    Polls STATUS until Twitter has processed an uploaded GIF/video.
+
+    Returns:
+        Optional[Dict[str, Any]]: The final upload response, or None if processing failed or timed out.
+    """
+    deadline = time.monotonic() + TWITTER_PROCESSING_TIMEOUT_SECONDS
+    response_data: Dict[str, Any] = {"processing_info": processing_info}
+    while processing_info and processing_info.get("state") in ("pending", "in_progress"):
+        delay = processing_info.get("check_after_secs", 1)
+        if time.monotonic() + delay > deadline:
+            print(f"Error uploading media: processing of {media_id} timed out")
+            return None
+        time.sleep(delay)
+        response = session.get(upload_url, params={"command": "STATUS", "media_id": media_id}, auth=auth)
+        if response.status_code != 200:
+            print(f"Error checking media status: {response.status_code} - {response.text}")
+            return None
+        response_data = response.json()
+        processing_info = response_data.get("processing_info")
+    if processing_info and processing_info.get("state") == "failed":
+        print(f"Error processing media: {processing_info.get('error')}")
+        return None
+    return response_data
+
+
 def upload_media_from_url(media_url: str) -> Optional[str]:
     """
     Download media from URL and upload to Twitter.
     Note: This requires a paid Twitter API subscription to work.
-    
+
+    The download is piped into Twitter's chunked upload (INIT/APPEND/FINALIZE) without touching
+    disk; segments are APPENDed concurrently. media_ids are cached per URL until they expire, so
+    the same media is not uploaded twice.
+
     Args:
         media_url (str): URL of the media to upload
-        
+
     Returns:
         Optional[str]: Media ID if successful, None otherwise
     """
+    cached_media_id = _media_id_cache.get(media_url)
+    if cached_media_id:
+        print(f"Reusing uploaded media. Media ID: {cached_media_id}")
+        return cached_media_id
+
     print("\u26a0ufe0f Note: Media uploads require Twitter API paid tier access")
-    
+
     # Twitter media upload endpoint
     upload_url = "https://upload.twitter.com/1.1/media/upload.json"
-    
+
     # Create OAuth1 auth object
-    auth = OAuth1(
-        client_key=API_KEY,
-        client_secret=API_KEY_SECRET,
-        resource_owner_key=ACCESS_TOKEN,
-        resource_owner_secret=ACCESS_TOKEN_SECRET
-    )
-    
-    # Create a temporary file to store the downloaded media
-    temp_file = None
+    auth = create_oauth1_auth()
+
+    spool = None
     try:
-        # Download the media from the URL
-        response = requests.get(media_url, stream=True)
-        if response.status_code != 200:
-            print(f"Error downloading media: {response.status_code} - {response.text}")
+        # Stream the media from the URL
+        source = open_media_stream(media_url, session)
+    except MediaStreamError as e:
+        print(f"Error downloading media: {e}")
+        return None
+    try:
+        total_bytes = media_stream_size(source)
+        if total_bytes is None:
+            # INIT needs the size up front; only sources without a Content-Length are spooled
+            spool, total_bytes = spool_media_stream(source)
+            reader = MediaStreamReader(iter(lambda: spool.read(DEFAULT_READ_SIZE), b""), total_bytes)
+        else:
+            reader = MediaStreamReader(source.iter_content(DEFAULT_READ_SIZE), total_bytes)
+        content_type = source.headers.get("Content-Type", "application/octet-stream").split(";")[0].strip()
+
+        response = session.post(upload_url, data={
+            "command": "INIT",
+            "total_bytes": total_bytes,
+            "media_type": content_type,
+            "media_category": _twitter_media_category(content_type),
+        }, auth=auth)
+        if response.status_code not in (200, 201, 202):
+            print(f"Error uploading media: {response.status_code} - {response.text}")
             return None
-        
-        # Create a temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False)
-        
-        # Write the content to the file
-        shutil.copyfileobj(response.raw, temp_file)
-        temp_file.close()
-        
-        # Upload the media to Twitter
-        with open(temp_file.name, 'rb') as media:
-            files = {'media': media}
-            response = requests.post(upload_url, files=files, auth=auth)
-            
-            if response.status_code == 200:
-                media_id = response.json().get('media_id_string')
-                print(f"Media uploaded successfully. Media ID: {media_id}")
-                return media_id
-            else:
-                print(f"Error uploading media: {response.status_code} - {response.text}")
-                return None
+        media_id = response.json().get("media_id_string")
+
+        if not _append_media_segments(upload_url, media_id, reader, auth):
+            return None
+
+        response = session.post(upload_url, data={"command": "FINALIZE", "media_id": media_id}, auth=auth)
+        if response.status_code not in (200, 201):
+            print(f"Error uploading media: {response.status_code} - {response.text}")
+            return None
+        finalize_data = response.json()
+        if _wait_for_media_processing(upload_url, media_id, finalize_data.get("processing_info"), auth) is None:
+            return None
+
+        expires_after = finalize_data.get("expires_after_secs", TWITTER_MEDIA_ID_TTL_SECONDS)
+        _media_id_cache.set(media_url, media_id, ttl=max(0, min(expires_after, TWITTER_MEDIA_ID_TTL_SECONDS) - 60 * 60))
+        print(f"Media uploaded successfully. Media ID: {media_id}")
+        return media_id
     except Exception as e:
         print(f"Error uploading media: {e}")
         return None
     finally:
-        # Clean up the temporary file
-        if temp_file and os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
+        source.close()
+        if spool is not None:
+            spool.close()
 
 
 def create_oauth1_auth():
@@ -375,7 +496,7 @@ def post_tweet_with_bearer(text: str, media_ids: Optional[List[str]] = None) ->
     
     try:
         # Make the request
-        response = requests.post(
+        response = session.post(
             url,
             json=payload,
             headers=headers
@@ -472,7 +593,7 @@ def post_tweet(text: str, media_ids: Optional[List[str]] = None) -> bool:
     
     try:
         # Make the request
-        response = requests.post(
+        response = session.post(
             url,
             json=payload,
             headers=headers,
@@ -578,7 +699,7 @@ def post_tweet_with_oauth2(text: str, media_ids: Optional[List[str]] = None, oau
     
     try:
         # Make the request
-        response = requests.post(url, json=payload, headers=headers)
+        response = session.post(url, json=payload, headers=headers)
         
         # Print response status for debugging
         print(f"Response status: {response.status_code}")
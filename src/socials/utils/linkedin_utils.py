@@ -16,35 +16,48 @@ def authenticate_linkedin() -> Optional[str]:
 
 
 def post_to_linkedin_if_possible(
-    post_text: str, media_url: Optional[str], media_type: Optional[str], profile_id: str
-):
-    if media_url and media_type:
-        try:
+    post_text: str,
+    media_url: Optional[str],
+    media_type: Optional[str],
+    profile_id: str,
+    blog_id: Optional[str] = None,
+) -> bool:
+    """
+    Publishes a post (text-only when there is no media) and records it in the post history.
+
+    Returns:
+        bool: True if the post was published and recorded, False if publishing failed.
+    """
+    if not (media_url and media_type):
+        print("ℹ️ No media to attach. Posting text only.")
+        media_url, media_type = None, None
+    try:
+        if blog_id is None:
             state = get_prompt_globals()
             raw_blog = state.get("raw_blog", {})
             blog_id = raw_blog.get("id") if isinstance(raw_blog, dict) else None
 
-            # Uncomment this line to actually post to LinkedIn
-            # linkedin_response = post_to_linkedin(
-            #     post_text=post_text,
-            #     profile_id=profile_id,
-            #     media_url=media_url,
-            #     media_type=media_type
-            # )
-            # post_url = extract_post_url_from_response(linkedin_response) if linkedin_response else None
+        # Uncomment this line to actually post to LinkedIn
+        # linkedin_response = post_to_linkedin(
+        #     post_text=post_text,
+        #     profile_id=profile_id,
+        #     media_url=media_url,
+        #     media_type=media_type or "NONE"
+        # )
+        # post_url = extract_post_url_from_response(linkedin_response) if linkedin_response else None
 
-            post_url = None  # In production this would come from the LinkedIn API response
-            print("✅ LinkedIn post submitted successfully.")
+        post_url = None  # In production this would come from the LinkedIn API response
+        print("✅ LinkedIn post submitted successfully.")
 
-            add_linkedin_post(
-                post_text=post_text,
-                blog_id=blog_id,
-                media_url=media_url,
-                media_type=media_type,
-                post_url=post_url,
-            )
-            print("💾 LinkedIn post saved to cache.")
-        except Exception as e:
-            print(f"❌ Error posting to LinkedIn: {e}")
-    else:
-        print("⚠️ No media to post to LinkedIn.")
+        add_linkedin_post(
+            post_text=post_text,
+            blog_id=blog_id,
+            media_url=media_url,
+            media_type=media_type,
+            post_url=post_url,
+        )
+        print("💾 LinkedIn post saved to cache.")
+        return True
+    except Exception as e:
+        print(f"❌ Error posting to LinkedIn: {e}")
+        return False
@@ -0,0 +1,62 @@
+import sys
+import os
+import asyncio
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import httpx
+import pytest
+from src.ml_models.base_generator import BaseGenerator
+from src.ml_models.deepseek.utils import deepseek_generator_utils
+from src.ml_models.deepseek.utils.deepseek_generator_utils import DeepSeekGenerator
+
+
+class SlowBlockingGenerator(BaseGenerator):
+    def __init__(self):
+        # Skip provider setup; only the async offload is under test
+        pass
+
+    def send_message(self, prompt_text: str = None):
+        time.sleep(0.2)
+        return {"status": "success", "response": prompt_text}
+
+
+@pytest.mark.asyncio
+async def test_blocking_generators_do_not_block_the_event_loop():
+    generator = SlowBlockingGenerator()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(generator.send_message_async(f"p{i}") for i in range(4)))
+    elapsed = time.perf_counter() - start
+    ticker_task.cancel()
+
+    assert [r["response"] for r in results] == ["p0", "p1", "p2", "p3"]
+    assert elapsed < 0.5
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_deepseek_async_path_uses_async_client(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    generator = DeepSeekGenerator()
+    seen = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen["auth"] = request.headers["authorization"]
+        return httpx.Response(200, json={"choices": [{"message": {"content": " Generated post "}}]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(deepseek_generator_utils, "get_async_client", lambda: client)
+    result = await generator.send_message_async("Write about caching")
+    await client.aclose()
+
+    assert result["status"] == "success"
+    assert result["response"] == "Generated post"
+    assert seen["auth"] == "Bearer test-key"
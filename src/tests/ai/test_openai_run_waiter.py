@@ -0,0 +1,86 @@
+import sys
+import os
+import asyncio
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import httpx
+import pytest
+from src.ml_models.openai.utils.openai_assistant_utils import wait_for_openai_response_async
+
+
+def make_client(statuses, calls):
+    status_iter = iter(statuses)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.url.path.endswith("/cancel"):
+            return httpx.Response(200, json={"status": "cancelling"})
+        status = next(status_iter, statuses[-1])
+        if isinstance(status, httpx.Response):
+            return status
+        return httpx.Response(200, json={"id": "run_1", "status": status})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_fast_run_returns_without_long_sleeps():
+    calls = []
+    async with make_client(["queued", "in_progress", "completed"], calls) as client:
+        start = time.perf_counter()
+        result = await wait_for_openai_response_async("thread_1", "run_1", client=client)
+        elapsed = time.perf_counter() - start
+    assert result is None
+    assert len(calls) == 3
+    # The old loop slept 5s between polls; backoff starts at a fraction of a second
+    assert elapsed < 1.5
+
+
+@pytest.mark.asyncio
+async def test_failed_run_returns_payload():
+    calls = []
+    async with make_client(["in_progress", "failed"], calls) as client:
+        result = await wait_for_openai_response_async("thread_1", "run_1", client=client)
+    assert result["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_run():
+    calls = []
+    async with make_client(["in_progress"], calls) as client:
+        result = await wait_for_openai_response_async("thread_1", "run_1", deadline_seconds=0.3, client=client)
+    assert result["status"] == "timeout"
+    assert ("POST", "/v1/threads/thread_1/runs/run_1/cancel") in calls
+
+
+@pytest.mark.asyncio
+async def test_caller_cancellation_cancels_run_remotely():
+    calls = []
+    async with make_client(["in_progress"], calls) as client:
+        task = asyncio.create_task(wait_for_openai_response_async("thread_1", "run_1", client=client))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert calls[-1] == ("POST", "/v1/threads/thread_1/runs/run_1/cancel")
+
+
+@pytest.mark.asyncio
+async def test_server_errors_and_bad_json_are_retried():
+    calls = []
+    responses = [httpx.Response(502, text="Bad Gateway"), httpx.Response(200, text="<html>"), "completed"]
+    async with make_client(responses, calls) as client:
+        result = await wait_for_openai_response_async("thread_1", "run_1", client=client)
+    assert result is None
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_client_error_returns_error_payload():
+    calls = []
+    not_found = httpx.Response(404, json={"error": {"message": "No run found with id 'run_1'."}})
+    async with make_client([not_found], calls) as client:
+        result = await wait_for_openai_response_async("thread_1", "run_1", client=client)
+    assert result["status"] == "error"
+    assert result["last_error"] == {"code": 404, "message": "No run found with id 'run_1'."}
+    assert len(calls) == 1
@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from src.utils.api.config_handler import (
+    EffectiveConfigCache,
+    config_fingerprint,
+    merge_configs,
+)
+
+BASE = {
+    "ai": {"text": {"generate_text": {"LLM": "OpenAI"}}, "creative": {"enabled": True}},
+    "hashtags": {"default_tags": ["#AI"]},
+}
+
+
+def test_fingerprint_ignores_key_order():
+    assert config_fingerprint({"a": 1, "b": {"c": 2, "d": 3}}) == config_fingerprint({"b": {"d": 3, "c": 2}, "a": 1})
+    assert config_fingerprint({"a": 1}) != config_fingerprint({"a": 2})
+
+
+def test_resolve_matches_merge_configs_and_is_read_only():
+    cache = EffectiveConfigCache()
+    override = {"ai": {"text": {"generate_text": {"LLM": "Claude"}}}}
+    merged = cache.resolve(BASE, override)
+    assert merged["ai"]["text"]["generate_text"]["LLM"] == "Claude"
+    assert merged["hashtags"]["default_tags"] == ("#AI",)
+    expected = merge_configs(BASE, override)
+    assert merged["ai"]["creative"] == expected["ai"]["creative"]
+    with pytest.raises(TypeError):
+        merged["ai"]["text"] = {}
+    assert BASE["ai"]["text"]["generate_text"]["LLM"] == "OpenAI"
+
+
+def test_repeated_profiles_hit_and_share_untouched_subtrees():
+    cache = EffectiveConfigCache()
+    calls = []
+    def normalize(override):
+        calls.append(override)
+        return override
+    first = cache.resolve(BASE, {"ai": {"creative": {"enabled": False}}}, normalize=normalize)
+    again = cache.resolve(BASE, {"ai": {"creative": {"enabled": False}}}, normalize=normalize)
+    other = cache.resolve(BASE, {"hashtags": {"custom_tags": ["#X"]}}, normalize=normalize)
+    assert again is first
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    # Subtrees no override touched are the same object across profiles
+    assert first["hashtags"] is cache.resolve(BASE, {}, normalize=normalize)["hashtags"]
+    assert other["ai"] is cache.resolve(BASE, {}, normalize=normalize)["ai"]
+
+
+def test_lru_eviction_and_base_change():
+    cache = EffectiveConfigCache(maxsize=2)
+    a = cache.resolve(BASE, {"x": 1})
+    cache.resolve(BASE, {"x": 2})
+    assert cache.resolve(BASE, {"x": 1}) is a  # refreshes x=1
+    cache.resolve(BASE, {"x": 3})  # evicts x=2
+    assert cache.stats()["size"] == 2
+    misses = cache.stats()["misses"]
+    cache.resolve(BASE, {"x": 2})
+    assert cache.stats()["misses"] == misses + 1
+    reloaded = dict(BASE, hashtags={"default_tags": ["#New"]})
+    assert cache.resolve(reloaded, {"x": 1})["hashtags"]["default_tags"] == ("#New",)
+    assert cache.stats()["size"] == 1
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    import importlib
+    monkeypatch.setenv("LINKEDIN_ACCESS_TOKEN", "test-token")
+    return importlib.import_module("src.api.routes")
+
+
+def test_job_payloads_built_from_a_cached_config_serialize(routes):
+    import json
+    from src.api.jobs import Job
+    from src.utils.dispatch.text.text_pipeline_utils import build_pollinations_payload
+    from src.utils.helpers.llm_cache_helper import make_llm_cache_key
+    from src.utils.helpers.prompt.run_context import use_run_context
+
+    openai_compatible = {
+        "model": "openai",
+        "messages": [{"role": "system", "content": "Be brief"}, {"role": "user", "content": ""}],
+        "tools": [{"type": "function", "function": {"name": "generate_post", "parameters": {"type": "object"}}}],
+        "logit_bias": {"50256": -100},
+        "metadata": {"source": "api"},
+    }
+    base = {"user_profile": {"llm": {"Pollinations": {"openai_compatible": openai_compatible}}}}
+    frozen = EffectiveConfigCache().resolve(base, {"user_profile": {"llm": {"Pollinations": {"openai_compatible": {"seed": 7}}}}})
+
+    run_context = routes.build_job_run_context(Job(id="job-1", kind="preview"), frozen)
+    run_context.state["prompt"] = "Write a post"
+    with use_run_context(run_context):
+        payload = build_pollinations_payload(run_context.state)
+    body = json.loads(json.dumps(payload))
+    assert body["tools"] == openai_compatible["tools"]
+    assert body["logit_bias"] == {"50256": -100}
+    assert body["seed"] == 7
+    # The cache key hashes the config's content, frozen or not
+    llm_config = run_context.config["user_profile"]["llm"]
+    assert make_llm_cache_key("Pollinations_Text_Completion", run_context.state, frozen["user_profile"]["llm"]) == \
+        make_llm_cache_key("Pollinations_Text_Completion", run_context.state, llm_config)
@@ -0,0 +1,84 @@
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from src.api.jobs import JOB_FAILED, JOB_SUCCEEDED, JobManager, format_sse
+
+
+@pytest.fixture
+def manager():
+    jobs = JobManager(max_workers=2)
+    yield jobs
+    jobs.shutdown()
+
+
+def wait_until_finished(manager, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.snapshot(job_id)
+        if job["status"] in (JOB_SUCCEEDED, JOB_FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_submit_returns_before_slow_job_finishes(manager):
+    release = threading.Event()
+    job = manager.submit("slow", lambda job: release.wait(5) and "done", tenant="acme")
+    assert manager.snapshot(job.id)["status"] in ("queued", "running")
+    # A second job is not blocked by the first
+    quick = manager.submit("quick", lambda job, x: x * 2, 21)
+    assert wait_until_finished(manager, quick.id)["result"] == 42
+    release.set()
+    finished = wait_until_finished(manager, job.id)
+    assert finished["result"] == "done"
+    assert finished["tenant"] == "acme"
+
+
+def test_failed_job_records_error(manager):
+    def boom(job):
+        raise RuntimeError("LLM unavailable")
+    job = manager.submit("boom", boom)
+    finished = wait_until_finished(manager, job.id)
+    assert finished["status"] == JOB_FAILED
+    assert finished["error"] == "LLM unavailable"
+
+
+def test_iter_events_streams_until_finished(manager):
+    def work(job):
+        manager.add_event(job, "halfway", step=1)
+        return {"ok": True}
+    job = manager.submit("work", work)
+    events = [event for event in manager.iter_events(job.id, heartbeat=0.05) if event]
+    assert [e["event"] for e in events] == ["queued", "running", "progress", "succeeded"]
+    assert events[2]["message"] == "halfway"
+    assert format_sse(events[-1]).startswith("event: succeeded\ndata: ")
+    assert format_sse(None) == ": keep-alive\n\n"
+
+
+def test_text_deltas_reach_the_event_stream(manager):
+    def work(job):
+        for piece in ["Big ", "news"]:
+            manager.add_text_delta(job, piece)
+        return {"ok": True}
+    job = manager.submit("preview", work)
+    events = [event for event in manager.iter_events(job.id, heartbeat=0.05) if event]
+    assert "".join(e["text"] for e in events if e["event"] == "text_delta") == "Big news"
+
+
+def test_unknown_job_has_no_snapshot_or_events(manager):
+    assert manager.snapshot("missing") is None
+    assert list(manager.iter_events("missing")) == []
+
+
+def test_text_reset_reaches_the_event_stream(manager):
+    def work(job):
+        manager.add_text_delta(job, "Draft")
+        manager.add_text_reset(job)
+        manager.add_text_delta(job, "Final")
+        return {"ok": True}
+    job = manager.submit("preview", work)
+    events = [event for event in manager.iter_events(job.id, heartbeat=0.05) if event]
+    assert [e["event"] for e in events if e["event"].startswith("text_")] == ["text_delta", "text_reset", "text_delta"]
@@ -2,6 +2,8 @@ import os
 import shutil
 import tempfile
 import time
+import pytest
+import src.asset_fetch.candid_index as candid_index
 from asset_fetch.candid import (
     get_candid_media_metadata,
     get_candid_media_by_filename,
@@ -10,6 +12,15 @@ from asset_fetch.candid import (
 import logging
 from datetime import datetime
 
+@pytest.fixture(autouse=True)
+def isolated_index(tmp_path, monkeypatch):
+    # Keep the shared indexes (and their SQLite file) out of the real _temp/ folder
+    monkeypatch.setattr(candid_index, "CANDID_INDEX_DB_FILE", str(tmp_path / "candid_media_index.db"))
+    monkeypatch.setattr(candid_index, "_indexes", {})
+    yield
+    for index in candid_index._indexes.values():
+        index.close()
+
 def create_test_images(test_dir, files):
     os.makedirs(test_dir, exist_ok=True)
     for fname in files:
@@ -35,6 +46,7 @@ def test_get_candid_media_metadata_images_only():
     for m in meta:
         if m['filename'] != 'README.txt':
             assert m['media_type'] == 'image'
+        assert 'dhash' not in m
     shutil.rmtree(test_dir)
 
 def test_get_candid_media_by_filename():
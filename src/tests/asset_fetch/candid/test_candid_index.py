@@ -0,0 +1,85 @@
+import os
+import time
+import pytest
+from src.asset_fetch.candid_index import CandidMediaIndex, CandidSearchIndex, tokenize
+
+
+def write_file(root, relative_path, content=b"x" * 1024, mtime=None):
+    path = os.path.join(root, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / "candids"
+    old = time.time() - 100
+    for name in ["events/beach_sunset.png", "events/TeamOffsite2024.jpg", "ai_robot.jpg", "notes.txt"]:
+        write_file(str(root), name, mtime=old)
+    db_path = str(tmp_path / "index.db")
+    return str(root), db_path
+
+
+def test_refresh_is_incremental_and_persistent(library):
+    root, db_path = library
+    index = CandidMediaIndex(root, db_path=db_path, rescan_interval=0)
+    assert index.refresh() == {'added': 3, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    assert [m['relative_path'] for m in index.all()] == [
+        'ai_robot.jpg', os.path.join('events', 'TeamOffsite2024.jpg'), os.path.join('events', 'beach_sunset.png')
+    ]
+
+    write_file(root, "ai_robot.jpg", content=b"y" * 2048)
+    os.remove(os.path.join(root, "events", "beach_sunset.png"))
+    write_file(root, "podcast_episode.mp3")
+    assert index.refresh() == {'added': 1, 'updated': 1, 'removed': 1, 'unchanged': 1}
+    assert index.by_filename('ai_robot.jpg')['size_bytes'] == 2048
+    assert index.by_filename('beach_sunset.png') is None
+    index.close()
+
+    # A new process loads the records and has nothing to re-read
+    reopened = CandidMediaIndex(root, db_path=db_path, rescan_interval=0)
+    assert reopened.refresh() == {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 3}
+    assert reopened.by_filename('podcast_episode.mp3')['media_type'] == 'audio'
+    reopened.close()
+
+
+def test_rescans_are_throttled(library):
+    root, db_path = library
+    index = CandidMediaIndex(root, db_path=db_path, rescan_interval=60)
+    index.refresh()
+    write_file(root, "new_photo.jpg")
+    assert index.by_filename('new_photo.jpg') is None
+    assert index.refresh(force=True)['added'] == 1
+    assert index.by_filename('new_photo.jpg') is not None
+    index.close()
+
+
+def test_search_uses_tokens_camel_case_and_fuzzy_matches(library):
+    root, db_path = library
+    index = CandidMediaIndex(root, db_path=db_path)
+    assert index.best_match('team offsite')['filename'] == 'TeamOffsite2024.jpg'
+    assert index.best_match('beach sunst')['filename'] == 'beach_sunset.png'
+    assert index.best_match('beach_sunset.png')['filename'] == 'beach_sunset.png'
+    assert index.best_match('mountain lake') is None
+    index.close()
+
+
+def test_tokenize_strips_media_extensions_only():
+    assert tokenize('TeamOffsite2024.jpg') == ['team', 'offsite', '2024']
+    assert tokenize('release-v1.2') == ['release', 'v', '1', '2']
+
+
+def test_dedupe_drops_near_identical_images():
+    media = [
+        {'filename': 'launch_day.jpg', 'relative_path': 'launch_day.jpg', 'media_type': 'image', 'dhash': 'ffff0000ffff0000'},
+        {'filename': 'launch_day_copy.jpg', 'relative_path': 'launch_day_copy.jpg', 'media_type': 'image', 'dhash': 'ffff0000ffff0001'},
+        {'filename': 'launch_party.jpg', 'relative_path': 'launch_party.jpg', 'media_type': 'image', 'dhash': '0123456789abcdef'},
+    ]
+    index = CandidSearchIndex(media)
+    assert [r['filename'] for _, r in index.search('launch day')] == ['launch_day.jpg', 'launch_day_copy.jpg', 'launch_party.jpg']
+    assert [r['filename'] for _, r in index.search('launch day', dedupe=True)] == ['launch_day.jpg', 'launch_party.jpg']
+    assert [[r['filename'] for r in group] for group in index.duplicates()] == [['launch_day.jpg', 'launch_day_copy.jpg']]
@@ -0,0 +1,101 @@
+import sys
+import os
+import asyncio
+from contextlib import asynccontextmanager
+import httpx
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import src.asset_fetch.giphy as giphy
+
+
+def gif(gif_id, title, imported="2024-01-01 00:00:00", size="1000"):
+    return {
+        "id": gif_id,
+        "type": "gif",
+        "title": title,
+        "import_datetime": imported,
+        "images": {"original": {"url": f"https://media.giphy.com/{gif_id}.gif", "size": size}},
+    }
+
+
+RESULTS = {
+    "celebration": [gif("party", "Party Time"), gif("celebrate", "Team Celebration GIF")],
+    "happy dance": [gif("dance", "Cat on a keyboard", imported="2015-01-01 00:00:00")],
+    "broken": None,
+}
+
+
+@pytest.fixture
+def giphy_api(monkeypatch):
+    calls = []
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request):
+        term = request.url.params["q"]
+        calls.append((term, request.url.params["rating"], request.url.params["lang"]))
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.05)
+        in_flight["now"] -= 1
+        if term == "garbled":
+            return httpx.Response(200, text="<html>Service unavailable</html>")
+        if RESULTS.get(term) is None:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"data": RESULTS[term], "pagination": {}, "meta": {"status": 200}})
+
+    @asynccontextmanager
+    async def fake_client():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            yield client
+
+    monkeypatch.setenv("GIPHY_ASSET_TOKEN", "test-token")
+    monkeypatch.setattr(giphy, "pooled_async_client", fake_client)
+    giphy.get_giphy_search_cache().clear()
+    yield calls, in_flight
+    giphy.get_giphy_search_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_terms_are_searched_concurrently_and_best_title_wins(giphy_api):
+    calls, in_flight = giphy_api
+    result = await giphy.giphy_find_with_metadata_async(["celebration", "happy dance", "broken"])
+    assert in_flight["max"] == 3
+    assert result["valid_terms"] == ["celebration", "happy dance"]
+    assert result["result"]["gif"]["id"] == "celebrate"
+    assert result["result"]["term"] == "celebration"
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_per_term_rating_and_lang(giphy_api):
+    calls, _ = giphy_api
+    await giphy.giphy_find_with_metadata_async(["celebration"])
+    await giphy.giphy_find_with_metadata_async(["Celebration "])
+    assert calls == [("celebration", "g", "en")]
+    await giphy.giphy_find_with_metadata_async(["celebration"], rating="pg")
+    assert len(calls) == 2
+    # Failed searches are not cached
+    await giphy.giphy_find_with_metadata_async(["broken"])
+    await giphy.giphy_find_with_metadata_async(["broken"])
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_only_drops_that_term(giphy_api):
+    result = await giphy.giphy_find_with_metadata_async(["garbled", "celebration"])
+    assert result["valid_terms"] == ["celebration"]
+    assert result["result"]["term"] == "celebration"
+
+
+def test_score_gif_prefers_relevant_titles_and_penalizes_oversized():
+    relevant = giphy.score_gif(gif("a", "Happy Dance"), "happy dance", position=3)
+    unrelated = giphy.score_gif(gif("b", "Cat"), "happy dance", position=0)
+    assert relevant > unrelated
+    oversized = giphy.score_gif(gif("c", "Happy Dance", size=str(20 * 1024 * 1024)), "happy dance", position=3)
+    assert oversized < relevant
+
+
+@pytest.mark.asyncio
+async def test_missing_token_raises(monkeypatch):
+    monkeypatch.delenv("GIPHY_ASSET_TOKEN", raising=False)
+    with pytest.raises(ValueError):
+        await giphy.giphy_find_with_metadata_async(["celebration"])
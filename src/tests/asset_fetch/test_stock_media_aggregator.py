@@ -0,0 +1,139 @@
+import sys
+import os
+import asyncio
+from contextlib import asynccontextmanager
+import httpx
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import src.asset_fetch.stock_media_aggregator as stock
+
+
+def pexels_photo(photo_id, alt, width=4000, height=3000):
+    return {
+        "id": photo_id, "alt": alt, "width": width, "height": height, "url": f"https://pexels.com/photo/{photo_id}",
+        "photographer": "Ann", "src": {"original": f"https://images.pexels.com/{photo_id}.jpg", "medium": "m.jpg"},
+    }
+
+
+def pixabay_hit(hit_id, tags, width=1920, height=1280):
+    return {
+        "id": hit_id, "tags": tags, "imageWidth": width, "imageHeight": height, "user": "bob",
+        "pageURL": f"https://pixabay.com/{hit_id}", "largeImageURL": f"https://pixabay.com/{hit_id}.jpg",
+    }
+
+
+@pytest.fixture
+def stock_api(monkeypatch):
+    calls = []
+    in_flight = {"now": 0, "max": 0}
+    delays = {}
+
+    async def handler(request):
+        host = request.url.host
+        query = request.url.params.get("query") or request.url.params.get("q")
+        calls.append((host, query))
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        try:
+            await asyncio.sleep(delays.get(host, 0.05))
+        finally:
+            in_flight["now"] -= 1
+        if host == "api.pexels.com":
+            photos = {"remote work": [pexels_photo(2, "Remote work from a cafe"), pexels_photo(1, "Laptop on a desk")]}
+            return httpx.Response(200, json={"photos": photos.get(query, [])})
+        if host == "pixabay.com":
+            return httpx.Response(200, json={"hits": [pixabay_hit(10, "office, team")]},
+                                  headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"})
+        return httpx.Response(429, headers={"Retry-After": "120"})
+
+    @asynccontextmanager
+    async def fake_client():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            yield client
+
+    for env_var in ("PEXELS_API_KEY", "PIXABAY_API_KEY", "UNSPLASH_ACCESS_KEY"):
+        monkeypatch.setenv(env_var, "test-key")
+    for env_var in ("SHUTTERSTOCK_API_KEY", "SHUTTERSTOCK_API_SECRET", "SHUTTERSTOCK_API_TOKEN"):
+        monkeypatch.delenv(env_var, raising=False)
+    monkeypatch.delenv("ADOBE_STOCK_API_KEY", raising=False)
+    monkeypatch.setattr(stock, "pooled_async_client", fake_client)
+    aggregator = stock.StockMediaAggregator(providers=["pexels", "pixabay", "unsplash"], latency_budget=1.0)
+    return aggregator, calls, in_flight, delays
+
+
+@pytest.mark.asyncio
+async def test_all_providers_and_tags_are_searched_concurrently(stock_api):
+    aggregator, calls, in_flight, _ = stock_api
+    results = await aggregator.search(["remote work", "office"])
+    assert in_flight["max"] == 6
+    assert {host for host, _ in calls} == {"api.pexels.com", "pixabay.com", "api.unsplash.com"}
+    best = results[0]
+    assert (best.provider, best.id) == ("pexels", "2")
+    assert best.url == "https://images.pexels.com/2.jpg"
+    # The pixabay photo was returned for both tags but only appears once
+    assert [record.key for record in results].count(("pixabay", "10")) == 1
+    assert sorted(next(r for r in results if r.provider == "pixabay").matched_queries) == ["office", "remote work"]
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_and_rate_limited_providers_are_skipped(stock_api):
+    aggregator, calls, _, _ = stock_api
+    await aggregator.search(["remote work"])
+    assert len(calls) == 3
+    await aggregator.search(["Remote Work "])
+    # Pexels and pixabay come from the cache; unsplash answered 429 and is backing off
+    assert len(calls) == 3
+    await aggregator.search(["office"])
+    # Pixabay reported no remaining requests, so only pexels is asked
+    assert calls[3:] == [("api.pexels.com", "office")]
+
+
+@pytest.mark.asyncio
+async def test_slow_providers_are_cut_off_by_the_latency_budget(stock_api):
+    aggregator, _, _, delays = stock_api
+    delays["api.pexels.com"] = 5
+    aggregator.latency_budget = 0.3
+    started = asyncio.get_running_loop().time()
+    results = await aggregator.search(["remote work"])
+    assert asyncio.get_running_loop().time() - started < 1
+    assert {record.provider for record in results} == {"pixabay"}
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_counts_as_no_results(stock_api, monkeypatch):
+    aggregator, _, _, _ = stock_api
+
+    @asynccontextmanager
+    async def garbled_client():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text="<html>maintenance</html>"))
+        async with httpx.AsyncClient(transport=transport) as client:
+            yield client
+
+    monkeypatch.setattr(stock, "pooled_async_client", garbled_client)
+    assert await aggregator.search(["remote work"]) == []
+
+
+def test_shutterstock_uses_basic_auth_or_an_oauth_token(monkeypatch):
+    import base64
+    shutterstock = stock.STOCK_PROVIDERS["shutterstock"]
+    for env_var in ("SHUTTERSTOCK_API_KEY", "SHUTTERSTOCK_API_SECRET", "SHUTTERSTOCK_API_TOKEN"):
+        monkeypatch.delenv(env_var, raising=False)
+    monkeypatch.setenv("SHUTTERSTOCK_API_KEY", "key")
+    # A key without its secret cannot authenticate, so the provider counts as not set up
+    assert shutterstock.credential() is None
+
+    monkeypatch.setenv("SHUTTERSTOCK_API_SECRET", "secret")
+    _, headers = shutterstock.build_request("office", 5, shutterstock.credential())
+    assert headers["Authorization"] == "Basic " + base64.b64encode(b"key:secret").decode()
+
+    monkeypatch.setenv("SHUTTERSTOCK_API_TOKEN", "oauth-token")
+    _, headers = shutterstock.build_request("office", 5, shutterstock.credential())
+    assert headers["Authorization"] == "Bearer oauth-token"
+
+
+def test_score_prefers_relevant_high_resolution_media():
+    relevant = stock.normalize_pexels(pexels_photo(1, "Remote work setup", width=3000, height=2000))
+    small = stock.normalize_pexels(pexels_photo(2, "Remote work setup", width=300, height=200))
+    unrelated = stock.normalize_pexels(pexels_photo(3, "Mountain lake", width=3000, height=2000))
+    assert stock.score_media(relevant, "remote work") > stock.score_media(small, "remote work")
+    assert stock.score_media(relevant, "remote work") > stock.score_media(unrelated, "remote work")
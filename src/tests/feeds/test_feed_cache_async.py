@@ -0,0 +1,105 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import httpx
+import pytest
+from utils.helpers.feed_cache_helper import FeedValidatorStore, fetch_feed_conditional_async
+
+FEED_URL = "https://example.com/feed"
+FEED_BODY = b"<rss><channel><item><guid>1</guid></item></channel></rss>"
+
+
+def make_client(seen_headers):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            content=FEED_BODY,
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 10:00:00 GMT"},
+        )
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_not_modified_feed_skips_parsing(tmp_path):
+    store = FeedValidatorStore(str(tmp_path / "feed_cache.json"))
+    parse_calls = []
+
+    def parse_blogs(content):
+        parse_calls.append(content)
+        return [{"id": "1"}]
+
+    seen_headers = []
+    async with make_client(seen_headers) as client:
+        first = await fetch_feed_conditional_async(client, FEED_URL, parse_blogs, store=store)
+        second = await fetch_feed_conditional_async(client, FEED_URL, parse_blogs, store=store)
+
+    assert first == second == [{"id": "1"}]
+    assert len(parse_calls) == 1
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+    assert seen_headers[1]["if-modified-since"] == "Mon, 01 Jan 2024 10:00:00 GMT"
+
+
+@pytest.mark.asyncio
+async def test_cache_file_keeps_validators_and_metadata_without_html(tmp_path):
+    path = str(tmp_path / "feed_cache.json")
+    blogs = [{"id": "1", "title": "Hello", "content": "<p>" + "x" * 5000 + "</p>", "summary": "<p>x</p>"}]
+    seen_headers = []
+    async with make_client(seen_headers) as client:
+        await fetch_feed_conditional_async(client, FEED_URL, lambda c: blogs, store=FeedValidatorStore(path))
+
+    with open(path, encoding="utf-8") as f:
+        assert "<p>" not in f.read()
+    assert sorted(os.listdir(tmp_path)) == ["feed_cache.json"]
+
+    reloaded = FeedValidatorStore(path)
+    metadata = reloaded.get_metadata(FEED_URL)
+    assert metadata["etag"] == '"v1"'
+    assert metadata["blogs"] == [{"id": "1", "title": "Hello"}]
+    assert reloaded.get_blogs(FEED_URL) is None
+
+
+@pytest.mark.asyncio
+async def test_cold_start_sends_persisted_validators_and_refetches_after_304(tmp_path):
+    path = str(tmp_path / "feed_cache.json")
+    seen_headers = []
+    async with make_client(seen_headers) as client:
+        await fetch_feed_conditional_async(client, FEED_URL, lambda c: [{"id": "1"}], store=FeedValidatorStore(path))
+
+    # A new process only has the file: it still asks conditionally, and a 304 it cannot
+    # answer from memory is followed by exactly one plain request
+    reloaded = FeedValidatorStore(path)
+    assert reloaded.conditional_headers(FEED_URL) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 10:00:00 GMT",
+    }
+    seen_headers.clear()
+    parse_calls = []
+    async with make_client(seen_headers) as client:
+        blogs = await fetch_feed_conditional_async(
+            client, FEED_URL, lambda c: parse_calls.append(c) or [{"id": "1"}], store=reloaded
+        )
+    assert blogs == [{"id": "1"}]
+    assert len(parse_calls) == 1
+    assert len(seen_headers) == 2
+    assert seen_headers[0]["if-none-match"] == '"v1"'
+    assert "if-none-match" not in seen_headers[1]
+    assert reloaded.get_blogs(FEED_URL) == [{"id": "1"}]
+
+
+@pytest.mark.asyncio
+async def test_identical_body_without_validators_is_not_reparsed(tmp_path):
+    store = FeedValidatorStore(str(tmp_path / "feed_cache.json"))
+    parse_calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=FEED_BODY)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        for _ in range(3):
+            await fetch_feed_conditional_async(
+                client, FEED_URL, lambda c: parse_calls.append(c) or [{"id": "1"}], store=store
+            )
+    assert len(parse_calls) == 1
@@ -0,0 +1,138 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import time
+import httpx
+import pytest
+from utils.helpers.feed_cache_helper import FeedValidatorStore
+from rss_feed.feed_fetcher import (
+    FeedSource,
+    build_feed_sources,
+    fetch_all_feeds,
+    fetch_latest_blog_concurrently,
+    merge_feed_results,
+)
+
+
+def make_rss(items):
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{guid}</link>"
+        f"<guid>{guid}</guid><pubDate>{pub}</pubDate>"
+        f"<description>&lt;p&gt;{title}&lt;/p&gt;</description></item>"
+        for guid, title, pub in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{body}</channel></rss>'.encode()
+
+
+FEEDS = {
+    "https://medium.com/feed/@alice": make_rss([("m1", "Medium One", "Mon, 01 Jan 2024 10:00:00 GMT")]),
+    "https://medium.com/feed/@bob": make_rss([("m2", "Medium Two", "Tue, 02 Jan 2024 10:00:00 GMT")]),
+    "https://wix.example.com/blog-feed.xml": make_rss([("w1", "Wix One", "Wed, 03 Jan 2024 10:00:00 GMT")]),
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeedValidatorStore(str(tmp_path / "feed_cache.json"))
+
+
+def make_client(delay: float = 0.0, fail_urls=()):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        url = str(request.url)
+        if url in fail_urls or url not in FEEDS:
+            return httpx.Response(500)
+        return httpx.Response(200, content=FEEDS[url])
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_build_feed_sources_accepts_lists_in_priority_order():
+    sources = build_feed_sources(
+        {"medium_username": ["alice", "bob"], "wix_url": "https://wix.example.com", "wordpress_url": None},
+        {"timeouts": {"Wix": 3}},
+    )
+    assert [s.platform for s in sources] == ["Medium", "Medium", "Wix"]
+    assert sources[1].feed_url == "https://medium.com/feed/@bob"
+    assert sources[2].timeout == 3.0
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_feeds_runs_concurrently(store):
+    sources = build_feed_sources(
+        {"medium_username": ["alice", "bob"], "wix_url": "https://wix.example.com"}
+    )
+    async with make_client(delay=0.2) as client:
+        start = time.perf_counter()
+        results = await fetch_all_feeds(sources, max_concurrency=8, client=client, store=store)
+        elapsed = time.perf_counter() - start
+    assert [r.error for r in results] == [None, None, None]
+    # Three 0.2s feeds fetched together should take roughly one feed's time, not three
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_merge_prefers_highest_priority_platform_and_newest_entry(store):
+    sources = build_feed_sources(
+        {"medium_username": ["alice", "bob"], "wix_url": "https://wix.example.com"}
+    )
+    async with make_client() as client:
+        results = await fetch_all_feeds(sources, client=client, store=store)
+    platform, blogs = merge_feed_results(results)
+    assert platform == "Medium"
+    assert [b["id"] for b in blogs] == ["m2", "m1"]
+
+
+@pytest.mark.asyncio
+async def test_failed_medium_falls_back_to_wix(store):
+    async with make_client(fail_urls={"https://medium.com/feed/@alice"}) as client:
+        result = await fetch_latest_blog_concurrently(
+            {"medium_username": "alice", "wix_url": "https://wix.example.com"}, client=client, store=store
+        )
+    assert result["platform"] == "Wix"
+    assert result["latest_blog"]["id"] == "w1"
+    assert result["latest_blog_direct_link"] == "https://example.com/w1"
+
+
+@pytest.mark.asyncio
+async def test_per_source_timeout_is_reported(store):
+    source = FeedSource(
+        platform="Medium",
+        identifier="alice",
+        feed_url="https://medium.com/feed/@alice",
+        priority=0,
+        order=0,
+        timeout=0.05,
+    )
+    async with make_client(delay=0.5) as client:
+        results = await fetch_all_feeds([source], client=client, store=store)
+    assert results[0].blogs == []
+    assert "Timed out" in results[0].error
+
+
+@pytest.fixture
+def prompt_sources(monkeypatch):
+    from src.utils.helpers.prompt import prompt_sources
+    latest = {"id": "m2", "content": "<p>Medium Two</p>", "link": "https://example.com/m2"}
+
+    async def fake_fetch(user_profile, fetch_config):
+        return {"platform": "Medium", "all_blogs": [latest], "latest_blog": latest}
+
+    monkeypatch.setattr(prompt_sources, "fetch_latest_blog_concurrently", fake_fetch)
+    return prompt_sources
+
+
+def test_latest_blog_matching_blog_cache_is_skipped(prompt_sources, tmp_path, monkeypatch):
+    from utils.helpers.blog_rss_helper import BlogCache
+    cache = BlogCache(str(tmp_path / "blog_cache.json"))
+    monkeypatch.setattr(prompt_sources, "get_blog_cache", lambda: cache)
+
+    assert prompt_sources.fetch_and_parse_blog()["id"] == "m2"
+    cache.save({"blogs": [{"id": "m2"}]})
+    assert prompt_sources.fetch_and_parse_blog() is None
+
+
+@pytest.mark.asyncio
+async def test_sync_fetch_and_parse_blog_refuses_a_running_loop(prompt_sources):
+    with pytest.raises(RuntimeError, match="fetch_and_parse_blog_async"):
+        prompt_sources.fetch_and_parse_blog()
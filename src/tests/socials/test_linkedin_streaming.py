@@ -0,0 +1,136 @@
+import sys
+import os
+import io
+import importlib
+import pytest
+import requests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+MEDIA = bytes(range(256)) * 40  # 10 KB
+
+
+def make_response(status=200, body=b"", headers=None, json_body=None):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(body if json_body is None else __import__("json").dumps(json_body).encode())
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeLinkedIn:
+    """Serves the media download and the LinkedIn asset endpoints."""
+
+    def __init__(self, multipart_parts=0, failing_parts=(), honor_range=True):
+        self.multipart_parts = multipart_parts
+        self.failing_parts = set(failing_parts)
+        self.honor_range = honor_range
+        self.uploaded = {}
+        self.largest_read = 0
+        self.registered = None
+        self.completed = None
+        self.downloads = []
+        self.open_at_registration = None
+
+    def get(self, url, stream=False, headers=None, **kwargs):
+        byte_range = (headers or {}).get("Range")
+        if byte_range and self.honor_range:
+            first, last = (int(value) for value in byte_range[len("bytes="):].split("-"))
+            response = make_response(206, MEDIA[first:last + 1], {"Content-Length": str(last - first + 1)})
+        else:
+            response = make_response(200, MEDIA, {"Content-Length": str(len(MEDIA))})
+        self.downloads.append((byte_range, response))
+        return response
+
+    def post(self, url, headers=None, json=None, **kwargs):
+        if "registerUpload" in url:
+            self.registered = json["registerUploadRequest"]
+            self.open_at_registration = [r for _, r in self.downloads if not r.raw.closed]
+            if self.multipart_parts:
+                part_size = -(-len(MEDIA) // self.multipart_parts)
+                parts = [
+                    {"url": f"https://upload.test/part/{i}",
+                     "byteRange": {"firstByte": i * part_size, "lastByte": min(len(MEDIA), (i + 1) * part_size) - 1},
+                     "headers": {"Content-Type": "application/octet-stream"}}
+                    for i in reversed(range(self.multipart_parts))
+                ]
+                mechanism = {"com.linkedin.digitalmedia.uploading.MultipartUpload": {"partUploadRequests": parts, "metadata": "meta"}}
+            else:
+                mechanism = {"com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {"uploadUrl": "https://upload.test/single"}}
+            value = {"asset": "urn:li:digitalmediaAsset:1", "mediaArtifact": "urn:li:artifact:1", "uploadMechanism": mechanism}
+            return make_response(json_body={"value": value})
+        if "completeMultiPartUpload" in url:
+            self.completed = json["completeMultipartUploadRequest"]
+            return make_response(200)
+        raise AssertionError(url)
+
+    def request(self, method, url, data=None, **kwargs):
+        if hasattr(data, "read"):
+            assert len(data) == len(MEDIA)
+            body = bytearray()
+            while True:
+                block = data.read(1024)
+                if not block:
+                    break
+                self.largest_read = max(self.largest_read, len(block))
+                body += block
+            data = bytes(body)
+        if url in self.failing_parts:
+            self.failing_parts.discard(url)
+            return make_response(503)
+        self.uploaded[url] = data
+        return make_response(201 if method == "POST" else 200, headers={"ETag": f"etag-{url[-1]}"})
+
+
+@pytest.fixture
+def linkedin(monkeypatch):
+    monkeypatch.setenv("LINKEDIN_ACCESS_TOKEN", "test-token")
+    module = importlib.import_module("src.socials.linkedin_bot")
+    monkeypatch.setattr("src.utils.helpers.media_stream_helper.time.sleep", lambda seconds: None)
+    return module
+
+
+def test_image_is_streamed_to_a_single_upload(linkedin, monkeypatch):
+    fake = FakeLinkedIn()
+    monkeypatch.setattr(linkedin, "session", fake)
+    assert linkedin.upload_linkedin_media("123", "https://cdn.test/cat.jpg", "IMAGE") == "urn:li:digitalmediaAsset:1"
+    assert fake.uploaded["https://upload.test/single"] == MEDIA
+    assert fake.largest_read <= 1024
+    assert "supportedUploadMechanism" not in fake.registered
+    # The size probe is closed before registerUpload; the upload downloads the media again
+    assert fake.open_at_registration == []
+    assert len(fake.downloads) == 2
+
+
+def test_large_video_uses_multipart_and_retries_failed_parts(linkedin, monkeypatch):
+    fake = FakeLinkedIn(multipart_parts=3, failing_parts={"https://upload.test/part/1"})
+    monkeypatch.setattr(linkedin, "session", fake)
+    monkeypatch.setattr(linkedin, "LINKEDIN_MULTIPART_THRESHOLD_BYTES", 1024)
+    assert linkedin.upload_linkedin_media("123", "https://cdn.test/talk.mp4", "VIDEO") == "urn:li:digitalmediaAsset:1"
+    assert fake.registered["supportedUploadMechanism"] == ["MULTIPART_UPLOAD"]
+    assert fake.registered["fileSize"] == len(MEDIA)
+    assert b"".join(fake.uploaded[f"https://upload.test/part/{i}"] for i in range(3)) == MEDIA
+    assert fake.open_at_registration == []
+    # One size probe, then one Range request per part; the retried part reuses its bytes
+    part_size = -(-len(MEDIA) // 3)
+    assert [byte_range for byte_range, _ in fake.downloads] == [
+        None,
+        f"bytes=0-{part_size - 1}",
+        f"bytes={part_size}-{2 * part_size - 1}",
+        f"bytes={2 * part_size}-{len(MEDIA) - 1}",
+    ]
+    assert [part["headers"]["ETag"] for part in fake.completed["partUploadResponses"]] == ["etag-0", "etag-1", "etag-2"]
+    assert fake.completed["metadata"] == "meta"
+
+
+def test_multipart_reads_one_download_in_order_when_range_is_ignored(linkedin, monkeypatch):
+    fake = FakeLinkedIn(multipart_parts=4, honor_range=False)
+    monkeypatch.setattr(linkedin, "session", fake)
+    monkeypatch.setattr(linkedin, "LINKEDIN_MULTIPART_THRESHOLD_BYTES", 1024)
+    assert linkedin.upload_linkedin_media("123", "https://cdn.test/talk.mp4", "VIDEO") == "urn:li:digitalmediaAsset:1"
+    assert b"".join(fake.uploaded[f"https://upload.test/part/{i}"] for i in range(4)) == MEDIA
+    assert len(fake.downloads) == 2
+    assert all(response.raw.closed for _, response in fake.downloads)
+
+
+def test_invalid_media_type_is_rejected(linkedin):
+    assert linkedin.upload_linkedin_media("123", "https://cdn.test/doc.pdf", "PDF") is None
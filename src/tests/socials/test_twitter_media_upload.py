@@ -0,0 +1,100 @@
+import sys
+import os
+import io
+import json
+import threading
+import pytest
+import requests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import src.socials.twitter_bot as twitter_bot
+
+SEGMENT = 1024
+MEDIA = bytes(range(256)) * 20  # 5 KB -> 5 segments
+
+
+def make_response(status=200, body=b"", headers=None, json_body=None):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(body if json_body is None else json.dumps(json_body).encode())
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeTwitter:
+    def __init__(self, content_type="video/mp4"):
+        self.content_type = content_type
+        # segment_index -> number of APPEND attempts that fail with a 503
+        self.failures = {}
+        self.segments = {}
+        self.commands = []
+        self.downloads = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.status_checks = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, **kwargs):
+        if params and params.get("command") == "STATUS":
+            self.status_checks += 1
+            return make_response(json_body={"media_id_string": "42", "processing_info": {"state": "succeeded"}})
+        self.downloads += 1
+        return make_response(200, MEDIA, {"Content-Length": str(len(MEDIA)), "Content-Type": self.content_type})
+
+    def post(self, url, data=None, **kwargs):
+        self.commands.append(data)
+        if data["command"] == "INIT":
+            return make_response(202, json_body={"media_id_string": "42"})
+        if data["command"] == "FINALIZE":
+            processing = {"state": "pending", "check_after_secs": 0} if self.content_type.startswith("video/") else None
+            return make_response(json_body={"media_id_string": "42", "expires_after_secs": 86400, "processing_info": processing})
+        raise AssertionError(data)
+
+    def request(self, method, url, data=None, files=None, **kwargs):
+        assert data["command"] == "APPEND"
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        threading.Event().wait(0.02)
+        with self._lock:
+            self.in_flight -= 1
+            if self.failures.get(data["segment_index"]):
+                self.failures[data["segment_index"]] -= 1
+                return make_response(503)
+            self.segments[data["segment_index"]] = files["media"]
+        return make_response(204)
+
+
+@pytest.fixture
+def fake_twitter(monkeypatch):
+    fake = FakeTwitter()
+    monkeypatch.setattr(twitter_bot, "session", fake)
+    monkeypatch.setattr(twitter_bot, "TWITTER_SEGMENT_BYTES", SEGMENT)
+    monkeypatch.setattr("src.utils.helpers.media_stream_helper.time.sleep", lambda seconds: None)
+    twitter_bot.get_twitter_media_cache().clear()
+    yield fake
+    twitter_bot.get_twitter_media_cache().clear()
+
+
+def test_chunked_upload_appends_segments_concurrently(fake_twitter):
+    fake_twitter.failures = {2: 1}
+    assert twitter_bot.upload_media_from_url("https://cdn.test/clip.mp4") == "42"
+    init = fake_twitter.commands[0]
+    assert init == {"command": "INIT", "total_bytes": len(MEDIA), "media_type": "video/mp4", "media_category": "tweet_video"}
+    assert fake_twitter.commands[-1] == {"command": "FINALIZE", "media_id": "42"}
+    assert b"".join(fake_twitter.segments[i] for i in range(5)) == MEDIA
+    assert 1 < fake_twitter.max_in_flight <= twitter_bot.TWITTER_APPEND_CONCURRENCY
+    assert fake_twitter.status_checks == 1
+
+
+def test_uploaded_media_ids_are_reused(fake_twitter):
+    assert twitter_bot.upload_media_from_url("https://cdn.test/clip.mp4") == "42"
+    assert twitter_bot.upload_media_from_url("https://cdn.test/clip.mp4") == "42"
+    assert fake_twitter.downloads == 1
+
+
+def test_gif_category_and_failed_append_is_not_cached(fake_twitter):
+    fake_twitter.content_type = "image/gif"
+    fake_twitter.failures = {1: 3}
+    assert twitter_bot.upload_media_from_url("https://cdn.test/party.gif") is None
+    assert fake_twitter.commands[0]["media_category"] == "tweet_gif"
+    assert twitter_bot.get_twitter_media_cache().get("https://cdn.test/party.gif") is None
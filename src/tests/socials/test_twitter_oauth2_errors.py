@@ -12,7 +12,7 @@ from socials.twitter_bot import get_oauth2_token, post_tweet_with_oauth2, post_t
 class TestTwitterOAuth2Errors(unittest.TestCase):
     """Test cases for verifying Twitter OAuth2 error handling and failure modes."""
     
-    @patch('socials.twitter_bot.requests.post')
+    @patch('socials.twitter_bot.session.post')
     def test_oauth2_token_failure(self, mock_post):
         """Test that get_oauth2_token fails properly with invalid credentials."""
         # Mock the response for an authentication failure
@@ -45,7 +45,7 @@ class TestTwitterOAuth2Errors(unittest.TestCase):
                 # self.fail("OAuth2 authentication failed as expected")
     
     @patch('socials.twitter_bot.get_oauth2_token')
-    @patch('socials.twitter_bot.requests.post')
+    @patch('socials.twitter_bot.session.post')
     def test_post_tweet_with_invalid_oauth2_token(self, mock_post, mock_get_token):
         """Test posting a tweet with an invalid OAuth2 token."""
         # Mock OAuth2 token retrieval to succeed but API call to fail
@@ -105,7 +105,7 @@ class TestTwitterOAuth2Errors(unittest.TestCase):
             print("\n\n🟡 OAUTH2 FALLBACK: Successfully fell back to OAuth1 when OAuth2 failed")
             print("This demonstrates the correct fallback behavior in the application")
     
-    @patch('socials.twitter_bot.requests.post')
+    @patch('socials.twitter_bot.session.post')
     def test_free_tier_permissions_error_failure(self, mock_post):
         """Test that demonstrates a Twitter API free tier limitation failure."""
         # First mock call for OAuth2 token
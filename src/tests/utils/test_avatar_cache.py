@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.helpers import avatar_cache_helper
+from utils.helpers.avatar_cache_helper import AvatarCache, resolve_avatar
+
+
+def test_avatar_is_scraped_once_and_persisted(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        avatar_cache_helper, "fetch_og_image", lambda url, platform="": calls.append(url) or "https://img/avatar.png"
+    )
+    path = str(tmp_path / "avatar_cache.json")
+    cache = AvatarCache(path)
+
+    for _ in range(3):
+        assert resolve_avatar("Medium", "alice", "https://medium.com/@alice", "default", cache) == "https://img/avatar.png"
+    assert calls == ["https://medium.com/@alice"]
+
+    # A fresh process reads the persisted entry instead of scraping again
+    assert resolve_avatar("Medium", "ALICE", "https://medium.com/@alice", "default", AvatarCache(path)) == "https://img/avatar.png"
+    assert len(calls) == 1
+
+
+def test_failed_lookup_returns_default_and_expires(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(avatar_cache_helper, "fetch_og_image", lambda url, platform="": calls.append(url) or None)
+    cache = AvatarCache(str(tmp_path / "avatar_cache.json"), failure_ttl=0)
+
+    assert resolve_avatar("Wix", "https://site.example/", "https://site.example/", "default", cache) == "default"
+    assert cache.lookup(AvatarCache.make_key("Wix", "https://site.example")) is None
+    resolve_avatar("Wix", "https://site.example", "https://site.example", "default", cache)
+    assert len(calls) == 2
+
+
+def test_persisted_entries_keep_their_original_expiry(tmp_path):
+    import json
+    import time
+    path = tmp_path / "avatar_cache.json"
+    now = time.time()
+    path.write_text(json.dumps({
+        "medium:fresh": {"url": "https://img/fresh.png", "fetched_at": now - 60},
+        "medium:stale": {"url": "https://img/stale.png", "fetched_at": now - 120},
+    }))
+    cache = AvatarCache(str(path), ttl=90)
+    assert cache.lookup("medium:fresh")["url"] == "https://img/fresh.png"
+    assert cache.lookup("medium:stale") is None
+
+    cache.store("medium:new", "https://img/new.png")
+    assert set(json.loads(path.read_text())) == {"medium:fresh", "medium:new"}
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from src.utils.helpers import post_cache_helper
+from src.utils.helpers.post_history_store import PostHistoryStore
+from src.utils.prompt_builder import select_unposted_blogs
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    history = PostHistoryStore(str(tmp_path / "post_history.db"), legacy_json_path=str(tmp_path / "none.json"))
+    monkeypatch.setattr(post_cache_helper, "get_post_history_store", lambda: history)
+    return history
+
+
+def test_unposted_ids_keep_feed_order(store):
+    store.add_post("linkedin", "posted", "b2")
+    store.add_post("twitter", "other platform", "b3")
+    assert post_cache_helper.get_unposted_blog_ids(["b1", "b2", "b3", None]) == ["b1", "b3"]
+    assert post_cache_helper.get_unposted_blog_ids(["b1", "b3"], platform="twitter") == ["b1"]
+
+
+def test_select_unposted_blogs_caps_newest_first(store):
+    store.add_post("linkedin", "posted", "b4")
+    feed = [{"id": f"b{i}"} for i in range(5, 0, -1)]
+    assert [b["id"] for b in select_unposted_blogs(feed)] == ["b5", "b3", "b2", "b1"]
+    assert [b["id"] for b in select_unposted_blogs(feed, 2)] == ["b5", "b3"]
+    assert select_unposted_blogs(feed, 0) == []
+
+
+@pytest.mark.asyncio
+async def test_async_init_fills_the_run_context(store, monkeypatch):
+    from src.utils import prompt_builder
+    from src.utils.helpers.prompt.prompt_globals import get_prompt_globals
+    from src.utils.helpers.prompt.run_context import RunContext, use_run_context
+
+    seen_configs = []
+
+    async def fake_fetch(run_config=None):
+        seen_configs.append(run_config)
+        return [{"id": "b2", "content": "<p>new</p>"}, {"id": "b1", "content": "<p>old</p>"}]
+
+    async def fake_build(blog_data, run_config=None):
+        seen_configs.append(run_config)
+        return {"prompt": f"prompt for {blog_data['id']}", "raw_blog": blog_data["raw"]}
+
+    monkeypatch.setattr(prompt_builder, "fetch_feed_blogs_async", fake_fetch)
+    monkeypatch.setattr(prompt_builder, "build_prompt_state_async", fake_build)
+    run_config = {"user_profile": {"medium_username": "override"}}
+    context = RunContext(config=run_config)
+    with use_run_context(context):
+        assert await prompt_builder.init_globals_if_needed_async() is True
+        assert get_prompt_globals()["prompt"] == "prompt for b2"
+    assert context.blog_id == "b2"
+    assert seen_configs == [run_config, run_config]
+
+    store.add_post("linkedin", "posted", "b2")
+    with use_run_context(RunContext()):
+        assert await prompt_builder.init_globals_if_needed_async() is False
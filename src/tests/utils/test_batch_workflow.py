@@ -0,0 +1,65 @@
+import sys
+import os
+import asyncio
+import importlib
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+    monkeypatch.setenv("LINKEDIN_ACCESS_TOKEN", "test-token")
+    return importlib.import_module("src.utils.workflow")
+
+
+@pytest.fixture
+def linkedin_utils(workflow):
+    return importlib.import_module("src.socials.utils.linkedin_utils")
+
+
+@pytest.fixture
+def batch(workflow, monkeypatch):
+    feed = [{"id": f"b{i}"} for i in range(3, 0, -1)]
+    published = []
+
+    async def fake_fetch():
+        return feed
+
+    async def fake_generate(blog_json, text_model, semaphore):
+        # The newest blog finishes generating first
+        await asyncio.sleep({"b3": 0, "b2": 0.02, "b1": 0.04}[blog_json["id"]])
+        return {"blog_id": blog_json["id"], "status": "generated", "error": None,
+                "post": (f"post {blog_json['id']}", None, None)}
+
+    def fake_publish(post_text, media_url, media_type, profile_id, blog_id):
+        published.append(blog_id)
+        return blog_id != "b2"
+
+    monkeypatch.setattr(workflow, "fetch_feed_blogs_async", fake_fetch)
+    monkeypatch.setattr(workflow, "select_unposted_blogs", lambda blogs, limit: blogs[:limit])
+    monkeypatch.setattr(workflow, "get_linkedin_profile_id_or_fail", lambda: "profile")
+    monkeypatch.setattr(workflow, "generate_post_for_batch", fake_generate)
+    monkeypatch.setattr(workflow, "post_to_linkedin_if_possible", fake_publish)
+    return published
+
+
+@pytest.mark.asyncio
+async def test_batch_publishes_oldest_first_and_reports_failures(workflow, batch):
+    results = await workflow.run_batch_rss_to_social_workflow(max_posts=3, max_concurrency=3)
+    assert batch == ["b1", "b2", "b3"]
+    assert [(r["blog_id"], r["status"]) for r in results] == [("b1", "posted"), ("b2", "failed"), ("b3", "posted")]
+
+
+def test_text_only_posts_are_recorded(linkedin_utils, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(linkedin_utils, "add_linkedin_post", lambda **kwargs: recorded.append(kwargs))
+    assert linkedin_utils.post_to_linkedin_if_possible("hello", None, None, "profile", "b1") is True
+    assert recorded[0]["blog_id"] == "b1" and recorded[0]["media_url"] is None
+
+
+def test_failed_publish_returns_false(linkedin_utils, monkeypatch):
+    def fail(**kwargs):
+        raise RuntimeError("history unavailable")
+
+    monkeypatch.setattr(linkedin_utils, "add_linkedin_post", fail)
+    assert linkedin_utils.post_to_linkedin_if_possible("hello", "https://x/y.gif", "GIF", "profile", "b1") is False
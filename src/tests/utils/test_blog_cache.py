@@ -0,0 +1,41 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.helpers import blog_rss_helper
+from utils.helpers.blog_rss_helper import BlogCache
+
+
+def test_blog_cache_parses_once_until_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "blog_cache.json"
+    path.write_text(json.dumps({"blogs": [{"id": "a"}]}))
+    cache = BlogCache(str(path))
+
+    loads = []
+    real_load = blog_rss_helper.json.load
+    monkeypatch.setattr(blog_rss_helper.json, "load", lambda f: loads.append(1) or real_load(f))
+
+    assert cache.is_valid()
+    assert cache.latest_blog_id() == "a"
+    assert cache.get() == {"blogs": [{"id": "a"}]}
+    assert len(loads) == 1
+
+    path.write_text(json.dumps({"blogs": [{"id": "b"}, {"id": "a"}]}))
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+    assert cache.latest_blog_id() == "b"
+    assert len(loads) == 2
+
+
+def test_blog_cache_validates_structure_and_save_stays_in_sync(tmp_path):
+    path = tmp_path / "blog_cache.json"
+    cache = BlogCache(str(path))
+    assert cache.get() == [] and not cache.is_valid()
+
+    path.write_text(json.dumps({"blogs": [{"title": "no id"}]}))
+    assert not cache.is_valid()
+    assert cache.latest_blog_id() is None
+
+    cache.save({"blogs": [{"id": "c"}]})
+    assert cache.is_valid() and cache.latest_blog_id() == "c"
+    assert json.loads(path.read_text()) == {"blogs": [{"id": "c"}]}
+    assert cache.delete() and not path.exists()
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from src.utils.config.config_provider import ModularYamlConfigProvider
+from src.utils.config.config_service import ConfigService, build_config_service
+
+
+def write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    write(tmp_path / "01_base.yaml", "user_profile:\n  medium_username: codingoni\n  wix_url: ''\n", 1_000)
+    write(tmp_path / "02_ai.yaml", "ai:\n  text:\n    LLM: OpenAI\n", 1_000)
+    return tmp_path
+
+
+def counting_service(config_dir):
+    provider = ModularYamlConfigProvider(str(config_dir))
+    loads = []
+    original = provider.get_config
+    def get_config():
+        loads.append(1)
+        return original()
+    provider.get_config = get_config
+    return build_config_service(provider, check_interval=0), loads
+
+
+def test_loads_once_until_a_file_changes(config_dir):
+    service, loads = counting_service(config_dir)
+    config = service.get_config()
+    assert config["user_profile"]["medium_username"] == "codingoni"
+    for _ in range(5):
+        assert service.get_config() is config
+    assert len(loads) == 1
+
+    write(config_dir / "02_ai.yaml", "ai:\n  text:\n    LLM: Claude\n", 2_000)
+    reloaded = service.get_config()
+    # A reload swaps in a new snapshot; the one a reader already holds never changes
+    assert reloaded is not config
+    assert config["ai"]["text"]["LLM"] == "OpenAI"
+    assert reloaded["ai"]["text"]["LLM"] == "Claude"
+    assert len(loads) == 2
+    assert service.get_versioned_config() == (reloaded, 2)
+
+
+def test_added_and_removed_files_trigger_reload(config_dir):
+    service, _ = counting_service(config_dir)
+    config = service.get_config()
+    write(config_dir / "03_extra.yaml", "batch_posting:\n  enabled: true\n", 3_000)
+    os.utime(config_dir, (3_000, 3_000))
+    assert service.get_config()["batch_posting"]["enabled"] is True
+    os.remove(config_dir / "03_extra.yaml")
+    os.utime(config_dir, (4_000, 4_000))
+    assert "batch_posting" not in service.get_config()
+    assert "batch_posting" not in config
+
+
+def test_invalid_edit_keeps_previous_config(config_dir):
+    service, _ = counting_service(config_dir)
+    events = []
+    service.add_listener(lambda config: events.append(config["ai"]["text"]["LLM"]))
+    service.get_config()
+    write(config_dir / "02_ai.yaml", "ai: [unclosed\n", 5_000)
+    assert service.get_config()["ai"]["text"]["LLM"] == "OpenAI"
+    assert events == []
+    write(config_dir / "02_ai.yaml", "ai:\n  text:\n    LLM: DeepSeek\n", 6_000)
+    assert service.get_config()["ai"]["text"]["LLM"] == "DeepSeek"
+    assert events == ["DeepSeek"]
+
+
+def test_check_interval_throttles_stat_calls(config_dir):
+    provider = ModularYamlConfigProvider(str(config_dir))
+    service = build_config_service(provider, check_interval=3600)
+    config = service.get_config()
+    write(config_dir / "02_ai.yaml", "ai:\n  text:\n    LLM: Claude\n", 7_000)
+    assert service.get_config()["ai"]["text"]["LLM"] == "OpenAI"
+    assert service.refresh_if_changed() is True
+    assert service.get_config()["ai"]["text"]["LLM"] == "Claude"
+
+
+def test_sources_without_watch_paths_refresh_on_an_interval(monkeypatch):
+    responses = [{"ai": {"text": {"LLM": "OpenAI"}}}, {"ai": {"text": {"LLM": "OpenAI"}}}, {"ai": {"text": {"LLM": "Claude"}}}]
+    now = [100.0]
+    monkeypatch.setattr("src.utils.config.config_service.time.monotonic", lambda: now[0])
+    service = ConfigService(lambda: responses.pop(0), check_interval=0, refresh_interval=300)
+    config = service.get_config()
+    assert service.get_config() is config
+    now[0] += 300
+    # Same payload: no new snapshot and no version bump
+    assert service.get_config() is config and service.version == 1
+    now[0] += 300
+    assert service.get_config()["ai"]["text"]["LLM"] == "Claude"
+    assert service.version == 2
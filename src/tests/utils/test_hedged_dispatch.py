@@ -0,0 +1,151 @@
+import sys
+import os
+import asyncio
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.dispatch.text.hedged_dispatch import LatencyTracker, hedge_delay, hedged_text_request
+from src.utils.helpers.llm_cache_helper import is_cacheable_response
+from src.utils.helpers.prompt.run_context import RunContext, emit_text_delta, use_run_context
+
+HEDGING = {"percentile": 95, "default_delay_seconds": 0.05, "min_delay_seconds": 0.01}
+
+
+def make_call(behaviour, started, cancelled):
+    async def call(provider, state):
+        started.append(provider)
+        delay, result = behaviour[provider]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(provider)
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return call
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_never_starts_backup():
+    started, cancelled = [], []
+    call = make_call({"A": (0, {"Text": "a"}), "B": (0, {"Text": "b"})}, started, cancelled)
+    result = await hedged_text_request(["A", "B"], {}, call, is_cacheable_response, HEDGING, LatencyTracker())
+    assert result == ("A", {"Text": "a"})
+    assert started == ["A"]
+
+
+@pytest.mark.asyncio
+async def test_stalled_primary_is_hedged_and_cancelled():
+    started, cancelled = [], []
+    call = make_call({"A": (5, {"Text": "a"}), "B": (0.01, {"Text": "b"})}, started, cancelled)
+    result = await hedged_text_request(["A", "B"], {}, call, is_cacheable_response, HEDGING, LatencyTracker())
+    assert result == ("B", {"Text": "b"})
+    assert started == ["A", "B"]
+    assert cancelled == ["A"]
+
+
+@pytest.mark.asyncio
+async def test_failures_and_invalid_responses_fall_through_immediately():
+    started, cancelled = [], []
+    behaviour = {
+        "A": (0, RuntimeError("down")),
+        "B": (0, {"Text": "", "error": "bad json"}),
+        "C": (0, {"Text": "c"}),
+    }
+    slow_hedging = {**HEDGING, "default_delay_seconds": 30}
+    result = await asyncio.wait_for(
+        hedged_text_request(["A", "B", "C"], {}, make_call(behaviour, started, cancelled), is_cacheable_response, slow_hedging, LatencyTracker()),
+        timeout=2,
+    )
+    assert result == ("C", {"Text": "c"})
+
+
+@pytest.mark.asyncio
+async def test_all_failing_returns_last_response_or_raises():
+    started, cancelled = [], []
+    call = make_call({"A": (0, {"Text": "", "error": "x"}), "B": (0, RuntimeError("down"))}, started, cancelled)
+    result = await hedged_text_request(["A", "B"], {}, call, is_cacheable_response, HEDGING, LatencyTracker())
+    assert result == ("A", {"Text": "", "error": "x"})
+
+    call = make_call({"A": (0, RuntimeError("down"))}, started, cancelled)
+    with pytest.raises(RuntimeError):
+        await hedged_text_request(["A"], {}, call, is_cacheable_response, HEDGING, LatencyTracker())
+
+
+def make_streaming_call(scripts):
+    async def call(provider, state):
+        for step in scripts[provider]:
+            if isinstance(step, Exception):
+                raise step
+            if isinstance(step, dict):
+                return step
+            if isinstance(step, (int, float)):
+                await asyncio.sleep(step)
+            else:
+                emit_text_delta(step)
+    return call
+
+
+@pytest.mark.asyncio
+async def test_hedged_streams_never_interleave():
+    scripts = {
+        "A": ["A1 ", 0.2, "A2 ", RuntimeError("dropped")],
+        "B": [0.02, "B1 ", "B2 ", 0.4, "B3", {"Text": "B1 B2 B3"}],
+    }
+    events = []
+    run_context = RunContext(on_text_delta=events.append, on_text_reset=lambda: events.append(None))
+    with use_run_context(run_context):
+        result = await hedged_text_request(["A", "B"], {}, make_streaming_call(scripts), is_cacheable_response, HEDGING, LatencyTracker())
+    assert result == ("B", {"Text": "B1 B2 B3"})
+    # A owned the stream until it failed; B's buffered text is replayed right after the reset
+    assert events == ["A1 ", "A2 ", None, "B1 B2 ", "B3"]
+
+
+@pytest.mark.asyncio
+async def test_winning_backup_replaces_the_streamed_primary_text():
+    scripts = {
+        "A": ["A1 ", 5, {"Text": "A"}],
+        "B": [0.02, "B1 ", "B2", {"Text": "B1 B2"}],
+    }
+    events = []
+    run_context = RunContext(on_text_delta=events.append, on_text_reset=lambda: events.append(None))
+    with use_run_context(run_context):
+        result = await hedged_text_request(["A", "B"], {}, make_streaming_call(scripts), is_cacheable_response, HEDGING, LatencyTracker())
+    assert result == ("B", {"Text": "B1 B2"})
+    assert events == ["A1 ", None, "B1 B2"]
+
+
+def test_hedge_delay_uses_percentile_after_enough_samples():
+    tracker = LatencyTracker()
+    assert hedge_delay("A", HEDGING, tracker) == 0.05
+    for seconds in [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]:
+        tracker.record("A", seconds)
+    assert hedge_delay("A", HEDGING, tracker) == 10
+    assert hedge_delay("A", {**HEDGING, "percentile": 50}, tracker) == 5
+
+
+@pytest.fixture
+def dispatch_text():
+    import importlib
+    return importlib.import_module("src.utils.dispatch.dispatch_text")
+
+
+@pytest.mark.asyncio
+async def test_winning_backup_is_cached_under_its_own_provider(dispatch_text, monkeypatch, tmp_path):
+    from src.utils.helpers.llm_cache_helper import LLMResponseCache, make_llm_cache_key
+    from src.utils.helpers.prompt.run_context import RunContext
+
+    cache = LLMResponseCache(str(tmp_path / "cache.db"))
+    started, cancelled = [], []
+    call = make_call({"A": (5, {"Text": "a"}), "B": (0.01, {"Text": "b"})}, started, cancelled)
+    monkeypatch.setattr(dispatch_text, "route_text_provider", call)
+    monkeypatch.setattr(dispatch_text, "resolve_provider", lambda kind, provider: provider)
+    monkeypatch.setattr(dispatch_text, "rank_providers", lambda kind, providers: list(providers))
+    monkeypatch.setattr(dispatch_text, "get_llm_response_cache", lambda: cache)
+    monkeypatch.setattr(dispatch_text, "get_hedging_config", lambda: {**HEDGING, "enabled": True, "backup_providers": ["B"]})
+
+    run_context = RunContext.from_prompt_state({"prompt": "Post about caching"}, config={"user_profile": {"llm": {}}})
+    assert await dispatch_text.dispatch_text_pipeline("A", run_context, use_cache=True) == {"Text": "b"}
+    assert cache.get(make_llm_cache_key("B", run_context.state, {})) == {"Text": "b"}
+    assert cache.get(make_llm_cache_key("A", run_context.state, {})) is None
+    cache.close()
@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from bs4 import BeautifulSoup
+from utils.helpers.html_extractor import extract_html
+
+BLOG_HTML = """
+<h1>Title &amp; More</h1>
+<p>Intro with a <a href="https://example.com/a">first <b>link</b></a> inside.</p>
+<script>var hidden = 1;</script><style>p { color: red; }</style>
+<img src="https://img.example.com/1.png" alt="one"><img src="https://img.example.com/2.png">
+<iframe src="https://www.youtube.com/embed/xyz"></iframe>
+<video src="https://cdn.example.com/v.mp4"><source src="https://cdn.example.com/v.webm"></video>
+<blockquote><p>Quoted</p><a href="https://twitter.com/x/status/1">tweet</a></blockquote>
+<blockquote><a href="https://twitter.com/x/status/2">second</a></blockquote>
+<script src="https://platform.twitter.com/widgets.js"></script>
+"""
+
+
+def test_extraction_matches_beautifulsoup():
+    soup = BeautifulSoup(BLOG_HTML, "html.parser")
+    extraction = extract_html(BLOG_HTML)
+
+    assert extraction.text == soup.get_text(separator="\n", strip=True)
+    assert [(l.text, l.href) for l in extraction.links] == [
+        (a.get_text(strip=True), a["href"]) for a in soup.find_all("a", href=True)
+    ]
+    assert [i.src for i in extraction.images] == [img["src"] for img in soup.find_all("img", src=True)]
+    assert [i.alt for i in extraction.images] == ["one", None]
+    assert list(extraction.embeds) == [s["src"] for s in soup.find_all("script", src=True)]
+    assert list(extraction.videos) == [
+        "https://www.youtube.com/embed/xyz",
+        "https://cdn.example.com/v.mp4",
+        "https://cdn.example.com/v.webm",
+    ]
+
+
+def test_first_of_each_follows_medium_rules():
+    extraction = extract_html(BLOG_HTML)
+    assert extraction.first_image == "https://img.example.com/1.png"
+    assert extraction.first_video == "https://www.youtube.com/embed/xyz"
+    # Only the first blockquote is treated as an embedded post
+    assert extraction.first_embed == "https://twitter.com/x/status/1"
+
+
+def test_extraction_is_memoized_and_handles_empty_input():
+    assert extract_html(BLOG_HTML) is extract_html(BLOG_HTML)
+    empty = extract_html("")
+    assert empty.text == "" and empty.links == () and empty.first_image is None
+
+
+def test_lxml_backend_matches_stdlib_backend():
+    pytest.importorskip("lxml")
+    from utils.helpers import html_extractor
+
+    assert html_extractor.get_parser_backend() == "lxml"
+    assert html_extractor._extract_with_lxml(BLOG_HTML) == html_extractor._extract_with_stdlib(BLOG_HTML)
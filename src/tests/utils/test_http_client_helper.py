@@ -0,0 +1,40 @@
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from src.utils.helpers import http_client_helper
+from src.utils.helpers.http_client_helper import get_async_client, get_session, TimeoutHTTPAdapter
+
+
+def test_session_is_shared_and_applies_default_timeout(monkeypatch):
+    session = get_session()
+    assert get_session() is session
+    adapter = session.get_adapter("https://api.example.com")
+    assert isinstance(adapter, TimeoutHTTPAdapter)
+
+    sent = {}
+    monkeypatch.setattr(
+        http_client_helper.HTTPAdapter, "send", lambda self, request, **kwargs: sent.update(kwargs)
+    )
+    adapter.send(object(), timeout=None)
+    assert sent["timeout"] == http_client_helper.DEFAULT_SYNC_TIMEOUT
+    adapter.send(object(), timeout=3)
+    assert sent["timeout"] == 3
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_reused_within_a_loop():
+    client = get_async_client()
+    assert get_async_client() is client
+    await http_client_helper.close_async_client()
+    assert get_async_client() is not client
+    await http_client_helper.close_async_client()
+
+
+def test_each_event_loop_gets_its_own_async_client():
+    async def grab():
+        return get_async_client()
+    first = asyncio.run(grab())
+    second = asyncio.run(grab())
+    assert first is not second
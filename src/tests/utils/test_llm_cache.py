@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.helpers.llm_cache_helper import (
+    LLMResponseCache,
+    is_cacheable_response,
+    is_llm_cache_enabled,
+    make_llm_cache_key,
+)
+
+LLM_CONFIG = {"Pollinations": {"native_post": {"model": "openai", "temperature": 0.7}}, "OpenAI": {"model": "gpt-4o"}}
+STATE = {"prompt": "Summarize this", "system_instructions": "Be brief", "blog_url": "https://blog/post"}
+
+
+def test_cache_key_covers_provider_params_and_prompt():
+    key = make_llm_cache_key("Pollinations_Text_Advanced", STATE, LLM_CONFIG)
+    assert key == make_llm_cache_key("Pollinations_Text_Advanced", dict(reversed(list(STATE.items()))), LLM_CONFIG)
+    assert key != make_llm_cache_key("OpenAI", STATE, LLM_CONFIG)
+    assert key != make_llm_cache_key("Pollinations_Text_Advanced", {**STATE, "prompt": "Other"}, LLM_CONFIG)
+    changed = {"Pollinations": {"native_post": {"model": "openai", "temperature": 0.2}}}
+    assert key != make_llm_cache_key("Pollinations_Text_Advanced", STATE, changed)
+
+
+def test_only_complete_responses_are_cacheable():
+    assert is_cacheable_response({"Text": "Post", "ImageAsset": None})
+    assert not is_cacheable_response({"Text": ""})
+    assert not is_cacheable_response({"error": "boom", "Text": "x"})
+    assert not is_cacheable_response(None)
+
+
+def test_get_set_persist_and_expire(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    cache = LLMResponseCache(path, ttl=60)
+    cache.set("k", "OpenAI", {"Text": "Post"})
+    cache.close()
+
+    reopened = LLMResponseCache(path, ttl=60)
+    assert reopened.get("k") == {"Text": "Post"}
+    assert reopened.get("missing") is None
+
+    import src.utils.helpers.llm_cache_helper as helper
+    now = helper.time.time()
+    monkeypatch.setattr(helper.time, "time", lambda: now + 120)
+    assert reopened.get("k") is None
+    assert reopened.count() == 0
+    reopened.close()
+
+
+def test_evicts_least_recently_used_by_count_and_size(tmp_path, monkeypatch):
+    import src.utils.helpers.llm_cache_helper as helper
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(helper.time, "time", lambda: next(clock))
+
+    cache = LLMResponseCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.set("a", "OpenAI", {"Text": "A"})
+    cache.set("b", "OpenAI", {"Text": "B"})
+    cache.get("a")
+    cache.set("c", "OpenAI", {"Text": "C"})
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+    small = LLMResponseCache(str(tmp_path / "small.db"), max_bytes=60)
+    small.set("x", "OpenAI", {"Text": "x" * 30})
+    small.set("y", "OpenAI", {"Text": "y" * 30})
+    assert small.get("x") is None and small.get("y") is not None
+    cache.close()
+    small.close()
+
+
+def test_bypass_flag(monkeypatch):
+    monkeypatch.delenv("LLM_CACHE_BYPASS", raising=False)
+    assert is_llm_cache_enabled(False) is False
+    assert is_llm_cache_enabled(True) is True
+    monkeypatch.setenv("LLM_CACHE_BYPASS", "true")
+    assert is_llm_cache_enabled() is False
+    assert is_llm_cache_enabled(True) is True
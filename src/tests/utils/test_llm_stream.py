@@ -0,0 +1,139 @@
+import sys
+import os
+import json
+from contextlib import asynccontextmanager
+import httpx
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.helpers.llm_stream_helper import (
+    JsonStreamValidator,
+    JsonStringFieldReader,
+    StreamAssembler,
+    StreamHTTPError,
+    StreamValidationError,
+    iter_sse_data,
+    stream_chat_completion,
+)
+from src.utils.helpers.prompt.run_context import RunContext, use_run_context
+
+
+def sse(*chunks):
+    body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks)
+    return body + "data: [DONE]\n\n"
+
+
+def content_chunk(text):
+    return {"model": "openai", "choices": [{"delta": {"content": text}}]}
+
+
+async def lines_of(text):
+    for line in text.split("\n"):
+        yield line
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_data_joins_multiline_data_and_stops_at_done():
+    stream = ": comment\nevent: message\ndata: a\ndata: b\n\ndata: c\n\ndata: [DONE]\n\ndata: ignored\n\n"
+    assert [data async for data in iter_sse_data(lines_of(stream))] == ["a\nb", "c"]
+
+
+def test_assembler_rebuilds_content_and_tool_calls():
+    assembler = StreamAssembler()
+    assembler.add(json.dumps(content_chunk("Hel")))
+    assembler.add(json.dumps(content_chunk("lo")))
+    assembler.add(json.dumps({"choices": [{"delta": {"tool_calls": [
+        {"index": 0, "id": "call_1", "function": {"name": "generate_post", "arguments": '{"Text": "Hi'}}
+    ]}}]}))
+    _, deltas = assembler.add(json.dumps({"choices": [{"delta": {"tool_calls": [
+        {"index": 0, "function": {"arguments": '"}'}}
+    ]}, "finish_reason": "tool_calls"}]}))
+    assert deltas == [(0, '"}')]
+    message = assembler.completion()["choices"][0]["message"]
+    assert message["content"] == "Hello"
+    assert message["tool_calls"][0]["id"] == "call_1"
+    assert json.loads(message["tool_calls"][0]["function"]["arguments"]) == {"Text": "Hi"}
+    assert assembler.completion()["choices"][0]["finish_reason"] == "tool_calls"
+
+
+def test_validator_accepts_wrapped_json_and_rejects_early():
+    validator = JsonStreamValidator()
+    for piece in ['json "', '{"Text": "a } in', ' a string", "Tags": ["x"]', '}"']:
+        validator.feed(piece)
+    validator.finish()
+
+    with pytest.raises(StreamValidationError):
+        JsonStreamValidator().feed("Sure! Here is your post")
+    with pytest.raises(StreamValidationError):
+        JsonStreamValidator().feed('{"a": [1}')
+    with pytest.raises(StreamValidationError):
+        JsonStreamValidator().feed('{"a": 1} and more')
+    truncated = JsonStreamValidator()
+    truncated.feed('{"a": ')
+    with pytest.raises(StreamValidationError):
+        truncated.finish()
+
+
+def test_field_reader_decodes_text_across_split_escapes():
+    reader = JsonStringFieldReader("Text")
+    pieces = ['{"Hashtags": ["#a"], "Te', 'xt": "Line one\\', 'nLine \\"two\\" \\u00e9', '", "x": "y"}']
+    assert "".join(reader.feed(piece) for piece in pieces) == 'Line one\nLine "two" é'
+    assert reader.done
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_completion_emits_post_text_and_assembles():
+    body = sse(content_chunk('{"Text": "Big '), content_chunk('news"'), content_chunk(', "Hashtags": []}'))
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+    received = []
+    async with httpx.AsyncClient(transport=transport) as client:
+        assembler = await stream_chat_completion(
+            client, "https://llm.test/openai", {"stream": True}, validate_json=True, on_text=received.append
+        )
+    assert "".join(received) == "Big news"
+    assert json.loads(assembler.content) == {"Text": "Big news", "Hashtags": []}
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_completion_aborts_malformed_output_and_http_errors():
+    body = sse(content_chunk("I cannot answer in JSON"), content_chunk("never read"))
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(StreamValidationError):
+            await stream_chat_completion(client, "https://llm.test/openai", {"stream": True}, validate_json=True)
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(429, text="slow down"))
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(StreamHTTPError) as error:
+            await stream_chat_completion(client, "https://llm.test/openai", {"stream": True})
+    assert error.value.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_unvalidated_streams_forward_only_the_text_field():
+    body = sse(content_chunk('{"Te'), content_chunk('xt": "Big news", "Hashtags": ["#a"]}'))
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+    received = []
+    async with httpx.AsyncClient(transport=transport) as client:
+        await stream_chat_completion(client, "https://llm.test/openai", {"stream": True}, on_text=received.append)
+    assert "".join(received) == "Big news"
+
+
+@pytest.mark.asyncio
+async def test_failed_stream_tells_the_listener_to_discard_its_text(monkeypatch):
+    from src.ml_models import pollinations_generator
+
+    body = sse(content_chunk('{"Text": "Half a po'), content_chunk('st"] oops'))
+
+    @asynccontextmanager
+    async def fake_client():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+        async with httpx.AsyncClient(transport=transport) as client:
+            yield client
+
+    monkeypatch.setattr(pollinations_generator, "pooled_async_client", fake_client)
+    events = []
+    run_context = RunContext(on_text_delta=events.append, on_text_reset=lambda: events.append(None))
+    with use_run_context(run_context):
+        result = await pollinations_generator.stream_text_request("https://llm.test", {"stream": True}, validate_json=True)
+    assert result["status"] == "error"
+    assert events == ["Half a po", None]
@@ -0,0 +1,76 @@
+import sys
+import os
+import io
+import pytest
+import requests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import src.utils.helpers.media_stream_helper as media_stream
+from src.utils.helpers.media_stream_helper import (
+    MediaStreamError,
+    MediaStreamReader,
+    media_stream_size,
+    open_media_stream,
+    request_with_retry,
+)
+
+
+def make_response(status=200, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(body)
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        data = kwargs.get("data")
+        self.calls.append((method, url, data.read() if hasattr(data, "read") else data))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return make_response(outcome)
+
+    def get(self, url, **kwargs):
+        return self.outcomes.pop(0)
+
+
+def test_reader_returns_exact_parts_and_length():
+    reader = MediaStreamReader(iter([b"abc", b"defg", b"h"]), length=8)
+    assert len(reader) == 8
+    assert reader.read(5) == b"abcde"
+    assert reader.read(5) == b"fgh"
+    assert reader.read(5) == b""
+    assert reader.bytes_read == 8
+    with pytest.raises(TypeError):
+        len(MediaStreamReader(iter([])))
+
+
+def test_stream_size_ignores_compressed_or_missing_lengths():
+    assert media_stream_size(make_response(headers={"Content-Length": "10"})) == 10
+    assert media_stream_size(make_response(headers={"Content-Length": "10", "Content-Encoding": "gzip"})) is None
+    assert media_stream_size(make_response()) is None
+
+
+def test_open_media_stream_raises_on_http_errors():
+    with pytest.raises(MediaStreamError):
+        open_media_stream("https://cdn.test/missing.mp4", FakeSession([make_response(404)]))
+
+
+def test_request_with_retry_rebuilds_streamed_bodies(monkeypatch):
+    monkeypatch.setattr(media_stream.time, "sleep", lambda seconds: None)
+    session = FakeSession([requests.ConnectionError("reset"), 503, 201])
+    bodies = iter([b"one", b"two", b"three"])
+    response = request_with_retry(
+        "POST", "https://upload.test", session=session,
+        body_factory=lambda: MediaStreamReader(iter([next(bodies)]), 5),
+    )
+    assert response.status_code == 201
+    assert [data for _, _, data in session.calls] == [b"one", b"two", b"three"]
+
+    session = FakeSession([500, 500])
+    assert request_with_retry("PUT", "https://upload.test", attempts=2, session=session, data=b"x").status_code == 500
@@ -0,0 +1,48 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.helpers.post_history_store import PostHistoryStore
+
+
+def make_store(tmp_path, legacy=None):
+    legacy_path = tmp_path / "linkedin_post_cache.json"
+    if legacy is not None:
+        legacy_path.write_text(json.dumps(legacy))
+    return PostHistoryStore(str(tmp_path / "post_history.db"), legacy_json_path=str(legacy_path))
+
+
+def test_lookup_is_scoped_by_blog_and_platform(tmp_path):
+    store = make_store(tmp_path)
+    record = store.add_post("linkedin", "hello", "blog-1", media_url="https://img", media_type="IMAGE")
+    assert record["id"] == "post_1"
+    assert store.has_post("blog-1", "linkedin")
+    assert not store.has_post("blog-1", "twitter")
+    assert store.has_post("blog-1")
+    assert not store.has_post("blog-2", "linkedin")
+    assert not store.has_post("", "linkedin")
+
+
+def test_iter_posts_streams_newest_first(tmp_path):
+    store = make_store(tmp_path)
+    for i in range(5):
+        store.add_post("linkedin" if i % 2 == 0 else "twitter", f"post {i}", f"blog-{i}")
+    linkedin = list(store.iter_posts(platform="linkedin", batch_size=1))
+    assert [p["blog_id"] for p in linkedin] == ["blog-4", "blog-2", "blog-0"]
+    assert store.count() == 5
+    assert store.count("twitter") == 2
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = {"posts": [
+        {"platform": "linkedin", "post_text": "newer", "blog_id": "b2", "timestamp": "2024-01-02T00:00:00"},
+        {"platform": "linkedin", "post_text": "older", "blog_id": "b1", "timestamp": "2024-01-01T00:00:00"},
+    ]}
+    store = make_store(tmp_path, legacy)
+    assert [p["blog_id"] for p in store.iter_posts()] == ["b2", "b1"]
+    store.close()
+
+    reopened = make_store(tmp_path, legacy)
+    assert reopened.count() == 2
+    assert reopened.has_post("b1", "linkedin")
+    assert reopened.is_healthy()
@@ -0,0 +1,99 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import pytest
+from src.utils.helpers.prompt.prompt_budget import (
+    apply_prompt_budget,
+    chunk_text,
+    estimate_tokens,
+    fit_blog_content,
+    fit_blog_content_async,
+    map_reduce_summarize,
+    split_blog_sections,
+    truncate_to_tokens,
+)
+
+def words(text: str) -> int:
+    return len(text.split())
+
+CONTENT = (
+    "Intro paragraph about caching.\n\nSecond paragraph with details."
+    "\n\nLinks:\nDocs (https://docs)\nRepo (https://repo)"
+    "\n\nImages:\nDiagram [Image] (https://img/1)\nChart [Image] (https://img/2)"
+    "\n\nEmbedded Media:\n[IFRAME] https://video"
+)
+
+
+def test_split_blog_sections():
+    text, sections = split_blog_sections(CONTENT)
+    assert text.endswith("Second paragraph with details.")
+    assert sections["links"] == ["Docs (https://docs)", "Repo (https://repo)"]
+    assert sections["images"] == ["Diagram [Image] (https://img/1)", "Chart [Image] (https://img/2)"]
+    assert sections["media"] == ["[IFRAME] https://video"]
+
+
+def test_content_within_budget_is_untouched():
+    assert fit_blog_content(CONTENT, 10_000) == CONTENT
+    assert estimate_tokens("abcd" * 10) == 10
+
+
+def test_low_ranked_sections_are_trimmed_first():
+    fitted = fit_blog_content(CONTENT, 17, count_tokens=words)
+    assert "Second paragraph with details." in fitted
+    assert "Links:\nDocs (https://docs)\nRepo (https://repo)" in fitted
+    assert "Embedded Media:" in fitted
+    assert "Images:" not in fitted
+    assert words(fitted) <= 17
+
+
+def test_oversized_text_is_truncated_at_a_boundary():
+    text = " ".join(f"Sentence {i} is here." for i in range(200))
+    truncated = truncate_to_tokens(text, 50, words)
+    assert words(truncated) <= 50
+    assert truncated.endswith("here. [...]")
+    fitted = fit_blog_content(text + "\n\nLinks:\nA (https://a)", 50, count_tokens=words)
+    assert "Links:" not in fitted and words(fitted) <= 50
+
+
+def test_chunk_text_is_paragraph_aligned():
+    text = "\n\n".join(f"p{i} " + "w " * 9 for i in range(6))
+    chunks = chunk_text(text, 25, words)
+    assert len(chunks) == 3
+    assert all(words(chunk) <= 25 for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_map_reduce_summarizes_chunks_and_falls_back_on_failure():
+    text = "\n\n".join(f"para{i} " + "word " * 40 for i in range(6))
+    calls = []
+    async def summarizer(chunk, target):
+        calls.append(chunk)
+        if chunk.startswith("para0"):
+            raise RuntimeError("LLM down")
+        return f"summary of {chunk.split()[0]}"
+    result = await map_reduce_summarize(text, 60, summarizer, count_tokens=words, chunk_tokens=45)
+    assert len(calls) == 6
+    assert "summary of para5" in result
+    assert result.startswith("para0")  # failed chunk was truncated instead
+    assert words(result) <= 60
+
+
+def test_apply_prompt_budget_respects_config():
+    long_text = "word " * 5000
+    assert apply_prompt_budget(long_text, {"enabled": False}) == long_text
+    fitted = apply_prompt_budget(long_text, {"max_blog_tokens": 100})
+    assert estimate_tokens(fitted) <= 100
+
+
+@pytest.mark.asyncio
+async def test_async_fit_summarizes_on_the_running_loop():
+    text = "\n\n".join(f"para{i} " + "word " * 40 for i in range(4))
+    loops = []
+    async def summarizer(chunk, target):
+        loops.append(asyncio.get_running_loop())
+        return f"summary of {chunk.split()[0]}"
+    fitted = await fit_blog_content_async(text, 60, count_tokens=words, summarizer=summarizer, chunk_tokens=45)
+    assert loops and all(loop is asyncio.get_running_loop() for loop in loops)
+    assert "summary of para3" in fitted
+    assert await fit_blog_content_async(CONTENT, 17, count_tokens=words) == fit_blog_content(CONTENT, 17, count_tokens=words)
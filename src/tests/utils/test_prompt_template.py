@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from types import MappingProxyType
+from src.utils.helpers.prompt.prompt_template import compile_prompt_template, get_compiled_prompt_template
+
+CONFIG = {
+    "user_profile": {"target_audience": "Developers", "professional_summary": "Engineer"},
+    "social_media_to_post_to": {"linkedin": {
+        "enabled": True, "minimum_characters": 100, "maximum_characters": 900,
+        "formatting_instructions": "Use bullets.",
+    }},
+    "ai": {
+        "viral_posting": {"emotional_storytelling": {"description": "Tell a story."}},
+        "viral_posts_i_liked": [{"text": "Hello", "engagement": "1k", "reason": "Short"}],
+        "creative": {
+            "generate_image": {"enabled": True, "prompt": " A sunrise ", "width": 1024, "height": 512, "model": "flux"},
+            "fetch_gif": {"enabled": True, "prompt": "celebrate"},
+        },
+    },
+    "hashtags": {"default_tags": ["#AI"], "custom_tags": ["#Dev"]},
+}
+
+
+def compile_template(config=CONFIG):
+    return compile_prompt_template(config, "SYS.", "DEFAULT.", "USER.")
+
+
+def test_render_wraps_blog_in_static_sections():
+    payload = compile_template().render("Blog body", "https://blog/post")
+    content = payload["content"]
+    assert content.startswith("SYS.DEFAULT.USER.Summarize this blog post into an engaging LinkedIn (100 MINIMUM chars, 900 MAXIMUM chars) post:\n\nBlog body\n\n")
+    assert "For target audience: Developers" in content
+    assert "Why it worked: Short" in content
+    assert "Tell a story." in content
+    assert "Include the original blog URL in the post: https://blog/post" in content
+    assert content.endswith("Formatting Instructions:\nUse bullets.\nDEFAULT.")
+    assert payload["creative_prompt"] == "A sunrise"
+    assert payload["hashtags"] == ["#AI", "#Dev"]
+    assert payload["blog_content"] == "Blog body"
+
+
+def test_random_creative_choice_is_made_per_blog():
+    template = compile_template()
+    assert len(template.creative_choices) == 2
+    # The same blog always gets the same prompt, so retries can reuse a cached response
+    assert len({template.render("Blog body", "https://blog/post")["content"] for _ in range(10)}) == 1
+    contents = {template.render(f"Blog body {i}")["content"] for i in range(50)}
+    assert any("Generate an AI image" in c for c in contents)
+    assert any("Fetch a GIF using prompt: (celebrate)" in c for c in contents)
+
+
+def test_render_many_and_empty_blogs():
+    template = compile_template({})
+    payloads = template.render_many([("One", ""), ("", ""), ("Two", "https://two")])
+    assert payloads[1] is None
+    assert "One" in payloads[0]["content"] and "URL" not in payloads[0]["content"]
+    assert "https://two" in payloads[2]["content"]
+    # Each payload gets its own hashtag list
+    payloads[0]["hashtags"].append("#x")
+    assert payloads[2]["hashtags"] == []
+
+
+def test_run_config_template_uses_its_own_instructions_and_hashtags():
+    run_config = MappingProxyType({
+        **CONFIG,
+        "ai": {**CONFIG["ai"], "custom_system_instructions": "Override system. "},
+        "hashtags": {"default_tags": ["#Override"], "custom_tags": []},
+    })
+    template = get_compiled_prompt_template(run_config)
+    assert template is get_compiled_prompt_template(run_config)
+    assert template.system_instructions == "Override system. "
+    assert template.hashtags == ("#Override",)
+    payload = template.render("Blog body")
+    assert payload["content"].startswith("Override system. ")
+    assert get_compiled_prompt_template(MappingProxyType(dict(CONFIG))).hashtags == ("#AI", "#Dev")
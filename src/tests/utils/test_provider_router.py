@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.dispatch.provider_router import ProviderRouter, UNMEASURED_SCORE
+
+CANDIDATES = [("A", "m1"), ("B", "m1"), ("C", "m1")]
+
+
+def make_router(**kwargs):
+    return ProviderRouter(alpha=0.5, slo_latency_seconds=10, slo_error_rate=0.1, **kwargs)
+
+
+def test_ewma_tracks_latency_and_errors():
+    router = make_router()
+    router.record("text", "A", "m1", 4.0, ok=True)
+    router.record("text", "A", "m1", 8.0, ok=True)
+    router.record("text", "A", "m1", 1.0, ok=False, error="timeout")
+    [stats] = router.stats()
+    assert stats["latency_ewma"] == 6.0
+    assert stats["error_ewma"] == 0.5
+    assert stats["calls"] == 3 and stats["failures"] == 1
+    assert stats["last_error"] == "timeout"
+    assert router.score("text", "A", "m1") == 6.0 / 10 + 0.5 / 0.1
+
+
+def test_rank_prefers_providers_meeting_the_slo():
+    router = make_router()
+    router.record("text", "A", "m1", 30.0, ok=True)
+    router.record("text", "B", "m1", 2.0, ok=True)
+    # B meets the SLO, C is untried, A misses the latency target
+    assert router.rank("text", CANDIDATES) == ["B", "C", "A"]
+    assert router.score("text", "C", "m1") == UNMEASURED_SCORE
+
+
+def test_stats_are_kept_per_kind_and_model():
+    router = make_router()
+    router.record("text", "OpenAI", "gpt-4o", 2.0, ok=True)
+    router.record("image", "OpenAI", "dall-e-3", 9.0, ok=True)
+    router.record("text", "OpenAI", "gpt-4o-mini", 1.0, ok=True)
+    keys = {(s["kind"], s["model"]) for s in router.stats()}
+    assert keys == {("text", "gpt-4o"), ("text", "gpt-4o-mini"), ("image", "dall-e-3")}
+
+
+def test_consecutive_failures_open_a_shared_circuit():
+    router = make_router(failure_threshold=2, recovery_timeout=60)
+    router.record("text", "A", "m1", 1.0, ok=False)
+    assert router.choose("text", CANDIDATES) == "B"
+    router.record("text", "A", "m1", 1.0, ok=False)
+    ranked = router.rank("text", CANDIDATES)
+    assert ranked[-1] == "A"
+    [stats] = router.stats()
+    assert stats["circuit_open"] is True and stats["score"] is None
+
+    # A success closes the circuit again
+    router.record("text", "A", "m1", 1.0, ok=True)
+    assert router.stats()[0]["circuit_open"] is False
+
+
+def test_circuit_allows_a_trial_after_recovery_timeout():
+    router = make_router(failure_threshold=1, recovery_timeout=0)
+    router.record("text", "A", "m1", 1.0, ok=False)
+    assert router.score("text", "A", "m1") != float("inf")
@@ -0,0 +1,45 @@
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from src.utils.helpers.prompt.prompt_globals import get_prompt_globals, reset_prompt_globals
+from src.utils.helpers.prompt.run_context import (
+    RunContext,
+    get_default_run_context,
+    get_run_context,
+    run_in_context,
+    use_run_context,
+)
+
+
+def test_outside_a_run_falls_back_to_default_context():
+    assert get_run_context() is get_default_run_context()
+    assert get_prompt_globals() is get_default_run_context().state
+
+
+def test_use_run_context_scopes_prompt_state():
+    context = RunContext.from_prompt_state({"prompt": "scoped", "raw_blog": {"id": "b1"}}, tenant="acme")
+    with use_run_context(context):
+        assert get_prompt_globals()["prompt"] == "scoped"
+        assert get_prompt_globals()["hashtags"] == []
+        assert get_run_context().blog_id == "b1"
+        reset_prompt_globals()
+        assert context.state["prompt"] is None
+    assert get_run_context() is get_default_run_context()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_see_their_own_prompt():
+    async def run(prompt: str) -> list:
+        with use_run_context(RunContext.from_prompt_state({"prompt": prompt})):
+            seen = [get_prompt_globals()["prompt"]]
+            await asyncio.sleep(0.01)
+            seen.append(get_prompt_globals()["prompt"])
+            loop = asyncio.get_running_loop()
+            seen.append(await loop.run_in_executor(None, run_in_context(lambda: get_prompt_globals()["prompt"])))
+            return seen
+
+    first, second = await asyncio.gather(run("first"), run("second"))
+    assert first == ["first"] * 3
+    assert second == ["second"] * 3
@@ -1,18 +1,36 @@
-from typing import Dict, Any
+"""
+config_handler.py
+- Config merging for API overrides.
+- EffectiveConfigCache memoizes merged configs by a fingerprint of the overrides, so the handful
+  of override profiles most traffic repeats are merged once. Cached configs are read-only
+  (MappingProxyType / tuple) and share every untouched subtree with the frozen base config.
+- A config handed to a run (RunContext.config) is thawed first: handlers copy config values
+  straight into JSON request bodies, which cannot serialize mappingproxy objects.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_EFFECTIVE_CONFIG_CACHE_SIZE = 128
+
 
 def merge_configs(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
     """
     Recursively merge two dictionaries with override taking precedence.
-    
+
     Args:
         base: Base configuration dictionary
         override: Override dictionary with values to apply on top of base
-        
+
     Returns:
         Merged configuration dictionary
     """
     result = base.copy()
-    
+
     for key, value in override.items():
         # If both base and override have dict at this key, merge them recursively
         if key in result and isinstance(result[key], dict) and isinstance(value, dict):
@@ -20,5 +38,120 @@ def merge_configs(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, A
         # Otherwise override takes precedence
         else:
             result[key] = value
-            
+
     return result
+
+
+def freeze_config(value: Any) -> Any:
+    """Returns a read-only deep copy: dicts become MappingProxyType, lists become tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze_config(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_config(item) for item in value)
+    return value
+
+
+def thaw_config(value: Any) -> Any:
+    """Inverse of freeze_config: a plain deep copy with dicts and lists, safe to mutate and serialize."""
+    if isinstance(value, Mapping):
+        return {key: thaw_config(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw_config(item) for item in value]
+    return value
+
+
+def merge_frozen(base: Mapping, override: Mapping) -> Mapping:
+    """
+    merge_configs() for frozen configs: only the mappings on overridden paths are rebuilt,
+    every other subtree is shared with `base`.
+    """
+    result = dict(base)
+    for key, value in override.items():
+        if isinstance(result.get(key), Mapping) and isinstance(value, Mapping):
+            result[key] = merge_frozen(result[key], value)
+        else:
+            result[key] = freeze_config(value)
+    return MappingProxyType(result)
+
+
+def config_fingerprint(override: Any) -> str:
+    """Stable sha256 of an override tree (independent of key order)."""
+    canonical = json.dumps(override, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class EffectiveConfigCache:
+    """
+    Thread-safe LRU of effective (base + override) configs keyed by override fingerprint.
+
+    The cache is bound to one base config object; passing a different base (e.g. after a
+    reload) drops every cached entry.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_EFFECTIVE_CONFIG_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Mapping]" = OrderedDict()
+        self._base: Optional[Any] = None
+        self._frozen_base: Optional[Mapping] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _frozen_base_for(self, base: Mapping) -> Mapping:
+        # Caller must hold self._lock
+        if base is not self._base:
+            self._base = base
+            self._frozen_base = freeze_config(base)
+            self._entries.clear()
+        return self._frozen_base
+
+    def resolve(
+        self,
+        base: Mapping,
+        override: Dict[str, Any],
+        normalize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> Mapping:
+        """
+        Returns the read-only merge of `base` and `override`.
+
+        Args:
+            base: Base config.
+            override: Raw override tree (from headers or a request body); this is what is hashed.
+            normalize: Optional transform applied to `override` before merging, on cache misses only.
+        """
+        key = config_fingerprint(override)
+        with self._lock:
+            frozen_base = self._frozen_base_for(base)
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        # Merge outside the lock; a racing miss on the same key just computes an equal value
+        merged = merge_frozen(frozen_base, normalize(override) if normalize else override)
+        with self._lock:
+            if self._base is base:
+                self._entries[key] = merged
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return merged
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._base = None
+            self._frozen_base = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+_effective_config_cache = EffectiveConfigCache()
+
+
+def get_effective_config_cache() -> EffectiveConfigCache:
+    """Returns the process-wide effective config cache."""
+    return _effective_config_cache
@@ -1,35 +1,40 @@
-from typing import Dict, Any
-from src.utils.index import get_env_variable
-from src.utils.config.config_provider import YamlConfigProvider, ApiConfigProvider, HybridConfigProvider
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator
+from src.utils.config.config_service import get_config_service
 
 def load_config() -> Dict[str, Any]:
     """
-    Loads the configuration using the appropriate provider based on environment variables.
-    Returns the configuration as a dictionary.
+    Returns the configuration from the shared config service.
+    The provider is chosen from environment variables (see select_config_provider) and the
+    config is only re-read when its file changes.
     """
-    # Check for API configuration in environment variables
-    api_url = get_env_variable("CONFIG_API_URL")
-    api_key = get_env_variable("CONFIG_API_KEY")
-    
-    # Cache duration (default: 5 minutes)
-    try:
-        cache_duration = int(get_env_variable("CONFIG_CACHE_DURATION"),300)
-    except ValueError:
-        cache_duration = 300
-    
-    # Choose the appropriate config provider
-    if api_url:
-        print(f"ud83cudf10 Using API config provider with URL: {api_url}")
-        if get_env_variable("CONFIG_HYBRID_MODE").lower() == "true":
-            print("u2699ufe0f Using hybrid mode (API with YAML fallback)")
-            provider = HybridConfigProvider(api_url, api_key, "config.yaml", cache_duration)
-        else:
-            provider = ApiConfigProvider(api_url, api_key, cache_duration)
-    else:
-        print("ud83dudcc4 Using YAML config provider")
-        provider = YamlConfigProvider("config.yaml")
-    
-    return provider.get_config()
-
-# Load config globally
-config = load_config()
+    return get_config_service().get_config()
+
+
+class LiveConfig(Mapping):
+    """
+    Read-only view that always reads the config service's current snapshot.
+    Reloads swap the snapshot instead of editing it, so code that needs several values from
+    one consistent config should take snapshot() once and read from that.
+    """
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the current snapshot dict."""
+        return get_config_service().get_config()
+
+    def __getitem__(self, key: str) -> Any:
+        return self.snapshot()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.snapshot())
+
+    def __len__(self) -> int:
+        return len(self.snapshot())
+
+    def __repr__(self) -> str:
+        return f"LiveConfig({self.snapshot()!r})"
+
+
+# Load config globally (always reflects the latest reload)
+config = LiveConfig()
+load_config()
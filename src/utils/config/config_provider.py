@@ -1,9 +1,12 @@
 import os
 import yaml
 import requests
-from typing import Dict, Any, Optional
+from src.utils.helpers.http_client_helper import get_session
+from typing import Dict, Any, List, Optional
 import time
 
+session = get_session()
+
 class ConfigProvider:
     """
     Abstract base class for config providers.
@@ -20,23 +23,23 @@ class YamlConfigProvider(ConfigProvider):
     """
     def __init__(self, file_path: str = "config.yaml"):
         self.file_path = file_path
-        
-    def get_config(self) -> Dict[str, Any]:
+
+    def resolve_path(self) -> Optional[str]:
+        """Returns the first existing config file location, or None."""
         # List of possible locations for the config file
         possible_paths = [
             self.file_path,  # Current directory
             os.path.join(os.path.dirname(__file__), "../..", self.file_path),  # Project root
             os.path.join(os.path.dirname(__file__), "../../_configs", self.file_path),  # _configs directory
         ]
+        return next((path for path in possible_paths if os.path.isfile(path)), None)
         
-        # Try each path until we find the file
-        for path in possible_paths:
-            try:
-                with open(path, "r", encoding="utf-8") as file:
-                    print(f" Loading config from YAML file: {path}")
-                    return yaml.safe_load(file)
-            except FileNotFoundError:
-                continue
+    def get_config(self) -> Dict[str, Any]:
+        path = self.resolve_path()
+        if path:
+            with open(path, "r", encoding="utf-8") as file:
+                print(f" Loading config from YAML file: {path}")
+                return yaml.safe_load(file)
         
         # For testing environments, return a default empty config if file not found
         print(f"\u26a0\ufe0f Warning: Config file '{self.file_path}' not found. Using default empty config for testing.")
@@ -51,13 +54,20 @@ class ModularYamlConfigProvider(ConfigProvider):
             config_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config')
         self.config_dir = config_dir
 
+    def config_files(self) -> List[str]:
+        """YAML files in the config directory, in merge order."""
+        return [
+            os.path.join(self.config_dir, fname)
+            for fname in sorted(os.listdir(self.config_dir))
+            if fname.endswith('.yaml') or fname.endswith('.yml')
+        ]
+
     def get_config(self) -> Dict[str, Any]:
         config = {}
-        for fname in sorted(os.listdir(self.config_dir)):
-            if fname.endswith('.yaml') or fname.endswith('.yml'):
-                with open(os.path.join(self.config_dir, fname), 'r', encoding='utf-8') as f:
-                    part = yaml.safe_load(f) or {}
-                    config = self.deep_merge_dicts(config, part)
+        for path in self.config_files():
+            with open(path, 'r', encoding='utf-8') as f:
+                part = yaml.safe_load(f) or {}
+                config = self.deep_merge_dicts(config, part)
         return config
 
     @staticmethod
@@ -72,9 +82,11 @@ class ModularYamlConfigProvider(ConfigProvider):
 
 def load_modular_config() -> Dict[str, Any]:
     """
-    Utility function to load merged config from all YAML files in config/ directory.
+    Utility function to get the merged config from all YAML files in config/ directory.
+    Served from the shared ConfigService: files are only re-read after they change.
     """
-    return ModularYamlConfigProvider().get_config()
+    from src.utils.config.config_service import get_modular_config_service
+    return get_modular_config_service().get_config()
 
 
 class ApiConfigProvider(ConfigProvider):
@@ -105,7 +117,7 @@ class ApiConfigProvider(ConfigProvider):
         
         try:
             print("\ud83c\udf10 Fetching config from API")
-            response = requests.get(self.api_url, headers=headers, timeout=10)
+            response = session.get(self.api_url, headers=headers, timeout=10)
             response.raise_for_status()  # Raise exception for 4XX/5XX responses
             
             # Update cache
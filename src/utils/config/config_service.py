@@ -0,0 +1,301 @@
+"""
+config_service.py
+- Load-once, hot-reloading config shared by every module.
+- A ConfigService keeps one merged snapshot and only re-reads YAML when a watched file's
+  mtime/size changes (checked at most every CONFIG_RELOAD_INTERVAL seconds), or right away on
+  a filesystem event when `watchdog` is installed and CONFIG_WATCH=true.
+- A reload builds a new snapshot dict and swaps the reference, so a reader holding a snapshot
+  never sees it change underneath it. `from ... config_loader import config` is a live view of
+  the current snapshot. Treat snapshots as read-only.
+- Providers without files to watch (API-only) have no change signal; they are re-read every
+  `refresh_interval` seconds instead (the provider's cache_duration, CONFIG_CACHE_DURATION).
+- get_config_view() reads the main and modular snapshots together under one version key.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.utils.index import get_env_variable
+from src.utils.config.config_provider import (
+    ApiConfigProvider,
+    ConfigProvider,
+    HybridConfigProvider,
+    ModularYamlConfigProvider,
+    YamlConfigProvider,
+)
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+DEFAULT_RELOAD_CHECK_SECONDS = 2.0
+
+FileSignature = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+
+def file_signature(paths: List[str]) -> FileSignature:
+    """(path, mtime_ns, size) for each path; missing files get (path, None, None)."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class ConfigService:
+    """
+    Shared config snapshot backed by a loader, reloaded only when its source files change.
+
+    Args:
+        loader: Returns the full config dict (e.g. a provider's get_config).
+        watch_paths: Returns the files/directories whose changes should trigger a reload.
+        check_interval: Minimum seconds between mtime checks (CONFIG_RELOAD_INTERVAL).
+        refresh_interval: Reload unconditionally after this many seconds (None: only on file
+            changes). Used for sources with nothing to watch, such as the config API.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Dict[str, Any]],
+        watch_paths: Callable[[], List[str]] = lambda: [],
+        check_interval: Optional[float] = None,
+        refresh_interval: Optional[float] = None,
+    ):
+        self.loader = loader
+        self.watch_paths = watch_paths
+        if check_interval is None:
+            check_interval = float(get_env_variable("CONFIG_RELOAD_INTERVAL") or DEFAULT_RELOAD_CHECK_SECONDS)
+        self.check_interval = check_interval
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._signature: Optional[FileSignature] = None
+        self._last_check = 0.0
+        self._loaded_at = 0.0
+        self._version = 0
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._observer = None
+
+    @property
+    def version(self) -> int:
+        """Increments on every (re)load; use it to key caches derived from the config."""
+        return self._version
+
+    def get_config(self) -> Dict[str, Any]:
+        """Returns the current snapshot, reloading first if a watched file changed."""
+        return self.get_versioned_config()[0]
+
+    def get_versioned_config(self) -> Tuple[Dict[str, Any], int]:
+        """Returns (snapshot, version) from the same load, reloading first if a watched file changed."""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._load()
+        elif self._refresh_due() or (
+            self._observer is None and time.monotonic() - self._last_check >= self.check_interval
+        ):
+            self.refresh_if_changed()
+        with self._lock:
+            return self._snapshot, self._version
+
+    def _refresh_due(self) -> bool:
+        return self.refresh_interval is not None and time.monotonic() - self._loaded_at >= self.refresh_interval
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Reloads if any watched file's mtime/size changed, or the refresh interval elapsed.
+        Returns True if the config changed.
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            unchanged = file_signature(self.watch_paths()) == self._signature
+            if self._snapshot is not None and unchanged and not self._refresh_due():
+                return False
+            version_before = self._version
+            try:
+                self._load()
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                # A half-saved or invalid edit must not take the bot down; retry on the next change
+                print(f"❌ Config reload failed, keeping the previous config: {e}")
+                self._signature = file_signature(self.watch_paths())
+                self._loaded_at = time.monotonic()
+                return False
+            return self._version != version_before
+
+    def reload(self) -> Dict[str, Any]:
+        """Forces a reload regardless of file state."""
+        with self._lock:
+            self._load()
+            return self._snapshot
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Registers a callback run with the new snapshot after every reload."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _load(self) -> None:
+        # Caller must hold self._lock. Signature first, so edits made during the load trigger another reload.
+        signature = file_signature(self.watch_paths())
+        data = dict(self.loader() or {})
+        reloaded = self._snapshot is not None
+        self._signature = signature
+        self._last_check = self._loaded_at = time.monotonic()
+        if reloaded and data == self._snapshot:
+            # A periodic refresh that found nothing new keeps the snapshot and its version
+            return
+        if reloaded:
+            print("🔄 Config changed. Reloading config.")
+        # Swap the whole snapshot: readers keep the complete dict they already hold
+        self._snapshot = data
+        self._version += 1
+        if not reloaded:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(self._snapshot)
+            except Exception as e:
+                print(f"⚠️ Config reload listener failed: {e}")
+
+    def start_watching(self) -> bool:
+        """
+        Reloads on filesystem events instead of mtime polling. Requires `watchdog`.
+        Returns False (and keeps polling) when watchdog is unavailable.
+        """
+        if not WATCHDOG_AVAILABLE:
+            print("ℹ️ watchdog not installed; config changes are detected by mtime checks.")
+            return False
+        with self._lock:
+            if self._observer is not None:
+                return True
+            service = self
+
+            class _ReloadHandler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    if not event.is_directory or event.event_type in ("created", "deleted", "moved"):
+                        service.refresh_if_changed()
+
+            observer = Observer()
+            directories = {path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path)) for path in self.watch_paths()}
+            for directory in directories:
+                if os.path.isdir(directory):
+                    observer.schedule(_ReloadHandler(), directory, recursive=False)
+            observer.daemon = True
+            observer.start()
+            self._observer = observer
+        return True
+
+    def stop_watching(self) -> None:
+        with self._lock:
+            observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=5)
+
+
+def select_config_provider() -> ConfigProvider:
+    """
+    Chooses the config provider based on environment variables (CONFIG_API_URL, CONFIG_HYBRID_MODE).
+    """
+    # Check for API configuration in environment variables
+    api_url = get_env_variable("CONFIG_API_URL")
+    api_key = get_env_variable("CONFIG_API_KEY")
+
+    # Cache duration (default: 5 minutes)
+    try:
+        cache_duration = int(get_env_variable("CONFIG_CACHE_DURATION") or 300)
+    except ValueError:
+        cache_duration = 300
+
+    if api_url:
+        print(f"🌐 Using API config provider with URL: {api_url}")
+        if (get_env_variable("CONFIG_HYBRID_MODE") or "").lower() == "true":
+            print("⚙️ Using hybrid mode (API with YAML fallback)")
+            return HybridConfigProvider(api_url, api_key, "config.yaml", cache_duration)
+        return ApiConfigProvider(api_url, api_key, cache_duration)
+    print("📄 Using YAML config provider")
+    return YamlConfigProvider("config.yaml")
+
+
+def provider_watch_paths(provider: ConfigProvider) -> List[str]:
+    """Files whose changes should reload a provider's config (none for API-only providers)."""
+    if isinstance(provider, ModularYamlConfigProvider):
+        # The directory mtime changes when files are added or removed
+        return [provider.config_dir, *provider.config_files()]
+    if isinstance(provider, YamlConfigProvider):
+        path = provider.resolve_path()
+        return [path] if path else []
+    if isinstance(provider, HybridConfigProvider):
+        return provider_watch_paths(provider.yaml_provider)
+    return []
+
+
+def provider_refresh_interval(provider: ConfigProvider) -> Optional[float]:
+    """Seconds between unconditional reloads for providers backed by the config API, else None."""
+    if isinstance(provider, HybridConfigProvider):
+        return provider_refresh_interval(provider.api_provider)
+    if isinstance(provider, ApiConfigProvider):
+        return float(provider.cache_duration)
+    return None
+
+
+def build_config_service(provider: ConfigProvider, check_interval: Optional[float] = None) -> ConfigService:
+    service = ConfigService(
+        provider.get_config,
+        lambda: provider_watch_paths(provider),
+        check_interval,
+        refresh_interval=provider_refresh_interval(provider),
+    )
+    if (get_env_variable("CONFIG_WATCH") or "").lower() == "true":
+        service.start_watching()
+    return service
+
+
+_services: Dict[str, ConfigService] = {}
+_services_lock = threading.Lock()
+
+
+def _shared_service(name: str, factory: Callable[[], ConfigService]) -> ConfigService:
+    if name not in _services:
+        with _services_lock:
+            if name not in _services:
+                _services[name] = factory()
+    return _services[name]
+
+
+def get_config_service() -> ConfigService:
+    """Returns the process-wide service for config.yaml (or the API provider)."""
+    return _shared_service("main", lambda: build_config_service(select_config_provider()))
+
+
+def get_modular_config_service() -> ConfigService:
+    """Returns the process-wide service for the modular config/ directory."""
+    return _shared_service("modular", lambda: build_config_service(ModularYamlConfigProvider()))
+
+
+@dataclass(frozen=True)
+class ConfigView:
+    """
+    The main and modular config snapshots read together.
+
+    `version` changes whenever either snapshot is reloaded; key caches derived from both
+    configs (e.g. the compiled prompt template) on it.
+    """
+    main: Dict[str, Any]
+    modular: Dict[str, Any]
+    version: Tuple[int, int]
+
+
+def get_config_view() -> ConfigView:
+    """Returns both config snapshots (refreshed if their sources changed) and their combined version."""
+    main, main_version = get_config_service().get_versioned_config()
+    modular, modular_version = get_modular_config_service().get_versioned_config()
+    return ConfigView(main=main, modular=modular, version=(main_version, modular_version))
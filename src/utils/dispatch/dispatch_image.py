@@ -1,4 +1,4 @@
-from utils.prompt_builder import init_globals_for_test, get_prompt_globals
+from utils.prompt_builder import init_globals_for_test
 from utils.dispatch.image.image_pipeline_utils import (
     handle_pollinations_image,
     handle_pollinations_image_get,
@@ -8,13 +8,14 @@ from utils.dispatch.image.image_pipeline_utils import (
     fallback_error_image,
 )
 from utils.index import get_env_variable
+from src.utils.dispatch.provider_router import AUTO_PROVIDER, record_provider_call, resolve_provider
 from typing import Optional, Dict
+import time
 
 # * Initialize state and test mode
 TEST_MODE = get_env_variable("TEST_MODE").lower() == "true"
 if TEST_MODE:
     init_globals_for_test()
-state = get_prompt_globals()
 
 # * Main async dispatch router for image providers
 type Provider = str  # For future: consider Literal types for provider names
@@ -27,26 +28,33 @@ async def dispatch_image_pipeline(
     """
     Main image dispatch router. Delegates provider logic to utility functions for maintainability.
     Args:
-        provider: Name of the image provider to dispatch to.
+        provider: Name of the image provider to dispatch to, or "Auto" to let the provider router pick.
         creative_prompt_output: The prompt for creative image generation (if required).
         gif_tags: Tags for GIF search (if required).
     Returns:
         dict: The result of the provider pipeline.
     """
+    started = time.monotonic()
     try:
+        provider = resolve_provider("image", provider)
+        started = time.monotonic()
         match provider:
             case "Pollinations_Image":
-                return await handle_pollinations_image(creative_prompt_output)
+                result = await handle_pollinations_image(creative_prompt_output)
             case "Pollinations_Image_Get":
-                return await handle_pollinations_image_get(creative_prompt_output)
+                result = await handle_pollinations_image_get(creative_prompt_output)
             case "OpenAI":
-                return await handle_openai_image(creative_prompt_output)
+                result = await handle_openai_image(creative_prompt_output)
             case "HuggingFace":
-                return await handle_huggingface_image(creative_prompt_output)
+                result = await handle_huggingface_image(creative_prompt_output)
             case "Giphy":
-                return await handle_giphy_image(gif_tags)
+                result = await handle_giphy_image(gif_tags)
             case _:
                 raise ValueError(f"❌ Unsupported provider: {provider}")
     except Exception as e:
         print(f"❌ Error in dispatch_image_pipeline: {str(e)}")
+        if provider != AUTO_PROVIDER:
+            record_provider_call("image", provider, time.monotonic() - started, ok=False, error=str(e))
         return fallback_error_image(e)
+    record_provider_call("image", provider, time.monotonic() - started, ok="error" not in result, error=result.get("error"))
+    return result
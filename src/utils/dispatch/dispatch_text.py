@@ -1,4 +1,7 @@
-from src.utils.prompt_builder import init_globals_for_test, get_prompt_globals
+import asyncio
+from typing import Optional
+from src.utils.prompt_builder import init_globals_for_test
+from src.utils.helpers.prompt.run_context import RunContext, emit_text_delta, get_run_context, reset_text_stream, use_run_context
 from src.utils.dispatch.text.text_pipeline_utils import (
     handle_pollinations_text,
     handle_pollinations_text_advanced,
@@ -10,42 +13,112 @@ from src.utils.dispatch.text.text_pipeline_utils import (
     fallback_error_text,
 )
 from src.utils.index import get_env_variable
+from src.utils.helpers.llm_cache_helper import (
+    get_llm_response_cache,
+    is_cacheable_response,
+    is_llm_cache_enabled,
+    make_llm_cache_key,
+)
+from src.utils.dispatch.text.hedged_dispatch import (
+    get_hedging_config,
+    hedged_text_request,
+    timed_provider_call,
+)
+from src.utils.dispatch.provider_router import rank_providers, resolve_provider
 
 # * Initialize state and test mode
 TEST_MODE = get_env_variable("TEST_MODE").lower() == "true"
 if TEST_MODE:
     init_globals_for_test()
-state = get_prompt_globals()
 
 # * Main async dispatch router for text providers
 type Provider = str  # For future: consider Literal types for provider names
 
-async def dispatch_text_pipeline(provider: Provider) -> dict:
+async def route_text_provider(provider: Provider, state: dict) -> dict:
+    """
+    Calls the handler for a provider. Raises on unsupported providers and handler errors.
+    """
+    match provider:
+        case "Pollinations_Text":
+            return await handle_pollinations_text(state)
+        case "Pollinations_Text_Advanced":
+            return await handle_pollinations_text_advanced(state)
+        case "Pollinations_Text_Completion":
+            return await handle_pollinations_text_completion(state)
+        case "OpenAI":
+            return await handle_openai_text(state)
+        case "HuggingFace":
+            return await handle_huggingface_text(state)
+        case "DeepSeek":
+            return await handle_deepseek_text(state)
+        case "Claude":
+            return await handle_claude_text(state)
+        case _:
+            raise ValueError(f"❌ Unsupported provider: {provider}")
+
+async def dispatch_text_pipeline(
+    provider: Provider,
+    run_context: Optional[RunContext] = None,
+    use_cache: Optional[bool] = None,
+) -> dict:
     """
     Main text dispatch router. Delegates provider logic to utility functions for maintainability.
+    Successful responses are cached by (provider, model parameters, prompt), so re-running a blog
+    reuses text that was already generated. With `ai.text.generate_text.hedging` enabled, backup
+    providers are raced against a slow primary.
     Args:
-        provider: Name of the text provider to dispatch to.
+        provider: Name of the text provider to dispatch to, or "Auto" to let the provider router pick.
+        run_context: Run whose prompt state is used. Defaults to the active run context.
+        use_cache: False bypasses the response cache (default: LLM_CACHE_BYPASS / llm_cache.enabled).
     Returns:
         dict: The result of the provider pipeline.
     """
+    if run_context is not None and run_context is not get_run_context():
+        # Handlers look up the active run (e.g. for streaming listeners); make it this one
+        with use_run_context(run_context):
+            return await dispatch_text_pipeline(provider, run_context, use_cache)
+    state = get_run_context().state
+    try:
+        provider = resolve_provider("text", provider)
+    except Exception as e:
+        print(f"❌ Error in dispatch_text_pipeline: {str(e)}")
+        return fallback_error_text(e)
+    cache = get_llm_response_cache() if is_llm_cache_enabled(use_cache) else None
+    # The key covers the model parameters this run actually uses, overrides included
+    run_config = get_run_context().config
+    llm_config = run_config.get("user_profile", {}).get("llm", {}) if run_config is not None else None
+    cache_key = make_llm_cache_key(provider, state, llm_config) if cache else None
+    if cache_key:
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            print(f"♻️ Reusing cached {provider} response for this prompt.")
+            emit_text_delta(cached.get("Text", ""))
+            return cached
     try:
-        match provider:
-            case "Pollinations_Text":
-                return await handle_pollinations_text(state)
-            case "Pollinations_Text_Advanced":
-                return await handle_pollinations_text_advanced(state)
-            case "Pollinations_Text_Completion":
-                return await handle_pollinations_text_completion(state)
-            case "OpenAI":
-                return await handle_openai_text(state)
-            case "HuggingFace":
-                return await handle_huggingface_text(state)
-            case "DeepSeek":
-                return await handle_deepseek_text(state)
-            case "Claude":
-                return await handle_claude_text(state)
-            case _:
-                raise ValueError(f"❌ Unsupported provider: {provider}")
+        hedging_config = get_hedging_config()
+        if hedging_config.get("enabled", False):
+            # Backups are tried healthiest first; open circuits go last
+            backups = [backup for backup in hedging_config.get("backup_providers", []) if backup != provider]
+            providers = [provider, *rank_providers("text", backups)]
+            # A backup that wins is cached (and labelled) as itself, not as the primary
+            answered_by, result = await hedged_text_request(
+                providers, state, route_text_provider, is_cacheable_response, hedging_config
+            )
+            if cache_key and answered_by != provider:
+                cache_key = make_llm_cache_key(answered_by, state, llm_config)
+            provider = answered_by
+        else:
+            result = await timed_provider_call(route_text_provider, provider, state, is_valid=is_cacheable_response)
     except Exception as e:
         print(f"❌ Error in dispatch_text_pipeline: {str(e)}")
+        reset_text_stream()
         return fallback_error_text(e)
+    if not is_cacheable_response(result):
+        # Whatever was streamed is not the post the caller gets back
+        reset_text_stream()
+    elif cache_key:
+        try:
+            await asyncio.to_thread(cache.set, cache_key, provider, result)
+        except Exception as e:
+            print(f"⚠️ Could not cache {provider} response: {e}")
+    return result
@@ -7,7 +7,7 @@ from utils.config.config_loader import config
 from ml_models.pollinations_generator import generate_image, generate_image_advanced
 from ml_models.openai_generator import OpenAIGenerator
 from ml_models.huggingface.utils.huggingface_generator_utils import HuggingFaceGenerator
-from socials.giphy import giphy_find_with_metadata
+from asset_fetch.giphy import giphy_find_with_metadata_async
 from circuitbreaker import circuit
 
 @circuit(failure_threshold=3, recovery_timeout=60)
@@ -45,7 +45,7 @@ async def handle_huggingface_image(creative_prompt_output: str) -> Dict[str, str
 @circuit(failure_threshold=3, recovery_timeout=60)
 async def handle_giphy_image(gif_tags: Optional[Dict]) -> Dict[str, str]:
     if gif_tags:
-        giphy_response = giphy_find_with_metadata(gif_tags.get("GifSearchTags", []))
+        giphy_response = await giphy_find_with_metadata_async(gif_tags.get("GifSearchTags", []))
         gif_obj = giphy_response.get("result", {}).get("gif")
         return {"GifAsset": gif_obj} if gif_obj else {"error": "No matching GIF found"}
     return {"error": "GIF tags generation failed"}
@@ -0,0 +1,230 @@
+"""
+provider_router.py
+- Latency-aware provider routing shared by the text and image dispatchers.
+- Every provider call updates an exponentially weighted moving average (EWMA) of latency and
+  error rate per (kind, provider, model). Providers are scored against the SLO in the
+  `provider_routing` config block, and "Auto" resolves to the best-scoring candidate.
+- Consecutive failures open a per-provider circuit that all dispatchers see, instead of each
+  handler tracking its own failures.
+"""
+import math
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from src.utils.config.config_loader import config
+
+AUTO_PROVIDER = "Auto"
+
+DEFAULT_EWMA_ALPHA = 0.2
+DEFAULT_SLO_LATENCY_SECONDS = 20.0
+DEFAULT_SLO_ERROR_RATE = 0.1
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RECOVERY_TIMEOUT_SECONDS = 60.0
+# Score given to providers with no samples yet: exactly on the SLO, so they are tried before
+# measured providers that miss it, and after ones that meet it
+UNMEASURED_SCORE = 2.0
+
+DEFAULT_CANDIDATES = {
+    "text": ["Pollinations_Text_Advanced", "Pollinations_Text", "OpenAI", "DeepSeek", "Claude"],
+    "image": ["Pollinations_Image_Get", "Pollinations_Image", "OpenAI", "HuggingFace"],
+}
+
+# Config path of each image provider's parameters (user_profile.llm.<...>)
+IMAGE_PROVIDER_PARAM_SECTIONS = {
+    "Pollinations_Image_Get": ("Pollinations", "pollinations_image_get"),
+    "Pollinations_Image": ("Pollinations",),
+    "OpenAI": ("OpenAI",),
+    "HuggingFace": ("HuggingFace",),
+}
+
+HealthKey = Tuple[str, str, str]
+
+
+@dataclass
+class ProviderHealth:
+    """Rolling health of one provider/model."""
+    kind: str
+    provider: str
+    model: str
+    latency_ewma: Optional[float] = None
+    error_ewma: float = 0.0
+    calls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_latency: Optional[float] = None
+    last_error: Optional[str] = None
+    open_until: float = 0.0
+
+
+class ProviderRouter:
+    """
+    Thread-safe health registry and SLO-based provider picker.
+
+    Args:
+        alpha: EWMA weight of the newest sample.
+        slo_latency_seconds: Latency target; a provider at the target scores 1 on latency.
+        slo_error_rate: Error-rate target; a provider at the target scores 1 on errors.
+        failure_threshold: Consecutive failures that open a provider's circuit.
+        recovery_timeout: Seconds an open circuit stays open before a trial call is allowed.
+    """
+
+    def __init__(
+        self,
+        alpha: float = DEFAULT_EWMA_ALPHA,
+        slo_latency_seconds: float = DEFAULT_SLO_LATENCY_SECONDS,
+        slo_error_rate: float = DEFAULT_SLO_ERROR_RATE,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT_SECONDS,
+    ):
+        self.alpha = alpha
+        self.slo_latency_seconds = slo_latency_seconds
+        self.slo_error_rate = slo_error_rate
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._health: Dict[HealthKey, ProviderHealth] = {}
+
+    def _entry(self, kind: str, provider: str, model: str) -> ProviderHealth:
+        # Caller must hold self._lock
+        key = (kind, provider, model)
+        if key not in self._health:
+            self._health[key] = ProviderHealth(kind=kind, provider=provider, model=model)
+        return self._health[key]
+
+    def record(self, kind: str, provider: str, model: str, seconds: float, ok: bool, error: Optional[str] = None) -> None:
+        """Adds one call outcome to the provider's EWMAs and circuit state."""
+        with self._lock:
+            health = self._entry(kind, provider, model)
+            health.calls += 1
+            health.last_latency = seconds
+            health.error_ewma += self.alpha * ((0.0 if ok else 1.0) - health.error_ewma)
+            if ok:
+                health.latency_ewma = seconds if health.latency_ewma is None else (
+                    health.latency_ewma + self.alpha * (seconds - health.latency_ewma)
+                )
+                health.consecutive_failures = 0
+                health.open_until = 0.0
+                return
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.last_error = error
+            if health.consecutive_failures >= self.failure_threshold:
+                if health.open_until <= time.monotonic():
+                    print(f"🔌 Circuit opened for {kind} provider {provider} ({model}) after {health.consecutive_failures} failures.")
+                health.open_until = time.monotonic() + self.recovery_timeout
+
+    def _score(self, health: Optional[ProviderHealth]) -> float:
+        if health is None or (health.latency_ewma is None and health.failures == 0):
+            return UNMEASURED_SCORE
+        latency = health.latency_ewma if health.latency_ewma is not None else self.slo_latency_seconds * 2
+        return latency / self.slo_latency_seconds + health.error_ewma / self.slo_error_rate
+
+    def score(self, kind: str, provider: str, model: str) -> float:
+        """SLO-normalized cost (lower is better); infinite while the provider's circuit is open."""
+        with self._lock:
+            health = self._health.get((kind, provider, model))
+            if health is not None and health.open_until > time.monotonic():
+                return math.inf
+            return self._score(health)
+
+    def rank(self, kind: str, candidates: Sequence[Tuple[str, str]]) -> List[str]:
+        """
+        Orders (provider, model) candidates best first. Providers with an open circuit are moved
+        to the end rather than dropped, so there is always something to try.
+        """
+        scored = [(self.score(kind, provider, model), index, provider) for index, (provider, model) in enumerate(candidates)]
+        return [provider for _, _, provider in sorted(scored)]
+
+    def choose(self, kind: str, candidates: Sequence[Tuple[str, str]]) -> Optional[str]:
+        ranked = self.rank(kind, candidates)
+        return ranked[0] if ranked else None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Snapshot of every tracked provider with its current score and circuit state."""
+        now = time.monotonic()
+        with self._lock:
+            entries = [asdict(health) for health in self._health.values()]
+        for entry in entries:
+            entry["circuit_open"] = entry["open_until"] > now
+            entry["score"] = self.score(entry["kind"], entry["provider"], entry["model"])
+            if math.isinf(entry["score"]):
+                entry["score"] = None
+            del entry["open_until"]
+        return sorted(entries, key=lambda entry: (entry["kind"], entry["score"] is None, entry["score"] or 0))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._health.clear()
+
+
+def get_routing_config() -> Mapping[str, Any]:
+    return config.get("provider_routing", {}) or {}
+
+
+def routing_candidates(kind: str, routing_config: Optional[Mapping[str, Any]] = None) -> List[str]:
+    """Providers "Auto" may pick for `kind` ("text" or "image")."""
+    routing_config = routing_config if routing_config is not None else get_routing_config()
+    return list(routing_config.get(f"{kind}_candidates") or DEFAULT_CANDIDATES.get(kind, []))
+
+
+def provider_model(kind: str, provider: str) -> str:
+    """Model configured for a provider, used to keep separate stats per model."""
+    if kind == "text":
+        from src.utils.helpers.llm_cache_helper import provider_params
+        params = provider_params(provider)
+    else:
+        params = config.get("user_profile", {}).get("llm", {})
+        for part in IMAGE_PROVIDER_PARAM_SECTIONS.get(provider, (provider,)):
+            params = params.get(part, {}) if isinstance(params, Mapping) else {}
+    model = params.get("model") if isinstance(params, Mapping) else None
+    return str(model) if model else "default"
+
+
+def rank_providers(kind: str, providers: Sequence[str], router: Optional["ProviderRouter"] = None) -> List[str]:
+    """Ranks provider names using their configured models."""
+    router = router or get_provider_router()
+    return router.rank(kind, [(provider, provider_model(kind, provider)) for provider in providers])
+
+
+def resolve_provider(kind: str, provider: str, router: Optional["ProviderRouter"] = None) -> str:
+    """Resolves "Auto" to the best-scoring candidate; other names are returned unchanged."""
+    if provider != AUTO_PROVIDER:
+        return provider
+    ranked = rank_providers(kind, routing_candidates(kind), router)
+    if not ranked:
+        raise ValueError(f"❌ No {kind} provider candidates configured for Auto routing.")
+    print(f"🧭 Auto routing picked {kind} provider: {ranked[0]}")
+    return ranked[0]
+
+
+def record_provider_call(
+    kind: str,
+    provider: str,
+    seconds: float,
+    ok: bool,
+    error: Optional[str] = None,
+    router: Optional["ProviderRouter"] = None,
+) -> None:
+    (router or get_provider_router()).record(kind, provider, provider_model(kind, provider), seconds, ok, error)
+
+
+_provider_router: Optional[ProviderRouter] = None
+_provider_router_lock = threading.Lock()
+
+
+def get_provider_router() -> ProviderRouter:
+    """Returns the process-wide router, configured from the `provider_routing` config block."""
+    global _provider_router
+    if _provider_router is None:
+        with _provider_router_lock:
+            if _provider_router is None:
+                routing_config = get_routing_config()
+                _provider_router = ProviderRouter(
+                    alpha=routing_config.get("ewma_alpha", DEFAULT_EWMA_ALPHA),
+                    slo_latency_seconds=routing_config.get("slo_latency_seconds", DEFAULT_SLO_LATENCY_SECONDS),
+                    slo_error_rate=routing_config.get("slo_error_rate", DEFAULT_SLO_ERROR_RATE),
+                    failure_threshold=routing_config.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD),
+                    recovery_timeout=routing_config.get("recovery_timeout_seconds", DEFAULT_RECOVERY_TIMEOUT_SECONDS),
+                )
+    return _provider_router
@@ -0,0 +1,263 @@
+"""
+hedged_dispatch.py
+- Hedged requests across text providers.
+- The primary provider starts alone; if it has not answered within its recent pN latency, the
+  next backup is started as well (a failed or invalid answer starts it right away). The first
+  valid structured response wins and every other in-flight request is cancelled.
+- While text is streamed to a listener, TextStreamGate keeps the racers from interleaving:
+  one attempt streams, the others buffer until they win or are dropped.
+"""
+import asyncio
+import dataclasses
+import math
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple
+from src.utils.config.config_loader import config
+from src.utils.dispatch.provider_router import record_provider_call
+from src.utils.helpers.prompt.run_context import (
+    RunContext,
+    emit_text_delta,
+    get_run_context,
+    reset_text_stream,
+    use_run_context,
+    wants_text_stream,
+)
+
+ProviderCall = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+ResponseCheck = Callable[[Any], bool]
+
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_HEDGE_DELAY_SECONDS = 8.0
+DEFAULT_MIN_HEDGE_DELAY_SECONDS = 0.5
+MIN_LATENCY_SAMPLES = 5
+LATENCY_WINDOW = 200
+
+
+class LatencyTracker:
+    """Rolling window of successful response times per provider."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(provider, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, provider: str, percentile: float, min_samples: int = MIN_LATENCY_SAMPLES) -> Optional[float]:
+        """Nearest-rank percentile, or None until `min_samples` responses have been seen."""
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        rank = max(1, math.ceil(percentile / 100 * len(samples)))
+        return samples[min(rank, len(samples)) - 1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+_latency_tracker = LatencyTracker()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Returns the process-wide provider latency tracker."""
+    return _latency_tracker
+
+
+class TextStreamGate:
+    """
+    Routes the text deltas of concurrent hedged attempts to one run's listener.
+    The first attempt to stream text owns the listener; the others buffer theirs. When an
+    attempt that streamed is dropped, or another one wins, the listener is reset and the
+    winner's buffered text is replayed, so the client only ever sees one generation.
+    """
+
+    def __init__(self, run_context: RunContext):
+        self._run_context = run_context
+        self._owner: Optional[str] = None
+        self._buffers: Dict[str, List[str]] = {}
+
+    def attempt_context(self, provider: str) -> RunContext:
+        """The run as seen by one attempt: same state and config, gated text listeners."""
+        return dataclasses.replace(
+            self._run_context,
+            on_text_delta=lambda text: self._delta(provider, text),
+            on_text_reset=lambda: self.drop(provider),
+        )
+
+    def drop(self, provider: str) -> None:
+        """Discards an attempt's text (it failed, was reset, or lost the race)."""
+        if provider != self._owner:
+            self._buffers.pop(provider, None)
+            return
+        self._owner = None
+        self._forward(None)
+        if self._buffers:
+            # Hand the stream to the attempt that has been buffering the longest
+            self._owner = next(iter(self._buffers))
+            self._forward("".join(self._buffers.pop(self._owner)))
+
+    def settle(self, winner: str) -> None:
+        """Makes the winner's text the streamed text."""
+        if winner != self._owner:
+            if self._owner is not None:
+                self._forward(None)
+            self._owner = winner
+            self._forward("".join(self._buffers.get(winner, [])))
+        self._buffers.clear()
+
+    def _delta(self, provider: str, text: str) -> None:
+        if self._owner is None:
+            # First to stream (or next after a dropped owner): catch up on its buffered text
+            self._owner = provider
+            text = "".join(self._buffers.pop(provider, [])) + text
+        if provider == self._owner:
+            self._forward(text)
+        else:
+            self._buffers.setdefault(provider, []).append(text)
+
+    def _forward(self, text: Optional[str]) -> None:
+        # None means reset; either way the real listener is the run's, not the attempt's
+        with use_run_context(self._run_context):
+            if text is None:
+                reset_text_stream()
+            else:
+                emit_text_delta(text)
+
+
+def get_hedging_config() -> Mapping[str, Any]:
+    return config.get("ai", {}).get("text", {}).get("generate_text", {}).get("hedging", {}) or {}
+
+
+def hedge_delay(
+    provider: str,
+    hedging_config: Optional[Mapping[str, Any]] = None,
+    tracker: Optional[LatencyTracker] = None,
+) -> float:
+    """
+    Seconds to wait on `provider` before starting a backup: its recent pN latency, or
+    `default_delay_seconds` until enough samples exist, never below `min_delay_seconds`.
+    """
+    hedging_config = hedging_config if hedging_config is not None else get_hedging_config()
+    tracker = tracker or get_latency_tracker()
+    observed = tracker.percentile(provider, hedging_config.get("percentile", DEFAULT_HEDGE_PERCENTILE))
+    delay = observed if observed is not None else hedging_config.get("default_delay_seconds", DEFAULT_HEDGE_DELAY_SECONDS)
+    return max(float(delay), float(hedging_config.get("min_delay_seconds", DEFAULT_MIN_HEDGE_DELAY_SECONDS)))
+
+
+async def timed_provider_call(
+    call: ProviderCall,
+    provider: str,
+    state: Dict[str, Any],
+    tracker: Optional[LatencyTracker] = None,
+    is_valid: Optional[ResponseCheck] = None,
+) -> Dict[str, Any]:
+    """
+    Runs one provider call, records its latency when the response is valid, and reports the
+    outcome to the provider router. Cancelled (out-raced) calls are not counted.
+    """
+    tracker = tracker or get_latency_tracker()
+    started = time.monotonic()
+    try:
+        result = await call(provider, state)
+    except Exception as e:
+        record_provider_call("text", provider, time.monotonic() - started, ok=False, error=str(e))
+        raise
+    elapsed = time.monotonic() - started
+    ok = is_valid is None or is_valid(result)
+    if ok:
+        tracker.record(provider, elapsed)
+    record_provider_call("text", provider, elapsed, ok=ok, error=None if ok else "Unusable response")
+    return result
+
+
+async def hedged_text_request(
+    providers: Sequence[str],
+    state: Dict[str, Any],
+    call: ProviderCall,
+    is_valid: ResponseCheck,
+    hedging_config: Optional[Mapping[str, Any]] = None,
+    tracker: Optional[LatencyTracker] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Races `providers` in order with staggered starts.
+
+    Args:
+        providers: Primary provider first, then backups in the order they should be tried.
+        state: Prompt state passed to every call.
+        call: Async provider call, e.g. route_text_provider.
+        is_valid: Decides whether a response can win.
+        hedging_config: The `hedging` config block (percentile, default/min delay).
+    Returns:
+        Tuple[str, Dict[str, Any]]: (provider that answered, response) for the first valid
+        response, or for the last unusable one if none was valid.
+    Raises:
+        The last provider error if every provider failed without an answer.
+    """
+    providers = list(dict.fromkeys(providers))
+    if not providers:
+        raise ValueError("❌ No text providers to dispatch to.")
+    tracker = tracker or get_latency_tracker()
+    pending: Dict[asyncio.Task, str] = {}
+    remaining: List[str] = list(providers)
+    last_result: Optional[Tuple[str, Dict[str, Any]]] = None
+    last_error: Optional[BaseException] = None
+    gate = TextStreamGate(get_run_context()) if wants_text_stream() else None
+
+    def start_next() -> None:
+        provider = remaining.pop(0)
+        if pending:
+            print(f"🏁 Hedging text request with backup provider: {provider}")
+        # The task copies the active context, so each attempt streams through the gate
+        with use_run_context(gate.attempt_context(provider)) if gate else nullcontext():
+            task = asyncio.create_task(timed_provider_call(call, provider, state, tracker, is_valid))
+        pending[task] = provider
+
+    start_next()
+    try:
+        while pending:
+            timeout = None
+            if remaining:
+                # The newest request gets its own pN latency before the next backup starts
+                timeout = hedge_delay(list(pending.values())[-1], hedging_config, tracker)
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                start_next()
+                continue
+            for task in done:
+                provider = pending.pop(task)
+                if task.exception() is not None:
+                    last_error = task.exception()
+                    print(f"⚠️ Text provider {provider} failed: {last_error}")
+                    if gate:
+                        gate.drop(provider)
+                    continue
+                result = task.result()
+                if is_valid(result):
+                    if provider != providers[0]:
+                        print(f"✅ Backup provider {provider} answered first.")
+                    if gate:
+                        gate.settle(provider)
+                    return provider, result
+                print(f"⚠️ Text provider {provider} returned an unusable response.")
+                if gate:
+                    gate.drop(provider)
+                last_result = (provider, result)
+            # A failed provider is replaced right away instead of after the hedge delay
+            if remaining:
+                start_next()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    if last_result is not None:
+        return last_result
+    raise last_error or RuntimeError("❌ All text providers failed.")
@@ -9,10 +9,15 @@ from ml_models.openai_generator import OpenAIGenerator
 from ml_models.huggingface.utils.huggingface_generator_utils import HuggingFaceGenerator
 from ml_models.deepseek.utils.deepseek_generator_utils import DeepSeekGenerator
 from ml_models.claude.utils.claude_generator_utils import ClaudeGenerator
-import asyncio
 import json
 from utils.dispatch.text.text_utils import clean_post_text
 from circuitbreaker import circuit
+from src.utils.helpers.prompt.run_context import get_run_context, wants_text_stream
+
+def pollinations_config() -> Dict[str, Any]:
+    """Returns the Pollinations settings of the active run's config (the loaded config by default)."""
+    run_config = get_run_context().config or config
+    return run_config["user_profile"]["llm"]["Pollinations"]
 
 # * Provider handler: Pollinations_Text
 @circuit(failure_threshold=3, recovery_timeout=60)
@@ -28,8 +33,9 @@ async def handle_pollinations_text(state: Dict[str, Any]) -> Dict[str, Any]:
 # * Provider handler: Pollinations_Text_Advanced
 @circuit(failure_threshold=3, recovery_timeout=60)
 async def handle_pollinations_text_advanced(state: Dict[str, Any]) -> Dict[str, Any]:
-    advanced_cfg = config["user_profile"]["llm"]["Pollinations"]["native_post"]
-    messages = advanced_cfg.get("messages", [])
+    advanced_cfg = pollinations_config()["native_post"]
+    # Copy the configured messages so concurrent runs don't overwrite each other's prompt
+    messages = [dict(msg) for msg in advanced_cfg.get("messages", [])]
     for msg in messages:
         if msg["role"] == "user":
             msg["content"] = state["prompt"]
@@ -39,7 +45,8 @@ async def handle_pollinations_text_advanced(state: Dict[str, Any]) -> Dict[str,
         "seed": advanced_cfg.get("seed", 42),
         "system": advanced_cfg.get("system", "You're a helpful assistant."),
         "json": advanced_cfg.get("json", True),
-        "stream": advanced_cfg.get("stream", False),
+        # Stream whenever someone is listening for partial text (e.g. an API preview)
+        "stream": advanced_cfg.get("stream", False) or wants_text_stream(),
         "private": advanced_cfg.get("private", True),
         "reasoning_effort": advanced_cfg.get("reasoning_effort", "medium"),
     }
@@ -64,9 +71,11 @@ async def handle_pollinations_text_advanced(state: Dict[str, Any]) -> Dict[str,
 @circuit(failure_threshold=3, recovery_timeout=60)
 async def handle_pollinations_text_completion(state: Dict[str, Any]) -> Dict[str, Any]:
     payload = build_pollinations_payload(state)
-    endpoint = config["user_profile"]["llm"]["Pollinations"]["openai_compatible"]["endpoint"]
+    endpoint = pollinations_config()["openai_compatible"]["endpoint"]
     llm_response = await call_openai_compatible_endpoint(endpoint, payload=payload)
-    tool_calls = llm_response["choices"][0]["message"]["tool_calls"]
+    if llm_response.get("status") != "success":
+        raise RuntimeError(f"Pollinations completion failed: {llm_response.get('details')}")
+    tool_calls = llm_response["response"]["choices"][0]["message"]["tool_calls"]
     generate_post_call = next(call for call in tool_calls if call["function"]["name"] == "generate_post")
     post_data = json.loads(generate_post_call["function"]["arguments"])
     post_text = post_data["Text"]
@@ -102,27 +111,23 @@ async def handle_pollinations_text_completion(state: Dict[str, Any]) -> Dict[str
 # * Provider handler: OpenAI
 @circuit(failure_threshold=3, recovery_timeout=60)
 async def handle_openai_text(state: Dict[str, Any]) -> Dict[str, Any]:
-    await asyncio.sleep(0)  # placeholder for async consistency
-    return await OpenAIGenerator.send_message(state["prompt"])
+    return await OpenAIGenerator().send_message_async(state["prompt"])
 
 # * Provider handler: HuggingFace
 @circuit(failure_threshold=3, recovery_timeout=60)
 async def handle_huggingface_text(state: Dict[str, Any]) -> Dict[str, Any]:
-    await asyncio.sleep(0)
-    result = HuggingFaceGenerator.send_message(state["prompt"])
+    result = await HuggingFaceGenerator().send_message_async(state["prompt"])
     return result.get("response", {})
 
 # * Provider handler: DeepSeek
 @circuit(failure_threshold=3, recovery_timeout=60)
 async def handle_deepseek_text(state: Dict[str, Any]) -> Dict[str, Any]:
-    await asyncio.sleep(0)
-    return await DeepSeekGenerator.send_message(state["prompt"])
+    return await DeepSeekGenerator().send_message_async(state["prompt"])
 
 # * Provider handler: Claude
 @circuit(failure_threshold=3, recovery_timeout=60)
 async def handle_claude_text(state: Dict[str, Any]) -> Dict[str, Any]:
-    await asyncio.sleep(0)
-    return await ClaudeGenerator.send_message(state["prompt"])
+    return await ClaudeGenerator().send_message_async(state["prompt"])
 
 # * Fallback for unhandled providers or errors
 def fallback_error_text(e: Exception) -> Dict[str, Any]:
@@ -130,8 +135,8 @@ def fallback_error_text(e: Exception) -> Dict[str, Any]:
 
 # * Helper: Build pollinations payload (moved from main pipeline)
 def build_pollinations_payload(state: Dict[str, Any]) -> Dict[str, Any]:
-    pollinations_cfg = config["user_profile"]["llm"]["Pollinations"]["openai_compatible"]
-    messages = pollinations_cfg.get("messages", [])
+    pollinations_cfg = pollinations_config()["openai_compatible"]
+    messages = [dict(message) for message in pollinations_cfg.get("messages", [])]
     for message in messages:
         if message["role"] == "user":
             message["content"] = state["prompt"]
@@ -145,7 +150,7 @@ def build_pollinations_payload(state: Dict[str, Any]) -> Dict[str, Any]:
         "max_completion_tokens": pollinations_cfg.get("max_completion_tokens", 256),
         "stop": pollinations_cfg.get("stop"),
         "seed": pollinations_cfg.get("seed"),
-        "stream": pollinations_cfg.get("stream"),
+        "stream": pollinations_cfg.get("stream") or wants_text_stream(),
         "stream_options": pollinations_cfg.get("stream_options"),
         "suffix": pollinations_cfg.get("suffix"),
         "tool_choice": pollinations_cfg.get("tool_choice"),
@@ -0,0 +1,173 @@
+"""
+avatar_cache_helper.py
+- Shared avatar resolver for the RSS bots.
+- Scrapes the og:image of a profile/home page at most once per TTL per (platform, identity).
+  Results live in a TTLCache and are persisted to _temp/avatar_cache.json so restarts don't refetch.
+"""
+import os
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+from bs4 import BeautifulSoup
+from src.utils.helpers.http_client_helper import get_session
+from src.utils.helpers.ttl_cache_helper import TTLCache
+
+session = get_session()
+
+# Define the directory and ensure it exists
+TEMP_FOLDER = '_temp'
+os.makedirs(TEMP_FOLDER, exist_ok=True)
+
+# Define the storage file path within the _temp directory
+AVATAR_CACHE_FILE = os.path.join(TEMP_FOLDER, 'avatar_cache.json')
+
+AVATAR_TTL_SECONDS = 7 * 24 * 60 * 60
+# Failed lookups are remembered briefly so a broken site isn't scraped on every poll
+AVATAR_FAILURE_TTL_SECONDS = 60 * 60
+AVATAR_MAX_ENTRIES = 1024
+USER_AGENT = "Mozilla/5.0"
+
+
+class AvatarCache:
+    """
+    Avatar URLs keyed by "platform:identity": a TTLCache whose entries are persisted as JSON.
+    Each entry keeps its fetch time on disk, so a restart only loads what has not expired.
+    """
+
+    def __init__(
+        self,
+        path: str = AVATAR_CACHE_FILE,
+        ttl: float = AVATAR_TTL_SECONDS,
+        failure_ttl: float = AVATAR_FAILURE_TTL_SECONDS,
+        maxsize: int = AVATAR_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._entries = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._loaded = False
+
+    @staticmethod
+    def make_key(platform: str, identity: str) -> str:
+        return f"{platform.lower()}:{identity.strip().rstrip('/').lower()}"
+
+    def _entry_ttl(self, entry: Dict[str, Any]) -> float:
+        return self.ttl if entry.get("url") else self.failure_ttl
+
+    def _load(self) -> None:
+        # Caller must hold self._lock
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            print("⚠️ Avatar cache file is corrupted. Starting with an empty avatar cache.")
+            return
+        if not isinstance(data, dict):
+            return
+        now = time.time()
+        for key, entry in data.items():
+            if not isinstance(entry, dict):
+                continue
+            # Carry the time left from the original fetch over to the in-memory TTL
+            remaining = self._entry_ttl(entry) - (now - entry.get("fetched_at", 0))
+            if remaining > 0:
+                self._entries.set(key, entry, ttl=remaining)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cache entry for a key if it has not expired, else None."""
+        with self._lock:
+            self._load()
+        return self._entries.get(key)
+
+    def store(self, key: str, url: Optional[str]) -> None:
+        """Records a resolved avatar URL (or None for a failed lookup) and persists the cache."""
+        entry = {"url": url, "fetched_at": time.time()}
+        with self._lock:
+            self._load()
+            self._entries.set(key, entry, ttl=self._entry_ttl(entry))
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump(dict(self._entries.items()), file, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def key_lock(self, key: str) -> threading.Lock:
+        """Per-key lock so concurrent callers for the same avatar share one scrape."""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._loaded = True
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+_avatar_cache = AvatarCache()
+
+
+def get_avatar_cache() -> AvatarCache:
+    """Returns the process-wide avatar cache."""
+    return _avatar_cache
+
+
+def fetch_og_image(page_url: str, platform: str = "") -> Optional[str]:
+    """
+    Scrapes the Open Graph image (og:image) from a page.
+
+    Returns:
+        Optional[str]: The image URL, or None if the page has none or the request failed.
+    """
+    try:
+        response = session.get(page_url, headers={"User-Agent": USER_AGENT}, timeout=15)
+        if response.status_code == 200:
+            soup = BeautifulSoup(response.text, "html.parser")
+            og_image = soup.find("meta", property="og:image")
+            if og_image and og_image.get("content"):
+                return og_image["content"]
+    except Exception as e:
+        print(f"Error fetching {platform + ' ' if platform else ''}avatar: {e}")
+    return None
+
+
+def resolve_avatar(
+    platform: str,
+    identity: str,
+    page_url: str,
+    default_url: str,
+    cache: Optional[AvatarCache] = None,
+) -> str:
+    """
+    Returns the avatar for (platform, identity), scraping `page_url` only on a cache miss.
+
+    Args:
+        platform (str): Platform name, e.g. "Medium".
+        identity (str): Username or site URL identifying the account.
+        page_url (str): Page whose og:image is the avatar.
+        default_url (str): Fallback returned when no avatar can be found. Never cached.
+        cache (Optional[AvatarCache]): Cache to use. Defaults to the shared cache.
+
+    Returns:
+        str: Avatar URL or `default_url`.
+    """
+    cache = cache or get_avatar_cache()
+    key = AvatarCache.make_key(platform, identity)
+
+    entry = cache.lookup(key)
+    if entry is None:
+        with cache.key_lock(key):
+            # Another thread may have resolved it while we waited
+            entry = cache.lookup(key)
+            if entry is None:
+                url = fetch_og_image(page_url, platform)
+                cache.store(key, url)
+                entry = {"url": url}
+    return entry.get("url") or default_url
@@ -1,8 +1,9 @@
 import os
 import json
+import threading
 from src.utils.index import parse_html_blog_content
-from typing import List, Dict
-from bs4 import BeautifulSoup
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils.helpers.html_extractor import extract_html
 
 # Define the directory and ensure it exists
 TEMP_FOLDER = '_temp'
@@ -11,26 +12,118 @@ os.makedirs(TEMP_FOLDER, exist_ok=True)
 # Define the storage file path within the _temp directory
 STORAGE_FILE = os.path.join(TEMP_FOLDER, 'blog_cache.json')
 
-def load_blog_cache() -> List[Dict]:
-    """Loads the blog cache from JSON file."""
-    if not os.path.exists(STORAGE_FILE):
-        return []
-    with open(STORAGE_FILE, 'r') as file:
+class BlogCache:
+    """
+    In-process view of the blog cache file, shared by every caller.
+
+    The file is read and structurally validated once, then reused until its mtime or size
+    changes, so one tick parses the JSON at most once no matter how many helpers ask for it.
+    Returned data is shared; write changes back with save() instead of mutating it in place.
+    """
+
+    def __init__(self, path: str = STORAGE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._data: Any = []
+        self._valid = False
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self) -> None:
+        # Caller must hold self._lock
+        signature = self._file_signature()
+        if signature is not None and signature == self._signature:
+            return
+        self._signature = signature
+        self._data, self._valid = [], False
+        if signature is None:
+            return
         try:
-            return json.load(file)
+            with open(self.path, 'r') as file:
+                self._data = json.load(file)
         except json.JSONDecodeError:
             print("⚠️ Cache file is corrupted. Returning empty cache.")
-            return []
+            return
+        self._valid = _validate_blog_cache(self._data)
+
+    def get(self) -> Any:
+        """Returns the parsed cache (dict with 'blogs', legacy list, or [] when missing/corrupted)."""
+        with self._lock:
+            self._refresh()
+            return self._data
+
+    def is_valid(self) -> bool:
+        """True if the cache is a dict whose 'blogs' list entries all carry an 'id'."""
+        with self._lock:
+            self._refresh()
+            return self._valid
+
+    def latest_blog_id(self) -> Optional[str]:
+        """Returns the id of the newest cached blog, if the cache is valid and non-empty."""
+        with self._lock:
+            self._refresh()
+            if not self._valid or not self._data["blogs"]:
+                return None
+            return self._data["blogs"][0]["id"]
+
+    def save(self, blog_entries: Any) -> None:
+        """Writes the cache file and keeps the in-memory copy in sync."""
+        with self._lock:
+            with open(self.path, 'w') as file:
+                json.dump(blog_entries, file, indent=2)
+            self._data = blog_entries
+            self._valid = _validate_blog_cache(blog_entries)
+            self._signature = self._file_signature()
+
+    def delete(self) -> bool:
+        """Deletes the cache file. Returns True if a file was removed."""
+        with self._lock:
+            self._signature, self._data, self._valid = None, [], False
+            if os.path.exists(self.path):
+                os.remove(self.path)
+                return True
+            return False
+
+
+def _validate_blog_cache(data: Any) -> bool:
+    if not isinstance(data, dict) or "blogs" not in data:
+        print("❌ Invalid blog cache structure. Expected dict with 'blogs' key.")
+        return False
+    blogs = data["blogs"]
+    if not isinstance(blogs, list):
+        print("❌ 'blogs' key is not a list.")
+        return False
+    missing_ids = [post for post in blogs if not isinstance(post, dict) or "id" not in post]
+    if missing_ids:
+        print(f"❌ {len(missing_ids)} cached blog entries are missing 'id'.")
+        return False
+    return True
+
+
+_blog_cache = BlogCache()
+
+
+def get_blog_cache() -> BlogCache:
+    """Returns the process-wide blog cache."""
+    return _blog_cache
+
+def load_blog_cache() -> Any:
+    """Loads the blog cache (parsed once per file change)."""
+    return _blog_cache.get()
 
 def save_blog_cache(blog_entries: List[Dict]) -> None:
     """Saves blog cache to JSON file."""
-    with open(STORAGE_FILE, 'w') as file:
-        json.dump(blog_entries, file, indent=2)
+    _blog_cache.save(blog_entries)
 
 def delete_blog_cache() -> None:
     """Deletes the blog cache file if it exists."""
-    if os.path.exists(STORAGE_FILE):
-        os.remove(STORAGE_FILE)
+    if _blog_cache.delete():
         print("🗑️ Blog cache deleted.")
     else:
         print("ℹ️ No blog cache file to delete.")
@@ -38,72 +131,20 @@ def delete_blog_cache() -> None:
 def is_blog_cache_valid() -> bool:
     """
     Checks if the blog cache file exists and contains a valid Medium blog dictionary structure.
-    
+
     Returns:
         bool: True if valid, False otherwise.
     """
-    print(f"🧪 Checking if cache file exists at: {STORAGE_FILE}")
-    if not os.path.exists(STORAGE_FILE):
-        print("❌ Cache file does not exist.")
-        return False
-
-    try:
-        with open(STORAGE_FILE, 'r') as file:
-            raw = file.read()
-            print(f"📦 Raw cache content:\n{raw[:300]}...")
-            data = json.loads(raw)
-            print(f"✅ Parsed data type: {type(data).__name__}")
-
-            if not isinstance(data, dict) or "blogs" not in data:
-                print("❌ Invalid structure. Expected dict with 'blogs' key.")
-                return False
-
-            blogs = data["blogs"]
-            if not isinstance(blogs, list):
-                print("❌ 'blogs' key is not a list.")
-                return False
-
-            missing_ids = [post for post in blogs if "id" not in post]
-            if missing_ids:
-                print(f"❌ These entries are missing 'id':\n{missing_ids}")
-                return False
-
-            print("✅ Blog cache is valid.")
-            return True
-
-    except Exception as e:
-        print(f"❌ Error reading or parsing cache file: {e}")
-        return False
+    valid = _blog_cache.is_valid()
+    print(f"🧪 Blog cache at {STORAGE_FILE} is {'valid' if valid else 'missing or invalid'}.")
+    return valid
 
 def extract_blog_media(content_html: str) -> Dict[str, List[str]]:
     """Extracts links, images, videos, and embeds from the blog content."""
-    soup = BeautifulSoup(content_html, "html.parser")
-    
-    # Extract standard media
-    links = [a['href'] for a in soup.find_all('a', href=True)]
-    images = [img['src'] for img in soup.find_all('img', src=True)]
-    embeds = [script['src'] for script in soup.find_all('script', src=True)]
-    
-    # Extract videos from iframe and video tags
-    videos = []
-    for video_tag in soup.find_all(['iframe', 'video']):
-        if video_tag.name == 'iframe':
-            src = video_tag.get('src')
-            if src:
-                videos.append(src)
-        elif video_tag.name == 'video':
-            src = video_tag.get('src')
-            if src:
-                videos.append(src)
-            # Also check for source tags within video elements
-            for source in video_tag.find_all('source'):
-                src = source.get('src')
-                if src:
-                    videos.append(src)
-    
+    extraction = extract_html(content_html)
     return {
-        "links": links,
-        "images": images,
-        "embeds": embeds,
-        "videos": videos
-    }
\ No newline at end of file
+        "links": [link.href for link in extraction.links if link.href],
+        "images": [image.src for image in extraction.images],
+        "embeds": list(extraction.embeds),
+        "videos": list(extraction.videos),
+    }
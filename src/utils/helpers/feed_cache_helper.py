@@ -0,0 +1,247 @@
+import os
+import json
+import asyncio
+import hashlib
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from src.utils.helpers.http_client_helper import get_session
+
+session = get_session()
+
+# Define the directory and ensure it exists
+TEMP_FOLDER = '_temp'
+os.makedirs(TEMP_FOLDER, exist_ok=True)
+
+# Define the storage file path within the _temp directory
+FEED_CACHE_FILE = os.path.join(TEMP_FOLDER, 'feed_cache.json')
+
+USER_AGENT = "Mozilla/5.0"
+
+BlogParser = Callable[[bytes], List[Dict[str, Any]]]
+
+
+# Raw HTML fields are kept in memory only; the cache file stays small
+HTML_BLOG_FIELDS = ("content", "summary")
+
+
+class FeedValidatorStore:
+    """
+    Persistent store of HTTP validators (ETag / Last-Modified), keyed by feed URL.
+
+    The file holds the validators, a hash of the last body and each blog's metadata (the
+    blog HTML is left out). Parsed blogs, HTML included, are kept in memory, so a feed that
+    answers 304 Not Modified (or returns a byte-identical body) is served without running
+    feedparser or BeautifulSoup again. Persisted validators are sent from a cold start too;
+    a 304 that arrives before the feed was parsed in this process triggers one plain refetch.
+    """
+
+    def __init__(self, path: str = FEED_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._parsed: Dict[str, List[Dict[str, Any]]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            entries: Dict[str, Dict[str, Any]] = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as file:
+                        data = json.load(file)
+                    if isinstance(data, dict):
+                        entries = {k: v for k, v in data.items() if isinstance(v, dict)}
+                except (OSError, json.JSONDecodeError):
+                    print("⚠️ Feed cache file is corrupted. Starting with an empty feed cache.")
+            self._entries = entries
+        return self._entries
+
+    def conditional_headers(self, feed_url: str) -> Dict[str, str]:
+        """Returns If-None-Match / If-Modified-Since headers from the stored validators of a feed."""
+        with self._lock:
+            entry = self._load().get(feed_url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get_blogs(self, feed_url: str) -> Optional[List[Dict[str, Any]]]:
+        """Returns the blogs parsed for a feed in this process, or None if it has not been parsed yet."""
+        with self._lock:
+            return self._parsed.get(feed_url)
+
+    def get_metadata(self, feed_url: str) -> Optional[Dict[str, Any]]:
+        """Returns the stored validators and blog metadata (no HTML) for a feed, if any."""
+        with self._lock:
+            entry = self._load().get(feed_url)
+        return dict(entry) if entry else None
+
+    def get_blogs_if_unchanged(self, feed_url: str, content: bytes) -> Optional[List[Dict[str, Any]]]:
+        """Returns the parsed blogs when a 200 body is byte-identical to the last one parsed."""
+        with self._lock:
+            blogs = self._parsed.get(feed_url)
+            entry = self._load().get(feed_url)
+        if blogs is not None and entry and entry.get("content_sha256") == _digest(content):
+            return blogs
+        return None
+
+    def update(
+        self,
+        feed_url: str,
+        content: bytes,
+        blogs: List[Dict[str, Any]],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Records validators and parsed blogs for a feed and persists the store."""
+        with self._lock:
+            self._parsed[feed_url] = blogs
+            self._load()[feed_url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_sha256": _digest(content),
+                "blogs": [_blog_metadata(blog) for blog in blogs],
+                "fetched_at": time.time(),
+            }
+            self._save()
+
+    def _save(self) -> None:
+        # Write to a unique temp file next to the cache and swap it in, so a crash or a
+        # concurrent writer never leaves a half-written cache behind
+        directory = os.path.dirname(self.path) or '.'
+        fd, tmp_path = tempfile.mkstemp(prefix='.feed_cache.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(self._entries, file)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def clear(self) -> None:
+        """Deletes every stored validator and the cache file."""
+        with self._lock:
+            self._entries = {}
+            self._parsed = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def _blog_metadata(blog: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in blog.items() if key not in HTML_BLOG_FIELDS}
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+_feed_validator_store = FeedValidatorStore()
+
+
+def get_feed_validator_store() -> FeedValidatorStore:
+    """Returns the process-wide feed validator store."""
+    return _feed_validator_store
+
+
+def _resolve_feed_response(
+    store: FeedValidatorStore,
+    feed_url: str,
+    status_code: int,
+    content: bytes,
+    headers: Any,
+    parse_blogs: BlogParser,
+) -> Optional[List[Dict[str, Any]]]:
+    """Shared 200/304 handling for the sync and async fetchers. Returns None if a plain refetch is needed."""
+    if status_code == 304:
+        cached = store.get_blogs(feed_url)
+        if cached is not None:
+            print(f"🟢 Feed not modified (304), reusing parsed blogs: {feed_url}")
+        return cached
+    if status_code != 200:
+        raise ValueError(f"Feed request failed with HTTP {status_code}: {feed_url}")
+    cached = store.get_blogs_if_unchanged(feed_url, content)
+    if cached is not None:
+        print(f"🟢 Feed body unchanged, reusing parsed blogs: {feed_url}")
+        return cached
+    blogs = parse_blogs(content)
+    store.update(
+        feed_url,
+        content,
+        blogs,
+        etag=headers.get("ETag"),
+        last_modified=headers.get("Last-Modified"),
+    )
+    return blogs
+
+
+def fetch_feed_blogs(
+    feed_url: str,
+    parse_blogs: BlogParser,
+    store: Optional[FeedValidatorStore] = None,
+    timeout: float = 15,
+) -> List[Dict[str, Any]]:
+    """
+    Fetches a feed with a conditional GET and returns its parsed blogs.
+
+    Args:
+        feed_url (str): The RSS feed URL.
+        parse_blogs (BlogParser): Turns the raw feed body into blog dictionaries. Only called when the feed changed.
+        store (Optional[FeedValidatorStore]): Validator store to use. Defaults to the shared store.
+        timeout (float): Request timeout in seconds.
+
+    Returns:
+        List[Dict[str, Any]]: Parsed blogs, served from the store when the feed is unchanged.
+    """
+    store = store or get_feed_validator_store()
+    headers = {"User-Agent": USER_AGENT, **store.conditional_headers(feed_url)}
+    response = session.get(feed_url, headers=headers, timeout=timeout)
+    blogs = _resolve_feed_response(
+        store, feed_url, response.status_code, response.content, response.headers, parse_blogs
+    )
+    if blogs is None:
+        # 304 without parsed blogs (cold start or cleared cache): ask for the full body
+        response = session.get(feed_url, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+        blogs = _resolve_feed_response(
+            store, feed_url, response.status_code, response.content, response.headers, parse_blogs
+        )
+    return blogs or []
+
+
+async def fetch_feed_conditional_async(
+    client: httpx.AsyncClient,
+    feed_url: str,
+    parse_blogs: BlogParser,
+    store: Optional[FeedValidatorStore] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of fetch_feed_blogs(). Parsing runs in a worker thread so the event
+    loop keeps serving other feeds.
+    """
+    store = store or get_feed_validator_store()
+    headers = {"User-Agent": USER_AGENT, **store.conditional_headers(feed_url)}
+    response = await client.get(feed_url, headers=headers, follow_redirects=True)
+    if response.status_code == 304 and store.get_blogs(feed_url) is None:
+        # Cold start: the validators came from the file but the blogs were never parsed here
+        response = await client.get(feed_url, headers={"User-Agent": USER_AGENT}, follow_redirects=True)
+    if response.status_code == 200 and store.get_blogs_if_unchanged(feed_url, response.content) is None:
+        blogs = await asyncio.to_thread(parse_blogs, response.content)
+        await asyncio.to_thread(
+            store.update,
+            feed_url,
+            response.content,
+            blogs,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return blogs
+    blogs = _resolve_feed_response(
+        store, feed_url, response.status_code, response.content, response.headers, parse_blogs
+    )
+    return blogs or []
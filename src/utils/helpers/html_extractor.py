@@ -0,0 +1,225 @@
+"""
+html_extractor.py
+- Single-pass HTML extraction for blog bodies.
+- Walks the markup once and collects text, links, images, videos, embeds, and the
+  first image / iframe / blockquote link, so callers never re-parse the same post.
+- Uses lxml's streaming target parser when lxml is installed, otherwise the stdlib HTMLParser.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
+
+# Text inside these tags is never visible, matching BeautifulSoup's get_text()
+SKIP_TEXT_TAGS = frozenset({"script", "style", "template"})
+MEDIA_TAGS = frozenset({"iframe", "video"})
+EXTRACTION_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class ExtractedLink:
+    href: str
+    text: str
+
+
+@dataclass(frozen=True)
+class ExtractedImage:
+    src: str
+    alt: Optional[str]
+
+
+@dataclass(frozen=True)
+class ExtractedMedia:
+    tag: str
+    src: str
+
+
+@dataclass(frozen=True)
+class HtmlExtraction:
+    """Everything the bots and prompt builder need from one blog body."""
+    text: str
+    links: Tuple[ExtractedLink, ...]
+    images: Tuple[ExtractedImage, ...]
+    videos: Tuple[str, ...]  # iframe/video src plus <source> inside <video>
+    embeds: Tuple[str, ...]  # external <script src>
+    media: Tuple[ExtractedMedia, ...]  # iframe/video tags with a src
+    first_image: Optional[str]
+    first_video: Optional[str]  # first iframe embed
+    first_embed: Optional[str]  # first link inside the first blockquote
+
+
+class _ExtractionHandler:
+    """Parser-agnostic event handler. Both backends feed it start/end/data events."""
+
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+        self.links: List[ExtractedLink] = []
+        self.images: List[ExtractedImage] = []
+        self.videos: List[str] = []
+        self.embeds: List[str] = []
+        self.media: List[ExtractedMedia] = []
+        self.first_image: Optional[str] = None
+        self.first_video: Optional[str] = None
+        self.first_embed: Optional[str] = None
+
+        self._pending_text: List[str] = []
+        self._skip_depth = 0
+        self._video_depth = 0
+        self._open_links: List[Tuple[str, List[str]]] = []
+        self._blockquote_depth = 0
+        self._seen_blockquote = False
+
+    def start(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+        self._flush_text()
+        tag = tag.lower()
+        src = attrs.get("src")
+
+        if tag in SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+            if tag == "script" and src:
+                self.embeds.append(src)
+        elif tag == "a":
+            href = attrs.get("href")
+            if href is not None:
+                self._open_links.append((href, []))
+                if self._blockquote_depth and self.first_embed is None:
+                    self.first_embed = href
+        elif tag == "img":
+            if src:
+                self.images.append(ExtractedImage(src=src, alt=attrs.get("alt")))
+                if self.first_image is None:
+                    self.first_image = src
+        elif tag in MEDIA_TAGS:
+            if src:
+                self.videos.append(src)
+                self.media.append(ExtractedMedia(tag=tag, src=src))
+                if tag == "iframe" and self.first_video is None:
+                    self.first_video = src
+            if tag == "video":
+                self._video_depth += 1
+        elif tag == "source":
+            if src and self._video_depth:
+                self.videos.append(src)
+        elif tag == "blockquote":
+            # Only the first blockquote counts as the post's embed
+            if not self._seen_blockquote:
+                self._seen_blockquote = True
+                self._blockquote_depth = 1
+            elif self._blockquote_depth:
+                self._blockquote_depth += 1
+
+    def end(self, tag: str) -> None:
+        self._flush_text()
+        tag = tag.lower()
+        if tag in SKIP_TEXT_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "a":
+            if self._open_links:
+                self._close_link()
+        elif tag == "video":
+            self._video_depth = max(0, self._video_depth - 1)
+        elif tag == "blockquote" and self._blockquote_depth:
+            self._blockquote_depth -= 1
+
+    def data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._pending_text.append(data)
+
+    def close(self) -> HtmlExtraction:
+        self._flush_text()
+        while self._open_links:
+            self._close_link()
+        return HtmlExtraction(
+            text="\n".join(self.texts),
+            links=tuple(self.links),
+            images=tuple(self.images),
+            videos=tuple(self.videos),
+            embeds=tuple(self.embeds),
+            media=tuple(self.media),
+            first_image=self.first_image,
+            first_video=self.first_video,
+            first_embed=self.first_embed,
+        )
+
+    def _flush_text(self) -> None:
+        # Backends may split one text node across several data() calls
+        if not self._pending_text:
+            return
+        chunk = "".join(self._pending_text).strip()
+        self._pending_text = []
+        if chunk:
+            self.texts.append(chunk)
+            for _, link_text in self._open_links:
+                link_text.append(chunk)
+
+    def _close_link(self) -> None:
+        href, link_text = self._open_links.pop()
+        self.links.append(ExtractedLink(href=href, text="".join(link_text)))
+
+
+class _StdlibParser(HTMLParser):
+    def __init__(self, handler: _ExtractionHandler) -> None:
+        super().__init__(convert_charrefs=True)
+        self.handler = handler
+
+    def handle_starttag(self, tag, attrs):
+        self.handler.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handler.start(tag, dict(attrs))
+        self.handler.end(tag)
+
+    def handle_endtag(self, tag):
+        self.handler.end(tag)
+
+    def handle_data(self, data):
+        self.handler.data(data)
+
+
+def _extract_with_stdlib(html_content: str) -> HtmlExtraction:
+    handler = _ExtractionHandler()
+    parser = _StdlibParser(handler)
+    parser.feed(html_content)
+    parser.close()
+    return handler.close()
+
+
+def _extract_with_lxml(html_content: str) -> HtmlExtraction:
+    handler = _ExtractionHandler()
+    parser = _lxml_etree.HTMLParser(target=handler)
+    parser.feed(html_content)
+    return parser.close()
+
+
+def get_parser_backend() -> str:
+    """Returns the name of the parser backend in use ("lxml" or "html.parser")."""
+    return "lxml" if _lxml_etree is not None else "html.parser"
+
+
+@lru_cache(maxsize=EXTRACTION_CACHE_SIZE)
+def extract_html(html_content: str) -> HtmlExtraction:
+    """
+    Parses blog HTML once and returns every piece of content the pipeline uses.
+
+    Results are immutable and memoized by content, so the feed parser, the media
+    extractor, and the prompt builder share one parse of the same post.
+
+    Args:
+        html_content (str): Raw blog HTML.
+
+    Returns:
+        HtmlExtraction: Text, links, images, videos, embeds, and first-of-each.
+    """
+    if not html_content:
+        return _ExtractionHandler().close()
+    if _lxml_etree is not None:
+        try:
+            return _extract_with_lxml(html_content)
+        except Exception as e:
+            print(f"⚠️ lxml failed to parse blog HTML ({e}). Falling back to html.parser.")
+    return _extract_with_stdlib(html_content)
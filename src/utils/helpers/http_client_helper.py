@@ -0,0 +1,125 @@
+"""
+http_client_helper.py
+- Shared, pooled HTTP clients for every outbound call (LLMs, socials, asset fetchers, feeds).
+- One requests.Session (keep-alive, per-host pool limits, default timeouts) for sync code.
+- One httpx.AsyncClient per event loop (keep-alive, pool limits, default timeouts) for async code.
+"""
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+# * Sync pool: pool_connections = number of hosts kept, pool_maxsize = connections per host
+SYNC_POOL_HOSTS = 32
+SYNC_POOL_PER_HOST = 16
+# (connect, read) seconds, applied when a caller doesn't pass its own timeout
+DEFAULT_SYNC_TIMEOUT = (5, 60)
+
+# * Async pool
+ASYNC_MAX_CONNECTIONS = 100
+ASYNC_MAX_KEEPALIVE = 32
+ASYNC_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_ASYNC_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests sent without one."""
+
+    def __init__(self, *args, timeout=DEFAULT_SYNC_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_async_lock = threading.Lock()
+
+
+def build_session(
+    pool_hosts: int = SYNC_POOL_HOSTS,
+    pool_per_host: int = SYNC_POOL_PER_HOST,
+    timeout=DEFAULT_SYNC_TIMEOUT,
+) -> requests.Session:
+    """Builds a requests.Session with pooled keep-alive adapters and a default timeout."""
+    session = requests.Session()
+    adapter = TimeoutHTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_per_host, timeout=timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide pooled requests.Session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def build_async_client(**overrides) -> httpx.AsyncClient:
+    """Builds an httpx.AsyncClient with the shared pool limits and timeouts."""
+    options = {
+        "timeout": DEFAULT_ASYNC_TIMEOUT,
+        "limits": httpx.Limits(
+            max_connections=ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=ASYNC_MAX_KEEPALIVE,
+            keepalive_expiry=ASYNC_KEEPALIVE_EXPIRY,
+        ),
+    }
+    options.update(overrides)
+    return httpx.AsyncClient(**options)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the shared httpx.AsyncClient for the running event loop.
+
+    httpx connections are bound to the loop that opened them, so each loop gets its own
+    client; it is dropped automatically when the loop is garbage collected.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = build_async_client()
+            _async_clients[loop] = client
+    return client
+
+
+@asynccontextmanager
+async def pooled_async_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Drop-in replacement for `async with httpx.AsyncClient() as client:` that yields the
+    shared client and leaves it open for the next caller.
+    """
+    yield get_async_client()
+
+
+async def close_async_client() -> None:
+    """Closes the running loop's shared client (call on shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def close_session() -> None:
+    """Closes the shared requests.Session (call on shutdown)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
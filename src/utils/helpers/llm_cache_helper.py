@@ -0,0 +1,215 @@
+"""
+llm_cache_helper.py
+- Content-addressed cache of LLM text responses for dispatch_text_pipeline.
+- Keyed by a sha256 of (provider, model parameters, final prompt), persisted in SQLite under
+  _temp/, with a TTL and LRU eviction bounded by entry count and total size.
+- Re-running the same blog (retries after a failed social post, test runs, repeated API calls)
+  reuses the text that was already paid for.
+"""
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+from src.utils.config.config_loader import config
+from src.utils.index import get_env_variable
+
+# Define the directory and ensure it exists
+TEMP_FOLDER = '_temp'
+os.makedirs(TEMP_FOLDER, exist_ok=True)
+
+LLM_CACHE_DB_FILE = os.path.join(TEMP_FOLDER, 'llm_response_cache.db')
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+# Config path of the model parameters behind each text provider (user_profile.llm.<...>)
+PROVIDER_PARAM_SECTIONS = {
+    "Pollinations_Text": ("Pollinations",),
+    "Pollinations_Text_Advanced": ("Pollinations", "native_post"),
+    "Pollinations_Text_Completion": ("Pollinations", "openai_compatible"),
+    "OpenAI": ("OpenAI",),
+    "HuggingFace": ("HuggingFace",),
+    "DeepSeek": ("DeepSeek",),
+    "Claude": ("Anthropic",),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+"""
+
+
+def provider_params(provider: str, llm_config: Optional[Mapping[str, Any]] = None) -> Any:
+    """Returns the config subtree holding a provider's model parameters."""
+    params: Any = llm_config if llm_config is not None else config.get("user_profile", {}).get("llm", {})
+    for part in PROVIDER_PARAM_SECTIONS.get(provider, (provider,)):
+        params = params.get(part, {}) if isinstance(params, Mapping) else {}
+    return params
+
+
+def make_llm_cache_key(provider: str, state: Mapping[str, Any], llm_config: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Hashes everything that shapes a provider's response: provider, its model parameters, the final
+    prompt, and the prompt-state fields handlers add to it.
+    """
+    material = {
+        "provider": provider,
+        "params": provider_params(provider, llm_config),
+        "prompt": state.get("prompt"),
+        "system_instructions": state.get("system_instructions"),
+        "blog_url": state.get("blog_url"),
+    }
+    # Read-only configs (MappingProxyType) hash like the dicts they wrap
+    canonical = json.dumps(
+        material, sort_keys=True, separators=(",", ":"),
+        default=lambda value: dict(value) if isinstance(value, Mapping) else str(value),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_cacheable_response(response: Any) -> bool:
+    """Only complete posts are cached; errors and empty generations are always retried."""
+    return isinstance(response, dict) and bool(response.get("Text")) and "error" not in response
+
+
+class LLMResponseCache:
+    """
+    Persistent TTL + LRU cache of LLM responses.
+
+    Args:
+        path (str): SQLite database file.
+        ttl (float): Seconds an entry stays valid.
+        max_entries (int): Entry cap; least recently used entries are evicted first.
+        max_bytes (int): Cap on the total size of stored responses.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_DB_FILE,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller must hold self._lock
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached response, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+
+    def set(self, key: str, provider: str, response: Dict[str, Any]) -> None:
+        """Stores a response and evicts expired / least recently used entries beyond the caps."""
+        payload = json.dumps(response, default=str)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, provider, response, size, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, provider, payload, len(payload), now, now),
+                )
+                self._evict(conn, now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        doomed = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def is_llm_cache_enabled(use_cache: Optional[bool] = None) -> bool:
+    """
+    Resolves the bypass flag: an explicit `use_cache` wins, then LLM_CACHE_BYPASS=true,
+    then `llm_cache.enabled` in config.
+    """
+    if use_cache is not None:
+        return use_cache
+    if (get_env_variable("LLM_CACHE_BYPASS") or "").lower() == "true":
+        return False
+    return bool(config.get("llm_cache", {}).get("enabled", True))
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Returns the process-wide LLM response cache, sized from the `llm_cache` config block."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                cache_config = config.get("llm_cache", {})
+                _llm_cache = LLMResponseCache(
+                    ttl=cache_config.get("ttl_seconds", DEFAULT_TTL_SECONDS),
+                    max_entries=cache_config.get("max_entries", DEFAULT_MAX_ENTRIES),
+                    max_bytes=cache_config.get("max_bytes", DEFAULT_MAX_BYTES),
+                )
+    return _llm_cache
@@ -0,0 +1,312 @@
+"""
+llm_stream_helper.py
+- Server-Sent Events streaming for Pollinations and OpenAI-compatible chat endpoints.
+- StreamAssembler rebuilds the non-streaming response shape (content and tool calls) from
+  `delta` chunks, so handlers parse streamed and buffered responses the same way.
+- JsonStreamValidator checks JSON output structurally as it arrives, so a reply that is not a
+  JSON object is aborted after its first bad characters instead of after the whole body.
+- JsonStringFieldReader decodes a string field (the post "Text") from partial JSON, so readable
+  post text can be forwarded to API clients while it is still being generated.
+"""
+import json
+import re
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import httpx
+
+SSE_DONE = "[DONE]"
+
+# Text allowed before the JSON object (code fences and Pollinations' `json "` wrapper)
+JSON_PREFIXES = ("", "json", 'json "', "```", "```json")
+MAX_JSON_PREFIX_CHARS = 16
+# Allowed after the object closes: whitespace, a closing fence, or the wrapper's closing quote
+JSON_SUFFIX_CHARS = set(' \t\r\n`"')
+
+JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+TextCallback = Callable[[str], None]
+
+
+class StreamValidationError(ValueError):
+    """Streamed output can no longer become valid JSON."""
+
+
+class StreamHTTPError(RuntimeError):
+    """The streaming request was answered with a non-200 status."""
+
+    def __init__(self, status_code: int, body: str):
+        super().__init__(f"HTTP {status_code}: {body[:200]}")
+        self.status_code = status_code
+        self.body = body
+
+
+async def iter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Yields the data payload of each SSE event (multi-line data joined by newlines) until
+    `[DONE]`. Lines that are not SSE fields are yielded as-is, for servers that stream plain text.
+    """
+    data: List[str] = []
+    async for line in lines:
+        line = line.rstrip("\r")
+        if not line:
+            if data:
+                payload = "\n".join(data)
+                data = []
+                if payload.strip() == SSE_DONE:
+                    return
+                yield payload
+            continue
+        if line.startswith(":"):
+            continue
+        if line.startswith("data:"):
+            value = line[5:]
+            data.append(value[1:] if value.startswith(" ") else value)
+        elif line.startswith(("event:", "id:", "retry:")):
+            continue
+        else:
+            yield line + "\n"
+    if data:
+        payload = "\n".join(data)
+        if payload.strip() != SSE_DONE:
+            yield payload
+
+
+class StreamAssembler:
+    """Accumulates chat-completion chunks into one complete message."""
+
+    def __init__(self):
+        self._content: List[str] = []
+        self.tool_calls: Dict[int, Dict[str, Any]] = {}
+        self.finish_reason: Optional[str] = None
+        self.model: Optional[str] = None
+        self.chunks = 0
+
+    def add(self, data: str) -> Tuple[str, List[Tuple[int, str]]]:
+        """
+        Adds one SSE payload.
+        Returns:
+            (content delta, [(tool call index, arguments delta), ...])
+        """
+        self.chunks += 1
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            chunk = None
+        if not isinstance(chunk, dict):
+            # Plain-text streams carry the text itself
+            self._content.append(data)
+            return data, []
+        self.model = chunk.get("model") or self.model
+        choices = chunk.get("choices") or []
+        if not choices:
+            content = chunk.get("content") or ""
+            self._content.append(content)
+            return content, []
+        choice = choices[0]
+        self.finish_reason = choice.get("finish_reason") or self.finish_reason
+        delta = choice.get("delta") or choice.get("message") or {}
+        content = delta.get("content") or ""
+        if content:
+            self._content.append(content)
+        argument_deltas: List[Tuple[int, str]] = []
+        for tool_call in delta.get("tool_calls") or []:
+            index = tool_call.get("index", len(self.tool_calls))
+            entry = self.tool_calls.setdefault(
+                index, {"id": None, "type": "function", "function": {"name": "", "arguments": ""}}
+            )
+            if tool_call.get("id"):
+                entry["id"] = tool_call["id"]
+            function = tool_call.get("function") or {}
+            if function.get("name"):
+                entry["function"]["name"] += function["name"]
+            if function.get("arguments"):
+                entry["function"]["arguments"] += function["arguments"]
+                argument_deltas.append((index, function["arguments"]))
+        return content, argument_deltas
+
+    @property
+    def content(self) -> str:
+        return "".join(self._content)
+
+    def completion(self) -> Dict[str, Any]:
+        """The assembled message in the non-streaming chat-completion shape."""
+        message: Dict[str, Any] = {"role": "assistant", "content": self.content}
+        if self.tool_calls:
+            message["tool_calls"] = [self.tool_calls[index] for index in sorted(self.tool_calls)]
+        return {
+            "model": self.model,
+            "choices": [{"index": 0, "message": message, "finish_reason": self.finish_reason}],
+        }
+
+
+class JsonStreamValidator:
+    """
+    Incremental structural check of a JSON object arriving in pieces: allowed prefix, balanced
+    and correctly nested brackets (outside strings), and nothing but trailing noise after it.
+    """
+
+    def __init__(self):
+        self._prefix = ""
+        self._stack: List[str] = []
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self.complete = False
+
+    def feed(self, text: str) -> None:
+        for char in text:
+            if self.complete:
+                if char not in JSON_SUFFIX_CHARS:
+                    raise StreamValidationError(f"Unexpected text after the JSON object: {char!r}")
+                continue
+            if not self._started:
+                self._feed_prefix(char)
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._stack.append("}")
+            elif char == "[":
+                self._stack.append("]")
+            elif char in "}]":
+                if not self._stack or self._stack.pop() != char:
+                    raise StreamValidationError(f"Mismatched {char!r} in streamed JSON.")
+                if not self._stack:
+                    self.complete = True
+
+    def _feed_prefix(self, char: str) -> None:
+        if char == "{":
+            if self._prefix.strip() not in JSON_PREFIXES:
+                raise StreamValidationError(f"Streamed output does not start with a JSON object: {self._prefix[:40]!r}")
+            self._started = True
+            self._stack.append("}")
+            return
+        self._prefix += char
+        prefix = self._prefix.strip()
+        if len(prefix) > MAX_JSON_PREFIX_CHARS or not any(allowed.startswith(prefix) for allowed in JSON_PREFIXES):
+            raise StreamValidationError(f"Streamed output does not start with a JSON object: {self._prefix[:40]!r}")
+
+    def finish(self) -> None:
+        """Raises if the stream ended before the object was closed."""
+        if not self.complete:
+            raise StreamValidationError("Stream ended before the JSON object was complete.")
+
+
+class JsonStringFieldReader:
+    """Decodes one top-level string field (e.g. "Text") from JSON that is still arriving."""
+
+    def __init__(self, field: str = "Text"):
+        self._pattern = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._position: Optional[int] = None
+        self.done = False
+
+    def feed(self, text: str) -> str:
+        """Adds raw JSON text and returns the newly decoded part of the field value."""
+        self._buffer += text
+        if self.done:
+            return ""
+        if self._position is None:
+            match = self._pattern.search(self._buffer)
+            if not match:
+                return ""
+            self._position = match.end()
+        buffer = self._buffer
+        index = self._position
+        decoded: List[str] = []
+        while index < len(buffer):
+            char = buffer[index]
+            if char == '"':
+                self.done = True
+                index += 1
+                break
+            if char == "\\":
+                # Wait for the rest of an escape sequence split across chunks
+                if index + 1 >= len(buffer):
+                    break
+                escape = buffer[index + 1]
+                if escape == "u":
+                    if index + 6 > len(buffer):
+                        break
+                    try:
+                        decoded.append(chr(int(buffer[index + 2: index + 6], 16)))
+                    except ValueError:
+                        decoded.append(buffer[index: index + 6])
+                    index += 6
+                    continue
+                decoded.append(JSON_ESCAPES.get(escape, escape))
+                index += 2
+                continue
+            decoded.append(char)
+            index += 1
+        self._position = index
+        return "".join(decoded)
+
+
+async def stream_chat_completion(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+    validate_json: bool = False,
+    on_text: Optional[TextCallback] = None,
+    text_field: str = "Text",
+) -> StreamAssembler:
+    """
+    POSTs a streaming request and assembles the reply as it arrives.
+
+    Args:
+        client: Shared async client.
+        url: Endpoint URL.
+        payload: Request body (its `stream` flag should be true).
+        headers: Extra request headers.
+        validate_json: Abort as soon as the message content cannot become a JSON object.
+            Tool-call arguments are always validated.
+        on_text: Called with each new piece of the `text_field` value, decoded from the content
+            or the tool-call arguments. The JSON around it is never forwarded, validated or not.
+        text_field: JSON string field streamed to `on_text`.
+    Returns:
+        StreamAssembler: The assembled reply.
+    Raises:
+        StreamHTTPError: Non-200 response.
+        StreamValidationError: Malformed JSON output (the connection is closed right away).
+    """
+    assembler = StreamAssembler()
+    content_validator = JsonStreamValidator() if validate_json else None
+    content_reader = JsonStringFieldReader(text_field)
+    tool_validators: Dict[int, JsonStreamValidator] = {}
+    tool_readers: Dict[int, JsonStringFieldReader] = {}
+
+    def emit(text: str) -> None:
+        if text and on_text is not None:
+            try:
+                on_text(text)
+            except Exception as e:
+                print(f"⚠️ Stream text callback failed: {e}")
+
+    async with client.stream("POST", url, json=payload, headers=headers or {}) as response:
+        if response.status_code != 200:
+            body = (await response.aread()).decode("utf-8", errors="replace")
+            raise StreamHTTPError(response.status_code, body)
+        async for data in iter_sse_data(response.aiter_lines()):
+            content_delta, argument_deltas = assembler.add(data)
+            if content_delta:
+                if content_validator is not None:
+                    content_validator.feed(content_delta)
+                emit(content_reader.feed(content_delta))
+            for index, arguments_delta in argument_deltas:
+                tool_validators.setdefault(index, JsonStreamValidator()).feed(arguments_delta)
+                emit(tool_readers.setdefault(index, JsonStringFieldReader(text_field)).feed(arguments_delta))
+
+    if content_validator is not None and assembler.content.strip():
+        content_validator.finish()
+    for validator in tool_validators.values():
+        validator.finish()
+    return assembler
@@ -0,0 +1,190 @@
+"""
+media_stream_helper.py
+- Streams remote media (images, GIFs, videos) to social upload endpoints without holding the
+  whole file in memory.
+- MediaStreamReader turns a download stream into a file-like upload body, or hands out
+  fixed-size parts for chunked/multipart uploads; at most one part is buffered.
+- RangedMediaSource downloads one part at a time with Range requests, so no download sits
+  open while the upload is being set up.
+- request_with_retry resends a request (or a single part) on connection errors, 429 and 5xx.
+"""
+import tempfile
+import time
+from typing import Any, Callable, Iterable, Optional, Tuple
+import requests
+from src.utils.helpers.http_client_helper import get_session
+
+DEFAULT_READ_SIZE = 64 * 1024
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF_SECONDS = 1.0
+# Downloads without a usable Content-Length are spooled; past this size the spool moves to disk
+SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class MediaStreamError(Exception):
+    """Raised when the source media cannot be downloaded."""
+
+
+class MediaStreamReader:
+    """
+    File-like view over an iterator of byte chunks.
+
+    `read(n)` returns exactly n bytes until the stream runs out, so it can feed both
+    requests (as an upload body) and fixed-size upload parts. `len()` is the expected total
+    length, which lets requests send a Content-Length instead of chunked encoding.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], length: Optional[int] = None):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+        self.length = length
+        self.bytes_read = 0
+
+    def __len__(self) -> int:
+        if self.length is None:
+            raise TypeError("MediaStreamReader length is unknown")
+        return self.length
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0 or size > len(self._buffer):
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self.bytes_read += len(data)
+        return data
+
+
+def open_media_stream(media_url: str, session: Optional[requests.Session] = None) -> requests.Response:
+    """Starts a streaming download of `media_url`; the body is read lazily."""
+    session = session or get_session()
+    try:
+        response = session.get(media_url, stream=True)
+    except requests.RequestException as e:
+        raise MediaStreamError(f"Could not download {media_url}: {e}") from e
+    if response.status_code != 200:
+        response.close()
+        raise MediaStreamError(f"Could not download {media_url}: HTTP {response.status_code}")
+    return response
+
+
+def open_media_range(media_url: str, first: int, last: int, session: Optional[requests.Session] = None) -> requests.Response:
+    """
+    Starts a streaming download of bytes `first`..`last` (inclusive). Answered with 206, or with
+    200 and the whole file by servers that ignore Range.
+    """
+    session = session or get_session()
+    try:
+        response = session.get(media_url, stream=True, headers={"Range": f"bytes={first}-{last}"})
+    except requests.RequestException as e:
+        raise MediaStreamError(f"Could not download {media_url}: {e}") from e
+    if response.status_code not in (200, 206):
+        response.close()
+        raise MediaStreamError(f"Could not download {media_url}: HTTP {response.status_code}")
+    return response
+
+
+class RangedMediaSource:
+    """
+    Reads consecutive byte ranges of a remote file, each with its own Range request made only
+    when that range is needed. If the server ignores Range, the full download it sent instead
+    is read on sequentially for the remaining ranges.
+    """
+
+    def __init__(self, media_url: str, session: Optional[requests.Session] = None, read_size: int = DEFAULT_READ_SIZE):
+        self.media_url = media_url
+        self.session = session
+        self.read_size = read_size
+        self._response: Optional[requests.Response] = None
+        self._sequential: Optional[MediaStreamReader] = None
+
+    def read_range(self, first: int, last: int) -> bytes:
+        expected = last - first + 1
+        if self._sequential is None:
+            response = open_media_range(self.media_url, first, last, self.session)
+            if response.status_code == 206:
+                try:
+                    return MediaStreamReader(response.iter_content(self.read_size)).read(expected)
+                finally:
+                    response.close()
+            self._response = response
+            self._sequential = MediaStreamReader(response.iter_content(self.read_size))
+        skip = first - self._sequential.bytes_read
+        if skip < 0:
+            raise MediaStreamError(f"{self.media_url} ignores Range requests, so ranges must be read in order.")
+        while skip > 0:
+            skipped = len(self._sequential.read(min(skip, self.read_size)))
+            if not skipped:
+                break
+            skip -= skipped
+        return self._sequential.read(expected)
+
+    def close(self) -> None:
+        if self._response is not None:
+            self._response.close()
+        self._response = None
+        self._sequential = None
+
+
+def media_stream_size(response: requests.Response) -> Optional[int]:
+    """Byte size of the (decoded) download, or None if the server didn't say or compressed it."""
+    encoding = response.headers.get("Content-Encoding", "identity").lower()
+    length = response.headers.get("Content-Length")
+    if encoding != "identity" or not length or not length.isdigit():
+        return None
+    return int(length)
+
+
+def media_stream_reader(response: requests.Response, read_size: int = DEFAULT_READ_SIZE) -> MediaStreamReader:
+    return MediaStreamReader(response.iter_content(read_size), media_stream_size(response))
+
+
+def spool_media_stream(response: requests.Response, read_size: int = DEFAULT_READ_SIZE) -> Tuple[Any, int]:
+    """
+    Copies a download of unknown size into a SpooledTemporaryFile (memory up to
+    SPOOL_MEMORY_BYTES, then disk) and returns (file rewound to the start, size).
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    size = 0
+    for chunk in response.iter_content(read_size):
+        spool.write(chunk)
+        size += len(chunk)
+    spool.seek(0)
+    return spool, size
+
+
+def request_with_retry(
+    method: str,
+    url: str,
+    attempts: int = DEFAULT_RETRY_ATTEMPTS,
+    backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS,
+    body_factory: Optional[Callable[[], Any]] = None,
+    session: Optional[requests.Session] = None,
+    **kwargs,
+) -> requests.Response:
+    """
+    Sends a request, retrying connection errors and 429/5xx responses with exponential backoff.
+    Streamed bodies can only be sent once, so pass `body_factory` to build a fresh body per attempt.
+    Returns the last response; re-raises the last connection error if every attempt failed that way.
+    """
+    session = session or get_session()
+    for attempt in range(attempts):
+        if body_factory is not None:
+            kwargs["data"] = body_factory()
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == attempts - 1:
+                raise
+            print(f"⚠️ {method} {url} failed ({e}); retrying ({attempt + 1}/{attempts - 1})")
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == attempts - 1:
+                return response
+            print(f"⚠️ {method} {url} returned {response.status_code}; retrying ({attempt + 1}/{attempts - 1})")
+        time.sleep(backoff * 2 ** attempt)
+    raise RuntimeError("request_with_retry needs at least one attempt")
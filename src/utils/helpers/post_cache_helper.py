@@ -1,72 +1,54 @@
 import os
-import json
-from typing import Optional, Dict, Any
-from datetime import datetime
-# Remove get_env_variable import if not used
+from typing import Any, Dict, Iterable, List, Optional
+from src.utils.helpers.post_history_store import (
+    LEGACY_LINKEDIN_POST_FILE,
+    get_post_history_store,
+)
 
-# Define the directory and ensure it exists
-TEMP_FOLDER = '_temp'
-os.makedirs(TEMP_FOLDER, exist_ok=True)
-
-# Define the storage file path within the _temp directory
-LINKEDIN_POST_STORAGE_FILE = os.path.join(TEMP_FOLDER, 'linkedin_post_cache.json')
+# * Post history now lives in the SQLite store (_temp/post_history.db).
+# * The legacy JSON path is kept so old caches are imported on first use.
+LINKEDIN_POST_STORAGE_FILE = LEGACY_LINKEDIN_POST_FILE
+LINKEDIN_PLATFORM = "linkedin"
 
 def load_linkedin_post_cache() -> Dict[str, Any]:
     """
-    Loads the LinkedIn post cache from JSON file.
-    
+    Loads the LinkedIn post history.
+
+    Prefer get_post_history_store().iter_posts() for large histories; this materializes every record.
+
     Returns:
-        Dict[str, Any]: Dictionary containing post history with 'posts' list
+        Dict[str, Any]: Dictionary containing post history with 'posts' list (most recent first)
     """
-    if not os.path.exists(LINKEDIN_POST_STORAGE_FILE):
-        return {"posts": []}
-    
-    with open(LINKEDIN_POST_STORAGE_FILE, 'r') as file:
-        try:
-            data = json.load(file)
-            # Ensure proper structure
-            if isinstance(data, list):
-                # Convert old format to new structure
-                return {"posts": data}
-            elif isinstance(data, dict) and "posts" in data:
-                return data
-            else:
-                # Initialize with proper structure
-                return {"posts": []}
-        except json.JSONDecodeError:
-            print("⚠️ LinkedIn post cache file is corrupted. Returning empty cache.")
-            return {"posts": []}
+    return {"posts": list(get_post_history_store().iter_posts(platform=LINKEDIN_PLATFORM))}
 
 def save_linkedin_post_cache(post_data: Dict[str, Any]) -> None:
     """
-    Saves LinkedIn post cache to JSON file.
-    
+    Replaces the LinkedIn post history in one transaction.
+
     Args:
         post_data (Dict[str, Any]): Dictionary containing post history with 'posts' list
     """
     # Ensure proper structure
     if not isinstance(post_data, dict):
         post_data = {"posts": post_data if isinstance(post_data, list) else []}
-    elif "posts" not in post_data:
-        post_data["posts"] = []
-        
-    with open(LINKEDIN_POST_STORAGE_FILE, 'w') as file:
-        json.dump(post_data, file, indent=2)
+    get_post_history_store().replace_posts(LINKEDIN_PLATFORM, post_data.get("posts", []))
 
 def delete_linkedin_post_cache() -> None:
     """
-    Deletes the LinkedIn post cache file if it exists.
+    Deletes the LinkedIn post history (and the legacy JSON file, if it still exists).
     """
+    removed = get_post_history_store().delete_posts(LINKEDIN_PLATFORM)
     if os.path.exists(LINKEDIN_POST_STORAGE_FILE):
         os.remove(LINKEDIN_POST_STORAGE_FILE)
+    if removed:
         print("🗑️ LinkedIn post cache deleted.")
     else:
         print("ℹ️ No LinkedIn post cache file to delete.")
 
 def add_linkedin_post(post_text: str, blog_id: Optional[str], media_url: Optional[str] = None, media_type: Optional[str] = None, post_url: Optional[str] = None) -> None:
     """
-    Adds a LinkedIn post to the cache with metadata and tracking information.
-    
+    Appends a LinkedIn post to the history with metadata and tracking information.
+
     Args:
         post_text (str): The text content of the posted message
         blog_id (Optional[str]): Reference to the blog ID this post was created from
@@ -74,85 +56,61 @@ def add_linkedin_post(post_text: str, blog_id: Optional[str], media_url: Optiona
         media_type (Optional[str]): Type of media (IMAGE, GIF, VIDEO)
         post_url (Optional[str]): URL of the LinkedIn post if available
     """
-    cache = load_linkedin_post_cache()
-    
-    # Create post record
-    post_record = {
-        "platform": "linkedin",
-        "post_text": post_text,
-        "blog_id": blog_id,
-        "media_url": media_url,
-        "media_type": media_type,
-        "post_url": post_url,
-        "timestamp": datetime.now().isoformat(),
-        "id": f"post_{len(cache['posts']) + 1}"
-    }
-    
-    # Add to the beginning of the list (most recent first)
-    cache["posts"].insert(0, post_record)
-    
-    # Save updated cache
-    save_linkedin_post_cache(cache)
+    get_post_history_store().add_post(
+        LINKEDIN_PLATFORM,
+        post_text,
+        blog_id,
+        media_url=media_url,
+        media_type=media_type,
+        post_url=post_url,
+    )
     print("💾 LinkedIn post successfully saved to cache.")
 
 def is_linkedin_post_cache_valid() -> bool:
     """
-    Checks if the LinkedIn post cache file exists and contains a valid structure.
-    
+    Checks that the post history database opens and passes an integrity check.
+
     Returns:
         bool: True if valid, False otherwise.
     """
-    print(f"🧪 Checking if LinkedIn post cache file exists at: {LINKEDIN_POST_STORAGE_FILE}")
-    if not os.path.exists(LINKEDIN_POST_STORAGE_FILE):
-        print("❌ LinkedIn post cache file does not exist.")
+    store = get_post_history_store()
+    print(f"🧪 Checking post history database at: {store.path}")
+    if not store.is_healthy():
+        print("❌ Post history database failed its integrity check.")
         return False
+    print("✅ LinkedIn post cache is valid.")
+    return True
 
-    try:
-        with open(LINKEDIN_POST_STORAGE_FILE, 'r') as file:
-            raw = file.read()
-            print(f"📦 Raw LinkedIn post cache content:\n{raw[:300]}...")
-            data = json.loads(raw)
-            
-            if not isinstance(data, dict) or "posts" not in data:
-                print("❌ Invalid structure. Expected dict with 'posts' key.")
-                return False
-
-            posts = data["posts"]
-            if not isinstance(posts, list):
-                print("❌ 'posts' key is not a list.")
-                return False
-
-            print("✅ LinkedIn post cache is valid.")
-            return True
-
-    except Exception as e:
-        print(f"❌ Error reading or parsing LinkedIn post cache file: {e}")
-        return False
 
-
-def is_blog_already_posted(blog_id: str) -> bool:
+def is_blog_already_posted(blog_id: str, platform: str = LINKEDIN_PLATFORM) -> bool:
     """
-    Check if a blog with the given ID has already been posted to LinkedIn.
-    
+    Check if a blog with the given ID has already been posted to a platform.
+
     Args:
         blog_id (str): The blog ID to check
-        
+        platform (str): Platform to check against (defaults to LinkedIn)
+
     Returns:
         bool: True if the blog has already been posted, False otherwise
     """
     if not blog_id:
         return False
-        
+
     try:
-        cache = load_linkedin_post_cache()
-        
-        # Check if any post in cache has the same blog_id
-        for post in cache.get("posts", []):
-            if post.get("blog_id") == blog_id:
-                print(f"⚠️ Blog ID {blog_id} has already been posted to LinkedIn")
-                return True
-                
+        if get_post_history_store().has_post(blog_id, platform):
+            print(f"⚠️ Blog ID {blog_id} has already been posted to {platform}")
+            return True
         return False
     except Exception as e:
         print(f"❌ Error checking for duplicate blog posts: {e}")
         return False
+
+
+def get_unposted_blog_ids(blog_ids: Iterable[str], platform: str = LINKEDIN_PLATFORM) -> List[str]:
+    """
+    Returns the blog IDs that have not been posted to a platform yet, in the given order.
+
+    Each check is an indexed lookup, so diffing a whole feed stays cheap as history grows.
+    """
+    store = get_post_history_store()
+    return [blog_id for blog_id in blog_ids if blog_id and not store.has_post(blog_id, platform)]
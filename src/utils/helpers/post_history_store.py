@@ -0,0 +1,243 @@
+"""
+post_history_store.py
+- SQLite-backed, append-only history of published social posts.
+- Lookups by (blog_id, platform) hit an index, writes are single-row transactions,
+  and reads stream rows instead of loading the whole history.
+- Imports the legacy linkedin_post_cache.json once on first use.
+"""
+import os
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+# Define the directory and ensure it exists
+TEMP_FOLDER = '_temp'
+os.makedirs(TEMP_FOLDER, exist_ok=True)
+
+# Define the storage file paths within the _temp directory
+POST_HISTORY_DB_FILE = os.path.join(TEMP_FOLDER, 'post_history.db')
+LEGACY_LINKEDIN_POST_FILE = os.path.join(TEMP_FOLDER, 'linkedin_post_cache.json')
+
+POST_COLUMNS = ("platform", "post_text", "blog_id", "media_url", "media_type", "post_url", "timestamp")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    rowid_pk INTEGER PRIMARY KEY AUTOINCREMENT,
+    platform TEXT NOT NULL,
+    post_text TEXT,
+    blog_id TEXT,
+    media_url TEXT,
+    media_type TEXT,
+    post_url TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_blog_platform ON posts (blog_id, platform);
+CREATE INDEX IF NOT EXISTS idx_posts_platform ON posts (platform, rowid_pk);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+_INSERT_POST = f"INSERT INTO posts ({', '.join(POST_COLUMNS)}) VALUES ({', '.join('?' * len(POST_COLUMNS))})"
+
+
+class PostHistoryStore:
+    """
+    Append-only post history.
+
+    Args:
+        path (str): SQLite database file.
+        legacy_json_path (Optional[str]): Old JSON cache to import once, if it exists.
+    """
+
+    def __init__(self, path: str = POST_HISTORY_DB_FILE, legacy_json_path: Optional[str] = LEGACY_LINKEDIN_POST_FILE):
+        self.path = path
+        self.legacy_json_path = legacy_json_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers stream history while a post is being recorded
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller must hold self._lock
+        if self._conn is None:
+            conn = self._connect()
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._import_legacy_json(conn)
+        return self._conn
+
+    def _import_legacy_json(self, conn: sqlite3.Connection) -> None:
+        if not self.legacy_json_path or not os.path.exists(self.legacy_json_path):
+            return
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_json_imported'").fetchone():
+            return
+        try:
+            with open(self.legacy_json_path, 'r') as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            print("⚠️ Legacy LinkedIn post cache is corrupted. Skipping import.")
+            data = []
+        posts = data.get("posts", []) if isinstance(data, dict) else data
+        if not isinstance(posts, list):
+            posts = []
+
+        # The JSON file is newest first; insert oldest first so row order matches posting order
+        rows = [_post_row(post, post.get("platform") or "linkedin") for post in reversed(posts) if isinstance(post, dict)]
+        with _transaction(conn):
+            conn.executemany(_INSERT_POST, rows)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_json_imported', ?)",
+                         (datetime.now().isoformat(),))
+        print(f"📦 Imported {len(rows)} post(s) from {self.legacy_json_path} into post history.")
+
+    def add_post(
+        self,
+        platform: str,
+        post_text: str,
+        blog_id: Optional[str],
+        media_url: Optional[str] = None,
+        media_type: Optional[str] = None,
+        post_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Appends one post record atomically and returns it."""
+        values = (platform, post_text, blog_id, media_url, media_type, post_url, datetime.now().isoformat())
+        with self._lock:
+            conn = self._connection()
+            with _transaction(conn):
+                cursor = conn.execute(_INSERT_POST, values)
+            return {**dict(zip(POST_COLUMNS, values)), "id": f"post_{cursor.lastrowid}"}
+
+    def has_post(self, blog_id: str, platform: Optional[str] = None) -> bool:
+        """Returns True if the blog was already posted (to `platform`, or to any platform if omitted)."""
+        if not blog_id:
+            return False
+        with self._lock:
+            conn = self._connection()
+            if platform is None:
+                row = conn.execute("SELECT 1 FROM posts WHERE blog_id = ? LIMIT 1", (blog_id,)).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT 1 FROM posts WHERE blog_id = ? AND platform = ? LIMIT 1", (blog_id, platform)
+                ).fetchone()
+        return row is not None
+
+    def iter_posts(self, platform: Optional[str] = None, newest_first: bool = True, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Streams post records without loading the whole history.
+
+        Uses its own read connection, so posts can be recorded while iterating.
+        """
+        with self._lock:
+            self._connection()
+        order = "DESC" if newest_first else "ASC"
+        query = f"SELECT rowid_pk, {', '.join(POST_COLUMNS)} FROM posts"
+        params: tuple = ()
+        if platform is not None:
+            query += " WHERE platform = ?"
+            params = (platform,)
+        query += f" ORDER BY rowid_pk {order}"
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _row_to_post(row)
+        finally:
+            conn.close()
+
+    def count(self, platform: Optional[str] = None) -> int:
+        """Returns the number of recorded posts."""
+        with self._lock:
+            conn = self._connection()
+            if platform is None:
+                return conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            return conn.execute("SELECT COUNT(*) FROM posts WHERE platform = ?", (platform,)).fetchone()[0]
+
+    def replace_posts(self, platform: str, posts: List[Dict[str, Any]]) -> None:
+        """Replaces every record for a platform in one transaction. `posts` is newest first."""
+        rows = [_post_row(post, platform) for post in reversed(posts) if isinstance(post, dict)]
+        with self._lock:
+            conn = self._connection()
+            with _transaction(conn):
+                conn.execute("DELETE FROM posts WHERE platform = ?", (platform,))
+                conn.executemany(_INSERT_POST, rows)
+
+    def delete_posts(self, platform: Optional[str] = None) -> int:
+        """Deletes history for a platform (or everything) and returns the number of removed rows."""
+        with self._lock:
+            conn = self._connection()
+            with _transaction(conn):
+                if platform is None:
+                    cursor = conn.execute("DELETE FROM posts")
+                else:
+                    cursor = conn.execute("DELETE FROM posts WHERE platform = ?", (platform,))
+            return cursor.rowcount
+
+    def is_healthy(self) -> bool:
+        """Runs SQLite's quick integrity check."""
+        try:
+            with self._lock:
+                result = self._connection().execute("PRAGMA quick_check").fetchone()
+            return bool(result) and result[0] == "ok"
+        except sqlite3.DatabaseError as e:
+            print(f"❌ Post history database error: {e}")
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """BEGIN IMMEDIATE / COMMIT, rolling back on error. Works with autocommit connections."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _post_row(post: Dict[str, Any], platform: str) -> tuple:
+    return (
+        platform,
+        post.get("post_text"),
+        post.get("blog_id"),
+        post.get("media_url"),
+        post.get("media_type"),
+        post.get("post_url"),
+        post.get("timestamp") or datetime.now().isoformat(),
+    )
+
+
+def _row_to_post(row: sqlite3.Row) -> Dict[str, Any]:
+    post = {column: row[column] for column in POST_COLUMNS}
+    post["id"] = f"post_{row['rowid_pk']}"
+    return post
+
+
+_post_history_store = PostHistoryStore()
+
+
+def get_post_history_store() -> PostHistoryStore:
+    """Returns the process-wide post history store."""
+    return _post_history_store
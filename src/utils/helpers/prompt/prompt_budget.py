@@ -0,0 +1,322 @@
+"""
+prompt_budget.py
+- Token budgeting for blog content before it is inlined into the LLM prompt.
+- Sections of parse_html_blog_content output are ranked (text > links > media > images) and
+  trimmed line by line to fit; text that alone exceeds the budget is map-reduce summarized
+  (when enabled) or truncated at a paragraph/sentence boundary.
+- Token counts come from a pluggable counter: a ~4 chars/token estimate by default, or tiktoken.
+"""
+import asyncio
+import math
+import re
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+from src.utils.config.config_loader import config
+from src.utils.index import run_coroutine_sync
+
+TokenCounter = Callable[[str], int]
+Summarizer = Callable[[str, int], Awaitable[str]]
+
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_BLOG_TOKENS = 3000
+DEFAULT_CHUNK_TOKENS = 1500
+DEFAULT_SUMMARY_CONCURRENCY = 4
+MAX_REDUCE_ROUNDS = 3
+TRUNCATION_MARKER = " [...]"
+
+# Section headers written by parse_html_blog_content, in ranking order after the body text
+SECTION_HEADERS = (
+    ("links", "\n\nLinks:\n"),
+    ("media", "\n\nEmbedded Media:\n"),
+    ("images", "\n\nImages:\n"),
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English prose)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+_token_counter: TokenCounter = estimate_tokens
+
+
+def set_token_counter(counter: TokenCounter) -> None:
+    """Replaces the token counter used by the budget stage (e.g. a model-specific tokenizer)."""
+    global _token_counter
+    _token_counter = counter
+
+
+def get_token_counter() -> TokenCounter:
+    return _token_counter
+
+
+@lru_cache(maxsize=None)
+def tiktoken_counter(encoding_name: str = "cl100k_base") -> Optional[TokenCounter]:
+    """Returns an exact tiktoken counter, or None if tiktoken is not installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        print("ℹ️ tiktoken not installed; using the character-based token estimate.")
+        return None
+    encoding = tiktoken.get_encoding(encoding_name)
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def split_blog_sections(content: str) -> Tuple[str, Dict[str, List[str]]]:
+    """
+    Splits parse_html_blog_content output into body text and its Links/Embedded Media/Images lines.
+    """
+    positions = sorted(
+        (content.find(header), name, header) for name, header in SECTION_HEADERS if header in content
+    )
+    if not positions:
+        return content, {}
+    text = content[: positions[0][0]]
+    sections: Dict[str, List[str]] = {}
+    for index, (start, name, header) in enumerate(positions):
+        end = positions[index + 1][0] if index + 1 < len(positions) else len(content)
+        body = content[start + len(header): end]
+        sections[name] = [line for line in body.split("\n") if line.strip()]
+    return text, sections
+
+
+def truncate_to_tokens(text: str, max_tokens: int, count_tokens: Optional[TokenCounter] = None) -> str:
+    """
+    Returns the longest prefix of `text` within `max_tokens`, cut back to a paragraph or
+    sentence boundary when one is close by.
+    """
+    count_tokens = count_tokens or get_token_counter()
+    if count_tokens(text) <= max_tokens:
+        return text
+    budget = max(0, max_tokens - count_tokens(TRUNCATION_MARKER))
+    low, high = 0, len(text)
+    # Binary search works with any monotonic counter, not just the character estimate
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    prefix = text[:low]
+    boundary = max(prefix.rfind("\n\n"), prefix.rfind(". "), prefix.rfind("\n"))
+    if boundary >= len(prefix) * 0.8:
+        prefix = prefix[: boundary + 1]
+    return prefix.rstrip() + TRUNCATION_MARKER if prefix.strip() else ""
+
+
+def chunk_text(text: str, chunk_tokens: int, count_tokens: Optional[TokenCounter] = None) -> List[str]:
+    """Splits text into paragraph-aligned chunks of at most ~chunk_tokens each."""
+    count_tokens = count_tokens or get_token_counter()
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for paragraph in (p for p in re.split(r"\n\s*\n", text) if p.strip()):
+        tokens = count_tokens(paragraph)
+        if tokens > chunk_tokens:
+            # A single huge paragraph is split by characters
+            if current:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            step = max(1, len(paragraph) * chunk_tokens // tokens)
+            chunks.extend(paragraph[i: i + step] for i in range(0, len(paragraph), step))
+            continue
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(paragraph)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+async def map_reduce_summarize(
+    text: str,
+    max_tokens: int,
+    summarizer: Summarizer,
+    count_tokens: Optional[TokenCounter] = None,
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+    max_concurrency: int = DEFAULT_SUMMARY_CONCURRENCY,
+    max_rounds: int = MAX_REDUCE_ROUNDS,
+) -> str:
+    """
+    Summarizes chunks concurrently and joins the summaries, repeating until the text fits.
+    A chunk whose summary fails is truncated instead; the result is always within budget.
+    """
+    count_tokens = count_tokens or get_token_counter()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def summarize_chunk(chunk: str, target: int) -> str:
+        async with semaphore:
+            try:
+                summary = await summarizer(chunk, target)
+            except Exception as e:
+                print(f"⚠️ Chunk summarization failed, truncating instead: {e}")
+                summary = ""
+        return summary.strip() or truncate_to_tokens(chunk, target, count_tokens)
+
+    for _ in range(max_rounds):
+        if count_tokens(text) <= max_tokens:
+            return text
+        chunks = chunk_text(text, chunk_tokens, count_tokens)
+        target = max(1, max_tokens // len(chunks))
+        summaries = await asyncio.gather(*(summarize_chunk(chunk, target) for chunk in chunks))
+        text = "\n\n".join(summary for summary in summaries if summary)
+    return truncate_to_tokens(text, max_tokens, count_tokens)
+
+
+def _split_over_budget(
+    content: str, max_tokens: int, count_tokens: TokenCounter
+) -> Optional[Tuple[str, Dict[str, List[str]]]]:
+    """Returns (body text, sections) when content exceeds the budget, or None if it already fits."""
+    if count_tokens(content) <= max_tokens:
+        return None
+    text, sections = split_blog_sections(content)
+    return text.strip(), sections
+
+
+def _report_reduction(original_tokens: int, text: str, count_tokens: TokenCounter) -> str:
+    print(f"✂️ Blog text reduced from {original_tokens} to {count_tokens(text)} tokens.")
+    return text
+
+
+def _fill_sections(text: str, sections: Dict[str, List[str]], max_tokens: int, count_tokens: TokenCounter) -> str:
+    """Appends Links, Embedded Media and Images line by line, in that order, while budget remains."""
+    result = text
+    remaining = max_tokens - count_tokens(result)
+    for name, header in SECTION_HEADERS:
+        lines = sections.get(name)
+        if not lines:
+            continue
+        header_tokens = count_tokens(header)
+        kept: List[str] = []
+        used = header_tokens
+        for line in lines:
+            line_tokens = count_tokens(line + "\n")
+            if used + line_tokens > remaining:
+                break
+            kept.append(line)
+            used += line_tokens
+        if kept:
+            result += header + "\n".join(kept)
+            remaining -= used
+    return result
+
+
+async def fit_blog_content_async(
+    content: str,
+    max_tokens: int,
+    count_tokens: Optional[TokenCounter] = None,
+    summarizer: Optional[Summarizer] = None,
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+    max_concurrency: int = DEFAULT_SUMMARY_CONCURRENCY,
+) -> str:
+    """
+    Fits parsed blog content into `max_tokens`.
+
+    Body text is kept first (summarized or truncated only if it alone is too long), then the
+    remaining budget is filled line by line from Links, Embedded Media and Images, in that order.
+    Summaries are awaited on the running loop.
+    """
+    count_tokens = count_tokens or get_token_counter()
+    split = _split_over_budget(content, max_tokens, count_tokens)
+    if split is None:
+        return content
+    text, sections = split
+    original_tokens = count_tokens(text)
+    if original_tokens > max_tokens:
+        if summarizer is not None:
+            text = await map_reduce_summarize(
+                text, max_tokens, summarizer, count_tokens, chunk_tokens, max_concurrency
+            )
+        else:
+            text = truncate_to_tokens(text, max_tokens, count_tokens)
+        return _report_reduction(original_tokens, text, count_tokens)
+    return _fill_sections(text, sections, max_tokens, count_tokens)
+
+
+def fit_blog_content(
+    content: str,
+    max_tokens: int,
+    count_tokens: Optional[TokenCounter] = None,
+    summarizer: Optional[Summarizer] = None,
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+    max_concurrency: int = DEFAULT_SUMMARY_CONCURRENCY,
+) -> str:
+    """
+    Synchronous fit_blog_content_async() for callers without an event loop. Only summarization
+    needs one; code already running on a loop should await fit_blog_content_async() instead.
+    """
+    count_tokens = count_tokens or get_token_counter()
+    split = _split_over_budget(content, max_tokens, count_tokens)
+    if split is None:
+        return content
+    text, sections = split
+    original_tokens = count_tokens(text)
+    if original_tokens > max_tokens:
+        if summarizer is not None:
+            text = run_coroutine_sync(
+                map_reduce_summarize(text, max_tokens, summarizer, count_tokens, chunk_tokens, max_concurrency)
+            )
+        else:
+            text = truncate_to_tokens(text, max_tokens, count_tokens)
+        return _report_reduction(original_tokens, text, count_tokens)
+    return _fill_sections(text, sections, max_tokens, count_tokens)
+
+
+async def llm_chunk_summarizer(chunk: str, max_tokens: int) -> str:
+    """Default summarizer: the keyless Pollinations OpenAI-compatible endpoint."""
+    from ml_models.pollinations_generator import OPENAI_ENDPOINT, call_openai_compatible_endpoint
+    payload = {
+        "model": "openai",
+        "messages": [
+            {
+                "role": "system",
+                "content": "Summarize the user's text. Keep key facts, numbers, names and the author's voice. Reply with the summary only.",
+            },
+            {"role": "user", "content": chunk},
+        ],
+        "max_tokens": max_tokens,
+    }
+    result = await call_openai_compatible_endpoint(OPENAI_ENDPOINT, payload=payload)
+    if result.get("status") != "success":
+        raise RuntimeError(result.get("details") or result.get("response"))
+    return result["response"]["choices"][0]["message"]["content"]
+
+
+def _budget_arguments(budget_config: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Keyword arguments for fit_blog_content* from the `prompt_budget` block, or None if disabled."""
+    budget_config = budget_config if budget_config is not None else config.get("prompt_budget", {})
+    if not budget_config.get("enabled", True):
+        return None
+    count_tokens = get_token_counter()
+    if budget_config.get("tokenizer") == "tiktoken":
+        count_tokens = tiktoken_counter() or count_tokens
+    summarize_config = budget_config.get("summarize", {})
+    return {
+        "max_tokens": budget_config.get("max_blog_tokens", DEFAULT_MAX_BLOG_TOKENS),
+        "count_tokens": count_tokens,
+        "summarizer": llm_chunk_summarizer if summarize_config.get("enabled", False) else None,
+        "chunk_tokens": summarize_config.get("chunk_tokens", DEFAULT_CHUNK_TOKENS),
+        "max_concurrency": summarize_config.get("max_concurrency", DEFAULT_SUMMARY_CONCURRENCY),
+    }
+
+
+def apply_prompt_budget(content: str, budget_config: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Applies the `prompt_budget` config block to parsed blog content.
+    """
+    arguments = _budget_arguments(budget_config) if content else None
+    if arguments is None:
+        return content
+    return fit_blog_content(content, **arguments)
+
+
+async def apply_prompt_budget_async(content: str, budget_config: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    apply_prompt_budget() for code running on an event loop; summaries are awaited, not run on a nested loop.
+    """
+    arguments = _budget_arguments(budget_config) if content else None
+    if arguments is None:
+        return content
+    return await fit_blog_content_async(content, **arguments)
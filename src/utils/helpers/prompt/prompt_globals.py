@@ -1,33 +1,21 @@
 """
 prompt_globals.py
-- Global state management for prompt building and workflow.
+- Prompt state accessors for prompt building and workflow.
+- Backed by the active RunContext (see run_context.py): inside a run these return that run's
+  state; outside any run they fall back to one process-wide state.
+- Always call get_prompt_globals() when the state is needed; never snapshot it at import time.
 """
-from typing import Any, Dict, Optional
+from typing import Any, Dict
 from src.utils.index import get_env_variable
+from src.utils.helpers.prompt.run_context import get_run_context
 
 TEST_MODE = get_env_variable("TEST_MODE").lower() == "true"
-_prompt_globals: Dict[str, Any] = {
-    "prompt": None,
-    "creative_prompt": None,
-    "gif_prompt": None,
-    "hashtags": [],
-    "system_instructions": None,
-    "blog_content": None,
-}
 
 def get_prompt_globals() -> Dict[str, Any]:
-    return _prompt_globals
+    return get_run_context().state
 
 def set_prompt_global(key: str, value: Any) -> None:
-    _prompt_globals[key] = value
+    get_run_context().state[key] = value
 
 def reset_prompt_globals() -> None:
-    global _prompt_globals
-    _prompt_globals = {
-        "prompt": None,
-        "creative_prompt": None,
-        "gif_prompt": None,
-        "hashtags": [],
-        "system_instructions": None,
-        "blog_content": None,
-    }
+    get_run_context().reset()
@@ -2,52 +2,87 @@
 prompt_sources.py
 - Handles fetching and parsing blog content from Medium, Wix, and WordPress.
 """
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Any, Dict, List, Mapping, Optional
 from src.utils.config.config_loader import config
-from rss_feed.medium_bot import fetch_latest_medium_blog
-from rss_feed.wix_bot import fetch_latest_wix_blog
-from rss_feed.wordpress_bot import fetch_latest_wordpress_blog
-from src.utils.index import parse_html_blog_content
+from rss_feed.feed_fetcher import fetch_latest_blog_concurrently
+from src.utils.helpers.blog_rss_helper import get_blog_cache
+from src.utils.index import parse_html_blog_content, run_coroutine_sync
 
 user_config = config.get("user_profile", {})
-medium_username = user_config.get("medium_username")
-wix_url = user_config.get("wix_url")
-wordpress_url = user_config.get("wordpress_url")
+feed_fetch_config = config.get("feed_fetch", {})
 
-def fetch_and_parse_blog() -> Optional[dict]:
+
+def parse_blog_entry(blog_json: Dict[str, Any]) -> Optional[dict]:
     """
-    Fetch the latest blog from the first available source in order of priority: Medium → Wix → WordPress.
+    Turn one feed entry into the blog data used for prompt building.
     Returns:
-        Optional[dict]: Latest blog data if found, otherwise None.
+        Optional[dict]: {id, content, raw, direct_link}, or None if the entry has no content.
     """
-    sources = {
-        "Medium": (medium_username, fetch_latest_medium_blog),
-        "Wix": (wix_url, fetch_latest_wix_blog),
-        "WordPress": (wordpress_url, fetch_latest_wordpress_blog),
-    }
-    print("Fetching blog from Medium, Wix, or WordPress...")
-    response = None
-    for platform, (identifier, fetch_function) in sources.items():
-        if identifier:
-            print(f"Fetching from {platform}...")
-            response = fetch_function(identifier)
-            if response:
-                print(f"Successfully fetched blog from {platform}")
-                break
-    if response is None:
-        print("No new blogs to parse — already up to date.")
-        return None
-    blog_json = response.get("latest_blog", {})
     blog_content = blog_json.get("content")
-    blog_id = blog_json.get("id")
-    blog_direct_link = response.get("latest_blog_direct_link")
     if not blog_content:
-        print("No blog content found in the latest blog.")
+        print(f"No blog content found for blog {blog_json.get('id')}.")
         return None
-    cleaned_blog_content = parse_html_blog_content(blog_content)
     return {
-        "id": blog_id,
-        "content": cleaned_blog_content,
+        "id": blog_json.get("id"),
+        "content": parse_html_blog_content(blog_content),
         "raw": blog_json,
-        "direct_link": blog_direct_link,
+        "direct_link": blog_json.get("link"),
     }
+
+
+async def fetch_feed_blogs_async(run_config: Optional[Mapping[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch every blog of the winning platform, newest first, without parsing their HTML.
+    Args:
+        run_config: Effective config of the run; its `user_profile` picks the feeds. None uses the loaded config.
+    Returns:
+        List[Dict[str, Any]]: Raw feed entries (empty if no feed returned blogs).
+    """
+    profile = run_config.get("user_profile", {}) if run_config is not None else user_config
+    response = await fetch_latest_blog_concurrently(profile, feed_fetch_config)
+    if response is None:
+        return []
+    print(f"Fetched {len(response['all_blogs'])} blog(s) from {response['platform']}")
+    return response["all_blogs"]
+
+
+async def fetch_and_parse_blog_async() -> Optional[dict]:
+    """
+    Fetch the latest blog from all configured sources at once.
+    Priority on merge is Medium → Wix → WordPress; wall-clock time tracks the slowest feed.
+    A latest blog whose id matches the blog cache is treated as already processed.
+    Returns:
+        Optional[dict]: Latest blog data if found, otherwise None.
+    """
+    print("Fetching blog from Medium, Wix, and WordPress concurrently...")
+    response = await fetch_latest_blog_concurrently(user_config, feed_fetch_config)
+    if response is None:
+        print("No new blogs to parse — already up to date.")
+        return None
+    print(f"Successfully fetched blog from {response['platform']}")
+    latest_blog = response.get("latest_blog", {})
+    cached_latest_id = get_blog_cache().latest_blog_id()
+    if cached_latest_id is not None and cached_latest_id == latest_blog.get("id"):
+        print("🟢 Latest blog already cached. No new blog to parse.")
+        return None
+    return parse_blog_entry(latest_blog)
+
+
+def fetch_and_parse_blog() -> Optional[dict]:
+    """
+    Synchronous wrapper around fetch_and_parse_blog_async().
+    Must not be called while an event loop is running; await fetch_and_parse_blog_async() there.
+    Returns:
+        Optional[dict]: Latest blog data if found, otherwise None.
+    Raises:
+        RuntimeError: If called from inside a running event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run_coroutine_sync(fetch_and_parse_blog_async())
+    raise RuntimeError(
+        "fetch_and_parse_blog() would block the running event loop; "
+        "await fetch_and_parse_blog_async() instead"
+    )
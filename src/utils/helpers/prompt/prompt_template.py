@@ -0,0 +1,248 @@
+"""
+prompt_template.py
+- Precompiled prompt template for build_prompt_payload.
+- Everything derived from config (instructions, viral methodology/examples, hashtags, creative
+  and formatting instructions) is assembled once per config version; rendering a blog only
+  adds its content and URL.
+"""
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from src.utils.config.config_service import get_config_view
+from src.utils.helpers.prompt.prompt_instructions import (
+    get_default_instructions,
+    get_system_instructions,
+    get_user_instructions,
+)
+
+
+@dataclass(frozen=True)
+class CompiledPromptTemplate:
+    """
+    Static parts of the prompt, ready to wrap any number of blogs.
+
+    `creative_choices` holds one instruction per enabled creative option; when both an image
+    and a GIF are enabled, one is picked at random per blog. The pick is seeded by the blog, so
+    re-rendering the same blog yields the same prompt (and an LLM response cache hit).
+    """
+    head: str
+    audience_block: str
+    creative_choices: Tuple[str, ...]
+    tail: str
+    creative_prompt: str
+    gif_prompt: str
+    hashtags: Tuple[str, ...]
+    system_instructions: str
+    user_instructions: str
+    default_instructions: str
+
+    def render(self, blog_content: str, blog_url: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Builds the prompt payload for one blog.
+        Returns:
+            Optional[Dict[str, Any]]: Same shape as build_prompt_payload, or None if the blog is empty.
+        """
+        if not blog_content:
+            print("Blog Content Empty", blog_content)
+            return None
+        if len(self.creative_choices) > 1:
+            seed = hashlib.sha256(f"{blog_url}\n{blog_content}".encode("utf-8")).hexdigest()
+            creative_instruction = random.Random(seed).choice(self.creative_choices)
+        else:
+            creative_instruction = self.creative_choices[0]
+        blog_url_instruction = (
+            f"\n\nInclude the original blog URL in the post: {blog_url}" if blog_url else ""
+        )
+        content = (
+            f"{self.head}"
+            f"{blog_content}\n\n"
+            f"{self.audience_block}"
+            f"{creative_instruction}"
+            f"{blog_url_instruction}"
+            f"{self.tail}"
+        )
+        return {
+            "content": content.strip(),
+            "creative_prompt": self.creative_prompt,
+            "gif_prompt": self.gif_prompt,
+            "hashtags": list(self.hashtags),
+            "system_instructions": self.system_instructions,
+            "user_instructions": self.user_instructions,
+            "default_instructions": self.default_instructions,
+            "blog_content": blog_content,
+        }
+
+    def render_many(self, blogs: Iterable[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Renders (blog_content, blog_url) pairs against this template."""
+        return [self.render(blog_content, blog_url) for blog_content, blog_url in blogs]
+
+
+def compile_prompt_template(
+    config: Mapping[str, Any],
+    system_instructions: str,
+    default_instructions: str,
+    user_instructions: str,
+) -> CompiledPromptTemplate:
+    """Assembles every config-derived part of the prompt."""
+    linkedin_config = config.get("social_media_to_post_to", {}).get("linkedin", {})
+    user_config = config.get("user_profile", {})
+    ai_config = config.get("ai", {})
+
+    linkedin_enabled = linkedin_config.get("enabled", False)
+    linkedin_max_chars = linkedin_config.get("maximum_characters", "")
+    linkedin_min_chars = linkedin_config.get("minimum_characters", "")
+    formatting_instructions = linkedin_config.get("formatting_instructions", "")
+    target_audience = user_config.get("target_audience", "")
+    professional_summary = user_config.get("professional_summary", "")
+
+    # Viral Methodologies
+    viral = ai_config.get("viral_posting", {})
+    viral_style_instructions = "\n".join([
+        viral.get("attention_grabbing_intro", {}).get("description", ""),
+        viral.get("emotional_storytelling", {}).get("description", ""),
+        viral.get("relatable_experiences", {}).get("description", ""),
+        viral.get("actionable_takeaways", {}).get("description", ""),
+        viral.get("data-backed_claims", {}).get("description", ""),
+        viral.get("extreme_statements", {}).get("description", ""),
+    ]).strip()
+
+    # Viral Examples
+    formatted_viral_examples = "".join(
+        f"\n---\n"
+        f"Text: {post.get('text')}\n"
+        f"Engagement: {post.get('engagement')}\n"
+        f"Creative: {post.get('creative')}\n"
+        f"Asset: {post.get('creative_asset')}\n"
+        f"Why it worked: {post.get('reason')}\n"
+        for post in ai_config.get("viral_posts_i_liked", [])
+    )
+    viral_examples_instruction = (
+        f"\n\nHere are some viral post examples for inspiration:\n{formatted_viral_examples}"
+        if formatted_viral_examples else ""
+    )
+
+    # Hashtags
+    hashtags_config = config.get("hashtags", {})
+    default_hashtags = list(hashtags_config.get("default_tags", []))
+    custom_hashtags = list(hashtags_config.get("custom_tags", []))
+    hashtags = default_hashtags + custom_hashtags
+    hashtag_instructions = (
+        f"\n\nInclude these default hashtags:\n{default_hashtags}\n"
+        f"Custom tags (optional):\n{custom_hashtags}"
+        if hashtags else ""
+    )
+
+    # Creative Options
+    creative = ai_config.get("creative", {})
+    generate_image_cfg = creative.get("generate_image", {})
+    post_gif_cfg = creative.get("fetch_gif", {})
+    generate_image = generate_image_cfg.get("enabled", False)
+    fetch_gif = post_gif_cfg.get("enabled", False)
+    image_prompt = generate_image_cfg.get("prompt", "")
+    dimensions_width = generate_image_cfg.get("width", "")
+    dimensions_height = generate_image_cfg.get("height", "")
+    image_model = generate_image_cfg.get("model", "")
+    gif_prompt = post_gif_cfg.get("prompt", "")
+    image_instruction = (
+        f"\n\nGenerate an AI image using prompt: ({image_prompt})\n"
+        f"width: {dimensions_width}, height: {dimensions_height}, model: {image_model}"
+    )
+    if generate_image and fetch_gif:
+        creative_choices = (
+            image_instruction + " that enhances the blog content.",
+            f"\n\nFetch a GIF using prompt: ({gif_prompt})" + " that enhances the blog content.",
+        )
+    elif generate_image:
+        creative_choices = (image_instruction,)
+    elif fetch_gif:
+        creative_choices = (f"\n\n[GIF Prompt]: {gif_prompt}",)
+    else:
+        creative_choices = ("",)
+
+    head = (
+        f"{system_instructions}"
+        f"{default_instructions}"
+        f"{user_instructions}"
+        f"Summarize this blog post into an engaging "
+        f"{'LinkedIn (' + str(linkedin_min_chars) + ' MINIMUM chars, ' + str(linkedin_max_chars) + ' MAXIMUM chars) ' if linkedin_enabled else ''}post:\n\n"
+    )
+    audience_block = (
+        f"For target audience: {target_audience}\n"
+        f"About the writer: {professional_summary}\n"
+        f"{viral_examples_instruction}\n"
+        f"Viral Methodologies To use:\n{viral_style_instructions}\n"
+        f"{hashtag_instructions}\n"
+    )
+    tail = (
+        f"Formatting Instructions:\n{formatting_instructions}\n"
+        f"{default_instructions}"
+    )
+    return CompiledPromptTemplate(
+        head=head,
+        audience_block=audience_block,
+        creative_choices=creative_choices,
+        tail=tail,
+        creative_prompt=image_prompt.strip(),
+        gif_prompt=gif_prompt.strip(),
+        hashtags=tuple(hashtags),
+        system_instructions=system_instructions,
+        user_instructions=user_instructions,
+        default_instructions=default_instructions,
+    )
+
+
+_compiled_template: Optional[Tuple[Tuple[int, int], CompiledPromptTemplate]] = None
+_compiled_template_lock = threading.Lock()
+
+# Templates for per-run configs (e.g. API overrides), most recently used last. Entries hold the
+# config itself, so an id() is never reused while its template is cached.
+MAX_RUN_CONFIG_TEMPLATES = 32
+_run_config_templates: "OrderedDict[int, Tuple[Mapping[str, Any], CompiledPromptTemplate]]" = OrderedDict()
+
+
+def compile_prompt_template_for(config: Mapping[str, Any]) -> CompiledPromptTemplate:
+    """Compiles the template for a config, taking the instructions from that same config."""
+    return compile_prompt_template(
+        config,
+        system_instructions=get_system_instructions(config),
+        default_instructions=get_default_instructions(config),
+        user_instructions=get_user_instructions(config),
+    )
+
+
+def get_compiled_prompt_template(run_config: Optional[Mapping[str, Any]] = None) -> CompiledPromptTemplate:
+    """
+    Returns the template for the current config, recompiling only after a config reload.
+    Args:
+        run_config: Effective config of the run (RunContext.config). None uses the loaded config.
+            Effective configs are cached per override profile, so each one compiles once.
+    """
+    if run_config is not None:
+        with _compiled_template_lock:
+            entry = _run_config_templates.get(id(run_config))
+            if entry is not None and entry[0] is run_config:
+                _run_config_templates.move_to_end(id(run_config))
+                return entry[1]
+        template = compile_prompt_template_for(run_config)
+        with _compiled_template_lock:
+            _run_config_templates[id(run_config)] = (run_config, template)
+            while len(_run_config_templates) > MAX_RUN_CONFIG_TEMPLATES:
+                _run_config_templates.popitem(last=False)
+        return template
+
+    # One view of both snapshots, so the template and its version key come from the same loads
+    view = get_config_view()
+    global _compiled_template
+    with _compiled_template_lock:
+        if _compiled_template is None or _compiled_template[0] != view.version:
+            template = compile_prompt_template(
+                view.modular,
+                system_instructions=get_system_instructions(view.main),
+                default_instructions=get_default_instructions(view.main),
+                user_instructions=get_user_instructions(view.main),
+            )
+            _compiled_template = (view.version, template)
+        return _compiled_template[1]
@@ -0,0 +1,143 @@
+"""
+run_context.py
+- Per-run prompt state for the RSS-to-social pipeline.
+- A RunContext carries the prompt state of one blog/tenant run. The active context is tracked
+  in a ContextVar, so concurrent asyncio tasks (and threads started via asyncio.to_thread or
+  run_in_context) each see their own prompt instead of one process-wide dict.
+"""
+import contextvars
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+
+def default_prompt_state() -> Dict[str, Any]:
+    """Returns a fresh, empty prompt state with every key the pipeline reads."""
+    return {
+        "prompt": None,
+        "creative_prompt": None,
+        "gif_prompt": None,
+        "hashtags": [],
+        "system_instructions": None,
+        "blog_content": None,
+    }
+
+
+@dataclass
+class RunContext:
+    """
+    State for one pipeline run.
+
+    Attributes:
+        state: Prompt state (prompt, creative_prompt, gif_prompt, hashtags, system_instructions,
+            blog_content, raw_blog, blog_url). Handlers read it like the old prompt globals.
+        run_id: Identifier used in logs and job tracking.
+        tenant: Optional tenant/account the run belongs to.
+        config: Effective config for this run (e.g. with API overrides). None means the loaded config.
+        on_text_delta: Receives generated post text as it streams in (e.g. to forward it to an
+            API client). When set, providers that support it are called in streaming mode.
+        on_text_reset: Called when the text streamed so far must be discarded (a malformed
+            stream, a retry, or a fallback), before the replacement text is streamed.
+    """
+    state: Dict[str, Any] = field(default_factory=default_prompt_state)
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    tenant: Optional[str] = None
+    config: Optional[Mapping[str, Any]] = None
+    on_text_delta: Optional[Callable[[str], None]] = None
+    on_text_reset: Optional[Callable[[], None]] = None
+
+    @classmethod
+    def from_prompt_state(cls, prompt_state: Dict[str, Any], **kwargs) -> "RunContext":
+        """Builds a context from a prompt state dict (e.g. build_prompt_state output)."""
+        state = default_prompt_state()
+        state.update(prompt_state)
+        return cls(state=state, **kwargs)
+
+    @property
+    def blog_id(self) -> Optional[str]:
+        raw_blog = self.state.get("raw_blog")
+        return raw_blog.get("id") if isinstance(raw_blog, dict) else None
+
+    def reset(self) -> None:
+        """Clears the prompt state in place, keeping references held by callers valid."""
+        self.state.clear()
+        self.state.update(default_prompt_state())
+
+
+# * Fallback context for code that never opens a run (CLI single-post mode, tests)
+_default_context = RunContext(run_id="default")
+_current_context: contextvars.ContextVar[Optional[RunContext]] = contextvars.ContextVar(
+    "run_context", default=None
+)
+
+
+def get_default_run_context() -> RunContext:
+    """Returns the process-wide fallback context."""
+    return _default_context
+
+
+def get_run_context() -> RunContext:
+    """Returns the context of the current run, or the process-wide fallback if none is active."""
+    return _current_context.get() or _default_context
+
+
+def wants_text_stream() -> bool:
+    """True when the current run has a listener for streamed text."""
+    return get_run_context().on_text_delta is not None
+
+
+def emit_text_delta(text: str) -> None:
+    """Forwards a piece of generated text to the current run's listener, if any."""
+    listener = get_run_context().on_text_delta
+    if listener is None or not text:
+        return
+    try:
+        listener(text)
+    except Exception as e:
+        print(f"⚠️ Text stream listener failed: {e}")
+
+
+def reset_text_stream() -> None:
+    """Tells the current run's listener to discard the text streamed so far, if anyone listens."""
+    listener = get_run_context().on_text_reset
+    if listener is None:
+        return
+    try:
+        listener()
+    except Exception as e:
+        print(f"⚠️ Text stream reset listener failed: {e}")
+
+
+def set_run_context(context: Optional[RunContext]) -> contextvars.Token:
+    """Activates a context for the current task/thread. Pass the returned token to reset_run_context()."""
+    return _current_context.set(context)
+
+
+def reset_run_context(token: contextvars.Token) -> None:
+    _current_context.reset(token)
+
+
+@contextmanager
+def use_run_context(context: RunContext) -> Iterator[RunContext]:
+    """
+    Makes `context` the active run for the enclosed block.
+
+    Example:
+        with use_run_context(RunContext.from_prompt_state(prompt_state)):
+            post = await dispatch_text_pipeline(text_model)
+    """
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
+def run_in_context(func: Callable[..., Any], *args, **kwargs) -> Callable[[], Any]:
+    """
+    Binds `func` to a copy of the current context so it sees the active run when executed
+    on another thread (loop.run_in_executor does not propagate ContextVars on its own).
+    """
+    ctx = contextvars.copy_context()
+    return lambda: ctx.run(func, *args, **kwargs)
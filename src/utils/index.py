@@ -1,8 +1,10 @@
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+import asyncio
+import concurrent.futures
 import os
-from typing import Optional
+from typing import Any, Awaitable, Optional
 from dotenv import load_dotenv
+from src.utils.helpers.html_extractor import extract_html
+from src.utils.helpers.http_client_helper import close_async_client
 
 # ✅ Load environment variables from .env file (if running locally)
 load_dotenv()
@@ -12,37 +14,22 @@ def parse_html_blog_content(html_content: str) -> str:
     Strips HTML and returns plain text, links, images, and embedded media from blog content.
     Ideal for feeding into AI ml_models.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    extraction = extract_html(html_content)
 
     # 1. Collect visible text
-    text = soup.get_text(separator="\n", strip=True)
+    text = extraction.text
 
     # 2. Extract links
-    links = []
-    for a in soup.find_all("a", href=True):
-        if isinstance(a, Tag):
-            link_text = a.get_text(strip=True)
-            href = a.get("href")
-            if href:
-                links.append(f"{link_text} ({href})")
+    links = [f"{link.text} ({link.href})" for link in extraction.links if link.href]
 
     # 3. Extract images
-    images = []
-    for img in soup.find_all("img", src=True):
-        if isinstance(img, Tag):
-            alt = img.get("alt", "No alt text")
-            src = img.get("src")
-            if src:
-                images.append(f"{alt} [Image] ({src})")
+    images = [
+        f"{image.alt if image.alt is not None else 'No alt text'} [Image] ({image.src})"
+        for image in extraction.images
+    ]
 
     # 4. Extract media (iframes, videos)
-    media = []
-    for tag in soup.find_all(["iframe", "video"], src=True):
-        if isinstance(tag, Tag):
-            src = tag.get("src")
-            tag_type = tag.name.upper()
-            if src:
-                media.append(f"[{tag_type}] {src}")
+    media = [f"[{item.tag.upper()}] {item.src}" for item in extraction.media]
 
     # Section formatting
     links_section = "\n\nLinks:\n" + "\n".join(links) if links else ""
@@ -65,4 +52,33 @@ def get_env_variable(key: str) -> Optional[str]:
     Returns:
         Optional[str]: The environment variable value or None if not found.
     """
-    return os.getenv(key, os.environ.get(key))
\ No newline at end of file
+    return os.getenv(key, os.environ.get(key))
+
+
+def run_coroutine_sync(coro: Awaitable[Any]) -> Any:
+    """
+    Runs a coroutine to completion from synchronous code.
+
+    Uses asyncio.run() when no event loop is running in this thread. When called from
+    inside a running loop (e.g. a sync helper invoked by an async workflow), the coroutine
+    runs on a fresh loop in a worker thread so the caller's loop is never re-entered.
+
+    Args:
+        coro (Awaitable[Any]): The coroutine to run.
+
+    Returns:
+        Any: The coroutine's result.
+    """
+    async def run_and_close_client() -> Any:
+        # The throwaway loop's pooled client would otherwise be left open when the loop closes
+        try:
+            return await coro
+        finally:
+            await close_async_client()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run_and_close_client())
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, run_and_close_client()).result()
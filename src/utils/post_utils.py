@@ -3,12 +3,14 @@ post_utils.py
 - Post preparation, GIF/image handling, and content assembly utilities.
 """
 from src.utils.dispatch.dispatch_text import dispatch_text_pipeline
-from asset_fetch.giphy import giphy_find_with_metadata, extract_social_upload_metadata
+from asset_fetch.giphy import giphy_find_with_metadata_async, extract_social_upload_metadata
+from src.utils.config.config_loader import config
+from src.utils.helpers.prompt.run_context import RunContext, get_run_context
 from typing import Optional
 
-async def prepare_linkedin_post(text_model: str) -> dict:
+async def prepare_linkedin_post(text_model: str, run_context: Optional[RunContext] = None) -> dict:
     print("🚀 Generating LinkedIn post...")
-    return await dispatch_text_pipeline(text_model)
+    return await dispatch_text_pipeline(text_model, run_context)
 
 
 async def attach_gif_to_post(post: dict) -> dict:
@@ -16,8 +18,14 @@ async def attach_gif_to_post(post: dict) -> dict:
     print(f"🔍 GIF search tags: {gif_tags}")
 
     if gif_tags:
-        # If giphy_find_with_metadata ever becomes async, update this call
-        gif_result = giphy_find_with_metadata(gif_tags)
+        run_config = get_run_context().config or config
+        gif_cfg = run_config.get("ai", {}).get("creative", {}).get("fetch_gif", {})
+        # All tags are searched at once; repeated tags are served from the search cache
+        gif_result = await giphy_find_with_metadata_async(
+            gif_tags,
+            rating=gif_cfg.get("rating", "g"),
+            lang=gif_cfg.get("lang", "en"),
+        )
         gif_obj = gif_result.get("result", {}).get("gif")
         if gif_obj:
             print("🎞️ Found GIF result, attaching metadata...")
@@ -1,151 +1,124 @@
-from typing import Dict, Any, Optional
-from src.utils.helpers.prompt.prompt_sources import fetch_and_parse_blog
-from src.utils.helpers.prompt.prompt_instructions import get_default_instructions, get_system_instructions, get_user_instructions
+import asyncio
+from typing import Dict, Any, List, Mapping, Optional
+from src.utils.helpers.prompt.prompt_sources import fetch_and_parse_blog, fetch_feed_blogs_async, parse_blog_entry
 from src.utils.helpers.prompt.prompt_globals import get_prompt_globals
-from src.utils.config.config_provider import load_modular_config
+from src.utils.helpers.prompt.run_context import RunContext, get_run_context
+from src.utils.helpers.prompt.prompt_template import get_compiled_prompt_template
+from src.utils.helpers.prompt.prompt_budget import apply_prompt_budget, apply_prompt_budget_async
 from src.utils.helpers.blog_rss_helper import load_blog_cache
-from src.utils.helpers.post_cache_helper import is_blog_already_posted
+from src.utils.helpers.post_cache_helper import get_unposted_blog_ids, is_blog_already_posted
 from src.utils.index import get_env_variable
 from src.utils.index import parse_html_blog_content
-import random
 
 TEST_MODE = get_env_variable("TEST_MODE").lower() == "true"
 
-def build_prompt_payload(blog_content: str, blog_url: str = "", **kwargs) -> Optional[Dict[str, Any]]:
-    config = load_modular_config()  # * Dynamically load merged config from all YAML files
+def build_prompt_payload(
+    blog_content: str, blog_url: str = "", run_config: Optional[Mapping[str, Any]] = None, **kwargs
+) -> Optional[Dict[str, Any]]:
     """
     Build the prompt payload for the AI model using blog content, system/user instructions, and config.
+    The config-derived parts come from the compiled template, rebuilt only when config changes.
+    `run_config` is the run's effective config (RunContext.config); None uses the loaded config.
     """
-    if not blog_content:
-        print("Blog Content Empty", blog_content)
-        return None
+    prompt_build_payload = get_compiled_prompt_template(run_config).render(blog_content, blog_url)
+    if prompt_build_payload:
+        print("Final Prompt build_prompt_payload:", prompt_build_payload)
+    return prompt_build_payload
 
-    # Instructions
-    default_instructions = get_default_instructions()
-    system_instructions = get_system_instructions()
-    user_instructions = get_user_instructions()
-
-    linkedin_config = config.get("social_media_to_post_to", {}).get("linkedin", {})
-    user_config = config.get("user_profile", {})
-    ai_config = config.get("ai", {})
-
-    linkedin_enabled = linkedin_config.get("enabled", False)
-    linkedin_max_chars = linkedin_config.get("maximum_characters", "")
-    linkedin_min_chars = linkedin_config.get("minimum_characters", "")
-    formatting_instructions = linkedin_config.get("formatting_instructions", "")
-    target_audience = user_config.get("target_audience", "")
-    professional_summary = user_config.get("professional_summary", "")
-
-    # Viral Methodologies
-    viral = ai_config.get("viral_posting", {})
-    viral_style_instructions = "\n".join([
-        viral.get("attention_grabbing_intro", {}).get("description", ""),
-        viral.get("emotional_storytelling", {}).get("description", ""),
-        viral.get("relatable_experiences", {}).get("description", ""),
-        viral.get("actionable_takeaways", {}).get("description", ""),
-        viral.get("data-backed_claims", {}).get("description", ""),
-        viral.get("extreme_statements", {}).get("description", ""),
-    ]).strip()
-
-    # Viral Examples
-    viral_examples = ai_config.get("viral_posts_i_liked", [])
-    formatted_viral_examples = ""
-    for post in viral_examples:
-        formatted_viral_examples += (
-            f"\n---\n"
-            f"Text: {post.get('text')}\n"
-            f"Engagement: {post.get('engagement')}\n"
-            f"Creative: {post.get('creative')}\n"
-            f"Asset: {post.get('creative_asset')}\n"
-            f"Why it worked: {post.get('reason')}\n"
-        )
-    viral_examples_instruction = (
-        f"\n\nHere are some viral post examples for inspiration:\n{formatted_viral_examples}"
-        if formatted_viral_examples else ""
-    )
 
-    # Hashtags
-    hashtags_config = config.get("hashtags", {})
-    default_hashtags = hashtags_config.get("default_tags", [])
-    custom_hashtags = hashtags_config.get("custom_tags", [])
-    hashtags = default_hashtags + custom_hashtags
-    hashtag_instructions = (
-        f"\n\nInclude these default hashtags:\n{default_hashtags}\n"
-        f"Custom tags (optional):\n{custom_hashtags}"
-        if hashtags else ""
+def build_prompt_payloads(
+    blogs: List[Dict[str, Any]], run_config: Optional[Mapping[str, Any]] = None
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Build prompt payloads for many parsed blogs ({content, direct_link}) against one compiled template.
+    """
+    template = get_compiled_prompt_template(run_config)
+    return template.render_many(
+        (apply_prompt_budget(blog["content"]), blog.get("direct_link", "")) for blog in blogs
     )
 
-    # Creative Options
-    creative = ai_config.get("creative", {})
-    generate_image_cfg = creative.get("generate_image", {})
-    post_gif_cfg = creative.get("fetch_gif", {})
-    generate_image = generate_image_cfg.get("enabled", False)
-    fetch_gif = post_gif_cfg.get("enabled", False)
-    image_prompt = generate_image_cfg.get("prompt", "")
-    dimensions_width = generate_image_cfg.get("width", "")
-    dimensions_height = generate_image_cfg.get("height", "")
-    image_model = generate_image_cfg.get("model", "")
-    gif_prompt = post_gif_cfg.get("prompt", "")
-    if generate_image and fetch_gif:
-        creative_instruction = (
-            f"\n\nGenerate an AI image using prompt: ({image_prompt})\n"
-            f"width: {dimensions_width}, height: {dimensions_height}, model: {image_model}"
-            if random.choice([True, False])
-            else f"\n\nFetch a GIF using prompt: ({gif_prompt})"
-        ) + " that enhances the blog content."
-    elif generate_image:
-        creative_instruction = (
-            f"\n\nGenerate an AI image using prompt: ({image_prompt})\n"
-            f"width: {dimensions_width}, height: {dimensions_height}, model: {image_model}"
-        )
-    elif fetch_gif:
-        creative_instruction = f"\n\n[GIF Prompt]: {gif_prompt}"
-    else:
-        creative_instruction = ""
 
-    blog_url_instruction = (
-        f"\n\nInclude the original blog URL in the post: {blog_url}" if blog_url else ""
-    )
-    content = (
-        f"{system_instructions}"
-        f"{default_instructions}"
-        f"{user_instructions}"
-        f"Summarize this blog post into an engaging "
-        f"{'LinkedIn (' + str(linkedin_min_chars) + ' MINIMUM chars, ' + str(linkedin_max_chars) + ' MAXIMUM chars) ' if linkedin_enabled else ''}post:\n\n"
-        f"{blog_content}\n\n"
-        f"For target audience: {target_audience}\n"
-        f"About the writer: {professional_summary}\n"
-        f"{viral_examples_instruction}\n"
-        f"Viral Methodologies To use:\n{viral_style_instructions}\n"
-        f"{hashtag_instructions}\n"
-        f"{creative_instruction}"
-        f"{blog_url_instruction}"
-        f"Formatting Instructions:\n{formatting_instructions}\n"
-        f"{default_instructions}"
+def _prompt_state_from_content(
+    blog_data: Dict[str, Any], fitted_content: str, run_config: Optional[Mapping[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    prompt_payload = build_prompt_payload(
+        fitted_content, blog_url=blog_data.get("direct_link", ""), run_config=run_config
     )
-    prompt_build_payload = {
-        "content": content.strip(),
-        "creative_prompt": image_prompt.strip(),
-        "gif_prompt": gif_prompt.strip(),
-        "hashtags": hashtags,
-        "system_instructions": system_instructions,
-        "user_instructions": user_instructions,
-        "default_instructions": default_instructions,
-        "blog_content": blog_content,
+    if not prompt_payload:
+        print("No prompt payload returned.")
+        return None
+    return {
+        "prompt": prompt_payload.get("content"),
+        "creative_prompt": prompt_payload.get("creative_prompt"),
+        "gif_prompt": prompt_payload.get("gif_prompt"),
+        "hashtags": prompt_payload.get("hashtags", []),
+        "system_instructions": prompt_payload.get("system_instructions"),
+        "blog_content": prompt_payload.get("blog_content"),
+        "raw_blog": blog_data["raw"],
+        "blog_url": blog_data.get("direct_link", ""),
     }
-    print("Final Prompt build_prompt_payload:", prompt_build_payload)
-    return prompt_build_payload
 
 
-def init_globals_if_needed() -> bool:
+def build_prompt_state(
+    blog_data: Dict[str, Any], run_config: Optional[Mapping[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
     """
-    Initialize global state for the prompt pipeline if new blog is found.
-    Returns True if new blog is ready, False if already posted or no new blog.
+    Build a standalone prompt state (same keys as prompt_globals) for one parsed blog.
+    `run_config` is the run's effective config (RunContext.config); None uses the loaded config.
+    Code running on an event loop should use build_prompt_state_async().
     """
-    print("Initializing global state...")
-    prompt_globals = get_prompt_globals()
-    print("Current global state before update:", prompt_globals)
-    blog_data = fetch_and_parse_blog()
+    # Long posts are trimmed/summarized to the prompt_budget before they reach the template
+    return _prompt_state_from_content(blog_data, apply_prompt_budget(blog_data["content"]), run_config)
+
+
+async def build_prompt_state_async(
+    blog_data: Dict[str, Any], run_config: Optional[Mapping[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Async build_prompt_state(). Chunk summaries are awaited on the running loop; the template
+    (which may read config files) is rendered in a worker thread.
+    Used by batch runs, where several blogs are in flight at once.
+    """
+    fitted_content = await apply_prompt_budget_async(blog_data["content"])
+    return await asyncio.to_thread(_prompt_state_from_content, blog_data, fitted_content, run_config)
+
+
+def build_run_context(blog_data: Dict[str, Any], tenant: Optional[str] = None) -> Optional[RunContext]:
+    """
+    Build a RunContext for one parsed blog, ready to pass to the dispatchers.
+    """
+    prompt_state = build_prompt_state(blog_data)
+    if not prompt_state:
+        return None
+    return RunContext.from_prompt_state(prompt_state, tenant=tenant)
+
+
+async def build_run_context_async(blog_data: Dict[str, Any], tenant: Optional[str] = None) -> Optional[RunContext]:
+    """
+    Async build_run_context().
+    """
+    prompt_state = await build_prompt_state_async(blog_data)
+    if not prompt_state:
+        return None
+    return RunContext.from_prompt_state(prompt_state, tenant=tenant)
+
+
+def select_unposted_blogs(blogs: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Diff feed entries against the post history.
+    Args:
+        blogs: Feed entries, newest first.
+        limit: Maximum number of entries to return (None for no cap).
+    Returns:
+        The newest unposted entries, newest first.
+    """
+    unposted_ids = set(get_unposted_blog_ids(blog.get("id") for blog in blogs))
+    selected = [blog for blog in blogs if blog.get("id") in unposted_ids]
+    return selected[:limit] if limit is not None else selected
+
+
+def _is_new_blog(blog_data: Optional[Dict[str, Any]]) -> bool:
+    """Logs the fetched blog and returns True if it exists and has not been posted yet."""
     if not blog_data:
         print("No blog data returned from fetch_and_parse_blog")
         return False
@@ -153,43 +126,57 @@ def init_globals_if_needed() -> bool:
     print("Blog ID:", blog_data["id"])
     print("Blog Content Length:", len(blog_data["content"]))
     blog_id = blog_data["id"]
-    cached = load_blog_cache()
-    print("Global Cache Check:", cached)
-    # Normalize cached structure
-    if isinstance(cached, list):
-        cached = {"blogs": cached}
-    elif not isinstance(cached, dict):
-        print("Cache is invalid. Resetting.")
-        cached = {"blogs": []}
     # 🛑 Check if this blog has already been posted
     if is_blog_already_posted(blog_id):
         print(f"🔄 Blog ID {blog_id} has already been posted to LinkedIn. Skipping duplicate post.")
         return False
-    # ✅ Proceed with processing if blog is new
-    prompt_payload = build_prompt_payload(
-        blog_data["content"], blog_url=blog_data.get("direct_link", "")
-    )
-    if not prompt_payload:
-        print("No prompt payload returned.")
+    return True
+
+
+def _store_prompt_state(prompt_globals: Dict[str, Any], prompt_state: Optional[Dict[str, Any]], blog_id: str) -> bool:
+    if not prompt_state:
         return False
-    print("Updating prompt_globals with prompt:", prompt_payload)
-    prompt_globals.update(
-        {
-            "prompt": prompt_payload.get("content"),
-            "creative_prompt": prompt_payload.get("creative_prompt"),
-            "gif_prompt": prompt_payload.get("gif_prompt"),
-            "hashtags": prompt_payload.get("hashtags", []),
-            "system_instructions": prompt_payload.get("system_instructions"),
-            "blog_content": prompt_payload.get("blog_content"),
-            "raw_blog": blog_data["raw"],
-            "blog_url": blog_data.get("direct_link", ""),
-        }
-    )
+    print("Updating prompt_globals with prompt:", prompt_state)
+    prompt_globals.update(prompt_state)
     print("Global state after update:", prompt_globals)
     print(f"✅ Successfully stored blog ID {blog_id} in LinkedIn post cache.")
     return True
 
 
+def init_globals_if_needed() -> bool:
+    """
+    Initialize global state for the prompt pipeline if new blog is found.
+    Returns True if new blog is ready, False if already posted or no new blog.
+    """
+    print("Initializing global state...")
+    prompt_globals = get_prompt_globals()
+    print("Current global state before update:", prompt_globals)
+    blog_data = fetch_and_parse_blog()
+    if not _is_new_blog(blog_data):
+        return False
+    # ✅ Proceed with processing if blog is new
+    return _store_prompt_state(prompt_globals, build_prompt_state(blog_data), blog_data["id"])
+
+
+async def init_globals_if_needed_async() -> bool:
+    """
+    Async counterpart of init_globals_if_needed() for code already running on an event loop.
+    Feeds are fetched and the prompt is built without blocking the loop, both with the
+    active run's config.
+    Returns True if new blog is ready, False if already posted or no new blog.
+    """
+    print("Initializing global state...")
+    prompt_globals = get_prompt_globals()
+    run_config = get_run_context().config
+    blogs = await fetch_feed_blogs_async(run_config)
+    blog_data = parse_blog_entry(blogs[0]) if blogs else None
+    if not _is_new_blog(blog_data):
+        return False
+    # ✅ Proceed with processing if blog is new
+    prompt_state = await build_prompt_state_async(blog_data, run_config)
+    return _store_prompt_state(prompt_globals, prompt_state, blog_data["id"])
+
+
 def init_globals_for_test() -> None:
     """
     Initialize global state for prompt building in test mode.
@@ -6,19 +6,24 @@ workflow.py
 from src.socials.utils.linkedin_utils import authenticate_linkedin, post_to_linkedin_if_possible
 from src.utils.post_utils import prepare_linkedin_post, attach_gif_to_post, assemble_post_content
 from src.utils.config.config_loader import config
-from src.utils.prompt_builder import init_globals_if_needed
+from src.utils.prompt_builder import init_globals_if_needed_async, build_prompt_state_async, build_run_context_async, select_unposted_blogs
+from src.utils.helpers.prompt.prompt_sources import fetch_feed_blogs_async, parse_blog_entry
+from src.utils.helpers.prompt.run_context import RunContext, use_run_context
 
 
-from typing import Optional, Dict
+import asyncio
+from typing import Optional, Dict, List
 
 # * Step 1: Initialize global state
 
-def initialize_global_state() -> None:
+async def initialize_global_state() -> bool:
     """
     Initializes any required global state for the workflow.
+    Returns True if a new, unposted blog is ready.
     """
-    init_globals_if_needed()
+    is_new_blog = await init_globals_if_needed_async()
     print("* Global state initialized.")
+    return is_new_blog
 
 # * Step 2: Authenticate and get LinkedIn profile ID
 
@@ -64,26 +69,160 @@ async def assemble_post_for_publishing(post: Dict) -> tuple[str, Optional[str],
 
 def post_to_linkedin_pipeline(post_text: str, media_url: Optional[str], media_type: Optional[str], profile_id: str) -> None:
     """
-    Handles posting the content to LinkedIn, including error handling.
+    Handles posting the content to LinkedIn, including error handling. Raises if publishing failed.
     """
-    post_to_linkedin_if_possible(post_text, media_url, media_type, profile_id)
+    if not post_to_linkedin_if_possible(post_text, media_url, media_type, profile_id):
+        raise RuntimeError("Publishing to LinkedIn failed.")
 
 # * Main orchestrator (pipeline)
-async def run_rss_to_social_workflow(rss_source: str = None) -> None:
+async def run_rss_to_social_workflow(rss_source: str = None, run_context: Optional[RunContext] = None) -> Dict:
     """
     Main workflow for fetching blog content, generating a social post, attaching media, and posting to LinkedIn.
     Args:
         rss_source (str, optional): RSS feed URL or identifier. Uses config default if None.
+        run_context (RunContext, optional): Context to run in (tenant, config overrides). A fresh one if None.
+    Returns:
+        Dict: {"status": "posted" | "skipped", "blog_id"}.
     """
+    # A fresh context per run, so a previous run's prompt can never be reused
+    run_context = run_context or RunContext()
+    run_config = run_context.config or config
     try:
-        initialize_global_state()
-        profile_id = get_linkedin_profile_id_or_fail()
-        text_model = config["ai"]["text"]["generate_text"]["LLM"]
-        post = await generate_post_or_fail(text_model)
-        post = await attach_media_assets(post)
-        post_text, media_url, media_type = await assemble_post_for_publishing(post)
-        post_to_linkedin_pipeline(post_text, media_url, media_type, profile_id)
+        with use_run_context(run_context):
+            if not await initialize_global_state():
+                print("🔄 No new blog to post.")
+                return {"status": "skipped", "blog_id": None}
+            profile_id = get_linkedin_profile_id_or_fail()
+            text_model = run_config["ai"]["text"]["generate_text"]["LLM"]
+            post = await generate_post_or_fail(text_model)
+            post = await attach_media_assets(post)
+            post_text, media_url, media_type = await assemble_post_for_publishing(post)
+            post_to_linkedin_pipeline(post_text, media_url, media_type, profile_id)
         print("✅ Workflow completed.")
+        return {"status": "posted", "blog_id": run_context.blog_id}
     except Exception as e:
         print(f"! Workflow failed: {e}")
         raise
+
+
+# * Preview: generate the newest blog's post without publishing it
+
+async def run_preview_workflow(run_context: Optional[RunContext] = None) -> Dict:
+    """
+    Generates the post for the newest blog in the feed without publishing it or marking it posted.
+    Set run_context.on_text_delta to receive the post text while it is generated.
+    Args:
+        run_context (RunContext, optional): Context to run in (tenant, config overrides, text listener).
+    Returns:
+        Dict: {"status": "generated" | "skipped", "blog_id", "post"}.
+    """
+    run_context = run_context or RunContext()
+    run_config = run_context.config or config
+    blogs = await fetch_feed_blogs_async(run_context.config)
+    blog_data = parse_blog_entry(blogs[0]) if blogs else None
+    if not blog_data:
+        print("🔄 No blog to preview.")
+        return {"status": "skipped", "blog_id": None, "post": None}
+    prompt_state = await build_prompt_state_async(blog_data, run_context.config)
+    if not prompt_state:
+        return {"status": "skipped", "blog_id": blog_data.get("id"), "post": None}
+    run_context.reset()
+    run_context.state.update(prompt_state)
+    with use_run_context(run_context):
+        text_model = run_config["ai"]["text"]["generate_text"]["LLM"]
+        post = await generate_post_or_fail(text_model)
+    return {"status": "generated", "blog_id": run_context.blog_id, "post": post}
+
+
+# * Batch mode: every unposted blog in the feed, up to a cap
+
+async def generate_post_for_batch(
+    blog_json: Dict,
+    text_model: str,
+    semaphore: asyncio.Semaphore,
+) -> Dict:
+    """
+    Generates and decorates one post inside its own RunContext, without publishing it.
+    Returns:
+        Dict: {"blog_id", "status": "generated" | "skipped" | "failed", "error", "post"}, where
+        "post" is the assembled (post_text, media_url, media_type) once generated.
+    """
+    blog_id = blog_json.get("id")
+    async with semaphore:
+        try:
+            blog_data = parse_blog_entry(blog_json)
+            if not blog_data:
+                return {"blog_id": blog_id, "status": "skipped", "error": "No blog content.", "post": None}
+            # Prompt building summarizes on the loop and renders the template off it
+            run_context = await build_run_context_async(blog_data)
+            if not run_context:
+                return {"blog_id": blog_id, "status": "skipped", "error": "No prompt payload.", "post": None}
+            # Each gather() task has its own copy of the context, so this run is invisible to the others
+            with use_run_context(run_context):
+                post = await prepare_linkedin_post(text_model, run_context)
+                if not post or not post.get("Text"):
+                    raise RuntimeError("Text generation failed: No post content was generated.")
+                post = await attach_media_assets(post)
+                assembled = await assemble_post_for_publishing(post)
+            return {"blog_id": blog_id, "status": "generated", "error": None, "post": assembled}
+        except Exception as e:
+            print(f"❌ Batch generation failed for blog {blog_id}: {e}")
+            return {"blog_id": blog_id, "status": "failed", "error": str(e), "post": None}
+
+
+async def publish_batch_post(result: Dict, profile_id: str) -> Dict:
+    """
+    Publishes one generated batch post and records it in the post history.
+    Returns:
+        Dict: {"blog_id", "status": "posted" | "failed", "error"} for the batch summary.
+    """
+    blog_id = result["blog_id"]
+    post_text, media_url, media_type = result["post"]
+    published = await asyncio.to_thread(
+        post_to_linkedin_if_possible, post_text, media_url, media_type, profile_id, blog_id
+    )
+    if not published:
+        return {"blog_id": blog_id, "status": "failed", "error": "Publishing to LinkedIn failed."}
+    return {"blog_id": blog_id, "status": "posted", "error": None}
+
+
+async def run_batch_rss_to_social_workflow(
+    max_posts: Optional[int] = None, max_concurrency: Optional[int] = None
+) -> List[Dict]:
+    """
+    Diffs the whole feed against the post history and publishes every unposted blog, up to `max_posts`.
+    Generation runs with at most `max_concurrency` posts in flight, each in its own RunContext;
+    publishing then happens one post at a time, oldest blog first, so the timeline keeps blog order.
+    Args:
+        max_posts (int, optional): Cap on posts per run. Uses config `batch_posting.max_posts` if None.
+        max_concurrency (int, optional): Posts generated at once. Uses config `batch_posting.max_concurrency` if None.
+    Returns:
+        List[Dict]: One {"blog_id", "status", "error"} entry per selected blog, oldest first.
+    """
+    batch_cfg = config.get("batch_posting", {})
+    max_posts = max_posts if max_posts is not None else batch_cfg.get("max_posts", 5)
+    max_concurrency = max_concurrency if max_concurrency is not None else batch_cfg.get("max_concurrency", 2)
+
+    blogs = await fetch_feed_blogs_async()
+    selected = select_unposted_blogs(blogs, max_posts)
+    if not selected:
+        print("🔄 No unposted blogs found. Nothing to do.")
+        return []
+    print(f"* Batch posting {len(selected)} blog(s) with concurrency {max_concurrency}")
+
+    profile_id = get_linkedin_profile_id_or_fail()
+    text_model = config["ai"]["text"]["generate_text"]["LLM"]
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    # Feeds are newest first; gather() keeps input order, so results come back oldest first
+    generated = await asyncio.gather(
+        *(generate_post_for_batch(blog, text_model, semaphore) for blog in reversed(selected))
+    )
+    results: List[Dict] = []
+    for result in generated:
+        if result["status"] == "generated":
+            results.append(await publish_batch_post(result, profile_id))
+        else:
+            results.append({"blog_id": result["blog_id"], "status": result["status"], "error": result["error"]})
+    posted = sum(1 for result in results if result["status"] == "posted")
+    print(f"✅ Batch workflow completed: {posted}/{len(results)} posted.")
+    return results